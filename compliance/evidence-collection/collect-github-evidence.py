@@ -2,6 +2,14 @@
 """
 GitHub Evidence Collection for SOC 2 Compliance
 Collects evidence from GitHub API and exports to CISO Assistant format
+
+List endpoints are paginated through Link headers and per-repository calls
+run concurrently (GITHUB_CONCURRENCY, default 8) on a pooled client that
+draws from the shared 'github' rate limiter and retries with backoff.
+
+GITHUB_EVIDENCE_MODE=graphql fetches branch protection and Dependabot
+alerts for many repositories per GraphQL query (github_graphql.py);
+secret scanning, which GraphQL does not expose, stays on REST.
 """
 
 import os
@@ -9,13 +17,24 @@ import sys
 import json
 import requests
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Dict, List, Any
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'scripts'))
+from github_client import DEFAULT_CONCURRENCY, GitHubClient
+from github_graphql import fetch_repositories
+from rate_limiter import get_rate_limiter
+
 # GitHub API configuration
 GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN')
 GITHUB_ORG = 'Seven-Fortunas'
 GITHUB_INTERNAL_ORG = 'Seven-Fortunas-Internal'
 API_BASE = 'https://api.github.com'
+GITHUB_CONCURRENCY = int(os.environ.get('GITHUB_CONCURRENCY', DEFAULT_CONCURRENCY))
+
+# 'rest': per-repository REST calls; 'graphql': batched GraphQL queries
+EVIDENCE_MODES = ['rest', 'graphql']
+EVIDENCE_MODE = os.environ.get('GITHUB_EVIDENCE_MODE', 'rest')
 
 # Evidence output directory
 EVIDENCE_DIR = os.environ.get('EVIDENCE_DIR', './evidence')
@@ -24,31 +43,63 @@ EVIDENCE_DIR = os.environ.get('EVIDENCE_DIR', './evidence')
 class GitHubEvidenceCollector:
     """Collects compliance evidence from GitHub"""
 
-    def __init__(self, token: str, org: str):
+    def __init__(self, token: str, org: str, client: GitHubClient = None, mode: str = EVIDENCE_MODE):
+        if mode not in EVIDENCE_MODES:
+            raise ValueError(f"Unknown evidence mode '{mode}' (expected one of: {', '.join(EVIDENCE_MODES)})")
         self.token = token
         self.org = org
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Authorization': f'token {token}',
-            'Accept': 'application/vnd.github.v3+json'
-        })
+        self.mode = mode
+        # Evidence collection is critical: it may use headroom reserved from bulk jobs
+        self.client = client or GitHubClient(
+            token, API_BASE, GITHUB_CONCURRENCY, get_rate_limiter('github', 'critical')
+        )
+        self._repos = None
 
     def _api_get(self, endpoint: str) -> Dict[str, Any]:
         """Make authenticated GET request to GitHub API"""
-        url = f"{API_BASE}{endpoint}"
-        response = self.session.get(url)
-        response.raise_for_status()
-        return response.json()
+        return self.client.get(endpoint)
+
+    def _api_list(self, endpoint: str) -> List[Any]:
+        """All items of a list endpoint, across every page"""
+        return self.client.paginate(endpoint)
+
+    def _org_repos(self) -> List[Dict[str, Any]]:
+        """
+        Organization repositories, fetched once per collector. In graphql
+        mode each also carries its branch protection and Dependabot alerts.
+        """
+        if self._repos is None:
+            if self.mode == 'graphql':
+                self._repos = fetch_repositories(self.client.graphql, self.org)
+            else:
+                self._repos = self._api_list(f'/orgs/{self.org}/repos')
+        return self._repos
+
+    @staticmethod
+    def _protection_status(repo_name: str, protection: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Branch protection entry for a repository (protection None: unprotected)"""
+        if protection is None:
+            return {
+                'repo_name': repo_name,
+                'protected': False
+            }
+        return {
+            'repo_name': repo_name,
+            'protected': True,
+            'required_reviews': protection.get('required_pull_request_reviews', {}).get('required_approving_review_count', 0),
+            'required_status_checks': protection.get('required_status_checks', {}).get('checks', []),
+            'enforce_admins': protection.get('enforce_admins', {}).get('enabled', False)
+        }
 
     def collect_2fa_status(self) -> Dict[str, Any]:
         """GH-AC-001: Two-Factor Authentication status"""
         print(f"Collecting 2FA status for {self.org}...")
 
         # Get all members
-        members = self._api_get(f'/orgs/{self.org}/members')
+        members = self._api_list(f'/orgs/{self.org}/members')
 
         # Get members without 2FA
-        members_no_2fa = self._api_get(f'/orgs/{self.org}/members?filter=2fa_disabled')
+        members_no_2fa = self._api_list(f'/orgs/{self.org}/members?filter=2fa_disabled')
 
         total_members = len(members)
         members_with_2fa = total_members - len(members_no_2fa)
@@ -77,18 +128,19 @@ class GitHubEvidenceCollector:
         """GH-AC-002: Team-Based Access Control"""
         print(f"Collecting team access for {self.org}...")
 
-        teams = self._api_get(f'/orgs/{self.org}/teams')
+        teams = self._api_list(f'/orgs/{self.org}/teams')
 
-        team_details = []
-        for team in teams:
-            members = self._api_get(f"/teams/{team['id']}/members")
-            team_details.append({
+        def team_detail(team):
+            members = self._api_list(f"/teams/{team['id']}/members")
+            return {
                 'team_name': team['name'],
                 'team_slug': team['slug'],
                 'permission': team.get('permission', 'unknown'),
                 'member_count': len(members),
                 'members': [m['login'] for m in members]
-            })
+            }
+
+        team_details = self.client.map(team_detail, teams)
 
         evidence = {
             'control_id': 'GH-AC-002',
@@ -111,25 +163,21 @@ class GitHubEvidenceCollector:
         """GH-AC-003: Branch Protection Rules"""
         print(f"Collecting branch protection for {self.org}...")
 
-        repos = self._api_get(f'/orgs/{self.org}/repos')
+        repos = self._org_repos()
 
-        repo_protection = []
-        for repo in repos:
+        def repo_protection_status(repo):
             try:
                 protection = self._api_get(f"/repos/{self.org}/{repo['name']}/branches/main/protection")
-                repo_protection.append({
-                    'repo_name': repo['name'],
-                    'protected': True,
-                    'required_reviews': protection.get('required_pull_request_reviews', {}).get('required_approving_review_count', 0),
-                    'required_status_checks': protection.get('required_status_checks', {}).get('checks', []),
-                    'enforce_admins': protection.get('enforce_admins', {}).get('enabled', False)
-                })
+                return self._protection_status(repo['name'], protection)
             except requests.exceptions.HTTPError as e:
                 if e.response.status_code == 404:
-                    repo_protection.append({
-                        'repo_name': repo['name'],
-                        'protected': False
-                    })
+                    return self._protection_status(repo['name'])
+                return None
+
+        if self.mode == 'graphql':
+            repo_protection = [self._protection_status(r['name'], r['branch_protection']) for r in repos]
+        else:
+            repo_protection = [r for r in self.client.map(repo_protection_status, repos) if r is not None]
 
         protected_count = sum(1 for r in repo_protection if r['protected'])
         compliance_rate = (protected_count / len(repos) * 100) if repos else 0
@@ -157,30 +205,38 @@ class GitHubEvidenceCollector:
         """GH-MON-002: Dependabot Alerts Monitoring"""
         print(f"Collecting Dependabot alerts for {self.org}...")
 
-        repos = self._api_get(f'/orgs/{self.org}/repos')
+        repos = self._org_repos()
+
+        def repo_alerts(repo):
+            try:
+                return self._api_list(f"/repos/{self.org}/{repo['name']}/dependabot/alerts?state=open")
+            except requests.exceptions.HTTPError:
+                # Repository doesn't have Dependabot enabled or no alerts
+                return []
+
+        if self.mode == 'graphql':
+            # None: alerts unavailable (Dependabot disabled), as the REST error case
+            repo_alert_lists = [r['vulnerability_alerts'] or [] for r in repos]
+        else:
+            repo_alert_lists = self.client.map(repo_alerts, repos)
 
         all_alerts = []
         critical_count = 0
         high_count = 0
 
-        for repo in repos:
-            try:
-                alerts = self._api_get(f"/repos/{self.org}/{repo['name']}/dependabot/alerts?state=open")
-                for alert in alerts:
-                    severity = alert.get('security_vulnerability', {}).get('severity', 'unknown')
-                    all_alerts.append({
-                        'repo_name': repo['name'],
-                        'severity': severity,
-                        'package': alert.get('security_vulnerability', {}).get('package', {}).get('name', 'unknown'),
-                        'created_at': alert.get('created_at')
-                    })
-                    if severity == 'critical':
-                        critical_count += 1
-                    elif severity == 'high':
-                        high_count += 1
-            except requests.exceptions.HTTPError:
-                # Repository doesn't have Dependabot enabled or no alerts
-                pass
+        for repo, alerts in zip(repos, repo_alert_lists):
+            for alert in alerts:
+                severity = alert.get('security_vulnerability', {}).get('severity', 'unknown')
+                all_alerts.append({
+                    'repo_name': repo['name'],
+                    'severity': severity,
+                    'package': alert.get('security_vulnerability', {}).get('package', {}).get('name', 'unknown'),
+                    'created_at': alert.get('created_at')
+                })
+                if severity == 'critical':
+                    critical_count += 1
+                elif severity == 'high':
+                    high_count += 1
 
         evidence = {
             'control_id': 'GH-MON-002',
@@ -204,23 +260,25 @@ class GitHubEvidenceCollector:
         """GH-MON-003: Secret Scanning Alerts"""
         print(f"Collecting secret scanning alerts for {self.org}...")
 
-        repos = self._api_get(f'/orgs/{self.org}/repos')
+        repos = self._org_repos()
 
-        all_alerts = []
-
-        for repo in repos:
+        def repo_alerts(repo):
             try:
-                alerts = self._api_get(f"/repos/{self.org}/{repo['name']}/secret-scanning/alerts?state=open")
-                for alert in alerts:
-                    all_alerts.append({
-                        'repo_name': repo['name'],
-                        'secret_type': alert.get('secret_type', 'unknown'),
-                        'created_at': alert.get('created_at'),
-                        'state': alert.get('state')
-                    })
+                return self._api_list(f"/repos/{self.org}/{repo['name']}/secret-scanning/alerts?state=open")
             except requests.exceptions.HTTPError:
                 # Repository doesn't have secret scanning or no alerts
-                pass
+                return []
+
+        all_alerts = []
+
+        for repo, alerts in zip(repos, self.client.map(repo_alerts, repos)):
+            for alert in alerts:
+                all_alerts.append({
+                    'repo_name': repo['name'],
+                    'secret_type': alert.get('secret_type', 'unknown'),
+                    'created_at': alert.get('created_at'),
+                    'state': alert.get('state')
+                })
 
         evidence = {
             'control_id': 'GH-MON-003',
@@ -313,6 +371,8 @@ def main():
         collector = GitHubEvidenceCollector(GITHUB_TOKEN, org)
         evidence = collector.collect_all_evidence()
         all_evidence.extend(evidence)
+        stats = collector.client.stats
+        print(f"API requests for {org}: {stats['requests']} ({stats['retries']} retries)")
 
     # Save evidence
     save_evidence(all_evidence, EVIDENCE_DIR)
@@ -3,20 +3,32 @@
 AI Advancements Dashboard Updater
 Fetches latest AI news from multiple sources with graceful degradation.
 
+Sources are fetched concurrently on a bounded thread pool with per-host
+caps and a global deadline (see the optional ``fetch`` block in
+sources.yaml), so refresh time tracks the slowest source rather than the
+sum of all of them.
+
 Usage (from repo root):
     python dashboards/ai/scripts/update_dashboard.py
 """
 
+import bisect
+import hashlib
 import json
 import os
 import re
 import sys
+import threading
 import time
 import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from urllib.parse import urlparse
 
 import feedparser
 import requests
@@ -29,6 +41,278 @@ try:
 except ImportError:
     REDDIT_AVAILABLE = False
 
+# Optional conditional-GET cache (scripts/http_cache.py in the infrastructure repo)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+try:
+    from http_cache import HTTPCache
+    HTTP_CACHE_AVAILABLE = True
+except ImportError:
+    HTTP_CACHE_AVAILABLE = False
+
+# Optional streaming feed parser (scripts/feed_stream.py), feedparser otherwise
+try:
+    import feed_stream
+    FEED_STREAM_AVAILABLE = True
+except ImportError:
+    FEED_STREAM_AVAILABLE = False
+
+# Optional shared GitHub rate limiter (scripts/rate_limiter.py); refreshes use
+# the shedding 'bulk' lane so they never eat into evidence collection quota
+try:
+    from rate_limiter import get_rate_limiter
+    RATE_LIMITER_AVAILABLE = True
+except ImportError:
+    RATE_LIMITER_AVAILABLE = False
+
+# Optional shared date normalizer (scripts/date_normalizer.py), _parse_date otherwise
+try:
+    from date_normalizer import DateNormalizer
+    DATE_NORMALIZER_AVAILABLE = True
+except ImportError:
+    DATE_NORMALIZER_AVAILABLE = False
+
+FETCH_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (compatible; AI-Dashboard/1.0; "
+        "+https://seven-fortunas.github.io/dashboards/ai/)"
+    )
+}
+
+# Defaults for the optional ``fetch`` block in sources.yaml
+DEFAULT_FETCH = {
+    "concurrent": True,        # False restores one-source-at-a-time fetching
+    "max_workers": 8,          # Thread pool size
+    "per_host": 2,             # Simultaneous requests per host
+    "deadline_seconds": 60,    # Sources still running after this count as failed
+}
+
+# praw is not thread-safe, so all subreddits share one slot
+REDDIT_HOST = "reddit.com"
+
+SITEMAP_NS = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+
+# Article pages are read only up to </head>, in chunks, capped at the limit
+HEAD_CHUNK_BYTES = 8192
+HEAD_LIMIT_BYTES = 256 * 1024
+
+
+# ----------------------------------------------------------------------
+# Response parsers (results are JSON-serializable so the HTTP cache can
+# return them on 304 Not Modified without re-parsing)
+# ----------------------------------------------------------------------
+
+def parse_feed(body: bytes, limit: int = 5) -> List[Dict[str, str]]:
+    """Latest entries of an RSS/Atom feed (feedparser, lenient)."""
+    feed = feedparser.parse(body)
+    if feed.bozo and not feed.entries:
+        raise Exception(f"Feed parse error: {feed.bozo_exception}")
+    return [
+        {
+            "title": entry.get("title", ""),
+            "link": entry.get("link", ""),
+            "published": entry.get("published", ""),
+            "summary": entry.get("summary", "")[:200],
+        }
+        for entry in feed.entries[:limit]
+    ]
+
+
+def parse_feed_stream(chunks: Iterable[bytes], limit: int = 5) -> List[Dict[str, str]]:
+    """Latest entries of a feed, reading only as far as the limit-th entry."""
+    return feed_stream.parse_entries_with_fallback(
+        chunks, lambda body: parse_feed(body, limit), limit
+    )
+
+
+def parse_sitemap(body: bytes, url_pattern: str = "") -> List[Dict[str, str]]:
+    """Sitemap <url> entries whose location contains url_pattern."""
+    root = ET.fromstring(body)
+    entries = []
+    for url_elem in root.findall("sm:url", SITEMAP_NS):
+        loc = url_elem.findtext("sm:loc", namespaces=SITEMAP_NS) or ""
+        lastmod = url_elem.findtext("sm:lastmod", namespaces=SITEMAP_NS) or ""
+        if url_pattern and url_pattern not in loc:
+            continue
+        entries.append({"loc": loc, "lastmod": lastmod})
+    return entries
+
+
+def read_head(chunks: Iterable[bytes], limit: int = HEAD_LIMIT_BYTES) -> bytes:
+    """Bytes of an HTML page up to and including </head> (or limit)."""
+    data = b""
+    for chunk in chunks:
+        data += chunk
+        end = data.lower().find(b"</head>")
+        if end >= 0:
+            return data[:end + len(b"</head>")]
+        if len(data) >= limit:
+            break
+    return data[:limit]
+
+
+def _meta_content(html: str, prop: str) -> str:
+    for pattern in [
+        rf'<meta[^>]+property=["\']{prop}["\'][^>]+content=["\']([^"\']+)["\']',
+        rf'<meta[^>]+content=["\']([^"\']+)["\'][^>]+property=["\']{prop}["\']',
+    ]:
+        m = re.search(pattern, html)
+        if m:
+            return m.group(1).strip()
+    return ""
+
+
+def extract_og_metadata(html: str) -> Dict[str, str]:
+    """og:title and og:description ('' when absent)."""
+    return {
+        "title": _meta_content(html, "og:title"),
+        "description": _meta_content(html, "og:description")[:200],
+    }
+
+
+class ArticleMetadataCache:
+    """
+    URL-keyed og:title/og:description cache, invalidated by sitemap lastmod.
+
+    put() after save() is ignored, so a fetch that outlives the run's
+    deadline cannot change what was persisted.
+    """
+
+    def __init__(self, path: Path, max_age_days: int = 30):
+        self.path = path
+        self.lock = threading.Lock()
+        self.max_age = timedelta(days=max_age_days)
+        self.closed = False
+        try:
+            with open(path) as f:
+                self.entries: Dict[str, Dict[str, str]] = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, url: str, lastmod: str):
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is None or entry["lastmod"] != lastmod:
+                return None
+            entry["seen"] = datetime.utcnow().isoformat()
+            return {"title": entry["title"], "description": entry["description"]}
+
+    def put(self, url: str, lastmod: str, metadata: Dict[str, str]):
+        with self.lock:
+            if self.closed:
+                return
+            self.entries[url] = {
+                "lastmod": lastmod,
+                "seen": datetime.utcnow().isoformat(),
+                **metadata,
+            }
+
+    def save(self):
+        """Write the cache, dropping articles not seen for max_age_days."""
+        cutoff = (datetime.utcnow() - self.max_age).isoformat()
+        with self.lock:
+            self.closed = True
+            self.entries = {u: e for u, e in self.entries.items() if e["seen"] >= cutoff}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp, self.path)
+
+
+def _utc_epoch(dt: datetime) -> int:
+    """Epoch seconds of a naive UTC datetime; datetime.min (unparseable) is 0."""
+    if dt == datetime.min:
+        return 0
+    return int(dt.replace(tzinfo=timezone.utc).timestamp())
+
+
+class SeenItemStore:
+    """
+    Append-only log of dashboard items keyed by link hash, with an
+    in-memory window sorted by each item's ``published_ts``.
+
+    Each run appends only items it has not seen before, so the write cost
+    tracks the number of new items. Items older than the window are
+    dropped from memory (the cutoff would reject them anyway) and the log
+    is compacted once it holds mostly expired lines.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.items: Dict[str, Dict[str, Any]] = {}  # id -> record
+        self.order: List[Tuple[int, str]] = []       # (published_ts, id), ascending
+        self.log_lines = 0
+        if path.exists():
+            with open(path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # partial trailing line
+                    self.log_lines += 1
+                    if record["id"] not in self.items:
+                        self.items[record["id"]] = record
+                        self.order.append((record["published_ts"], record["id"]))
+        self.order.sort()
+
+    @staticmethod
+    def item_id(update: Dict[str, Any]) -> str:
+        key = update.get("link") or f"{update.get('source')}:{update.get('title')}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+    def merge(self, updates: List[Dict[str, Any]], cutoff_ts: int) -> List[Dict[str, Any]]:
+        """Insert and append only unseen items (with published_ts) newer than cutoff."""
+        new = []
+        for update in updates:
+            item_id = self.item_id(update)
+            if item_id in self.items or update["published_ts"] < cutoff_ts:
+                continue
+            record = {"id": item_id, **update}
+            self.items[item_id] = record
+            bisect.insort(self.order, (record["published_ts"], item_id))
+            new.append(record)
+
+        if new:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                for record in new:
+                    f.write(json.dumps(record) + "\n")
+            self.log_lines += len(new)
+        return new
+
+    def expire(self, cutoff_ts: int):
+        """Drop items older than cutoff; compact the log when mostly expired."""
+        split = bisect.bisect_left(self.order, (cutoff_ts, ""))
+        for _, item_id in self.order[:split]:
+            del self.items[item_id]
+        del self.order[:split]
+
+        if self.log_lines > 2 * len(self.items) + 100:
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                for _, item_id in self.order:
+                    f.write(json.dumps(self.items[item_id]) + "\n")
+            os.replace(tmp, self.path)
+            self.log_lines = len(self.order)
+
+    def window(self) -> List[Dict[str, Any]]:
+        """Items newest first, without store bookkeeping fields."""
+        return [
+            {k: v for k, v in self.items[item_id].items() if k != "id"}
+            for _, item_id in reversed(self.order)
+        ]
+
+
+def parse_release(body: bytes) -> Dict[str, str]:
+    """Fields of a GitHub releases/latest response used by the dashboard."""
+    release = json.loads(body)
+    return {
+        "tag_name": release["tag_name"],
+        "html_url": release["html_url"],
+        "published_at": release["published_at"],
+        "body": (release.get("body") or "")[:200],
+    }
+
 
 class DashboardUpdater:
     def __init__(self, config_path: str = "dashboards/ai/sources.yaml"):
@@ -52,38 +336,156 @@ class DashboardUpdater:
         self.failures: List[Dict[str, str]] = []
         self.source_count = 0
         self.failure_count = 0
+        self._lock = threading.Lock()
+        # Set once the fetch deadline passes; abandoned sources stop early
+        self._deadline_passed = threading.Event()
+        self.fetch_config = {**DEFAULT_FETCH, **(self.config.get("fetch") or {})}
+        self.http_cache = (
+            HTTPCache(Path(self.config["cache"].get("http_directory", ".cache/http/ai")))
+            if HTTP_CACHE_AVAILABLE else None
+        )
+        self.item_store = (
+            SeenItemStore(cache_dir / self.config["cache"].get("seen_items", "seen_items.jsonl"))
+            if self.config["cache"].get("incremental") else None
+        )
+        self.dates = DateNormalizer() if DATE_NORMALIZER_AVAILABLE else None
+        self.article_cache = ArticleMetadataCache(Path(
+            self.config["cache"].get(
+                "article_metadata", ".cache/http/ai/article-metadata.json"
+            )
+        ))
 
     # ------------------------------------------------------------------
     # Source fetchers
     # ------------------------------------------------------------------
 
+    def _enabled_sources(self, kind: str) -> List[Dict[str, Any]]:
+        return [s for s in self.config["sources"].get(kind, []) if s.get("enabled", True)]
+
+    def _record_failure(self, source: str, error: Exception):
+        with self._lock:
+            self.failures.append({"source": source, "error": str(error)})
+            self.failure_count += 1
+
+    def _run_source(self, name: str, fetch: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Fetch one source, counting it and recording its failure."""
+        with self._lock:
+            self.source_count += 1
+        try:
+            return fetch()
+        except Exception as e:
+            self._record_failure(name, e)
+            return []
+
+    def _get_parsed(self, url: str, parse: Callable[[Any], Any], timeout: float,
+                    headers: Dict[str, str], parser_name: str = None, stream: bool = False) -> Any:
+        """
+        GET and parse a URL, through the conditional-GET cache when available.
+
+        With stream=True, parse receives an iterator of body chunks and may
+        stop reading early.
+        """
+        if self.http_cache is not None:
+            return self.http_cache.fetch(
+                url, parse, timeout=timeout, headers=headers,
+                parser_name=parser_name, stream=stream
+            )
+        # Download with a timeout; feedparser's own fetching has none
+        with requests.get(url, timeout=timeout, headers=headers, stream=stream) as resp:
+            resp.raise_for_status()
+            return parse(resp.iter_content(16 * 1024) if stream else resp.content)
+
+    def _fetch_rss_source(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
+        limit = source.get("limit", 5)
+        if FEED_STREAM_AVAILABLE:
+            entries = self._get_parsed(
+                source["url"], lambda chunks: parse_feed_stream(chunks, limit),
+                source.get("timeout", 10), FETCH_HEADERS,
+                parser_name=f"feed_stream:{limit}", stream=True
+            )
+        else:
+            entries = self._get_parsed(
+                source["url"], lambda body: parse_feed(body, limit),
+                source.get("timeout", 10), FETCH_HEADERS, parser_name=f"feed:{limit}"
+            )
+        return [{"source": source["name"], "type": "rss", **entry} for entry in entries]
+
     def fetch_rss_feeds(self) -> List[Dict[str, Any]]:
         """Fetch updates from RSS feeds."""
         updates = []
-        for source in self.config["sources"].get("rss", []):
-            if not source.get("enabled", True):
-                continue
-            self.source_count += 1
-            try:
-                feed = feedparser.parse(source["url"])
-                if feed.bozo and not feed.entries:
-                    raise Exception(f"Feed parse error: {feed.bozo_exception}")
-                for entry in feed.entries[:5]:
-                    updates.append(
-                        {
-                            "source": source["name"],
-                            "type": "rss",
-                            "title": entry.get("title", ""),
-                            "link": entry.get("link", ""),
-                            "published": entry.get("published", ""),
-                            "summary": entry.get("summary", "")[:200],
-                        }
-                    )
-            except Exception as e:
-                self.failures.append({"source": source["name"], "error": str(e)})
-                self.failure_count += 1
+        for source in self._enabled_sources("rss"):
+            updates.extend(
+                self._run_source(source["name"], lambda s=source: self._fetch_rss_source(s))
+            )
+        return updates
+
+    def _fetch_sitemap_source(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
+        updates = []
+        cutoff = datetime.utcnow() - timedelta(days=14)
+        url_pattern = source.get("url_pattern", "")
+        sitemap = self._get_parsed(
+            source["sitemap_url"],
+            lambda body: parse_sitemap(body, url_pattern),
+            source.get("timeout", 15),
+            FETCH_HEADERS,
+            parser_name=f"sitemap:{url_pattern}",
+        )
+
+        entries = []
+        for entry in sitemap:
+            if entry["lastmod"]:
+                try:
+                    pub_date = datetime.fromisoformat(entry["lastmod"][:10])
+                    if pub_date < cutoff:
+                        continue
+                except ValueError:
+                    pass
+
+            entries.append(entry)
+
+        entries.sort(key=lambda x: x["lastmod"], reverse=True)
+        limit = source.get("limit", 5)
+
+        for entry in entries[:limit]:
+            if self._deadline_passed.is_set():
+                raise TimeoutError("fetch deadline passed")
+            # Already-seen articles cost no request and no politeness sleep
+            metadata = self.article_cache.get(entry["loc"], entry["lastmod"])
+            if metadata is None:
+                metadata = self._fetch_article_metadata(entry["loc"], source.get("timeout", 10))
+                if metadata is not None:
+                    self.article_cache.put(entry["loc"], entry["lastmod"], metadata)
+
+            # Derive fallback title from URL slug
+            slug = entry["loc"].rstrip("/").split("/")[-1]
+            title = (metadata or {}).get("title") or slug.replace("-", " ").title()
+            description = (metadata or {}).get("description", "")
+
+            updates.append(
+                {
+                    "source": source["name"],
+                    "type": "sitemap",
+                    "title": title,
+                    "link": entry["loc"],
+                    "published": entry["lastmod"],
+                    "summary": description,
+                }
+            )
         return updates
 
+    @staticmethod
+    def _fetch_article_metadata(url: str, timeout: float):
+        """og:title/og:description of an article, reading only its <head>."""
+        try:
+            time.sleep(0.5)
+            with requests.get(url, timeout=timeout, headers=FETCH_HEADERS, stream=True) as resp:
+                if not resp.ok:
+                    return None
+                head = read_head(resp.iter_content(HEAD_CHUNK_BYTES))
+                return extract_og_metadata(head.decode(resp.encoding or "utf-8", errors="replace"))
+        except Exception:
+            return None  # Use slug-derived title
+
     def fetch_sitemap_sources(self) -> List[Dict[str, Any]]:
         """
         Fetch recent articles from sitemap-based sources (e.g. Anthropic).
@@ -91,173 +493,85 @@ class DashboardUpdater:
         from each article page.
         """
         updates = []
-        cutoff = datetime.utcnow() - timedelta(days=14)
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (compatible; AI-Dashboard/1.0; "
-                "+https://seven-fortunas.github.io/dashboards/ai/)"
+        for source in self._enabled_sources("sitemap"):
+            updates.extend(
+                self._run_source(source["name"], lambda s=source: self._fetch_sitemap_source(s))
             )
-        }
-
-        for source in self.config["sources"].get("sitemap", []):
-            if not source.get("enabled", True):
-                continue
-            self.source_count += 1
-            try:
-                resp = requests.get(
-                    source["sitemap_url"],
-                    timeout=source.get("timeout", 15),
-                    headers=headers,
-                )
-                resp.raise_for_status()
-
-                ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-                root = ET.fromstring(resp.text)
-                url_pattern = source.get("url_pattern", "")
-
-                entries = []
-                for url_elem in root.findall("sm:url", ns):
-                    loc = url_elem.findtext("sm:loc", namespaces=ns) or ""
-                    lastmod = url_elem.findtext("sm:lastmod", namespaces=ns) or ""
-
-                    if url_pattern and url_pattern not in loc:
-                        continue
-
-                    if lastmod:
-                        try:
-                            pub_date = datetime.fromisoformat(lastmod[:10])
-                            if pub_date < cutoff:
-                                continue
-                        except ValueError:
-                            pass
-
-                    entries.append({"loc": loc, "lastmod": lastmod})
-
-                entries.sort(key=lambda x: x["lastmod"], reverse=True)
-                limit = source.get("limit", 5)
-
-                for entry in entries[:limit]:
-                    # Derive fallback title from URL slug
-                    slug = entry["loc"].rstrip("/").split("/")[-1]
-                    title = slug.replace("-", " ").title()
-                    description = ""
-
-                    # Fetch article page to extract og:title / og:description
-                    try:
-                        time.sleep(0.5)
-                        article_resp = requests.get(
-                            entry["loc"],
-                            timeout=source.get("timeout", 10),
-                            headers=headers,
-                        )
-                        if article_resp.ok:
-                            html = article_resp.text
-                            for pattern in [
-                                r'<meta[^>]+property=["\']og:title["\'][^>]+content=["\']([^"\']+)["\']',
-                                r'<meta[^>]+content=["\']([^"\']+)["\'][^>]+property=["\']og:title["\']',
-                            ]:
-                                m = re.search(pattern, html)
-                                if m:
-                                    title = m.group(1).strip()
-                                    break
-                            for pattern in [
-                                r'<meta[^>]+property=["\']og:description["\'][^>]+content=["\']([^"\']+)["\']',
-                                r'<meta[^>]+content=["\']([^"\']+)["\'][^>]+property=["\']og:description["\']',
-                            ]:
-                                m = re.search(pattern, html)
-                                if m:
-                                    description = m.group(1).strip()[:200]
-                                    break
-                    except Exception:
-                        pass  # Use slug-derived title
-
-                    updates.append(
-                        {
-                            "source": source["name"],
-                            "type": "sitemap",
-                            "title": title,
-                            "link": entry["loc"],
-                            "published": entry["lastmod"],
-                            "summary": description,
-                        }
-                    )
-            except Exception as e:
-                self.failures.append({"source": source["name"], "error": str(e)})
-                self.failure_count += 1
-
         return updates
 
-    def fetch_github_releases(self) -> List[Dict[str, Any]]:
-        """Fetch latest GitHub releases."""
-        updates = []
+    def _fetch_github_source(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
         token = os.environ.get("GITHUB_TOKEN")
         headers = {"Authorization": f"token {token}"} if token else {}
+        url = f"https://api.github.com/repos/{source['repo']}/releases/latest"
+        limiter = get_rate_limiter("github", "bulk") if RATE_LIMITER_AVAILABLE else nullcontext()
+        with limiter:
+            release = self._get_parsed(url, parse_release, source.get("timeout", 10), headers)
+        return [
+            {
+                "source": source["name"],
+                "type": "github",
+                "title": f"Release {release['tag_name']}",
+                "link": release["html_url"],
+                "published": release["published_at"],
+                "summary": release["body"],
+            }
+        ]
 
-        for source in self.config["sources"].get("github", []):
-            if not source.get("enabled", True):
-                continue
-            self.source_count += 1
-            try:
-                url = f"https://api.github.com/repos/{source['repo']}/releases/latest"
-                resp = requests.get(url, headers=headers, timeout=source.get("timeout", 10))
-                resp.raise_for_status()
-                release = resp.json()
-                updates.append(
-                    {
-                        "source": source["name"],
-                        "type": "github",
-                        "title": f"Release {release['tag_name']}",
-                        "link": release["html_url"],
-                        "published": release["published_at"],
-                        "summary": (release.get("body") or "")[:200],
-                    }
-                )
-            except Exception as e:
-                self.failures.append({"source": source["name"], "error": str(e)})
-                self.failure_count += 1
-
+    def fetch_github_releases(self) -> List[Dict[str, Any]]:
+        """Fetch latest GitHub releases."""
+        updates = []
+        for source in self._enabled_sources("github"):
+            updates.extend(
+                self._run_source(source["name"], lambda s=source: self._fetch_github_source(s))
+            )
         return updates
 
-    def fetch_reddit_posts(self) -> List[Dict[str, Any]]:
-        """Fetch top Reddit posts (requires praw + credentials)."""
+    def _reddit_client(self):
+        """praw client, or None without praw, credentials or on auth failure."""
         if not REDDIT_AVAILABLE:
-            return []
+            return None
 
         client_id = os.environ.get("REDDIT_CLIENT_ID")
         client_secret = os.environ.get("REDDIT_CLIENT_SECRET")
         if not client_id or not client_secret:
-            return []
+            return None
 
-        updates = []
         try:
-            reddit = praw.Reddit(
+            return praw.Reddit(
                 client_id=client_id,
                 client_secret=client_secret,
                 user_agent=os.environ.get("REDDIT_USER_AGENT", "AI-Dashboard/1.0"),
             )
-            for source in self.config["sources"].get("reddit", []):
-                if not source.get("enabled", True):
-                    continue
-                self.source_count += 1
-                try:
-                    sub = reddit.subreddit(source["subreddit"])
-                    for post in sub.top(time_filter="day", limit=source.get("limit", 10)):
-                        updates.append(
-                            {
-                                "source": f"r/{source['subreddit']}",
-                                "type": "reddit",
-                                "title": post.title,
-                                "link": f"https://reddit.com{post.permalink}",
-                                "published": datetime.fromtimestamp(post.created_utc).isoformat(),
-                                "summary": (post.selftext or "")[:200],
-                            }
-                        )
-                except Exception as e:
-                    self.failures.append({"source": source["subreddit"], "error": str(e)})
-                    self.failure_count += 1
         except Exception as e:
             print(f"Reddit auth failed: {e}")
+            return None
+
+    @staticmethod
+    def _fetch_reddit_source(reddit, source: Dict[str, Any]) -> List[Dict[str, Any]]:
+        sub = reddit.subreddit(source["subreddit"])
+        return [
+            {
+                "source": f"r/{source['subreddit']}",
+                "type": "reddit",
+                "title": post.title,
+                "link": f"https://reddit.com{post.permalink}",
+                "published": datetime.fromtimestamp(post.created_utc).isoformat(),
+                "summary": (post.selftext or "")[:200],
+            }
+            for post in sub.top(time_filter="day", limit=source.get("limit", 10))
+        ]
 
+    def fetch_reddit_posts(self) -> List[Dict[str, Any]]:
+        """Fetch top Reddit posts (requires praw + credentials)."""
+        reddit = self._reddit_client()
+        if reddit is None:
+            return []
+
+        updates = []
+        for source in self._enabled_sources("reddit"):
+            updates.extend(self._run_source(
+                source["subreddit"], lambda s=source: self._fetch_reddit_source(reddit, s)
+            ))
         return updates
 
     def fetch_x_posts(self) -> List[Dict[str, Any]]:
@@ -267,13 +581,88 @@ class DashboardUpdater:
         # X API v2 implementation placeholder
         return []
 
+    # ------------------------------------------------------------------
+    # Concurrent fetch engine
+    # ------------------------------------------------------------------
+
+    def _source_jobs(self) -> List[Tuple[str, str, Callable[[], List[Dict[str, Any]]]]]:
+        """(source name, host, fetch) for every enabled source, in config order."""
+        jobs = []
+        for source in self._enabled_sources("rss"):
+            jobs.append((source["name"], urlparse(source["url"]).netloc,
+                         lambda s=source: self._fetch_rss_source(s)))
+        for source in self._enabled_sources("sitemap"):
+            jobs.append((source["name"], urlparse(source["sitemap_url"]).netloc,
+                         lambda s=source: self._fetch_sitemap_source(s)))
+        for source in self._enabled_sources("github"):
+            jobs.append((source["name"], "api.github.com",
+                         lambda s=source: self._fetch_github_source(s)))
+        reddit = self._reddit_client()
+        if reddit is not None:
+            for source in self._enabled_sources("reddit"):
+                jobs.append((source["subreddit"], REDDIT_HOST,
+                             lambda s=source: self._fetch_reddit_source(reddit, s)))
+        return jobs
+
+    def fetch_all_concurrent(self) -> List[Dict[str, Any]]:
+        """
+        Fetch every enabled source on a bounded thread pool.
+
+        Each host gets at most ``per_host`` simultaneous requests (one for
+        Reddit). Sources not finished within ``deadline_seconds`` are recorded
+        as failures and their results discarded; queued ones never start and
+        running sitemap sources stop before their next article request.
+
+        Returns:
+            Updates from all sources that finished, in config order
+        """
+        cfg = self.fetch_config
+        jobs = self._source_jobs()
+        if not jobs:
+            return []
+
+        host_slots: Dict[str, threading.BoundedSemaphore] = defaultdict(
+            lambda: threading.BoundedSemaphore(max(1, int(cfg["per_host"])))
+        )
+        host_slots[REDDIT_HOST] = threading.BoundedSemaphore(1)
+        for _, host, _ in jobs:
+            host_slots[host]  # create all slots before any thread looks one up
+
+        def guarded(host: str, fetch: Callable[[], List[Dict[str, Any]]]):
+            with host_slots[host]:
+                return fetch()
+
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, int(cfg["max_workers"])), thread_name_prefix="dashboard-fetch"
+        )
+        try:
+            futures = [(name, executor.submit(guarded, host, fetch)) for name, host, fetch in jobs]
+            done, pending = wait([f for _, f in futures], timeout=cfg["deadline_seconds"])
+            if pending:
+                self._deadline_passed.set()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        updates = []
+        self.source_count += len(futures)
+        for name, future in futures:
+            if future not in done:
+                self._record_failure(
+                    name, TimeoutError(f"deadline of {cfg['deadline_seconds']}s exceeded")
+                )
+            elif future.exception() is not None:
+                self._record_failure(name, future.exception())
+            else:
+                updates.extend(future.result())
+        return updates
+
     # ------------------------------------------------------------------
     # Cache / output
     # ------------------------------------------------------------------
 
     @staticmethod
     def _parse_date(date_str: str) -> datetime:
-        """Normalize mixed date formats to datetime for sorting."""
+        """Normalize mixed date formats to datetime (fallback without date_normalizer)."""
         if not date_str:
             return datetime.min
         # ISO 8601: "2026-02-23T21:48:08.000Z", "2026-02-23T21:48:08Z", "2026-02-23"
@@ -288,6 +677,15 @@ class DashboardUpdater:
             pass
         return datetime.min
 
+    def _normalize_dates(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Parse each item's date once into an epoch ``published_ts`` on the record."""
+        if self.dates is not None:
+            return self.dates.normalize(updates)
+        for update in updates:
+            if not isinstance(update.get("published_ts"), int):
+                update["published_ts"] = _utc_epoch(self._parse_date(update.get("published", "")))
+        return updates
+
     def load_cached_data(self) -> Dict[str, Any]:
         try:
             if self.cache_file.exists():
@@ -392,21 +790,38 @@ class DashboardUpdater:
     def run(self):
         print("Starting AI Advancements Dashboard update...")
 
-        self.updates.extend(self.fetch_rss_feeds())
-        self.updates.extend(self.fetch_sitemap_sources())
-        self.updates.extend(self.fetch_github_releases())
-        self.updates.extend(self.fetch_reddit_posts())
+        started = time.monotonic()
+        if self.fetch_config["concurrent"]:
+            self.updates.extend(self.fetch_all_concurrent())
+        else:
+            self.updates.extend(self.fetch_rss_feeds())
+            self.updates.extend(self.fetch_sitemap_sources())
+            self.updates.extend(self.fetch_github_releases())
+            self.updates.extend(self.fetch_reddit_posts())
         self.updates.extend(self.fetch_x_posts())
+        self.article_cache.save()
+        print(f"Fetched {self.source_count} sources in {time.monotonic() - started:.1f}s")
+        if self.http_cache is not None:
+            print(self.http_cache.summary())
 
-        # Drop anything older than 30 days
-        cutoff = datetime.utcnow() - timedelta(days=30)
-        self.updates = [
-            u for u in self.updates
-            if self._parse_date(u.get("published", "")) >= cutoff
-        ]
+        # Parse every date once; filters and sorts below compare integers
+        self._normalize_dates(self.updates)
 
-        # Sort by date descending before writing — handles mixed date formats
-        self.updates.sort(key=lambda x: self._parse_date(x.get("published", "")), reverse=True)
+        # Drop anything older than 30 days
+        cutoff_ts = _utc_epoch(datetime.utcnow() - timedelta(days=30))
+        if self.item_store is not None:
+            # Incremental: insert only unseen items into the sorted store
+            if not self.item_store.items:
+                self.item_store.merge(
+                    self._normalize_dates(self.load_cached_data()["updates"]), cutoff_ts
+                )
+            new = self.item_store.merge(self.updates, cutoff_ts)
+            self.item_store.expire(cutoff_ts)
+            self.updates = self.item_store.window()
+            print(f"{len(new)} new items merged")
+        else:
+            self.updates = [u for u in self.updates if u["published_ts"] >= cutoff_ts]
+            self.updates.sort(key=lambda u: u["published_ts"], reverse=True)
 
         self.save_cached_data()
         self.generate_dashboard()
@@ -10,30 +10,40 @@ Features:
 - SLA compliance reporting
 - Performance degradation detection
 - Optimization recommendations
+- Optional hourly/daily rollup store (--rollups), updated incrementally
 """
 
 import csv
 import json
 import sys
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+import metrics_rollup
+from metrics_rollup import RollupStore
+
 
 class DashboardPerformanceAnalyzer:
     """Analyzes dashboard performance metrics."""
 
-    def __init__(self, metrics_file: Path, target_duration: float = 10.0):
+    def __init__(self, metrics_file: Path, target_duration: float = 10.0,
+                 rollup_store: Optional[RollupStore] = None):
         """
         Initialize the analyzer.
 
         Args:
             metrics_file: Path to performance metrics CSV file
             target_duration: Performance target in minutes (default: 10)
+            rollup_store: Optional rollup store to aggregate from
         """
         self.metrics_file = metrics_file
         self.target_duration = target_duration
+        self.rollup_store = rollup_store
         self.metrics = []
 
     def load_metrics(self) -> List[Dict[str, Any]]:
@@ -77,6 +87,9 @@ class DashboardPerformanceAnalyzer:
         Returns:
             Dictionary containing analysis results
         """
+        if self.rollup_store is not None:
+            return self._analyze_rollups(self.rollup_store)
+
         if not self.metrics:
             self.load_metrics()
 
@@ -142,6 +155,45 @@ class DashboardPerformanceAnalyzer:
             'recent_7_day_runs': len(recent_metrics)
         }
 
+    def _analyze_rollups(self, store: RollupStore) -> Dict[str, Any]:
+        """Bring the rollup store up to date, then analyze from it."""
+        metrics_rollup.ingest_dashboard_performance(store, self.metrics_file, self.target_duration)
+
+        per_workflow = store.query(metrics_rollup.DASHBOARD_PERFORMANCE)
+        recent = store.query(
+            metrics_rollup.DASHBOARD_PERFORMANCE, time.time() - timedelta(days=7).total_seconds()
+        )
+
+        total_runs = sum(agg['count'] for agg in per_workflow.values())
+        compliant_runs = sum(agg['ok'] for agg in per_workflow.values())
+        total_duration = sum(agg['total'] for agg in per_workflow.values())
+        recent_runs = sum(agg['count'] for agg in recent.values())
+        recent_compliant = sum(agg['ok'] for agg in recent.values())
+
+        workflow_stats = {}
+        for name, agg in per_workflow.items():
+            workflow_stats[name] = {
+                'runs': agg['count'],
+                'compliant': agg['ok'],
+                'total_duration': agg['total'],
+                'average_duration': agg['total'] / agg['count'],
+                'compliance_rate': agg['ok'] / agg['count'] * 100
+            }
+
+        return {
+            'total_runs': total_runs,
+            'compliant_runs': compliant_runs,
+            'non_compliant_runs': total_runs - compliant_runs,
+            'compliance_rate': (compliant_runs / total_runs * 100) if total_runs > 0 else 0.0,
+            'average_duration': total_duration / total_runs if total_runs else 0.0,
+            'max_duration': max((agg['max'] for agg in per_workflow.values()), default=0.0),
+            'min_duration': min((agg['min'] for agg in per_workflow.values()), default=0.0),
+            'target_duration': self.target_duration,
+            'workflow_stats': workflow_stats,
+            'recent_7_day_compliance': recent_compliant / recent_runs * 100 if recent_runs else 0.0,
+            'recent_7_day_runs': recent_runs
+        }
+
     def generate_report(self) -> str:
         """
         Generate a human-readable performance report.
@@ -249,13 +301,16 @@ def main():
     parser.add_argument('--output', help='Path to save report (optional)')
     parser.add_argument('--check-compliance', action='store_true',
                         help='Exit with code 1 if not compliant')
+    parser.add_argument('--rollups',
+                        help='SQLite rollup store to aggregate from (updated incrementally)')
 
     args = parser.parse_args()
 
     # Run analysis
     analyzer = DashboardPerformanceAnalyzer(
         metrics_file=Path(args.metrics),
-        target_duration=args.target
+        target_duration=args.target,
+        rollup_store=RollupStore(Path(args.rollups)) if args.rollups else None
     )
 
     # Generate and display report
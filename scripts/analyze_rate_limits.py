@@ -9,75 +9,403 @@ Features:
 - Compliance checking
 - Violation analysis
 - Trend reporting
+- Day-partitioned metrics rotation with a sidecar byte-offset index,
+  so an N-day report reads only the last N days in bounded memory
+- Optional hourly/daily rollup store (--rollups), updated incrementally
 """
 
+import hashlib
 import json
+import os
+import re
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict
-from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+from collections import defaultdict, deque
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import metrics_rollup
+from metrics_rollup import RollupStore, to_epoch
+from rate_limiter import metrics_file_lock
+
+
+METRICS_FILES = ('api-usage.jsonl', 'violations.jsonl', 'github-rate-limit.jsonl')
+
+# Metrics lines are written with json.dumps, so the timestamp's date can be
+# read without decoding the whole line
+_TIMESTAMP_DAY = re.compile(rb'"timestamp":\s*"(\d{4}-\d{2}-\d{2})')
+
+# Violations listed in the report
+RECENT_VIOLATIONS = 10
+
+
+def _line_day(line: bytes) -> Optional[str]:
+    match = _TIMESTAMP_DAY.search(line)
+    return match.group(1).decode() if match else None
+
+
+def partition_path(path: Path, day: str) -> Path:
+    """
+    Day partition of a metrics file (api-usage.jsonl -> api-usage.2026-01-31.jsonl).
+
+    Args:
+        path: Active metrics file
+        day: Date as YYYY-MM-DD
+
+    Returns:
+        Partition file path
+    """
+    return path.with_name(f'{path.stem}.{day}{path.suffix}')
+
+
+def list_partitions(path: Path) -> List[Tuple[str, Path]]:
+    """
+    List existing day partitions of a metrics file, oldest first.
+
+    Args:
+        path: Active metrics file
+
+    Returns:
+        List of (day, partition_path) tuples
+    """
+    pattern = re.compile(rf'^{re.escape(path.stem)}\.(\d{{4}}-\d{{2}}-\d{{2}}){re.escape(path.suffix)}$')
+    partitions = []
+    if path.parent.exists():
+        for candidate in path.parent.iterdir():
+            match = pattern.match(candidate.name)
+            if match:
+                partitions.append((match.group(1), candidate))
+    return sorted(partitions)
+
+
+class OffsetIndex:
+    """
+    Sidecar byte-offset index for an append-only JSONL metrics file.
+
+    Maps each day to the offset of its first line, so readers can seek
+    straight to a cutoff date. Updates are incremental: only bytes
+    appended since the last update are scanned. The index also records a
+    digest of the file's first line; a file that was replaced (rotated)
+    or truncated since is re-indexed from the start, even if it has grown
+    past the indexed size.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialize index for a metrics file.
+
+        Args:
+            path: Metrics JSONL file (index is stored at <path>.idx)
+        """
+        self.path = path
+        self.index_path = path.with_name(path.name + '.idx')
+        self.size = 0
+        self.days: Dict[str, int] = {}
+        self.last_day: Optional[str] = None
+        self.head: Optional[str] = None
+
+        if self.index_path.exists():
+            try:
+                data = json.loads(self.index_path.read_text())
+                self.size = data['size']
+                self.days = data['days']
+                self.last_day = data.get('last_day')
+                self.head = data.get('head')
+            except (ValueError, KeyError):
+                self._reset()
+
+    def _reset(self):
+        self.size, self.days, self.last_day, self.head = 0, {}, None, None
+
+    def rebuild(self) -> 'OffsetIndex':
+        """Index the whole file again, replacing the stored index."""
+        self._reset()
+        self.update()
+        self._save()
+        return self
+
+    def update(self) -> 'OffsetIndex':
+        """Index lines appended since the last update."""
+        if not self.path.exists():
+            self._reset()
+            return self
+
+        previous = (self.size, self.head)
+        with open(self.path, 'rb') as f:
+            first = f.readline()
+            head = hashlib.sha1(first).hexdigest() if first.endswith(b'\n') else None
+            if head != self.head or os.path.getsize(self.path) < self.size:
+                # File was rotated, replaced or truncated: rebuild
+                self._reset()
+            self.head = head
+
+            f.seek(self.size)
+            offset = self.size
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # partial line still being written
+                day = _line_day(line)
+                if day and day != self.last_day:
+                    self.days.setdefault(day, offset)
+                    self.last_day = day
+                offset += len(line)
+
+        self.size = offset
+        if (self.size, self.head) != previous:
+            self._save()
+        return self
+
+    def _save(self):
+        tmp = self.index_path.with_name(self.index_path.name + '.tmp')
+        tmp.write_text(json.dumps({'size': self.size, 'days': self.days, 'last_day': self.last_day,
+                                   'head': self.head}))
+        tmp.replace(self.index_path)
+
+    def offset_for(self, day: str) -> int:
+        """
+        Byte offset of the first line on or after a day.
+
+        Args:
+            day: Date as YYYY-MM-DD
+
+        Returns:
+            Offset to seek to (end of indexed data if no later day)
+        """
+        later = [offset for d, offset in self.days.items() if d >= day]
+        return min(later) if later else self.size
+
+
+def rotate_metrics_file(path: Path, before: Optional[str] = None) -> int:
+    """
+    Move completed days out of an active metrics file into day partitions.
+
+    Lines dated before ``before`` (default: today, UTC) are appended to
+    their partition; later lines stay in the active file. Runs under the
+    metrics sinks' file lock, so concurrent appends wait instead of landing
+    in the file being split.
+
+    Args:
+        path: Active metrics file
+        before: Date as YYYY-MM-DD; lines on or after it are kept
+
+    Returns:
+        Number of lines moved into partitions
+    """
+    if not path.exists():
+        return 0
+
+    before = before or datetime.utcnow().strftime('%Y-%m-%d')
+    rotating = path.with_name(path.name + '.rotating')
+
+    moved = 0
+    handles = {}
+    with metrics_file_lock(path):
+        path.replace(rotating)
+        keep = open(path, 'ab')
+        try:
+            with open(rotating, 'rb') as f:
+                for line in f:
+                    day = _line_day(line)
+                    if day is None or day >= before:
+                        keep.write(line)
+                        continue
+                    if day not in handles:
+                        handles[day] = open(partition_path(path, day), 'ab')
+                    handles[day].write(line)
+                    moved += 1
+        finally:
+            keep.close()
+            for handle in handles.values():
+                handle.close()
+
+        rotating.unlink()
+        # The active file was replaced: offsets from before the split are void
+        OffsetIndex(path).rebuild()
+    return moved
+
+
+def iter_metrics(path: Path, cutoff: datetime) -> Iterator[Dict]:
+    """
+    Stream records at or after a cutoff from a metrics file and its partitions.
+
+    Partitions older than the cutoff day are skipped without being opened,
+    and the active file is read from the indexed offset of the cutoff day.
+
+    Args:
+        path: Active metrics file
+        cutoff: Earliest timestamp to include
+
+    Yields:
+        Decoded metric records in file order
+    """
+    cutoff_day = cutoff.strftime('%Y-%m-%d')
+
+    def _records(f):
+        for line in f:
+            day = _line_day(line)
+            if day is not None and day < cutoff_day:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # partial or corrupt line
+            if day == cutoff_day:
+                timestamp = datetime.fromisoformat(
+                    record['timestamp'].replace('Z', '+00:00')
+                ).replace(tzinfo=None)
+                if timestamp < cutoff:
+                    continue
+            yield record
+
+    for day, partition in list_partitions(path):
+        if day >= cutoff_day:
+            with open(partition, 'rb') as f:
+                yield from _records(f)
+
+    if path.exists():
+        index = OffsetIndex(path).update()
+        with open(path, 'rb') as f:
+            f.seek(index.offset_for(cutoff_day))
+            yield from _records(f)
 
 
 class RateLimitAnalyzer:
     """Analyzes rate limit usage and compliance."""
 
-    def __init__(self, metrics_dir: Path):
+    def __init__(self, metrics_dir: Path, rollup_store: Optional[RollupStore] = None):
         """
         Initialize analyzer.
 
         Args:
             metrics_dir: Directory containing rate limit metrics
+            rollup_store: Optional rollup store to aggregate from
         """
         self.metrics_dir = metrics_dir
-        self.github_metrics = []
-        self.usage_metrics = []
-        self.violations = []
+        self.rollup_store = rollup_store
+        self._reset()
+
+    def _reset(self) -> None:
+        # Streaming aggregates (bounded memory regardless of file size)
+        self.github_latest: Optional[Dict] = None
+        self.github_samples = 0
+        self.github_used_total = 0
+        self.api_stats: Dict[str, Dict] = defaultdict(lambda: {
+            'total_requests': 0,
+            'throttled_requests': 0,
+            'violations': 0
+        })
+        self.violation_count = 0
+        self.violations_by_api: Dict[str, int] = defaultdict(int)
+        self.recent_violations = deque(maxlen=RECENT_VIOLATIONS)
 
     def load_metrics(self, days: int = 7):
         """
-        Load metrics from files.
+        Stream metrics from files into aggregates.
 
         Args:
             days: Number of days to analyze
         """
+        self._reset()
         cutoff = datetime.utcnow() - timedelta(days=days)
 
-        # Load GitHub rate limit metrics
-        github_file = self.metrics_dir / 'github-rate-limit.jsonl'
-        if github_file.exists():
-            with open(github_file, 'r') as f:
-                for line in f:
-                    metric = json.loads(line)
-                    timestamp = datetime.fromisoformat(
-                        metric['timestamp'].replace('Z', '+00:00')
-                    )
-                    if timestamp >= cutoff:
-                        self.github_metrics.append(metric)
-
-        # Load general API usage metrics
-        usage_file = self.metrics_dir / 'api-usage.jsonl'
-        if usage_file.exists():
-            with open(usage_file, 'r') as f:
-                for line in f:
-                    metric = json.loads(line)
-                    timestamp = datetime.fromisoformat(
-                        metric['timestamp'].replace('Z', '+00:00')
-                    )
-                    if timestamp >= cutoff:
-                        self.usage_metrics.append(metric)
-
-        # Load violations
-        violations_file = self.metrics_dir / 'violations.jsonl'
-        if violations_file.exists():
-            with open(violations_file, 'r') as f:
-                for line in f:
-                    violation = json.loads(line)
-                    timestamp = datetime.fromisoformat(
-                        violation['timestamp'].replace('Z', '+00:00')
-                    )
-                    if timestamp >= cutoff:
-                        self.violations.append(violation)
+        if self.rollup_store is not None:
+            self._load_rollups(self.rollup_store, cutoff)
+            return
+
+        # GitHub rate limit metrics
+        for metric in iter_metrics(self.metrics_dir / 'github-rate-limit.jsonl', cutoff):
+            self.github_latest = metric
+            self.github_samples += 1
+            self.github_used_total += metric['core']['used']
+
+        # General API usage metrics
+        for metric in iter_metrics(self.metrics_dir / 'api-usage.jsonl', cutoff):
+            stats = self.api_stats[metric['api']]
+            stats['total_requests'] += metric.get('total_requests', 0)
+            stats['throttled_requests'] += metric.get('throttled_requests', 0)
+            stats['violations'] += metric.get('violations', 0)
+
+        # Violations
+        for violation in iter_metrics(self.metrics_dir / 'violations.jsonl', cutoff):
+            self.violation_count += 1
+            self.violations_by_api[violation['api']] += 1
+            self.recent_violations.append(violation)
+
+    def _rollup_reader(self, name: str, to_sample):
+        def read(watermark: float):
+            since = datetime(1970, 1, 1) + timedelta(seconds=watermark)
+            for metric in iter_metrics(self.metrics_dir / name, since):
+                try:
+                    yield to_sample(metric)
+                except (KeyError, TypeError, ValueError):
+                    continue
+        return read
+
+    def _load_rollups(self, store: RollupStore, cutoff: datetime):
+        """Bring the rollup store up to date, then aggregate from it."""
+        ts = metrics_rollup.parse_timestamp
+
+        store.ingest_samples(
+            metrics_rollup.GITHUB_RATE_LIMIT, self.metrics_dir / 'github-rate-limit.jsonl',
+            self._rollup_reader('github-rate-limit.jsonl', lambda m: (
+                ts(m['timestamp']), 'core', 0, m['core']['used'], 0.0, 0.0, json.dumps(m)
+            ))
+        )
+        store.ingest_samples(
+            metrics_rollup.API_USAGE, self.metrics_dir / 'api-usage.jsonl',
+            self._rollup_reader('api-usage.jsonl', lambda m: (
+                ts(m['timestamp']), m['api'], 0, m.get('total_requests', 0),
+                m.get('throttled_requests', 0), m.get('violations', 0), None
+            ))
+        )
+        store.ingest_samples(
+            metrics_rollup.VIOLATIONS, self.metrics_dir / 'violations.jsonl',
+            self._rollup_reader('violations.jsonl', lambda m: (
+                ts(m['timestamp']), m['api'], 0, 0.0, 0.0, 0.0, None
+            ))
+        )
+
+        since = to_epoch(cutoff)
+        github = store.query(metrics_rollup.GITHUB_RATE_LIMIT, since).get('core')
+        latest = store.latest(metrics_rollup.GITHUB_RATE_LIMIT, since)
+        if github and latest is not None:
+            self.github_samples = github['count']
+            self.github_used_total = github['total']
+            self.github_latest = json.loads(latest)
+
+        for api, agg in store.query(metrics_rollup.API_USAGE, since).items():
+            self.api_stats[api] = {
+                'total_requests': int(agg['total']),
+                'throttled_requests': int(agg['total2']),
+                'violations': int(agg['total3'])
+            }
+
+        for api, agg in store.query(metrics_rollup.VIOLATIONS, since).items():
+            self.violations_by_api[api] = agg['count']
+            self.violation_count += agg['count']
+
+        # Violations are rare; the listed ones still come from the raw file
+        if self.violation_count:
+            self.recent_violations.extend(
+                iter_metrics(self.metrics_dir / 'violations.jsonl', cutoff)
+            )
+
+    def rotate(self, before: Optional[str] = None) -> Dict[str, int]:
+        """
+        Rotate all metrics files into day partitions.
+
+        Args:
+            before: Date as YYYY-MM-DD; lines on or after it stay active
+
+        Returns:
+            Dictionary mapping file names to lines moved
+        """
+        return {
+            name: rotate_metrics_file(self.metrics_dir / name, before)
+            for name in METRICS_FILES
+        }
 
     def analyze_github_usage(self) -> Dict:
         """
@@ -86,11 +414,10 @@ class RateLimitAnalyzer:
         Returns:
             Dictionary containing GitHub usage stats
         """
-        if not self.github_metrics:
-            return {'no_data': True}
-
         # Get latest metrics
-        latest = self.github_metrics[-1]
+        latest = self.github_latest
+        if latest is None or not self.github_samples:
+            return {'no_data': True}
 
         core_limit = latest['core']['limit']
         core_used = latest['core']['used']
@@ -98,8 +425,7 @@ class RateLimitAnalyzer:
         core_usage_pct = (core_used / core_limit * 100) if core_limit > 0 else 0
 
         # Calculate average usage over period
-        total_used = sum(m['core']['used'] for m in self.github_metrics)
-        avg_used = total_used / len(self.github_metrics)
+        avg_used = self.github_used_total / self.github_samples
         avg_usage_pct = (avg_used / core_limit * 100) if core_limit > 0 else 0
 
         return {
@@ -110,7 +436,7 @@ class RateLimitAnalyzer:
             'current_usage_pct': core_usage_pct,
             'avg_used': avg_used,
             'avg_usage_pct': avg_usage_pct,
-            'samples': len(self.github_metrics),
+            'samples': self.github_samples,
             'compliant': core_usage_pct < 100
         }
 
@@ -121,19 +447,7 @@ class RateLimitAnalyzer:
         Returns:
             Dictionary mapping API names to usage stats
         """
-        api_stats = defaultdict(lambda: {
-            'total_requests': 0,
-            'throttled_requests': 0,
-            'violations': 0
-        })
-
-        for metric in self.usage_metrics:
-            api = metric['api']
-            api_stats[api]['total_requests'] += metric.get('total_requests', 0)
-            api_stats[api]['throttled_requests'] += metric.get('throttled_requests', 0)
-            api_stats[api]['violations'] += metric.get('violations', 0)
-
-        return dict(api_stats)
+        return dict(self.api_stats)
 
     def analyze_violations(self) -> Dict:
         """
@@ -142,23 +456,18 @@ class RateLimitAnalyzer:
         Returns:
             Dictionary containing violation statistics
         """
-        if not self.violations:
+        if not self.violation_count:
             return {
                 'total': 0,
                 'by_api': {},
                 'compliant': True
             }
 
-        # Group by API
-        by_api = defaultdict(int)
-        for violation in self.violations:
-            by_api[violation['api']] += 1
-
         return {
-            'total': len(self.violations),
-            'by_api': dict(by_api),
-            'compliant': len(self.violations) == 0,
-            'violations': self.violations
+            'total': self.violation_count,
+            'by_api': dict(self.violations_by_api),
+            'compliant': False,
+            'violations': list(self.recent_violations)
         }
 
     def generate_report(self, days: int = 7) -> str:
@@ -241,7 +550,7 @@ class RateLimitAnalyzer:
                 report += f"- {api.upper()}: {count} violations\n"
 
             report += "\n### Recent Violations\n\n"
-            for v in violation_stats['violations'][:10]:  # Show last 10
+            for v in violation_stats['violations']:  # Most recent RECENT_VIOLATIONS
                 report += f"- {v['timestamp']}: {v['api']} - {v.get('violation_type', 'unknown')}\n"
 
         # Rate limit configuration
@@ -295,11 +604,28 @@ def main():
         '--output',
         help='Path to save report (optional)'
     )
+    parser.add_argument(
+        '--rotate',
+        action='store_true',
+        help='Move completed days into day partitions before analyzing'
+    )
+    parser.add_argument(
+        '--rollups',
+        help='SQLite rollup store to aggregate from (updated incrementally)'
+    )
 
     args = parser.parse_args()
 
     # Run analysis
-    analyzer = RateLimitAnalyzer(metrics_dir=Path(args.metrics_dir))
+    analyzer = RateLimitAnalyzer(
+        metrics_dir=Path(args.metrics_dir),
+        rollup_store=RollupStore(Path(args.rollups)) if args.rollups else None
+    )
+
+    if args.rotate:
+        for name, moved in analyzer.rotate().items():
+            print(f"🗂️  Rotated {moved} lines from {name}", file=sys.stderr)
+
     report = analyzer.generate_report(days=args.days)
 
     # Print report
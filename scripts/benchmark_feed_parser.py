@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Feed Parser Benchmark
+
+Times the streaming feed parser (feed_stream.py) against full-document
+parsing on recorded fixture feeds, expanded into large archive feeds by
+repeating their entries.
+
+Usage:
+    python3 scripts/benchmark_feed_parser.py [--entries N] [--limit N]
+"""
+
+import argparse
+import re
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import feed_stream
+
+FIXTURES = Path(__file__).parent.parent / 'tests' / 'unit' / 'python' / 'fixtures' / 'feeds'
+
+try:
+    import feedparser
+    FEEDPARSER_AVAILABLE = True
+except ImportError:
+    FEEDPARSER_AVAILABLE = False
+
+
+def expand_feed(body: bytes, entries: int) -> bytes:
+    """
+    Build an archive-sized feed by repeating a fixture's entries.
+
+    Args:
+        body: Fixture feed
+        entries: Number of entries in the result
+
+    Returns:
+        Feed bytes with the fixture's header and footer
+    """
+    text = body.decode('utf-8')
+    blocks = re.findall(r'\s*<(?:item|entry)>.*?</(?:item|entry)>', text, re.S)
+    head = text[:text.index(blocks[0])]
+    tail = text[text.rindex(blocks[-1]) + len(blocks[-1]):]
+    repeated = [blocks[i % len(blocks)] for i in range(entries)]
+    return (head + ''.join(repeated) + tail).encode('utf-8')
+
+
+def full_tree(body: bytes, limit: int):
+    """Baseline: build the whole document tree, then take the first entries."""
+    root = ET.fromstring(body)
+    entries = [e for e in root.iter() if feed_stream._local(e.tag) in feed_stream.ENTRY_TAGS]
+    return [feed_stream._entry(e) for e in entries][:limit]
+
+
+def measure(parse, body: bytes, limit: int, repeat: int) -> dict:
+    """Best-of-repeat wall time and peak traced memory of one parser."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(body, limit)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    parse(body, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'ms': best * 1000, 'peak_kib': peak / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark streaming vs full feed parsing')
+    parser.add_argument('--entries', type=int, default=5000, help='Entries per archive feed')
+    parser.add_argument('--limit', type=int, default=5, help='Entries the dashboard keeps')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions')
+    parser.add_argument('--fixtures', default=str(FIXTURES), help='Directory of fixture feeds')
+    args = parser.parse_args()
+
+    parsers = [('full tree (ElementTree)', full_tree)]
+    if FEEDPARSER_AVAILABLE:
+        parsers.append((
+            'feedparser', lambda body, limit: feedparser.parse(body).entries[:limit]
+        ))
+    parsers.append(('streaming (feed_stream)', feed_stream.parse_entries))
+
+    print("Feed Parser Benchmark")
+    print("=" * 60)
+    for fixture in sorted(Path(args.fixtures).glob('*.xml')):
+        body = expand_feed(fixture.read_bytes(), args.entries)
+        print(f"\n{fixture.name}: {args.entries} entries, {len(body) / 1024:.0f} KiB, "
+              f"keeping {args.limit}")
+        results = [(name, measure(parse, body, args.limit, args.repeat)) for name, parse in parsers]
+        for name, r in results:
+            print(f"  {name:<26} {r['ms']:>9.2f} ms  peak {r['peak_kib']:>9.0f} KiB")
+        speedup = results[0][1]['ms'] / results[-1][1]['ms']
+        print(f"  Speedup vs full tree: {speedup:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
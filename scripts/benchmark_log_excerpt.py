@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Log Excerpt Benchmark
+
+Compares the tail excerpt (last 50 KB) with the error-region excerpt
+(error_regions.py) on recorded CI failure logs: excerpt size, approximate
+prompt tokens, extraction time, and what the pattern-based fallback
+classifier makes of each excerpt.
+
+Usage:
+    python3 scripts/benchmark_log_excerpt.py [--max-bytes N] [--fixtures DIR]
+"""
+
+import argparse
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+FIXTURES = Path(__file__).parent.parent / 'tests' / 'unit' / 'python' / 'fixtures' / 'ci-logs'
+
+_CLASSIFY_SCRIPT = Path(__file__).parent / 'classify-failure-logs.py'
+_spec = importlib.util.spec_from_file_location('classify_failure_logs', _CLASSIFY_SCRIPT)
+if _spec is None or _spec.loader is None:
+    raise ImportError(f'Cannot load {_CLASSIFY_SCRIPT}')
+classify = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(classify)
+
+# Rough prompt-token estimate for English/log text
+BYTES_PER_TOKEN = 4
+
+
+def measure(extract, path: Path, max_bytes: int, repeat: int) -> dict:
+    """Best-of-repeat extraction time plus the excerpt's size and fallback classification."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        excerpt = extract(path, max_bytes)[0]
+        best = min(best, time.perf_counter() - started)
+    size = len(excerpt.encode('utf-8'))
+    return {
+        'ms': best * 1000,
+        'bytes': size,
+        'tokens': size // BYTES_PER_TOKEN,
+        'pattern': classify.fallback_classification(excerpt)['pattern'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tail vs error-region log excerpts')
+    parser.add_argument('--max-bytes', type=int, default=50000, help='Excerpt byte budget')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions')
+    parser.add_argument('--fixtures', default=str(FIXTURES), help='Directory of fixture logs')
+    args = parser.parse_args()
+
+    strategies = [('tail', classify.read_log_tail), ('error regions', classify.extract_log_excerpt)]
+
+    print("Log Excerpt Benchmark")
+    print("=" * 60)
+    totals = {name: 0 for name, _ in strategies}
+    for fixture in sorted(Path(args.fixtures).glob('*.log')):
+        print(f"\n{fixture.name}: {fixture.stat().st_size / 1024:.0f} KiB")
+        for name, extract in strategies:
+            r = measure(extract, fixture, args.max_bytes, args.repeat)
+            totals[name] += r['tokens']
+            print(f"  {name:<14} {r['bytes']:>7} B  ~{r['tokens']:>6} tokens  {r['ms']:>7.2f} ms  "
+                  f"-> {r['pattern']}")
+    tail, regions = totals['tail'], totals['error regions']
+    if regions:
+        print(f"\nPrompt tokens: {tail} tail vs {regions} error regions ({tail / regions:.0f}x fewer)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter Micro-Benchmark
+
+Measures RateLimiter request throughput (check_limit + record_request)
+with the write-through metrics sink versus the buffered background sink,
+and the overhead of cross-process shared state.
+
+Usage:
+    python3 scripts/benchmark_rate_limiter.py [--requests N] [--threads N]
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from rate_limiter import BufferedMetricsSink, FileMetricsSink, RateLimiter, SharedStateFile
+
+
+# Unconfigured API name, so the benchmark measures bookkeeping, not throttling
+BENCH_API = 'benchmark'
+
+
+def run_scenario(name: str, sink, requests: int, threads: int, shared_state=None) -> dict:
+    """
+    Drive a limiter from several threads and measure throughput.
+
+    Args:
+        name: Scenario label
+        sink: Metrics sink to attach to the limiter
+        requests: Requests per thread
+        threads: Number of concurrent threads
+        shared_state: Optional SharedStateFile for the limiter
+
+    Returns:
+        Dictionary with scenario results
+    """
+    limiter = RateLimiter(
+        BENCH_API, metrics_file=sink.path, metrics_sink=sink, shared_state=shared_state
+    )
+
+    def worker():
+        for _ in range(requests):
+            limiter.check_limit()
+            limiter.record_request()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    sink.close()
+
+    total = requests * threads
+    return {
+        'scenario': name,
+        'requests': total,
+        'seconds': elapsed,
+        'requests_per_second': total / elapsed if elapsed else float('inf'),
+        'records_written': sink.written,
+        'records_dropped': getattr(sink, 'dropped', 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark RateLimiter metrics sinks')
+    parser.add_argument('--requests', type=int, default=20000, help='Requests per thread')
+    parser.add_argument('--threads', type=int, default=4, help='Concurrent threads')
+    parser.add_argument('--sample-rate', type=float, default=1.0, help='Buffered sink sample rate')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        results = [
+            run_scenario(
+                'sink off (write-through)',
+                FileMetricsSink(tmp / 'direct.jsonl'),
+                args.requests, args.threads
+            ),
+            run_scenario(
+                'sink on (buffered)',
+                BufferedMetricsSink(tmp / 'buffered.jsonl', sample_rate=args.sample_rate),
+                args.requests, args.threads
+            ),
+            run_scenario(
+                'sink on + shared state',
+                BufferedMetricsSink(tmp / 'shared.jsonl', sample_rate=args.sample_rate),
+                args.requests, args.threads,
+                shared_state=SharedStateFile(tmp / f'{BENCH_API}.state')
+            ),
+        ]
+
+    print("Rate Limiter Metrics Sink Benchmark")
+    print("=" * 50)
+    for r in results:
+        print(
+            f"{r['scenario']:<26} {r['requests_per_second']:>12,.0f} req/s "
+            f"({r['requests']} requests, {r['seconds']:.2f}s, "
+            f"{r['records_written']} written, {r['records_dropped']} dropped)"
+        )
+
+    speedup = results[1]['requests_per_second'] / results[0]['requests_per_second']
+    print(f"\nSpeedup: {speedup:.1f}x")
+
+    shared_cost = 1 / results[2]['requests_per_second'] - 1 / results[1]['requests_per_second']
+    print(f"Shared state overhead: {shared_cost * 1e6:.1f} us/request")
+
+
+if __name__ == '__main__':
+    main()
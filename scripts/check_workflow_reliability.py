@@ -9,19 +9,26 @@ Features:
 - Excludes external outages from calculation
 - Tracks trends over time
 - Alerts when below threshold
+- Optional hourly/daily rollup store (--rollups), updated incrementally
 """
 
 import csv
 import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import metrics_rollup
+from metrics_rollup import RollupStore
 
 
 class WorkflowReliabilityChecker:
     """Checks workflow reliability against NFR-4.1 target."""
 
-    def __init__(self, metrics_file: Path, threshold: float = 0.99, grace_workflows: List[str] = None):
+    def __init__(self, metrics_file: Path, threshold: float = 0.99, grace_workflows: List[str] = None,
+                 rollup_store: Optional[RollupStore] = None):
         """
         Initialize the checker.
 
@@ -29,12 +36,16 @@ class WorkflowReliabilityChecker:
             metrics_file: Path to workflow results CSV file
             threshold: Success rate threshold (default: 0.99 for 99%)
             grace_workflows: List of workflow names in 24h grace period (NFR-4.6)
+            rollup_store: Optional rollup store to aggregate from
         """
         self.metrics_file = metrics_file
         self.threshold = threshold
         self.grace_workflows = grace_workflows or []
+        self.rollup_store = rollup_store
         self.results = []
         self.grace_results = []
+        # Per-workflow (total, successful) when aggregating from rollups
+        self.rollup_counts: Optional[Dict[str, Tuple[int, int]]] = None
 
     def load_results(self, period_days: int = 30) -> List[Dict]:
         """
@@ -44,13 +55,23 @@ class WorkflowReliabilityChecker:
             period_days: Number of days to analyze (default: 30)
 
         Returns:
-            List of result dictionaries
+            List of result dictionaries (empty when aggregating from rollups)
         """
         if not self.metrics_file.exists():
             print(f"⚠️ Warning: Metrics file not found: {self.metrics_file}")
             return []
 
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=period_days)
+
+        if self.rollup_store is not None:
+            metrics_rollup.ingest_workflow_results(self.rollup_store, self.metrics_file)
+            self.rollup_counts = {
+                name: (agg['count'], agg['ok'])
+                for name, agg in self.rollup_store.query(
+                    metrics_rollup.WORKFLOW_RUNS, cutoff_date.timestamp()
+                ).items()
+            }
+            return []
         results = []
 
         with open(self.metrics_file, 'r') as f:
@@ -93,6 +114,16 @@ class WorkflowReliabilityChecker:
         Returns:
             Tuple of (success_rate, total_runs, successful_runs)
         """
+        if self.rollup_counts is not None:
+            established = [
+                counts for name, counts in self.rollup_counts.items()
+                if name not in self.grace_workflows
+            ]
+            total_runs = sum(total for total, _ in established)
+            successful_runs = sum(ok for _, ok in established)
+            success_rate = successful_runs / total_runs if total_runs > 0 else 0.0
+            return success_rate, total_runs, successful_runs
+
         if not self.results:
             return 0.0, 0, 0
 
@@ -140,8 +171,13 @@ class WorkflowReliabilityChecker:
         print(f"Target: {self.threshold * 100:.0f}%")
 
         if self.grace_workflows:
-            grace_count = len(self.grace_results)
-            grace_failed = sum(1 for r in self.grace_results if r['conclusion'] != 'success')
+            if self.rollup_counts is not None:
+                grace = [c for n, c in self.rollup_counts.items() if n in self.grace_workflows]
+                grace_count = sum(total for total, _ in grace)
+                grace_failed = sum(total - ok for total, ok in grace)
+            else:
+                grace_count = len(self.grace_results)
+                grace_failed = sum(1 for r in self.grace_results if r['conclusion'] != 'success')
             print(f"\nNFR-4.6 Grace Period: {len(self.grace_workflows)} workflow(s) excluded")
             print(f"  Grace period runs: {grace_count} (failures: {grace_failed} — counted as WARNING)")
             if len(self.grace_workflows) > 3:
@@ -174,6 +210,14 @@ class WorkflowReliabilityChecker:
         """
         workflow_stats = {}
 
+        if self.rollup_counts is not None:
+            for name, (total, successful) in self.rollup_counts.items():
+                workflow_stats[name] = {
+                    'total': total,
+                    'successful': successful,
+                    'failed': total - successful
+                }
+
         for result in self.results:
             name = result['workflow_name']
             if name not in workflow_stats:
@@ -249,6 +293,10 @@ def main():
         default=[],
         help='Workflow names in 24h grace period (NFR-4.6) — excluded from threshold'
     )
+    parser.add_argument(
+        '--rollups',
+        help='SQLite rollup store to aggregate from (updated incrementally)'
+    )
 
     args = parser.parse_args()
 
@@ -256,7 +304,8 @@ def main():
     checker = WorkflowReliabilityChecker(
         metrics_file=Path(args.metrics),
         threshold=args.threshold,
-        grace_workflows=args.grace_workflows
+        grace_workflows=args.grace_workflows,
+        rollup_store=RollupStore(Path(args.rollups)) if args.rollups else None
     )
 
     meets_target = checker.check_threshold(period_days=args.period)
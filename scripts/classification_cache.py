@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Classification Cache
+
+Persistent on-disk cache of failure classifications keyed by a normalized
+fingerprint of the log excerpt. Timestamps, run/job IDs, UUIDs and hex
+noise (SHAs, addresses, request IDs) are stripped before hashing, so the
+same flaky failure seen in another run maps to the same key and is
+classified from the cache without an API call.
+
+Features:
+- Fingerprint: sha256 of the normalized excerpt plus a namespace (model
+  and prompt version), so prompt changes invalidate old entries
+- TTL eviction on load, lookup and save
+- Hit/miss counts persisted with the entries, giving a running hit rate
+- Thread-safe lookups for concurrent batch classification
+- Atomic writes (temp file + rename), standard library only
+
+Usage:
+    cache = ClassificationCache(Path('.cache/classify/classifications.json'))
+    key = fingerprint(log_excerpt, namespace='claude-sonnet-4-6:1a2b3c')
+    classification = cache.get(key)
+    if classification is None:
+        classification = classify(log_excerpt)
+        cache.put(key, classification)
+    cache.save()
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+# (pattern, placeholder), applied in order: whole timestamps before bare
+# times, UUIDs before generic hex, hex before plain numbers.
+NOISE_PATTERNS = [
+    (re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?'), '<ts>'),
+    (re.compile(r'\b\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?\b'), '<time>'),
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', re.I), '<uuid>'),
+    (re.compile(r'\b0x[0-9a-f]+\b', re.I), '<hex>'),
+    (re.compile(r'\b(?=[0-9a-f]*[a-f])(?=[0-9a-f]*\d)[0-9a-f]{7,}\b', re.I), '<hex>'),
+    (re.compile(r'\b\d{5,}\b'), '<id>'),
+]
+WHITESPACE = re.compile(r'[ \t]+')
+
+
+def normalize_log(text: str) -> str:
+    """Replace per-run noise with placeholders and collapse runs of blanks."""
+    for pattern, placeholder in NOISE_PATTERNS:
+        text = pattern.sub(placeholder, text)
+    lines = (WHITESPACE.sub(' ', line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def fingerprint(text: str, namespace: str = '') -> str:
+    """Content address of a log excerpt (hex sha256 of namespace + normalized text)."""
+    digest = hashlib.sha256(namespace.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(normalize_log(text).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ClassificationCache:
+    """JSON file of fingerprint -> classification with TTL eviction."""
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize cache and load unexpired entries.
+
+        Args:
+            path: Cache file (created on first save)
+            ttl_seconds: Entry lifetime from when it was stored
+            clock: Time source in epoch seconds (for tests)
+        """
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.stats = {'hits': 0, 'misses': 0}
+        self.lock = threading.RLock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        self.entries = data.get('entries') or {}
+        stats = data.get('stats') or {}
+        self.stats = {stat: int(stats.get(stat, 0)) for stat in self.stats}
+        self.evict()
+
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return now - entry.get('stored_at', 0) > self.ttl_seconds
+
+    def evict(self) -> int:
+        """Drop expired entries. Returns the number removed."""
+        now = self.clock()
+        with self.lock:
+            expired = [key for key, entry in self.entries.items() if self._expired(entry, now)]
+            for key in expired:
+                del self.entries[key]
+        return len(expired)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored classification for key (a copy), or None on a miss."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and self._expired(entry, self.clock()):
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            entry['hits'] = entry.get('hits', 0) + 1
+            return dict(entry['classification'])
+
+    def put(self, key: str, classification: Dict[str, Any]):
+        """Store a classification (without its per-run metadata)."""
+        value = {k: v for k, v in classification.items() if k != 'metadata'}
+        with self.lock:
+            self.entries[key] = {'classification': value, 'stored_at': self.clock(), 'hits': 0}
+
+    def hit_rate(self) -> float:
+        """Hits / lookups over the cache file's lifetime (0.0 before any lookup)."""
+        with self.lock:
+            hits, lookups = self.stats['hits'], self.stats['hits'] + self.stats['misses']
+        return hits / lookups if lookups else 0.0
+
+    def info(self, key: str, hit: bool) -> Dict[str, Any]:
+        """Cache summary for a classification's metadata."""
+        return {
+            'hit': hit,
+            'fingerprint': key,
+            'hits': self.stats['hits'],
+            'misses': self.stats['misses'],
+            'hit_rate': round(self.hit_rate(), 4),
+            'entries': len(self.entries),
+        }
+
+    def save(self):
+        """Evict expired entries and write the cache file atomically."""
+        self.evict()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        with self.lock, open(tmp, 'w') as f:
+            json.dump({'entries': self.entries, 'stats': self.stats}, f)
+        os.replace(tmp, self.path)
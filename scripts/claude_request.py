@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Prompt-Cache-Aware Claude Request Builder
+
+Builds Messages API requests with static material first and the
+per-call content last, marking the end of the static prefix with
+cache_control so repeated calls read it from the prompt cache instead of
+paying full input-token cost and latency for it again.
+
+Features:
+- Ordering: system prompt, then static instructions, then dynamic content
+- cache_control breakpoints on the last system block and the instructions
+- Per-call usage record with cache read/write tokens, also counted in
+  the OpenMetrics registry (claude_tokens{call,kind})
+
+Prefixes shorter than the model's minimum cacheable length (1024 tokens,
+2048 for Haiku) are not cached and a cache_control marker on them buys
+nothing, so call sites with a short or per-run prefix pass cache=False.
+
+Usage:
+    request = build_request(MODEL, 1024, system=SYSTEM, instructions=RULES,
+                            content=log_excerpt)
+    message = client.messages.create(**request)
+    usage = record_usage(message, 'classify-failure-logs')
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+sys.path.insert(0, str(Path(__file__).parent))
+from metrics_registry import REGISTRY
+
+CACHE_CONTROL = {'type': 'ephemeral'}
+
+TOKENS_METRIC = REGISTRY.counter(
+    'claude_tokens', 'Claude API tokens by call site and kind', ['call', 'kind'])
+
+# usage attribute -> record field
+USAGE_FIELDS = {
+    'input_tokens': 'input_tokens',
+    'output_tokens': 'output_tokens',
+    'cache_creation_input_tokens': 'cache_write_tokens',
+    'cache_read_input_tokens': 'cache_read_tokens',
+}
+
+Text = Union[str, Sequence[str]]
+
+
+def _blocks(text: Optional[Text], cache: bool) -> List[Dict[str, Any]]:
+    parts = [text] if isinstance(text, str) else list(text or [])
+    blocks: List[Dict[str, Any]] = [{'type': 'text', 'text': part} for part in parts if part]
+    if cache and blocks:
+        blocks[-1]['cache_control'] = CACHE_CONTROL
+    return blocks
+
+
+def build_request(
+    model: str,
+    max_tokens: int,
+    system: Optional[Text] = None,
+    instructions: Optional[Text] = None,
+    content: Optional[Text] = None,
+    cache: bool = True,
+    **params
+) -> Dict[str, Any]:
+    """
+    Build Messages API parameters with the stable prefix first.
+
+    Args:
+        model: Model name
+        max_tokens: Output token limit
+        system: Static system prompt (string or list of blocks' text)
+        instructions: Static task instructions, sent before the content
+        content: Per-call material (logs, updates), sent last
+        cache: Mark the system prompt and instructions for prompt caching
+            (only useful when together they reach the cacheable minimum)
+        **params: Other Messages API parameters (temperature, ...)
+
+    Returns:
+        Keyword arguments for client.messages.create() or a batch
+        request's params
+    """
+    request: Dict[str, Any] = {'model': model, 'max_tokens': max_tokens, **params}
+    system_blocks = _blocks(system, cache)
+    if system_blocks:
+        request['system'] = system_blocks
+    user_blocks = _blocks(instructions, cache) + _blocks(content, cache=False)
+    request['messages'] = [{'role': 'user', 'content': user_blocks}]
+    return request
+
+
+def prompt_text(request: Dict[str, Any]) -> str:
+    """Concatenated text of a built request's user message."""
+    return '\n\n'.join(block['text'] for block in request['messages'][0]['content'])
+
+
+def record_usage(message: Any, call: str) -> Dict[str, int]:
+    """
+    Record one response's token usage, including prompt-cache reads/writes.
+
+    Args:
+        message: Messages API response (anything with a .usage)
+        call: Call-site label for metrics (e.g. 'classify-failure-logs')
+
+    Returns:
+        Dict of input_tokens, output_tokens, cache_write_tokens and
+        cache_read_tokens (0 when the API did not report a field)
+    """
+    usage = getattr(message, 'usage', None)
+    record = {
+        field: int(getattr(usage, attr, None) or 0)
+        for attr, field in USAGE_FIELDS.items()
+    }
+    for field, tokens in record.items():
+        if tokens:
+            TOKENS_METRIC.inc(tokens, call=call, kind=field[:-len('_tokens')])
+    return record
+
+
+def format_usage(usage: Dict[str, int]) -> str:
+    """One-line usage report."""
+    return (
+        f"{usage['input_tokens']} uncached input, {usage['cache_read_tokens']} cache read, "
+        f"{usage['cache_write_tokens']} cache write, {usage['output_tokens']} output tokens"
+    )
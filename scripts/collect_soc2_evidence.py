@@ -2,6 +2,9 @@
 """
 SOC 2 Evidence Collection Script
 Collects evidence from GitHub for SOC 2 compliance
+
+GITHUB_EVIDENCE_MODE=graphql fetches branch protection and Dependabot
+alerts for many repositories per GraphQL query (github_graphql.py).
 """
 
 import json
@@ -11,9 +14,16 @@ from datetime import datetime
 from pathlib import Path
 import subprocess
 
+sys.path.insert(0, str(Path(__file__).parent))
+from github_graphql import GraphQLError, fetch_repositories
+from rate_limiter import get_rate_limiter
+
 class SOC2EvidenceCollector:
-    def __init__(self, org_name="Seven-Fortunas-Internal"):
+    def __init__(self, org_name="Seven-Fortunas-Internal", mode=None):
         self.org_name = org_name
+        # 'rest' (one call per repository) or 'graphql' (batched queries)
+        self.mode = mode or os.environ.get('GITHUB_EVIDENCE_MODE', 'rest')
+        self._graphql_repos = None
         self.evidence_dir = Path(f"compliance/evidence/{datetime.utcnow().strftime('%Y-%m-%d')}")
         self.evidence_dir.mkdir(parents=True, exist_ok=True)
 
@@ -25,6 +35,8 @@ class SOC2EvidenceCollector:
 
     def run_gh_api(self, endpoint):
         """Run GitHub API call via gh CLI"""
+        # Evidence collection is critical: it may use headroom reserved from bulk jobs
+        get_rate_limiter('github', 'critical').acquire()
         try:
             result = subprocess.run(
                 ['gh', 'api', endpoint],
@@ -40,6 +52,36 @@ class SOC2EvidenceCollector:
             print(f"Error parsing JSON from {endpoint}: {e}")
             return None
 
+    def run_gh_graphql(self, query, variables):
+        """Run a GraphQL query via gh CLI; returns the response payload"""
+        get_rate_limiter('github', 'critical').acquire()
+        try:
+            result = subprocess.run(
+                ['gh', 'api', 'graphql', '--input', '-'],
+                input=json.dumps({'query': query, 'variables': variables}),
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            return json.loads(result.stdout)
+        except subprocess.CalledProcessError as e:
+            # gh exits non-zero on GraphQL errors but still prints the payload,
+            # which may hold partial data
+            try:
+                return json.loads(e.stdout)
+            except (TypeError, json.JSONDecodeError):
+                print(f"Error calling GraphQL API: {e.stderr}")
+                return None
+        except json.JSONDecodeError as e:
+            print(f"Error parsing JSON from GraphQL API: {e}")
+            return None
+
+    def graphql_repositories(self):
+        """Repositories with branch protection and Dependabot alerts, fetched once"""
+        if self._graphql_repos is None:
+            self._graphql_repos = fetch_repositories(self.run_gh_graphql, self.org_name, alert_states=None)
+        return self._graphql_repos
+
     def collect_2fa_status(self):
         """Collect 2FA status for all organization members"""
         print("Collecting 2FA status...")
@@ -137,16 +179,24 @@ class SOC2EvidenceCollector:
         """Collect Dependabot alerts for all repositories"""
         print("Collecting Dependabot alerts...")
 
-        repos = self.run_gh_api(f"/orgs/{self.org_name}/repos")
-        if not repos:
-            print("  ✗ Failed to fetch repos")
-            return
+        if self.mode == 'graphql':
+            try:
+                repo_alerts = [(r['name'], r['vulnerability_alerts']) for r in self.graphql_repositories()]
+            except GraphQLError as e:
+                print(f"  ✗ Failed to fetch repos: {e}")
+                return
+        else:
+            repos = self.run_gh_api(f"/orgs/{self.org_name}/repos")
+            if not repos:
+                print("  ✗ Failed to fetch repos")
+                return
+            repo_alerts = [
+                (repo['name'], self.run_gh_api(f"/repos/{self.org_name}/{repo['name']}/dependabot/alerts"))
+                for repo in repos
+            ]
 
         all_alerts = []
-        for repo in repos:
-            repo_name = repo['name']
-            alerts = self.run_gh_api(f"/repos/{self.org_name}/{repo_name}/dependabot/alerts")
-
+        for repo_name, alerts in repo_alerts:
             if alerts and isinstance(alerts, list):
                 for alert in alerts:
                     all_alerts.append({
@@ -173,20 +223,30 @@ class SOC2EvidenceCollector:
         """Collect branch protection status for all repositories"""
         print("Collecting branch protection status...")
 
-        repos = self.run_gh_api(f"/orgs/{self.org_name}/repos")
-        if not repos:
-            print("  ✗ Failed to fetch repos")
-            return
+        if self.mode == 'graphql':
+            try:
+                repo_protection = [
+                    (r['name'], r['default_branch'] or 'main', r['default_branch_protection'])
+                    for r in self.graphql_repositories()
+                ]
+            except GraphQLError as e:
+                print(f"  ✗ Failed to fetch repos: {e}")
+                return
+        else:
+            repos = self.run_gh_api(f"/orgs/{self.org_name}/repos")
+            if not repos:
+                print("  ✗ Failed to fetch repos")
+                return
+            repo_protection = []
+            for repo in repos:
+                default_branch = repo.get('default_branch', 'main')
+                protection = self.run_gh_api(
+                    f"/repos/{self.org_name}/{repo['name']}/branches/{default_branch}/protection"
+                )
+                repo_protection.append((repo['name'], default_branch, protection))
 
         protection_status = []
-        for repo in repos:
-            repo_name = repo['name']
-            default_branch = repo.get('default_branch', 'main')
-
-            protection = self.run_gh_api(
-                f"/repos/{self.org_name}/{repo_name}/branches/{default_branch}/protection"
-            )
-
+        for repo_name, default_branch, protection in repo_protection:
             if protection:
                 protection_status.append({
                     'repository': repo_name,
@@ -13,6 +13,9 @@ import yaml
 import feedparser
 import requests
 
+sys.path.insert(0, str(Path(__file__).parent))
+from rate_limiter import get_rate_limiter
+
 class DashboardCurator:
     def __init__(self):
         self.sources_file = Path("dashboards/ai/sources.yaml")
@@ -70,7 +73,10 @@ class DashboardCurator:
         try:
             url = f"https://www.reddit.com/r/{subreddit}/about.json"
             headers = {'User-Agent': 'DashboardCurator/1.0'}
+            limiter = get_rate_limiter('reddit', 'interactive')
+            limiter.acquire()
             response = requests.get(url, headers=headers, timeout=10)
+            limiter.record_response(response.headers)
 
             if response.status_code == 404:
                 return False, "Subreddit not found"
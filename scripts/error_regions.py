@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Error Region Extraction for CI Failure Logs
+
+Streaming pre-pass over a GitHub Actions job log that finds error hotspots
+and builds a compact excerpt of the lines around them. The real error is
+often far from the end of the log (teardown, post-job cleanup and cache
+uploads follow it), so a plain tail excerpt can miss it while still
+costing the full byte budget in prompt tokens.
+
+Hotspots:
+- GitHub Actions error annotations (##[error])
+- Python tracebacks
+- Non-zero exit codes ("Process completed with exit code 1", "exit status 2")
+- ERROR / FATAL / FAILED, "error:", "fatal:", "SomethingError:", npm ERR!
+
+Step boundaries (##[group]Run ...) label each region and end an open one.
+
+Features:
+- One forward pass, line by line; memory bounded by the byte budget
+- Context windows before/after each hotspot, merged when they overlap
+- Earliest regions kept first (usually the root cause), latest regions in
+  a bounded rolling buffer (the final failure), middle ones counted as omitted
+- Runner timestamps stripped and very long lines clipped to save tokens
+- No line numbers in the excerpt text, so the same failure in another run
+  produces the same excerpt (see classification_cache.fingerprint)
+
+Usage:
+    with open(log_path, errors='replace') as f:
+        found = find_regions(f)
+    if found['regions']:
+        excerpt = format_regions(found)
+"""
+
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+CONTEXT_BEFORE = 5
+CONTEXT_AFTER = 10
+MAX_REGION_LINES = 60
+MAX_LINE_CHARS = 400
+
+# Share of the byte budget reserved for the earliest regions; the rest holds
+# the latest ones.
+HEAD_SHARE = 2 / 3
+
+# Budget kept free for the excerpt header and the omitted-regions marker
+FORMAT_BYTES = 200
+
+TIMESTAMP = re.compile(r'^\ufeff?\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?Z ')
+STEP_START = re.compile(r'##\[group\]Run (.+)')
+HOTSPOT = re.compile(
+    r'(?P<annotation>##\[error\])'
+    r'|(?P<traceback>Traceback \(most recent call last\))'
+    r'|(?P<exit_code>(?:exit code|exit status|exited with code)\s*[1-9]\d*)'
+    r'|(?P<error>\b(?:ERROR|FATAL|FAILED|FAILURE)\b|\b\w*Error:|\berror:|\bfatal:|npm ERR!)'
+)
+
+
+def _region_text(region: Dict[str, Any]) -> str:
+    return f"--- step: {region['step'] or '(setup)'} ---\n" + '\n'.join(region['lines'])
+
+
+def find_regions(
+    lines: Iterable[str],
+    max_bytes: int = 50000,
+    before: int = CONTEXT_BEFORE,
+    after: int = CONTEXT_AFTER
+) -> Dict[str, Any]:
+    """
+    Scan log lines once and collect windows around error hotspots.
+
+    Args:
+        lines: Log lines (an open text file works)
+        max_bytes: Budget for the formatted excerpt
+        before: Context lines kept before a hotspot
+        after: Context lines kept after the last hotspot of a region
+
+    Returns:
+        Dict with 'regions' (start/end line numbers, step, kinds, lines),
+        'omitted' (regions dropped from the middle) and 'total_lines'
+    """
+    budget = max_bytes - FORMAT_BYTES
+    head_budget = int(budget * HEAD_SHARE)
+    tail_budget = budget - head_budget
+    head: List[Dict[str, Any]] = []
+    tail: deque = deque()
+    sizes = {'head': 0, 'tail': 0}
+    omitted = 0
+    head_full = False
+
+    def close(region):
+        nonlocal omitted, head_full
+        size = len(_region_text(region).encode('utf-8')) + 2
+        if not head_full and sizes['head'] + size <= head_budget:
+            head.append(region)
+            sizes['head'] += size
+            return
+        head_full = True
+        tail.append((region, size))
+        sizes['tail'] += size
+        while sizes['tail'] > tail_budget and tail:
+            _, dropped = tail.popleft()
+            sizes['tail'] -= dropped
+            omitted += 1
+
+    ring: deque = deque(maxlen=before)
+    step: Optional[str] = None
+    # start/end line numbers, step, kinds and lines of the open region
+    region: Optional[Dict[str, Any]] = None
+    remaining = 0
+    lineno = 0
+    for lineno, raw in enumerate(lines, 1):
+        text = TIMESTAMP.sub('', raw.rstrip('\r\n'))
+        if len(text) > MAX_LINE_CHARS:
+            text = text[:MAX_LINE_CHARS] + ' [...]'
+
+        step_start = STEP_START.search(text)
+        if step_start:
+            if region is not None:
+                close(region)
+                region = None
+            ring.clear()
+            step = step_start.group(1).strip()
+
+        hotspot = HOTSPOT.search(text)
+        if hotspot:
+            if region is None:
+                start = ring[0][0] if ring else lineno
+                region = {'start': start, 'end': lineno, 'step': step, 'kinds': [],
+                          'lines': [line for _, line in ring]}
+                ring.clear()
+            region['lines'].append(text)
+            region['end'] = lineno
+            if hotspot.lastgroup not in region['kinds']:
+                region['kinds'].append(hotspot.lastgroup)
+            remaining = after
+        elif region is not None:
+            region['lines'].append(text)
+            region['end'] = lineno
+            remaining -= 1
+        else:
+            ring.append((lineno, text))
+
+        if region is not None and (remaining <= 0 or len(region['lines']) >= MAX_REGION_LINES):
+            close(region)
+            region = None
+
+    if region is not None:
+        close(region)
+    return {
+        'regions': head + [region for region, _ in tail],
+        'head': len(head),
+        'omitted': omitted,
+        'total_lines': lineno,
+    }
+
+
+def format_regions(found: Dict[str, Any]) -> str:
+    """Excerpt text for find_regions() output."""
+    regions = found['regions']
+    parts = [f"[ERROR REGIONS - {len(regions)} regions around errors]"]
+    for index, region in enumerate(regions):
+        if index == found['head'] and found['omitted']:
+            parts.append(f"[... {found['omitted']} more error regions omitted ...]")
+        parts.append(_region_text(region))
+    return '\n\n'.join(parts)
+
+
+def summarize_regions(found: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Region locations (no text) for classification metadata."""
+    return [{'start': r['start'], 'end': r['end'], 'step': r['step'], 'kinds': r['kinds']}
+            for r in found['regions']]
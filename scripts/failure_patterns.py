@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Compiled Failure Pattern Matcher
+
+Data-driven rules for the pattern-based fallback in classify-failure-logs.py.
+Rules are loaded from YAML (config/failure_patterns.yaml) and every match
+string of every rule is compiled into one trie-shaped regex that runs over
+the lowercased log. A single scan finds all rules at once, and its cost
+grows with the length of the longest pattern, not the number of rules.
+
+Features:
+- One pass returns every matching rule with the line of each occurrence
+- Overlapping matches are all reported (a pattern that is a prefix or
+  substring of another is still found)
+- First matching rule in file order decides the classification, with a
+  configurable default for logs that match nothing
+
+Usage:
+    matcher = PatternMatcher.from_file(Path('config/failure_patterns.yaml'))
+    matches = matcher.scan(log_excerpt)
+    classification = matcher.classify(log_excerpt)
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+DEFAULT_PATTERNS_FILE = Path(__file__).parent.parent / 'config' / 'failure_patterns.yaml'
+
+# Rule fields copied into a classification
+CLASSIFICATION_FIELDS = ['category', 'pattern', 'is_retriable', 'root_cause', 'suggested_fix']
+
+
+def trie_regex(strings: List[str]) -> str:
+    """
+    Regex source matching any of strings, factored by common prefix.
+
+    At each character the regex engine follows a single trie branch instead
+    of trying every alternative, and the longest string wins at a position.
+    """
+    trie: Dict[str, Any] = {}
+    for string in strings:
+        node = trie
+        for char in string:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node: Dict[str, Any]) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            body = (body if len(branches) == 1 and len(body) == 1 else f'(?:{body})') + '?'
+        return body
+
+    return build(trie)
+
+
+class PatternMatcher:
+    """All rules' match strings compiled into one scan."""
+
+    def __init__(self, rules: List[Dict[str, Any]], default: Optional[Dict[str, Any]] = None):
+        """
+        Compile rules.
+
+        Args:
+            rules: Rule dicts with id, match (list of substrings) and the
+                classification fields; earlier rules take precedence
+            default: Classification for logs that match no rule
+
+        Raises:
+            ValueError: A rule has no id or no match strings, or an id repeats
+        """
+        self.rules = rules
+        self.default = default
+        self.rank = {}
+        self.rules_by_string: Dict[str, List[str]] = {}
+        for index, rule in enumerate(rules):
+            rule_id = rule.get('id')
+            if not rule_id or not rule.get('match'):
+                raise ValueError(f'Rule {index} needs an id and at least one match string')
+            if rule_id in self.rank:
+                raise ValueError(f'Duplicate rule id: {rule_id}')
+            self.rank[rule_id] = index
+            for string in rule['match']:
+                rule_ids = self.rules_by_string.setdefault(str(string).lower(), [])
+                if rule_id not in rule_ids:
+                    rule_ids.append(rule_id)
+
+        self.lengths = sorted({len(s) for s in self.rules_by_string})
+        source = trie_regex(sorted(self.rules_by_string))
+        # Zero-width lookahead: a match is attempted at every position, so
+        # overlapping occurrences are not skipped.
+        self.regex = re.compile(f'(?=({source}))') if source else None
+
+    @classmethod
+    def from_file(cls, path: Path = DEFAULT_PATTERNS_FILE) -> 'PatternMatcher':
+        """
+        Load rules from YAML ({rules: [...], default: {...}}).
+
+        Raises:
+            ImportError: PyYAML is not installed
+            OSError, ValueError: File missing or invalid
+        """
+        if not YAML_AVAILABLE:
+            raise ImportError('PyYAML is required to load failure patterns (pip install pyyaml)')
+        with open(path) as f:
+            config = yaml.safe_load(f) or {}
+        return cls(config.get('rules') or [], config.get('default'))
+
+    def scan(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Find every occurrence of every rule in one pass.
+
+        Args:
+            text: Log text
+
+        Returns:
+            Match dicts (rule, line, text) in log order; line is 1-based
+            and text is the matched (lowercase) string
+        """
+        matches = []
+        if self.regex is None:
+            return matches
+        # Lowercasing once is far cheaper than re.IGNORECASE on every position
+        text = text.lower()
+        line, last = 1, 0
+        for found in self.regex.finditer(text):
+            start = found.start()
+            line += text.count('\n', last, start)
+            last = start
+            longest = found.group(1)
+            # The trie regex returns the longest string at this position;
+            # shorter strings starting here are its prefixes.
+            for length in self.lengths:
+                if length > len(longest):
+                    break
+                candidate = longest[:length]
+                for rule_id in self.rules_by_string.get(candidate, ()):
+                    matches.append({'rule': rule_id, 'line': line, 'text': candidate})
+        return matches
+
+    def summarize(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Per-rule summary (rule, first line, count) in rule precedence order."""
+        summary: Dict[str, Dict[str, Any]] = {}
+        for match in matches:
+            entry = summary.setdefault(match['rule'], {'rule': match['rule'], 'line': match['line'], 'count': 0})
+            entry['count'] += 1
+        return sorted(summary.values(), key=lambda entry: self.rank[entry['rule']])
+
+    def classify(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Classification from the highest-precedence matching rule.
+
+        Returns:
+            Classification fields plus 'matches' (summarize() of the scan), the
+            default classification when nothing matches, or None without a default
+        """
+        matched = self.summarize(self.scan(text))
+        if matched:
+            rule = self.rules[self.rank[matched[0]['rule']]]
+        elif self.default is not None:
+            rule = self.default
+        else:
+            return None
+        classification = {field: rule[field] for field in CLASSIFICATION_FIELDS if field in rule}
+        classification['matches'] = matched
+        return classification
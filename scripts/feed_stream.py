@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Streaming RSS/Atom Feed Parser
+
+Pull-parses RSS 2.0, RSS 1.0 (RDF) and Atom feeds chunk by chunk and stops
+after the requested number of entries, so only the head of a large archive
+feed is downloaded and parsed. Finished entries are detached from the tree,
+keeping memory bounded by one entry.
+
+Features:
+- xml.etree XMLPullParser (standard library), namespace-agnostic
+- Accepts bytes, a binary file object or an iterable of byte chunks
+- Entries as plain dicts: title, link, published, summary
+
+Malformed feeds raise xml.etree.ElementTree.ParseError; callers fall back
+to a lenient parser (feedparser) for those.
+"""
+
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, Iterable, Iterator, List, Union
+
+CHUNK_BYTES = 16 * 1024
+
+# Local element names of an entry in each feed format
+ENTRY_TAGS = frozenset({'item', 'entry'})
+
+# Candidate child elements per field, in order of preference
+TITLE_TAGS = ('title',)
+PUBLISHED_TAGS = ('pubDate', 'published', 'date', 'updated', 'modified')
+SUMMARY_TAGS = ('description', 'summary', 'encoded', 'content')
+
+FeedSource = Union[bytes, Iterable[bytes]]
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _chunks(source) -> Iterator[bytes]:
+    if isinstance(source, (bytes, bytearray)):
+        for start in range(0, len(source), CHUNK_BYTES):
+            yield bytes(source[start:start + CHUNK_BYTES])
+    elif hasattr(source, 'read'):
+        yield from iter(lambda: source.read(CHUNK_BYTES), b'')
+    else:
+        yield from source
+
+
+def _text(elem: ET.Element) -> str:
+    # Atom text constructs may hold XHTML children
+    return ''.join(elem.itertext()).strip()
+
+
+def _entry(elem: ET.Element) -> Dict[str, str]:
+    children: Dict[str, ET.Element] = {}
+    link = ''
+    for child in elem:
+        name = _local(child.tag)
+        children.setdefault(name, child)
+        if name == 'link' and not link:
+            # Atom: <link rel="alternate" href="..."/>; RSS: <link>url</link>
+            href = child.get('href')
+            if href and child.get('rel', 'alternate') == 'alternate':
+                link = href
+            elif child.text:
+                link = child.text.strip()
+
+    def first(names) -> str:
+        for name in names:
+            if name in children:
+                return _text(children[name])
+        return ''
+
+    return {
+        'title': first(TITLE_TAGS),
+        'link': link,
+        'published': first(PUBLISHED_TAGS),
+        'summary': first(SUMMARY_TAGS)[:200],
+    }
+
+
+def iter_entries(source: FeedSource, limit: int = 5) -> Iterator[Dict[str, str]]:
+    """
+    Yield feed entries as they are parsed, stopping after limit.
+
+    Args:
+        source: Feed bytes, binary file object or iterable of byte chunks
+        limit: Maximum number of entries (the rest of the feed is not read)
+
+    Yields:
+        Entry dicts with title, link, published and summary
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the feed is not well-formed XML
+    """
+    if limit <= 0:
+        return
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    stack: List[ET.Element] = []
+    depth_in_entry = 0
+    count = 0
+
+    for chunk in _chunks(source):
+        parser.feed(chunk)
+        for event, elem in parser.read_events():  # type: ignore[misc]
+            if not isinstance(elem, ET.Element):
+                continue  # namespace events carry no element
+            if event == 'start':
+                if depth_in_entry or _local(elem.tag) in ENTRY_TAGS:
+                    depth_in_entry += 1
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            if not depth_in_entry:
+                continue
+            depth_in_entry -= 1
+            if depth_in_entry:
+                continue
+
+            yield _entry(elem)
+            count += 1
+            if count >= limit:
+                return
+            # Detach the finished entry so the tree never holds more than one
+            if stack:
+                stack[-1].remove(elem)
+    parser.close()
+
+
+def parse_entries(source: FeedSource, limit: int = 5) -> List[Dict[str, str]]:
+    """
+    Parse the first entries of a feed.
+
+    Args:
+        source: Feed bytes, binary file object or iterable of byte chunks
+        limit: Maximum number of entries
+
+    Returns:
+        List of entry dicts (title, link, published, summary)
+    """
+    return list(iter_entries(source, limit))
+
+
+def parse_entries_with_fallback(
+    source: Iterable[bytes],
+    fallback: Callable[[bytes], List[Dict[str, str]]],
+    limit: int = 5
+) -> List[Dict[str, str]]:
+    """
+    Stream-parse a feed, handing malformed feeds to a lenient parser.
+
+    Chunks read before the parse error are kept, so the fallback receives
+    the complete body.
+
+    Args:
+        source: Iterable of byte chunks (consumed at most once)
+        fallback: Parses a complete body into entry dicts (e.g. via feedparser)
+        limit: Maximum number of entries
+
+    Returns:
+        List of entry dicts (at most limit)
+    """
+    chunks = iter(_chunks(source))
+    seen: List[bytes] = []
+
+    def tee():
+        for chunk in chunks:
+            seen.append(chunk)
+            yield chunk
+
+    try:
+        return parse_entries(tee(), limit)
+    except ET.ParseError:
+        return fallback(b''.join(seen) + b''.join(chunks))[:limit]
@@ -8,9 +8,13 @@ Generates: 1-2 paragraphs + 10 bullet points with links
 import json
 import os
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from claude_request import build_request, format_usage, record_usage
+
 try:
     from anthropic import Anthropic
 except ImportError:
@@ -41,11 +45,10 @@ def generate_summary(data, api_key):
         for item in updates[:20]  # Limit to 20 items
     ])
 
-    prompt = f"""Summarize top 10 AI developments this week into a professional weekly report.
-
-Here are the latest AI developments:
-
-{updates_text if updates_text else "No new items this week."}
+    # Static instructions first, this week's developments last. One call per run
+    # with a prefix far below the cacheable minimum, so no cache breakpoint.
+    instructions = """Summarize top 10 AI developments this week into a professional weekly report.
+The latest AI developments follow these instructions.
 
 Please generate a summary with:
 1. Brief context (1-2 paragraphs) on overall AI landscape trends this week
@@ -64,13 +67,14 @@ Format the output with clear sections:
 ## Top 10 Developments
 [10 numbered bullet points with links]"""
 
-    message = client.messages.create(
-        model="claude-3-5-haiku-20241022",
-        max_tokens=1024,
-        messages=[
-            {"role": "user", "content": prompt}
-        ]
-    )
+    message = client.messages.create(**build_request(
+        "claude-3-5-haiku-20241022", 1024,
+        instructions=instructions,
+        content=f"Here are the latest AI developments:\n\n"
+                f"{updates_text if updates_text else 'No new items this week.'}",
+        cache=False,
+    ))
+    print(f"API usage: {format_usage(record_usage(message, 'generate-ai-summary'))}")
 
     return message.content[0].text
 
@@ -9,15 +9,21 @@ Features:
 - Failure analysis and classification
 - Trend analysis over time
 - Recommendations for improvement
+- Optional hourly/daily rollup store (--rollups), updated incrementally
 """
 
 import csv
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+import metrics_rollup
+from metrics_rollup import RollupStore
+
 
 class ReliabilityReportGenerator:
     """Generates workflow reliability reports."""
@@ -26,7 +32,8 @@ class ReliabilityReportGenerator:
         self,
         metrics_file: Path,
         classifications_file: Path,
-        threshold: float = 0.99
+        threshold: float = 0.99,
+        rollup_store: Optional[RollupStore] = None
     ):
         """
         Initialize the report generator.
@@ -35,12 +42,18 @@ class ReliabilityReportGenerator:
             metrics_file: Path to workflow results CSV
             classifications_file: Path to failure classifications CSV
             threshold: Success rate threshold (default: 0.99)
+            rollup_store: Optional rollup store to aggregate from
         """
         self.metrics_file = metrics_file
         self.classifications_file = classifications_file
         self.threshold = threshold
+        self.rollup_store = rollup_store
         self.results = []
         self.classifications = []
+        # Per-workflow (total, successful) and (internal, external, other)
+        # counts when aggregating from rollups
+        self.rollup_counts: Optional[Dict[str, Tuple[int, int]]] = None
+        self.rollup_classifications: Optional[Dict[str, Tuple[int, int, int]]] = None
 
     def load_data(self, month: str = None):
         """
@@ -52,6 +65,10 @@ class ReliabilityReportGenerator:
         if month is None:
             month = datetime.utcnow().strftime('%Y-%m')
 
+        if self.rollup_store is not None:
+            self._load_rollups(self.rollup_store, month)
+            return
+
         # Load workflow results
         if self.metrics_file.exists():
             with open(self.metrics_file, 'r') as f:
@@ -109,6 +126,47 @@ class ReliabilityReportGenerator:
                     except (KeyError, ValueError):
                         continue
 
+    def _load_rollups(self, store: RollupStore, month: str):
+        """Bring the rollup store up to date, then aggregate the month from it."""
+        start = datetime.strptime(month, '%Y-%m').replace(tzinfo=timezone.utc)
+        end = (start + timedelta(days=32)).replace(day=1)
+        since, until = start.timestamp(), end.timestamp()
+
+        metrics_rollup.ingest_workflow_results(store, self.metrics_file)
+        metrics_rollup.ingest_classifications(store, self.classifications_file)
+
+        self.rollup_counts = {
+            name: (agg['count'], agg['ok'])
+            for name, agg in store.query(metrics_rollup.WORKFLOW_RUNS, since, until).items()
+        }
+        self.rollup_classifications = {
+            name: (agg['ok'], int(agg['total']), agg['count'] - agg['ok'])
+            for name, agg in store.query(
+                metrics_rollup.FAILURE_CLASSIFICATIONS, since, until
+            ).items()
+        }
+
+    def _classification_counts(self) -> Dict[str, Tuple[int, int, int]]:
+        """
+        Failure classifications per workflow.
+
+        Returns:
+            Dictionary mapping workflow names to (internal, external, not internal)
+        """
+        if self.rollup_classifications is not None:
+            return self.rollup_classifications
+
+        counts = defaultdict(lambda: [0, 0, 0])
+        for classification in self.classifications:
+            name = classification['workflow_name']
+            if classification['failure_type'] == 'internal':
+                counts[name][0] += 1
+            else:
+                counts[name][2] += 1
+            if classification['failure_type'] == 'external':
+                counts[name][1] += 1
+        return {name: (c[0], c[1], c[2]) for name, c in counts.items()}
+
     def calculate_statistics(self) -> Dict:
         """
         Calculate reliability statistics.
@@ -116,10 +174,14 @@ class ReliabilityReportGenerator:
         Returns:
             Dictionary containing statistics
         """
-        total_runs = len(self.results)
-        successful_runs = sum(
-            1 for r in self.results if r['conclusion'] == 'success'
-        )
+        if self.rollup_counts is not None:
+            total_runs = sum(total for total, _ in self.rollup_counts.values())
+            successful_runs = sum(ok for _, ok in self.rollup_counts.values())
+        else:
+            total_runs = len(self.results)
+            successful_runs = sum(
+                1 for r in self.results if r['conclusion'] == 'success'
+            )
         failed_runs = total_runs - successful_runs
 
         # Calculate overall success rate
@@ -128,14 +190,9 @@ class ReliabilityReportGenerator:
         )
 
         # Classify failures
-        internal_failures = sum(
-            1 for c in self.classifications
-            if c['failure_type'] == 'internal'
-        )
-        external_failures = sum(
-            1 for c in self.classifications
-            if c['failure_type'] == 'external'
-        )
+        classification_counts = self._classification_counts().values()
+        internal_failures = sum(c[0] for c in classification_counts)
+        external_failures = sum(c[1] for c in classification_counts)
 
         # Calculate internal success rate (excluding external failures)
         internal_runs = total_runs - external_failures
@@ -150,6 +207,11 @@ class ReliabilityReportGenerator:
             'total': 0, 'successful': 0, 'failed': 0
         })
 
+        for name, (total, successful) in (self.rollup_counts or {}).items():
+            workflow_stats[name] = {
+                'total': total, 'successful': successful, 'failed': total - successful
+            }
+
         for result in self.results:
             name = result['workflow_name']
             workflow_stats[name]['total'] += 1
@@ -256,12 +318,11 @@ class ReliabilityReportGenerator:
             internal_by_workflow = defaultdict(int)
             external_by_workflow = defaultdict(int)
 
-            for classification in self.classifications:
-                name = classification['workflow_name']
-                if classification['failure_type'] == 'internal':
-                    internal_by_workflow[name] += 1
-                else:
-                    external_by_workflow[name] += 1
+            for name, (internal, _, other) in self._classification_counts().items():
+                if internal:
+                    internal_by_workflow[name] += internal
+                if other:
+                    external_by_workflow[name] += other
 
             if internal_failures := stats['internal_failures']:
                 report += f"### Internal Failures ({internal_failures} total)\n\n"
@@ -372,6 +433,10 @@ def main():
         default=0.99,
         help='Success rate threshold (default: 0.99)'
     )
+    parser.add_argument(
+        '--rollups',
+        help='SQLite rollup store to aggregate from (updated incrementally)'
+    )
 
     args = parser.parse_args()
 
@@ -379,7 +444,8 @@ def main():
     generator = ReliabilityReportGenerator(
         metrics_file=Path(args.metrics),
         classifications_file=Path(args.classifications),
-        threshold=args.threshold
+        threshold=args.threshold,
+        rollup_store=RollupStore(Path(args.rollups)) if args.rollups else None
     )
 
     generator.save_report(
@@ -0,0 +1,644 @@
+#!/usr/bin/env python3
+"""
+Weekly Dashboard Summary Engine
+
+Generates the Claude-written weekly summaries for several dashboards in one
+process. All dashboards share one Anthropic client (pooled connections)
+and the 'claude' rate limiter; independent dashboards run concurrently.
+The per-dashboard generate_weekly_summary.py scripts are thin wrappers
+around this engine.
+
+Features:
+- One interpreter start and one HTTP connection pool per weekly run
+- Dashboards summarized concurrently; one failure does not stop the rest
+- Claude calls admitted by the shared rate limiter and recorded from
+  response headers
+- Static per-dashboard instructions sent first (claude_request.py);
+  token usage reported per dashboard
+- Batch mode: every dashboard's prompt submitted as one Message Batch
+  (lower cost), polled, and fanned back out to each summaries directory
+- Local stub batch backend for tests and dry runs
+
+Usage:
+    python scripts/generate_weekly_summaries.py                 # all dashboards
+    python scripts/generate_weekly_summaries.py --dashboards ai security
+    python scripts/generate_weekly_summaries.py --batch
+    python scripts/generate_weekly_summaries.py --batch --backend stub  # no API calls
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from claude_request import build_request, format_usage, prompt_text, record_usage
+from date_normalizer import DateNormalizer, to_epoch
+from rate_limiter import get_rate_limiter
+
+MODEL = "claude-sonnet-4-20250514"
+MAX_TOKENS = 2048
+MAX_UPDATES = 30       # Updates sent to Claude, to stay within token limits
+FALLBACK_UPDATES = 20  # Most recent updates used when none are from this week
+BATCH_POLL_SECONDS = 30
+BATCH_TIMEOUT_SECONDS = 3600  # Batches usually end within minutes
+
+# Prompt wording per dashboard
+DASHBOARDS: Dict[str, Dict[str, Any]] = {
+    "ai": {
+        "label": "AI",
+        "subject": "recent AI advancements for an enterprise AI-SecOps team",
+        "focus": [
+            "Major model releases and capabilities",
+            "Security and safety improvements",
+            "Enterprise-relevant applications",
+            "Research breakthroughs",
+            "Infrastructure updates (PyTorch, TensorFlow, etc.)",
+        ],
+        "impact": "what matters for AI-SecOps",
+    },
+    "edutech": {
+        "label": "EduTech",
+        "subject": "recent EduTech trends and developments for an enterprise team "
+                   "with Peru market focus",
+        "focus": [
+            "Educational technology innovations",
+            "Learning management systems (Moodle, OpenEdX, etc.)",
+            "Digital inclusion and accessibility",
+            "EdTech regulations and policy changes",
+            "Platform updates and new features for education",
+        ],
+        "impact": "what matters for educational digital transformation",
+    },
+    "fintech": {
+        "label": "Fintech",
+        "subject": "recent Fintech trends and developments for an enterprise team",
+        "focus": [
+            "Payment technology innovations",
+            "Banking and financial services digital transformation",
+            "Regulatory updates and compliance",
+            "Security and fraud prevention",
+            "API and SDK releases from major fintech platforms (Stripe, Plaid, etc.)",
+        ],
+        "impact": "what matters for fintech adoption",
+    },
+    "security": {
+        "label": "Security",
+        "subject": "recent Security Intelligence and cybersecurity developments for an "
+                   "enterprise AI-SecOps team",
+        "focus": [
+            "Vulnerability disclosures and CVEs",
+            "Threat intelligence and attack patterns",
+            "Security tool updates (OWASP, Metasploit, etc.)",
+            "Compliance and regulatory changes",
+            "Zero-day exploits and emerging threats",
+        ],
+        "impact": "what matters for enterprise security posture",
+    },
+}
+
+
+def dashboard_job(name: str, data_dir: Optional[Path] = None,
+                  output_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Resolve a dashboard's prompt settings and paths.
+
+    Args:
+        name: Key of DASHBOARDS
+        data_dir: Directory with cached_updates.json (default dashboards/<name>/data)
+        output_dir: Summary directory (default dashboards/<name>/summaries)
+
+    Returns:
+        Job dict for summarize_dashboard()
+    """
+    data_dir = Path(data_dir or f"dashboards/{name}/data")
+    return {
+        **DASHBOARDS[name],
+        "name": name,
+        "data_dir": data_dir,
+        "output_dir": Path(output_dir or f"dashboards/{name}/summaries"),
+        "dashboard_dir": data_dir.parent,
+    }
+
+
+def load_latest_updates(data_dir: Path) -> dict:
+    """Load the latest dashboard data"""
+    cached_file = data_dir / "cached_updates.json"
+    if not cached_file.exists():
+        raise FileNotFoundError(f"{cached_file} not found")
+
+    with open(cached_file, 'r') as f:
+        return json.load(f)
+
+
+def get_week_number() -> tuple:
+    """Get current ISO week number and year"""
+    iso_calendar = datetime.utcnow().isocalendar()
+    return iso_calendar[0], iso_calendar[1]  # year, week
+
+
+def get_week_date_range() -> tuple:
+    """Get Monday-Sunday date range for current week"""
+    now = datetime.utcnow()
+    monday = now - timedelta(days=now.weekday())
+    sunday = monday + timedelta(days=6)
+    return monday.strftime("%B %d"), sunday.strftime("%B %d, %Y")
+
+
+def filter_updates_by_week(updates: list) -> list:
+    """Filter updates from the last 7 days"""
+    one_week_ago = to_epoch(datetime.utcnow() - timedelta(days=7))
+
+    # Dates are parsed once into published_ts (already set by the dashboard updater)
+    DateNormalizer().normalize(updates)
+    return [update for update in updates if update['published_ts'] >= one_week_ago]
+
+
+def build_instructions(job: Dict[str, Any]) -> str:
+    """Static summary instructions for one dashboard (sent before the updates)"""
+    focus = "\n".join(f"- {item}" for item in job["focus"])
+
+    return f"""You are analyzing {job['subject']}.
+Generate a concise weekly summary highlighting the most significant developments
+in the updates that follow.
+
+Focus on:
+{focus}
+
+Generate a structured summary with:
+1. **Executive Summary** (2-3 sentences)
+2. **Key Highlights** (3-5 bullet points)
+3. **Notable Releases** (list major releases)
+4. **Enterprise Impact** ({job['impact']})
+5. **Looking Ahead** (trends to watch)
+
+Keep it concise, technical, and actionable. Use markdown formatting.
+"""
+
+
+def build_summary_request(job: Dict[str, Any], updates: list) -> Dict[str, Any]:
+    """
+    Messages API request: static instructions first, this week's updates last
+
+    The instructions differ per dashboard and stay well below the 1024-token
+    cacheable minimum, so no cache breakpoint is set.
+    """
+    updates_text = "\n\n".join([
+        f"**{update['source']}** - {update['title']}\n"
+        f"Link: {update['link']}\n"
+        f"Published: {update['published']}\n"
+        f"Summary: {update.get('summary', 'No summary available')}"
+        for update in updates[:MAX_UPDATES]
+    ])
+    return build_request(
+        MODEL, MAX_TOKENS,
+        instructions=build_instructions(job),
+        content=f"Here are this week's updates:\n\n{updates_text}",
+        cache=False,
+    )
+
+
+def generate_summary_with_claude(request: Dict[str, Any], client, limiter) -> tuple:
+    """
+    Generate summary using Claude API
+
+    Args:
+        request: Request from build_summary_request()
+        client: Shared Anthropic client
+        limiter: Shared 'claude' rate limiter
+
+    Returns:
+        (summary markdown, token usage dict)
+    """
+    limiter.acquire()
+    raw = client.messages.with_raw_response.create(**request)
+    limiter.record_response(dict(raw.headers))
+    message = raw.parse()
+    return message.content[0].text, record_usage(message, "weekly-summary")
+
+
+def save_summary(summary: str, output_dir: Path, year: int, week: int,
+                 label: str = "AI") -> Path:
+    """Save summary to markdown file"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_file = output_dir / f"{year}-W{week:02d}.md"
+
+    monday, sunday = get_week_date_range()
+    header = f"""# Weekly {label} Summary - Week {week}, {year}
+
+**Period:** {monday} - {sunday}
+**Generated:** {datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")}
+
+---
+
+"""
+
+    with open(output_file, 'w') as f:
+        f.write(header + summary)
+    return output_file
+
+
+def update_readme_with_summary(dashboard_dir: Path, summary_file: Path, year: int, week: int) -> bool:
+    """
+    Update README.md with link to latest summary
+
+    Returns:
+        False if the dashboard has no README.md
+    """
+    readme_file = dashboard_dir / "README.md"
+    if not readme_file.exists():
+        return False
+
+    with open(readme_file, 'r') as f:
+        content = f.read()
+
+    summary_section = f"\n\n## Latest Weekly Summary\n\n**Week {week}, {year}:** [View Summary](weekly-summaries/{year}-W{week:02d}.md)\n\n"
+
+    if "## Latest Weekly Summary" in content:
+        # Replace existing section
+        pattern = r"## Latest Weekly Summary\n\n.*?\n\n"
+        content = re.sub(pattern, summary_section.lstrip(), content, flags=re.DOTALL)
+    else:
+        # Add section before the first second-level header
+        lines = content.split('\n')
+        insert_pos = 0
+        for i, line in enumerate(lines):
+            if line.startswith('##'):
+                insert_pos = i
+                break
+
+        if insert_pos > 0:
+            lines.insert(insert_pos, summary_section.strip())
+            content = '\n'.join(lines)
+        else:
+            content += summary_section
+
+    with open(readme_file, 'w') as f:
+        f.write(content)
+    return True
+
+
+def prepare_dashboard(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load and filter one dashboard's updates and build its prompt.
+
+    Args:
+        job: Job dict from dashboard_job()
+
+    Returns:
+        Result dict (name, updates, recent) with the 'request' to send
+    """
+    updates = load_latest_updates(job["data_dir"]).get('updates', [])
+    recent_updates = filter_updates_by_week(updates)
+    result = {"name": job["name"], "updates": len(updates), "recent": len(recent_updates)}
+    if not recent_updates:
+        recent_updates = updates[:FALLBACK_UPDATES]
+    result["request"] = build_summary_request(job, recent_updates)
+    return result
+
+
+def finish_dashboard(job: Dict[str, Any], result: Dict[str, Any], summary: str,
+                     usage: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """
+    Save a generated summary and link it from the dashboard README.
+
+    Returns:
+        The result dict with summary_file, readme_updated and usage
+        (request dropped)
+    """
+    result.pop("request", None)
+    result["usage"] = usage
+    year, week = get_week_number()
+    summary_file = save_summary(summary, job["output_dir"], year, week, job["label"])
+    result["summary_file"] = summary_file
+    result["readme_updated"] = update_readme_with_summary(
+        job["dashboard_dir"], summary_file, year, week
+    )
+    return result
+
+
+def summarize_dashboard(job: Dict[str, Any], client, limiter) -> Dict[str, Any]:
+    """
+    Load, filter, summarize and save one dashboard's weekly summary.
+
+    Args:
+        job: Job dict from dashboard_job()
+        client: Shared Anthropic client
+        limiter: Shared 'claude' rate limiter
+
+    Returns:
+        Result dict: name, updates, recent, summary_file, readme_updated
+    """
+    result = prepare_dashboard(job)
+    summary, usage = generate_summary_with_claude(result["request"], client, limiter)
+    return finish_dashboard(job, result, summary, usage)
+
+
+def run_dashboards(jobs: List[Dict[str, Any]], client, limiter,
+                   max_workers: int = 4) -> List[Dict[str, Any]]:
+    """
+    Summarize dashboards concurrently.
+
+    Args:
+        jobs: Job dicts from dashboard_job()
+        client: Anthropic client shared by all dashboards
+        limiter: Rate limiter shared by all dashboards
+        max_workers: Dashboards summarized at once
+
+    Returns:
+        One result dict per job, in job order; failed jobs carry 'error'
+    """
+    def run(job):
+        try:
+            return summarize_dashboard(job, client, limiter)
+        except Exception as e:
+            return {"name": job["name"], "error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+        return list(pool.map(run, jobs))
+
+
+def submit_batch(requests: Dict[str, Dict[str, Any]], client, limiter,
+                 poll_seconds: float = BATCH_POLL_SECONDS,
+                 timeout: float = BATCH_TIMEOUT_SECONDS,
+                 sleep: Callable[[float], None] = time.sleep) -> Dict[str, Any]:
+    """
+    Send requests as one Message Batch and wait for its results.
+
+    Args:
+        requests: Messages API request per custom_id (dashboard name)
+        client: Anthropic client (or LocalBatchBackend)
+        limiter: 'claude' rate limiter, or None; admits create and poll calls
+        poll_seconds: Seconds between status polls
+        timeout: Seconds before the batch is cancelled
+        sleep: Sleep function (injectable for tests)
+
+    Returns:
+        (summary text, usage) or an Exception for failed requests, per custom_id
+
+    Raises:
+        TimeoutError: If the batch has not ended within timeout
+    """
+    def admit():
+        if limiter is not None:
+            limiter.acquire()
+
+    admit()
+    batch = client.messages.batches.create(requests=[
+        {"custom_id": custom_id, "params": params}
+        for custom_id, params in requests.items()
+    ])
+    print(f"   Batch {batch.id} submitted ({len(requests)} requests)")
+
+    deadline = time.monotonic() + timeout
+    while batch.processing_status != "ended":
+        if time.monotonic() >= deadline:
+            admit()
+            client.messages.batches.cancel(batch.id)
+            raise TimeoutError(f"batch {batch.id} not ended after {timeout:.0f}s")
+        sleep(poll_seconds)
+        admit()
+        batch = client.messages.batches.retrieve(batch.id)
+
+    results: Dict[str, Any] = {
+        custom_id: RuntimeError("no result returned") for custom_id in requests
+    }
+    admit()
+    for entry in client.messages.batches.results(batch.id):
+        if entry.result.type == "succeeded":
+            message = entry.result.message
+            results[entry.custom_id] = (
+                message.content[0].text, record_usage(message, "weekly-summary-batch")
+            )
+        else:
+            error = getattr(entry.result, "error", None)
+            detail = f": {getattr(error, 'error', error)}" if error is not None else ""
+            results[entry.custom_id] = RuntimeError(f"batch request {entry.result.type}{detail}")
+    return results
+
+
+def run_dashboards_batch(jobs: List[Dict[str, Any]], client, limiter,
+                         poll_seconds: float = BATCH_POLL_SECONDS,
+                         timeout: float = BATCH_TIMEOUT_SECONDS,
+                         sleep: Callable[[float], None] = time.sleep) -> List[Dict[str, Any]]:
+    """
+    Summarize dashboards through one Message Batch.
+
+    Requests for every dashboard are built first and submitted together;
+    the results are then fanned back out to each dashboard's summaries
+    directory and README.
+
+    Returns:
+        One result dict per job, in job order; failed jobs carry 'error'
+    """
+    results: List[Dict[str, Any]] = []
+    requests: Dict[str, Dict[str, Any]] = {}
+    for job in jobs:
+        try:
+            result = prepare_dashboard(job)
+            requests[job["name"]] = result["request"]
+        except Exception as e:
+            result = {"name": job["name"], "error": str(e)}
+        results.append(result)
+
+    if not requests:
+        return results
+    try:
+        summaries = submit_batch(requests, client, limiter, poll_seconds, timeout, sleep)
+    except Exception as e:
+        summaries = {name: e for name in requests}
+
+    for i, job in enumerate(jobs):
+        summary = summaries.get(job["name"])
+        if summary is None:
+            continue  # failed while preparing
+        if isinstance(summary, Exception):
+            results[i] = {"name": job["name"], "error": str(summary)}
+            continue
+        try:
+            results[i] = finish_dashboard(job, results[i], *summary)
+        except Exception as e:
+            results[i] = {"name": job["name"], "error": str(e)}
+    return results
+
+
+class LocalBatchBackend:
+    """
+    Offline stand-in for the Anthropic client's Message Batches API.
+
+    Implements client.messages.batches create/retrieve/results/cancel and
+    answers every request locally, so batch runs can be exercised in tests
+    and dry runs without an API key or cost.
+    """
+
+    def __init__(self, respond: Optional[Callable[[Dict[str, Any]], str]] = None,
+                 polls_until_ended: int = 1):
+        """
+        Initialize backend.
+
+        Args:
+            respond: Returns the summary text for a request's params; an
+                exception marks that request as errored
+            polls_until_ended: retrieve() calls before the batch ends
+        """
+        self.messages = self
+        self.batches = self
+        self.respond = respond or self._placeholder
+        self.polls_until_ended = polls_until_ended
+        self.submitted: Dict[str, List[Dict[str, Any]]] = {}
+        self.polls: Dict[str, int] = {}
+        self.cancelled: List[str] = []
+
+    @staticmethod
+    def _placeholder(params: Dict[str, Any]) -> str:
+        prompt = prompt_text(params)
+        return (
+            "## Executive Summary\n\n"
+            f"Local stub summary of {prompt.count('Link: ')} updates (no API call made).\n"
+        )
+
+    def _batch(self, batch_id: str) -> SimpleNamespace:
+        ended = self.polls[batch_id] >= self.polls_until_ended or batch_id in self.cancelled
+        return SimpleNamespace(id=batch_id, processing_status="ended" if ended else "in_progress")
+
+    def create(self, requests: List[Dict[str, Any]]) -> SimpleNamespace:
+        batch_id = f"msgbatch_local_{len(self.submitted) + 1}"
+        self.submitted[batch_id] = list(requests)
+        self.polls[batch_id] = 0
+        return self._batch(batch_id)
+
+    def retrieve(self, batch_id: str) -> SimpleNamespace:
+        self.polls[batch_id] += 1
+        return self._batch(batch_id)
+
+    def cancel(self, batch_id: str) -> SimpleNamespace:
+        self.cancelled.append(batch_id)
+        return self._batch(batch_id)
+
+    def results(self, batch_id: str) -> Iterator[SimpleNamespace]:
+        for request in self.submitted[batch_id]:
+            if batch_id in self.cancelled:
+                result = SimpleNamespace(type="canceled")
+            else:
+                try:
+                    text = self.respond(request["params"])
+                    result = SimpleNamespace(
+                        type="succeeded",
+                        message=SimpleNamespace(content=[SimpleNamespace(text=text)], usage=None),
+                    )
+                except Exception as e:
+                    result = SimpleNamespace(type="errored", error=SimpleNamespace(error=str(e)))
+            yield SimpleNamespace(custom_id=request["custom_id"], result=result)
+
+
+def create_client(api_key: str):
+    """Anthropic client shared by every dashboard in the run"""
+    try:
+        from anthropic import Anthropic
+    except ImportError:
+        print("Error: anthropic package not installed")
+        print("Install with: pip install anthropic")
+        sys.exit(1)
+    return Anthropic(api_key=api_key)
+
+
+def report(results: List[Dict[str, Any]]) -> int:
+    """Print per-dashboard results; returns the number of failures"""
+    failures = 0
+    for result in results:
+        if "error" in result:
+            failures += 1
+            print(f"   ❌ {result['name']}: {result['error']}")
+            continue
+        print(f"   ✅ {result['name']}: {result['recent']}/{result['updates']} updates "
+              f"from last 7 days → {result['summary_file']}")
+        if result.get("usage"):
+            print(f"      {format_usage(result['usage'])}")
+        if not result["readme_updated"]:
+            print(f"   ⚠️  {result['name']}: README.md not found, skipping update")
+    return failures
+
+
+def run(jobs: List[Dict[str, Any]], max_workers: int = 4, batch: bool = False,
+        backend: str = "anthropic", poll_seconds: float = BATCH_POLL_SECONDS,
+        timeout: float = BATCH_TIMEOUT_SECONDS) -> int:
+    """
+    Summarize jobs with a shared client and limiter.
+
+    Args:
+        jobs: Job dicts from dashboard_job()
+        max_workers: Dashboards summarized concurrently (direct mode)
+        batch: Submit all prompts as one Message Batch
+        backend: 'anthropic', or 'stub' for LocalBatchBackend (batch mode,
+            no API key needed)
+        poll_seconds: Seconds between batch status polls
+        timeout: Seconds before an unfinished batch is cancelled
+
+    Returns:
+        Exit code (1 if any dashboard failed)
+    """
+    if backend == "stub":
+        client, limiter, batch = LocalBatchBackend(), None, True
+    else:
+        api_key = os.environ.get('ANTHROPIC_API_KEY')
+        if not api_key:
+            print("Error: ANTHROPIC_API_KEY environment variable not set")
+            return 1
+        client, limiter = create_client(api_key), get_rate_limiter('claude')
+
+    mode = f"batch, {backend}" if batch else "direct"
+    print(f"🤖 Generating weekly summaries ({mode}): {', '.join(job['name'] for job in jobs)}")
+    print("=" * 50)
+    if batch:
+        results = run_dashboards_batch(jobs, client, limiter, poll_seconds, timeout)
+    else:
+        results = run_dashboards(jobs, client, limiter, max_workers)
+    failures = report(results)
+    print("=" * 50)
+    return 1 if failures else 0
+
+
+def main_single(name: str):
+    """CLI of a per-dashboard generate_weekly_summary.py wrapper"""
+    label = DASHBOARDS[name]["label"]
+    parser = argparse.ArgumentParser(description=f"Generate {label} weekly summary")
+    parser.add_argument("--output-dir", type=str, required=True,
+                        help="Output directory for summaries")
+    parser.add_argument("--data-dir", type=str, default=f"dashboards/{name}/data",
+                        help="Data directory with cached_updates.json")
+    args = parser.parse_args()
+
+    sys.exit(run([dashboard_job(name, Path(args.data_dir), Path(args.output_dir))]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate weekly summaries for several dashboards")
+    parser.add_argument("--dashboards", nargs="+", choices=sorted(DASHBOARDS),
+                        default=sorted(DASHBOARDS), help="Dashboards to summarize (default: all)")
+    parser.add_argument("--max-workers", type=int, default=4,
+                        help="Dashboards summarized concurrently")
+    parser.add_argument("--batch", action="store_true",
+                        help="Submit all prompts as one Message Batch (lower cost)")
+    parser.add_argument("--backend", choices=["anthropic", "stub"], default="anthropic",
+                        help="'stub' answers batches locally without API calls")
+    parser.add_argument("--poll-seconds", type=float, default=BATCH_POLL_SECONDS,
+                        help="Seconds between batch status polls")
+    parser.add_argument("--batch-timeout", type=float, default=BATCH_TIMEOUT_SECONDS,
+                        help="Seconds before an unfinished batch is cancelled")
+    args = parser.parse_args()
+
+    sys.exit(run(
+        [dashboard_job(name) for name in args.dashboards], args.max_workers,
+        args.batch, args.backend, args.poll_seconds, args.batch_timeout
+    ))
+
+
+if __name__ == "__main__":
+    main()
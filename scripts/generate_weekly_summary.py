@@ -11,6 +11,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from anthropic import Anthropic
 
+sys.path.insert(0, str(Path(__file__).parent))
+from claude_request import build_request, format_usage, record_usage
+
 class WeeklySummaryGenerator:
     def __init__(self):
         self.api_key = os.environ.get('ANTHROPIC_API_KEY')
@@ -41,8 +44,8 @@ class WeeklySummaryGenerator:
         print(f"Loaded {len(updates)} updates from cache")
         return updates
 
-    def create_claude_prompt(self, updates):
-        """Create prompt for Claude API"""
+    def create_claude_request(self, updates):
+        """Create Claude API request: static instructions first, updates last"""
         updates_text = "\n\n".join([
             f"**{update['source']}** ({update['type']})\n"
             f"Title: {update['title']}\n"
@@ -52,11 +55,8 @@ class WeeklySummaryGenerator:
             for update in updates[:50]  # Limit to 50 most recent
         ])
 
-        prompt = f"""You are an AI research analyst tasked with creating a weekly summary of AI advancements.
-
-Here are the latest AI updates from the past week:
-
-{updates_text}
+        instructions = f"""You are an AI research analyst tasked with creating a weekly summary of AI advancements.
+The latest AI updates from the past week follow these instructions.
 
 Please create a concise weekly summary with the following structure:
 
@@ -79,7 +79,13 @@ Please create a concise weekly summary with the following structure:
 
 Keep the summary concise (300-500 words), focus on the most impactful developments, and write for a technical audience (VP AI-SecOps).
 """
-        return prompt
+        return build_request(
+            "claude-sonnet-4-20250514", 2000,
+            instructions=instructions,
+            content=f"Here are the latest AI updates from the past week:\n\n{updates_text}",
+            cache=False,  # one call per run, prefix below the cacheable minimum
+            temperature=0.7,
+        )
 
     def generate_summary(self, updates):
         """Generate summary using Claude API"""
@@ -87,29 +93,18 @@ Keep the summary concise (300-500 words), focus on the most impactful developmen
             print("No updates to summarize")
             return None
 
-        prompt = self.create_claude_prompt(updates)
+        request = self.create_claude_request(updates)
 
         print("Generating summary with Claude API...")
         try:
-            message = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=2000,
-                temperature=0.7,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            message = self.client.messages.create(**request)
 
             summary = message.content[0].text
             print(f"Summary generated ({len(summary)} characters)")
 
-            # Track API usage
-            usage = {
-                'input_tokens': message.usage.input_tokens,
-                'output_tokens': message.usage.output_tokens,
-                'timestamp': datetime.utcnow().isoformat()
-            }
-            print(f"API usage: {usage['input_tokens']} input tokens, {usage['output_tokens']} output tokens")
+            # Track API usage (including prompt-cache reads/writes)
+            usage = record_usage(message, 'weekly-ai-summary')
+            print(f"API usage: {format_usage(usage)}")
 
             return summary
 
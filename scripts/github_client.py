@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Concurrent GitHub REST Client
+
+Shared client for scripts that fan out per-repository GitHub API calls
+(compliance evidence collection). One pooled requests.Session is used by a
+bounded thread pool, every request draws from the shared 'github' rate
+limiter, and list endpoints are followed through their Link headers so
+results are not silently cut off at the default page size of 30.
+
+Features:
+- Link-header pagination (rel="next") at 100 items per page
+- GraphQL queries (graphql()) on the same session, limiter and retries
+- Bounded fan-out with map(), results in input order
+- Connection pool sized to the concurrency, so workers reuse connections
+- Retries with exponential backoff on 429/5xx, secondary rate limits
+  (403 with Retry-After or no remaining quota) and connection errors,
+  honouring Retry-After and x-ratelimit-reset
+
+Usage:
+    client = GitHubClient(token, limiter=get_rate_limiter('github', 'critical'))
+    repos = client.paginate('/orgs/my-org/repos')
+    protections = client.map(lambda repo: client.get(f"/repos/my-org/{repo['name']}"), repos)
+"""
+
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.insert(0, str(Path(__file__).parent))
+from rate_limiter import get_rate_limiter
+
+API_BASE = 'https://api.github.com'
+
+DEFAULT_CONCURRENCY = 8
+PER_PAGE = 100
+
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1.0
+# Longest single wait; a primary quota reset further out fails the request
+MAX_BACKOFF_SECONDS = 60.0
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class GitHubClient:
+    """Pooled, rate-limited GitHub REST client with pagination and retries."""
+
+    def __init__(
+        self,
+        token: str,
+        api_base: str = API_BASE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        limiter=None,
+        timeout: float = 30,
+        max_retries: int = MAX_RETRIES,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize client.
+
+        Args:
+            token: GitHub token
+            api_base: API root URL (endpoints are appended to it)
+            concurrency: Maximum requests in flight from map()
+            limiter: Rate limiter acquired before every request
+                (default: the shared 'github' limiter)
+            timeout: Per-request timeout in seconds
+            max_retries: Retries after the first attempt
+            sleep: Backoff sleep function (replaceable in tests)
+        """
+        self.api_base = api_base.rstrip('/')
+        self.concurrency = max(1, concurrency)
+        self.limiter = limiter if limiter is not None else get_rate_limiter('github')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.sleep = sleep
+        self.stats = {'requests': 0, 'retries': 0}
+        self.lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Authorization': f'token {token}',
+            'Accept': 'application/vnd.github.v3+json'
+        })
+
+    def _count(self, stat: str):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def _url(self, endpoint: str) -> str:
+        return endpoint if endpoint.startswith(('https://', 'http://')) else f'{self.api_base}{endpoint}'
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter for a retry after attempt."""
+        return min(BACKOFF_BASE_SECONDS * (2 ** attempt) * (1 + random.random() / 2), MAX_BACKOFF_SECONDS)
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the response is final."""
+        backoff = self._backoff(attempt)
+        status = response.status_code
+        headers = response.headers
+        rate_limited = status == 403 and (
+            'retry-after' in headers or headers.get('x-ratelimit-remaining') == '0'
+        )
+        if status not in RETRY_STATUSES and not rate_limited:
+            return None
+
+        if 'retry-after' in headers:
+            try:
+                return float(headers['retry-after'])
+            except ValueError:
+                return backoff
+        if headers.get('x-ratelimit-remaining') == '0' and 'x-ratelimit-reset' in headers:
+            try:
+                return max(0.0, float(headers['x-ratelimit-reset']) - time.time()) + 1
+            except ValueError:
+                return backoff
+        return backoff
+
+    def request(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        method: str = 'GET',
+        json: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        """
+        Call an endpoint with rate limiting and retries.
+
+        Args:
+            endpoint: Path under api_base (e.g. '/orgs/x/repos') or a full URL
+            params: Query parameters
+            method: HTTP method
+            json: JSON request body
+
+        Returns:
+            Successful response
+
+        Raises:
+            requests.exceptions.HTTPError: Non-retryable status, or retries exhausted
+            requests.exceptions.RequestException: Connection errors after retries
+        """
+        url = self._url(endpoint)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            self._count('requests')
+            try:
+                response = self.session.request(method, url, params=params, json=json, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                self.limiter.record_response(response.headers)
+                if response.ok:
+                    return response
+                retry_delay = self._retry_delay(response, attempt)
+                if retry_delay is None or attempt == self.max_retries or retry_delay > MAX_BACKOFF_SECONDS:
+                    response.raise_for_status()
+                    # Final non-ok status that raise_for_status() lets through
+                    raise requests.exceptions.HTTPError(
+                        f'{response.status_code} {response.reason} for url: {url}', response=response)
+                delay = retry_delay
+            self._count('retries')
+            self.sleep(delay)
+
+        raise requests.exceptions.RetryError(f'No attempts made for {url} (max_retries={self.max_retries})')
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Parsed JSON body of a single GET."""
+        return self.request(endpoint, params).json()
+
+    def graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run a GraphQL query.
+
+        Returns:
+            Response payload ({'data': ..., 'errors': ...}); GraphQL errors
+            arrive with status 200 and are left to the caller
+        """
+        return self.request('/graphql', method='POST', json={'query': query, 'variables': variables or {}}).json()
+
+    def paginate(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """
+        All items of a list endpoint, following Link rel="next".
+
+        Args:
+            endpoint: List endpoint (its query string is kept)
+            params: Extra query parameters for the first page
+
+        Returns:
+            Items from every page, in order
+        """
+        items: List[Any] = []
+        response = self.request(endpoint, {'per_page': PER_PAGE, **(params or {})})
+        while True:
+            items.extend(response.json())
+            next_url = response.links.get('next', {}).get('url')
+            if not next_url:
+                return items
+            # The next link carries the full query string, cursor included
+            response = self.request(next_url)
+
+    def map(self, func: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """
+        Apply func to items with at most `concurrency` calls in flight.
+
+        Returns:
+            Results in input order; the first exception raised by func propagates
+        """
+        items = list(items)
+        if self.concurrency == 1 or len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return list(executor.map(func, items))
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+GraphQL Batch Queries for Per-Repository Compliance Evidence
+
+Fetches branch protection and Dependabot (vulnerability) alerts for many
+repositories per GraphQL query instead of one REST call per repository and
+evidence type. Repositories and each repository's alerts are paged with
+GraphQL cursors. Results are normalized to the shapes the REST endpoints
+return (branch protection and Dependabot alert objects), so collectors keep
+their existing evidence mapping and schema.
+
+Secret scanning alerts are not exposed through GraphQL; collectors keep
+fetching them over REST.
+
+The query runner is supplied by the caller (GitHubClient.graphql, or the gh
+CLI), so the module has no HTTP dependency of its own. GraphQL rate limiting
+arrives as HTTP 200 with null data and a RATE_LIMITED error, which the
+runner's HTTP retries do not see, so those queries are retried here with
+exponential backoff.
+
+Usage:
+    repos = fetch_repositories(client.graphql, 'my-org')
+    for repo in repos:
+        protection = repo['branch_protection']        # REST shape or None
+        alerts = repo['vulnerability_alerts']         # REST shapes, or None
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+REPOS_PER_QUERY = 50
+ALERTS_PER_PAGE = 100
+
+# Retries of a query answered with a RATE_LIMITED error, waiting
+# RATE_LIMIT_BACKOFF_SECONDS * 2**attempt before each
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF_SECONDS = 60.0
+
+DEFAULT_REF = 'refs/heads/main'
+
+PROTECTION_FIELDS = '''
+    requiresApprovingReviews
+    requiredApprovingReviewCount
+    requiresStatusChecks
+    requiredStatusCheckContexts
+    requiredStatusChecks { context app { databaseId } }
+    isAdminEnforced
+'''
+
+ALERT_CONNECTION = '''
+    pageInfo { hasNextPage endCursor }
+    nodes {
+        number
+        state
+        createdAt
+        fixedAt
+        securityVulnerability { severity package { name } }
+        securityAdvisory { severity }
+    }
+'''
+
+REPOSITORY_EVIDENCE_QUERY = f'''
+query RepositoryEvidence($org: String!, $cursor: String, $ref: String!,
+                         $states: [RepositoryVulnerabilityAlertState!],
+                         $repos: Int!, $alerts: Int!) {{
+  organization(login: $org) {{
+    repositories(first: $repos, after: $cursor, orderBy: {{field: CREATED_AT, direction: DESC}}) {{
+      pageInfo {{ hasNextPage endCursor }}
+      nodes {{
+        name
+        defaultBranchRef {{ name branchProtectionRule {{ {PROTECTION_FIELDS} }} }}
+        ref(qualifiedName: $ref) {{ branchProtectionRule {{ {PROTECTION_FIELDS} }} }}
+        vulnerabilityAlerts(first: $alerts, states: $states) {{ {ALERT_CONNECTION} }}
+      }}
+    }}
+  }}
+}}
+'''
+
+REPOSITORY_ALERTS_QUERY = f'''
+query RepositoryAlerts($org: String!, $name: String!, $cursor: String,
+                       $states: [RepositoryVulnerabilityAlertState!], $alerts: Int!) {{
+  repository(owner: $org, name: $name) {{
+    vulnerabilityAlerts(first: $alerts, after: $cursor, states: $states) {{ {ALERT_CONNECTION} }}
+  }}
+}}
+'''
+
+# GraphQL SecurityAdvisorySeverity -> REST severity
+SEVERITIES = {'LOW': 'low', 'MODERATE': 'medium', 'HIGH': 'high', 'CRITICAL': 'critical'}
+
+
+class GraphQLError(Exception):
+    """A GraphQL response carried no data."""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        self.errors = errors or []
+        messages = '; '.join(e.get('message', str(e)) for e in self.errors) or 'no data returned'
+        super().__init__(f'GraphQL query failed: {messages}')
+
+
+def _rate_limited(payload: Optional[Dict[str, Any]]) -> bool:
+    if not payload or payload.get('data') is not None:
+        return False
+    return any(error.get('type') == 'RATE_LIMITED' for error in payload.get('errors') or [])
+
+
+def _data(payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not payload or payload.get('data') is None:
+        raise GraphQLError((payload or {}).get('errors') or [])
+    return payload['data']
+
+
+def _query(
+    run_query: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+    query: str,
+    variables: Dict[str, Any],
+    sleep: Callable[[float], None]
+) -> Dict[str, Any]:
+    """Data of one query, backing off while GitHub answers RATE_LIMITED."""
+    payload = run_query(query, variables)
+    for attempt in range(RATE_LIMIT_RETRIES):
+        if not _rate_limited(payload):
+            break
+        sleep(RATE_LIMIT_BACKOFF_SECONDS * (2 ** attempt))
+        payload = run_query(query, variables)
+    return _data(payload)
+
+
+def rest_protection(rule: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """REST branch-protection shape for a GraphQL BranchProtectionRule (None if unprotected)."""
+    if rule is None:
+        return None
+    protection: Dict[str, Any] = {'enforce_admins': {'enabled': bool(rule.get('isAdminEnforced'))}}
+    if rule.get('requiresApprovingReviews'):
+        protection['required_pull_request_reviews'] = {
+            'required_approving_review_count': rule.get('requiredApprovingReviewCount') or 0
+        }
+    if rule.get('requiresStatusChecks'):
+        protection['required_status_checks'] = {
+            'contexts': list(rule.get('requiredStatusCheckContexts') or []),
+            'checks': [
+                {'context': check['context'], 'app_id': (check.get('app') or {}).get('databaseId')}
+                for check in rule.get('requiredStatusChecks') or []
+            ]
+        }
+    return protection
+
+
+def rest_alert(node: Dict[str, Any]) -> Dict[str, Any]:
+    """REST Dependabot alert shape for a GraphQL RepositoryVulnerabilityAlert."""
+    vulnerability = node.get('securityVulnerability') or {}
+    advisory = node.get('securityAdvisory') or {}
+    return {
+        'number': node.get('number'),
+        'state': (node.get('state') or '').lower() or None,
+        'created_at': node.get('createdAt'),
+        'fixed_at': node.get('fixedAt'),
+        'security_vulnerability': {
+            'severity': SEVERITIES.get(vulnerability.get('severity') or '', 'unknown'),
+            'package': {'name': (vulnerability.get('package') or {}).get('name', 'unknown')}
+        },
+        'security_advisory': {'severity': SEVERITIES.get(advisory.get('severity') or '', 'unknown')}
+    }
+
+
+def _remaining_alerts(
+    run_query: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+    org: str,
+    name: str,
+    connection: Dict[str, Any],
+    states: Optional[Sequence[str]],
+    sleep: Callable[[float], None]
+) -> List[Dict[str, Any]]:
+    """Alert nodes of a repository beyond its first embedded page."""
+    nodes = []
+    while connection['pageInfo']['hasNextPage']:
+        variables = {'org': org, 'name': name, 'cursor': connection['pageInfo']['endCursor'],
+                     'states': states, 'alerts': ALERTS_PER_PAGE}
+        repository = _query(run_query, REPOSITORY_ALERTS_QUERY, variables, sleep).get('repository') or {}
+        next_page = repository.get('vulnerabilityAlerts')
+        if next_page is None:
+            break
+        connection = next_page
+        nodes.extend(connection['nodes'])
+    return nodes
+
+
+def fetch_repositories(
+    run_query: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+    org: str,
+    ref: str = DEFAULT_REF,
+    alert_states: Optional[Sequence[str]] = ('OPEN',),
+    page_size: int = REPOS_PER_QUERY,
+    sleep: Callable[[float], None] = time.sleep
+) -> List[Dict[str, Any]]:
+    """
+    Branch protection and vulnerability alerts for every repository of org.
+
+    Args:
+        run_query: Callable(query, variables) returning the GraphQL response
+            payload ({'data': ..., 'errors': ...})
+        org: Organization login
+        ref: Fully qualified branch whose protection is reported as
+            'branch_protection'
+        alert_states: RepositoryVulnerabilityAlertState filter (None for all)
+        page_size: Repositories per query
+        sleep: Backoff sleep for RATE_LIMITED responses (replaceable in tests)
+
+    Returns:
+        One dict per repository (newest first, like the REST org listing):
+        name, default_branch, branch_protection (ref), default_branch_protection,
+        vulnerability_alerts (None when alerts are unavailable for the repo)
+
+    Raises:
+        GraphQLError: A page returned no data (still RATE_LIMITED after
+            RATE_LIMIT_RETRIES retries, or any other error)
+    """
+    states = list(alert_states) if alert_states is not None else None
+    repositories = []
+    cursor = None
+    while True:
+        variables = {'org': org, 'cursor': cursor, 'ref': ref, 'states': states,
+                     'repos': page_size, 'alerts': ALERTS_PER_PAGE}
+        organization = _query(run_query, REPOSITORY_EVIDENCE_QUERY, variables, sleep).get('organization')
+        if organization is None:
+            raise GraphQLError([{'message': f'Organization not found: {org}'}])
+        connection = organization['repositories']
+
+        for node in connection['nodes']:
+            default_branch = node.get('defaultBranchRef') or {}
+            alerts = node.get('vulnerabilityAlerts')
+            if alerts is not None:
+                # Partial errors (e.g. Dependabot disabled) leave the field null
+                alert_nodes = alerts['nodes'] + _remaining_alerts(run_query, org, node['name'], alerts, states, sleep)
+            repositories.append({
+                'name': node['name'],
+                'default_branch': default_branch.get('name'),
+                'branch_protection': rest_protection((node.get('ref') or {}).get('branchProtectionRule')),
+                'default_branch_protection': rest_protection(default_branch.get('branchProtectionRule')),
+                'vulnerability_alerts': [rest_alert(n) for n in alert_nodes] if alerts is not None else None
+            })
+
+        if not connection['pageInfo']['hasNextPage']:
+            return repositories
+        cursor = connection['pageInfo']['endCursor']
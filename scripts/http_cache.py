@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Conditional-GET HTTP Cache
+
+Persistent on-disk cache for dashboard source fetching. Stores each
+response's ETag/Last-Modified validators, body and parsed result, and
+revalidates with If-None-Match/If-Modified-Since. A 304 response returns
+the stored parsed result without re-downloading or re-parsing.
+
+Features:
+- One JSON entry per URL (validators, parsed result) plus the raw body
+- Parsed results keyed by parser name, so one URL can serve several parsers
+- Thread-safe hit/miss statistics with a hit ratio for run reports
+- Streaming mode: the parser reads the response in chunks and may stop
+  early (only the parsed result is stored)
+- Standard library only (urllib), usable from any dashboard script
+
+Usage:
+    cache = HTTPCache(Path('.cache/http/ai'))
+    entries = cache.fetch(url, parse_feed, timeout=10)
+    print(cache.summary())
+"""
+
+import hashlib
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+CHUNK_BYTES = 16 * 1024
+
+
+class HTTPCache:
+    """On-disk cache of validators, bodies and parsed results per URL."""
+
+    def __init__(self, directory: Path):
+        """
+        Initialize cache.
+
+        Args:
+            directory: Directory for cache entries (created on first write)
+        """
+        self.directory = Path(directory)
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'errors': 0}
+
+    def _paths(self, url: str):
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        return self.directory / f'{digest}.json', self.directory / f'{digest}.body'
+
+    def _load(self, url: str) -> Optional[Dict[str, Any]]:
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == url else None
+
+    def _write(self, path: Path, data: bytes):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _save(self, url: str, entry: Dict[str, Any], body: Optional[bytes] = None):
+        meta_path, body_path = self._paths(url)
+        if body is not None:
+            self._write(body_path, body)
+        self._write(meta_path, json.dumps(entry).encode('utf-8'))
+
+    def _count(self, stat: str):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def fetch(
+        self,
+        url: str,
+        parse: Callable[[Any], Any],
+        timeout: float = 10,
+        headers: Optional[Dict[str, str]] = None,
+        parser_name: Optional[str] = None,
+        stream: bool = False
+    ) -> Any:
+        """
+        Fetch and parse a URL, revalidating any cached copy.
+
+        Args:
+            url: URL to fetch
+            parse: Converts the response body (bytes, or an iterator of byte
+                chunks with stream=True) into a JSON-serializable result
+            timeout: Request timeout in seconds
+            headers: Extra request headers
+            parser_name: Key for the parsed result (default: parse.__name__)
+            stream: Pass parse an iterator of body chunks instead of bytes;
+                the body is not stored, so other parsers refetch it
+
+        Returns:
+            Parsed result (from cache on 304 Not Modified)
+
+        Raises:
+            urllib.error.URLError: On network errors and non-2xx/304 responses
+        """
+        if parser_name is None:
+            parser_name = getattr(parse, '__name__', 'parse')
+        entry = self._load(url)
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        request = urllib.request.Request(url, headers=request_headers)
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as resp:
+                etag = resp.headers.get('ETag')
+                last_modified = resp.headers.get('Last-Modified')
+                if stream:
+                    body = None
+                    result = parse(iter(lambda: resp.read(CHUNK_BYTES), b''))
+                else:
+                    body = resp.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and entry is not None:
+                try:
+                    result = self._cached_result(url, entry, parse, parser_name)
+                except OSError:
+                    # Body lost: drop the entry and fetch unconditionally
+                    self._paths(url)[0].unlink(missing_ok=True)
+                    return self.fetch(url, parse, timeout, headers, parser_name, stream)
+                self._count('hits')
+                return result
+            self._count('errors')
+            raise
+        except Exception:
+            self._count('errors')
+            raise
+
+        self._count('misses')
+        if body is not None:
+            result = parse(body)
+        else:
+            self._paths(url)[1].unlink(missing_ok=True)  # stale body of an older version
+        if etag or last_modified:
+            self._save(url, {
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'parsed': {parser_name: result},
+            }, body)
+        return result
+
+    def _cached_result(self, url: str, entry: Dict[str, Any],
+                       parse: Callable[[Any], Any], parser_name: str) -> Any:
+        """
+        Stored parsed result, parsing the stored body once if missing.
+
+        Raises:
+            OSError: If the result is missing and no body was stored
+        """
+        parsed = entry.setdefault('parsed', {})
+        if parser_name in parsed:
+            return parsed[parser_name]
+        _, body_path = self._paths(url)
+        result = parse(body_path.read_bytes())
+        parsed[parser_name] = result
+        self._save(url, entry)
+        return result
+
+    def hit_ratio(self) -> float:
+        """Share of successful fetches answered by 304 Not Modified."""
+        served = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / served if served else 0.0
+
+    def summary(self) -> str:
+        """One-line hit ratio report."""
+        return (
+            f"HTTP cache: {self.stats['hits']} not modified, {self.stats['misses']} fetched, "
+            f"{self.stats['errors']} errors (hit ratio {self.hit_ratio() * 100:.0f}%)"
+        )
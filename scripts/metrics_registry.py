@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+In-Process Metrics Registry
+
+Counters, gauges and histograms for the rate limiter, circuit breakers
+and retry logic, exported in OpenMetrics text format to a file or a
+localhost HTTP endpoint.
+
+Features:
+- Labelled counters, gauges and fixed-bucket histograms
+- OpenMetrics text exposition (file or http://127.0.0.1:<port>/metrics)
+- Disabled by default: instrumentation points cost one attribute check
+
+Configuration (environment):
+    METRICS_ENABLED=1      Record metrics
+    METRICS_FILE=<path>    Write the exposition to <path> at exit
+    METRICS_PORT=<port>    Serve the exposition on localhost:<port>
+"""
+
+import atexit
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Latency-style buckets in seconds (rate limit waits, retry backoffs)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.5, 1, 2, 4, 8, 16, 60, 300)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = '') -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class: a metric family with optional label names."""
+
+    TYPE = ''
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str,
+                 labelnames: Tuple[str, ...] = ()):
+        self._registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        # Per-label-set state; subclasses narrow the value type
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, '')) for n in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [
+            f'# TYPE {self.name} {self.TYPE}',
+            f'# HELP {self.name} {_escape(self.documentation)}',
+        ]
+
+    def render(self) -> List[str]:
+        """Exposition lines of this family."""
+        raise NotImplementedError
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    TYPE = 'counter'
+
+    _values: Dict[Tuple[str, ...], float]
+
+    def inc(self, amount: float = 1.0, **labels):
+        """Increase the counter (no-op while the registry is disabled)."""
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(
+                    f'{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}'
+                )
+        return lines
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    TYPE = 'gauge'
+
+    _values: Dict[Tuple[str, ...], float]
+
+    def set(self, value: float, **labels):
+        """Set the gauge (no-op while the registry is disabled)."""
+        if not self._registry.enabled:
+            return
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}')
+        return lines
+
+
+class _HistogramState:
+    """Bucket counts, sum and count of one histogram label set."""
+
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * buckets
+        self.total = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram with sum and count."""
+
+    TYPE = 'histogram'
+
+    _values: Dict[Tuple[str, ...], _HistogramState]
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str,
+                 labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        """Record an observation (no-op while the registry is disabled)."""
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = _HistogramState(len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state.counts[i] += 1
+                    break
+            state.total += value
+            state.count += 1
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return state.count if state else 0
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            for key, state in sorted(self._values.items(), key=lambda item: item[0]):
+                cumulative = 0
+                for bound, n in zip(self.buckets, state.counts):
+                    cumulative += n
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(
+                        f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}'
+                    )
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f'{self.name}_sum{labels} {_format_value(state.total)}')
+                lines.append(f'{self.name}_count{labels} {state.count}')
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metric families with OpenMetrics export."""
+
+    def __init__(self, enabled: bool = False):
+        """
+        Initialize registry.
+
+        Args:
+            enabled: Whether instrumentation points record values
+        """
+        self.enabled = enabled
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{name}' already registered as {metric.TYPE}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, tuple(labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, tuple(labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, tuple(labelnames), buckets)
+
+    def reset(self):
+        """Clear all recorded values (families stay registered)."""
+        for metric in list(self._metrics.values()):
+            metric.clear()
+
+    def render(self) -> str:
+        """
+        Render all metrics in OpenMetrics text format.
+
+        Returns:
+            Exposition text terminated by '# EOF'
+        """
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: Path):
+        """
+        Write the exposition to a file (atomically, for textfile collectors).
+
+        Args:
+            path: Output file path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        tmp.write_text(self.render())
+        tmp.rename(path)
+
+    def serve(self, port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """
+        Serve the exposition at http://<host>:<port>/metrics from a daemon thread.
+
+        Args:
+            port: TCP port (0 picks a free port)
+            host: Bind address, localhost by default
+
+        Returns:
+            The running server (server.server_address has the bound port)
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(
+            target=self._server.serve_forever, name='metrics-http', daemon=True
+        ).start()
+        return self._server
+
+    def stop(self):
+        """Stop the HTTP endpoint if running."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+# Global registry used by rate_limiter.py and resilience.py
+REGISTRY = MetricsRegistry(enabled=os.environ.get('METRICS_ENABLED') == '1')
+
+
+def enable():
+    """Start recording metrics in the global registry."""
+    REGISTRY.enabled = True
+
+
+def disable():
+    """Stop recording metrics in the global registry."""
+    REGISTRY.enabled = False
+
+
+def _configure_from_env():
+    if not REGISTRY.enabled:
+        return
+    metrics_file = os.environ.get('METRICS_FILE')
+    if metrics_file:
+        atexit.register(REGISTRY.write, Path(metrics_file))
+    metrics_port = os.environ.get('METRICS_PORT')
+    if metrics_port:
+        REGISTRY.serve(int(metrics_port))
+
+
+_configure_from_env()
+
+
+if __name__ == '__main__':
+    print(REGISTRY.render(), end='')
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Metrics Rollup Store
+
+Compact hourly and daily pre-aggregates of the rate limit, workflow
+reliability and dashboard performance metrics, so 7- and 30-day reports
+read a few hundred rollup rows instead of re-parsing raw CSV/JSONL history.
+
+Features:
+- SQLite (stdlib) store, one row per (series, grain, bucket, key)
+- Hourly and daily grains; window edges use hourly rows, whole days daily rows
+- Incremental ingestion: CSV sources resume from a byte offset, JSONL
+  sources from a timestamp watermark, re-reading an overlap window so
+  late (out-of-order) appends are counted exactly once
+- Source truncation, a rewritten first line (e.g. `tail -n` trimming) or
+  changed parameters rebuild the series
+
+Each row keeps count, ok (series-specific success count), three value sums,
+min/max of the first value and the most recent sample ('last').
+Window starts are rounded down to the hour.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Grain name -> bucket width in seconds
+GRAINS = (('hour', 3600), ('day', 86400))
+
+# Watermarked sources are re-read from this far behind the watermark, so
+# samples appended late (buffered sinks of other processes, merged metrics
+# commits) are still rolled up; fingerprints of the window's samples keep
+# re-read ones from being counted twice. One day matches the metrics day
+# partitions, which are read whole anyway.
+INGEST_OVERLAP_SECONDS = 86400
+
+# Series names shared by the report scripts
+WORKFLOW_RUNS = 'workflow_runs'
+FAILURE_CLASSIFICATIONS = 'failure_classifications'
+DASHBOARD_PERFORMANCE = 'dashboard_performance'
+API_USAGE = 'api_usage'
+VIOLATIONS = 'violations'
+GITHUB_RATE_LIMIT = 'github_rate_limit'
+
+WORKFLOW_RESULTS_FIELDS = [
+    'timestamp', 'workflow_name', 'workflow_id',
+    'status', 'conclusion', 'created_at', 'updated_at', 'run_url'
+]
+CLASSIFICATION_FIELDS = [
+    'timestamp', 'workflow_name', 'workflow_id',
+    'failure_type', 'failure_reason'
+]
+DASHBOARD_PERFORMANCE_FIELDS = [
+    'timestamp', 'workflow_name', 'workflow_id', 'duration_minutes', 'conclusion'
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    series TEXT NOT NULL,
+    grain TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    ok INTEGER NOT NULL,
+    total REAL NOT NULL,
+    total2 REAL NOT NULL,
+    total3 REAL NOT NULL,
+    min REAL,
+    max REAL,
+    last_ts REAL NOT NULL,
+    last TEXT,
+    PRIMARY KEY (series, grain, bucket, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sources (
+    series TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    offset INTEGER NOT NULL DEFAULT 0,
+    watermark REAL NOT NULL DEFAULT 0,
+    params TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS seen (
+    series TEXT NOT NULL,
+    ts REAL NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (series, digest)
+) WITHOUT ROWID;
+"""
+
+_UPSERT = """
+INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (series, grain, bucket, key) DO UPDATE SET
+    count = count + excluded.count,
+    ok = ok + excluded.ok,
+    total = total + excluded.total,
+    total2 = total2 + excluded.total2,
+    total3 = total3 + excluded.total3,
+    min = min(min, excluded.min),
+    max = max(max, excluded.max),
+    last = CASE WHEN excluded.last_ts >= last_ts THEN excluded.last ELSE last END,
+    last_ts = max(last_ts, excluded.last_ts)
+"""
+
+# A sample: (epoch_seconds, key, ok, value, value2, value3, last)
+Sample = Tuple[float, str, int, float, float, float, Optional[str]]
+
+
+def parse_timestamp(value: str) -> float:
+    """
+    Parse an ISO 8601 timestamp to epoch seconds (naive values are UTC).
+
+    Args:
+        value: Timestamp string, optionally 'Z'-suffixed
+
+    Returns:
+        Seconds since the epoch
+
+    Raises:
+        ValueError: If the value is not an ISO 8601 timestamp
+    """
+    timestamp = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def to_epoch(moment: datetime) -> float:
+    """Epoch seconds of a datetime (naive values are UTC)."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _floor(ts: float, size: int) -> int:
+    return int(ts // size * size)
+
+
+def _ceil(ts: float, size: int) -> int:
+    return -_floor(-ts, size)
+
+
+def _first_line_digest(path: Path) -> str:
+    """Digest of a file's first line; it changes when the file is trimmed from the front."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.readline()).hexdigest()
+    except FileNotFoundError:
+        return ''
+
+
+class RollupStore:
+    """SQLite-backed hourly/daily rollups keyed by series and key."""
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) a rollup store.
+
+        Args:
+            path: SQLite database file (':memory:' for a private store)
+        """
+        self.path = path
+        if str(path) != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(_SCHEMA)
+        self.lock = threading.Lock()
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def _source(self, series: str, path: Path, params: str) -> Tuple[int, float]:
+        """Ingestion position of a series, resetting it if its source changed."""
+        row = self.conn.execute(
+            'SELECT path, offset, watermark, params FROM sources WHERE series = ?',
+            (series,)
+        ).fetchone()
+        if row is None or row[0] != str(path) or row[3] != params:
+            self.reset(series)
+            self.conn.execute(
+                'INSERT INTO sources (series, path, params) VALUES (?, ?, ?)',
+                (series, str(path), params)
+            )
+            return 0, 0.0
+        return row[1], row[2]
+
+    def _add(self, series: str, samples: Iterable[Sample]) -> int:
+        """Fold samples into hourly and daily rows (caller commits)."""
+        rows: Dict[Tuple[str, int, str], list] = {}
+        added = 0
+        for ts, key, ok, value, value2, value3, last in samples:
+            added += 1
+            for grain, size in GRAINS:
+                bucket_key = (grain, _floor(ts, size), key)
+                row = rows.get(bucket_key)
+                if row is None:
+                    rows[bucket_key] = [1, ok, value, value2, value3, value, value, ts, last]
+                    continue
+                row[0] += 1
+                row[1] += ok
+                row[2] += value
+                row[3] += value2
+                row[4] += value3
+                row[5] = min(row[5], value)
+                row[6] = max(row[6], value)
+                if ts >= row[7]:
+                    row[7] = ts
+                    row[8] = last
+        self.conn.executemany(_UPSERT, [
+            (series, grain, bucket, key, *row)
+            for (grain, bucket, key), row in rows.items()
+        ])
+        return added
+
+    def reset(self, series: str):
+        """Drop all rollups and the ingestion position of a series."""
+        with self.conn:
+            self.conn.execute('DELETE FROM rollups WHERE series = ?', (series,))
+            self.conn.execute('DELETE FROM sources WHERE series = ?', (series,))
+            self.conn.execute('DELETE FROM seen WHERE series = ?', (series,))
+
+    def ingest_csv(
+        self,
+        series: str,
+        path: Path,
+        fieldnames: List[str],
+        to_sample: Callable[[Dict[str, str]], Sample],
+        params: str = ''
+    ) -> int:
+        """
+        Roll up rows appended to a CSV file since the last ingestion.
+
+        Comment lines, header rows and rows to_sample rejects with
+        KeyError/ValueError are skipped. A partial trailing line is left
+        for the next run; a file smaller than the stored offset, or whose
+        first line changed, is rebuilt.
+
+        Args:
+            series: Series name
+            path: CSV file
+            fieldnames: Column names (files are read without a header)
+            to_sample: Converts a row dict into a Sample
+            params: Parameters baked into the samples; a change rebuilds
+
+        Returns:
+            Number of rows added
+        """
+        path = Path(path)
+        identity = f'{params}|{_first_line_digest(path)}'
+        with self.lock, self.conn:
+            offset, _ = self._source(series, path, identity)
+            if not path.exists():
+                return 0
+            if path.stat().st_size < offset:
+                self.reset(series)
+                self._source(series, path, identity)
+                offset = 0
+
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+            end = data.rfind(b'\n') + 1
+            if not end:
+                return 0
+
+            def samples():
+                text = io.StringIO(data[:end].decode('utf-8', errors='replace'))
+                for row in csv.DictReader(text, fieldnames=fieldnames):
+                    if (row.get(fieldnames[0]) or '').startswith('#'):
+                        continue
+                    try:
+                        yield to_sample(row)
+                    except (KeyError, TypeError, ValueError, AttributeError):
+                        continue
+
+            added = self._add(series, samples())
+            self.conn.execute(
+                'UPDATE sources SET offset = ? WHERE series = ?', (offset + end, series)
+            )
+            return added
+
+    def ingest_samples(
+        self,
+        series: str,
+        path: Path,
+        read: Callable[[float], Iterable[Sample]],
+        params: str = ''
+    ) -> int:
+        """
+        Roll up samples not yet ingested, from the watermark minus an overlap.
+
+        For mostly time-ordered sources (the rate limit JSONL files) whose
+        lines may move between files on rotation, so byte offsets are
+        unstable. Samples up to INGEST_OVERLAP_SECONDS older than the
+        watermark are still added if they were not seen before; identical
+        samples are told apart by their occurrence within a read. Samples
+        older than the overlap window are skipped.
+
+        Args:
+            series: Series name
+            path: Source identity (e.g. the active metrics file)
+            read: Called with the window start; yields samples from that
+                time on
+            params: Parameters baked into the samples; a change rebuilds
+
+        Returns:
+            Number of samples added
+        """
+        with self.lock, self.conn:
+            _, watermark = self._source(series, Path(path), params)
+            start = max(0.0, watermark - INGEST_OVERLAP_SECONDS)
+            seen = {row[0] for row in self.conn.execute(
+                'SELECT digest FROM seen WHERE series = ? AND ts >= ?', (series, start)
+            )}
+            occurrences: Dict[str, int] = {}
+            fingerprints: List[Tuple[str, float, str]] = []
+            newest = [watermark]
+
+            def samples():
+                for sample in read(start):
+                    if sample[0] < start:
+                        continue
+                    fingerprint = hashlib.sha1(repr(sample).encode('utf-8')).hexdigest()
+                    occurrences[fingerprint] = occurrences.get(fingerprint, 0) + 1
+                    digest = f'{fingerprint}:{occurrences[fingerprint]}'
+                    if digest in seen:
+                        continue
+                    fingerprints.append((series, sample[0], digest))
+                    newest[0] = max(newest[0], sample[0])
+                    yield sample
+
+            added = self._add(series, samples())
+            self.conn.executemany('INSERT OR IGNORE INTO seen VALUES (?, ?, ?)', fingerprints)
+            self.conn.execute(
+                'DELETE FROM seen WHERE series = ? AND ts < ?',
+                (series, newest[0] - INGEST_OVERLAP_SECONDS)
+            )
+            self.conn.execute(
+                'UPDATE sources SET watermark = ? WHERE series = ?', (newest[0], series)
+            )
+            return added
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _ranges(since: float, until: Optional[float]) -> List[Tuple[str, int, int]]:
+        """Cover [since, until) with hourly edges and whole daily buckets."""
+        start = _floor(since, 3600)
+        end = _ceil(until, 3600) if until is not None else 2 ** 62
+        day_start = _ceil(start, 86400)
+        day_end = _floor(end, 86400) if until is not None else end
+        if day_start >= day_end:
+            return [('hour', start, end)]
+        ranges = [('hour', start, day_start), ('day', day_start, day_end)]
+        if day_end < end:
+            ranges.append(('hour', day_end, end))
+        return ranges
+
+    def _where(self, series: str, since: float, until: Optional[float]) -> Tuple[str, list]:
+        ranges = self._ranges(since, until)
+        clause = ' OR '.join('(grain = ? AND bucket >= ? AND bucket < ?)' for _ in ranges)
+        args: list = [series]
+        for r in ranges:
+            args.extend(r)
+        return f'series = ? AND ({clause})', args
+
+    def query(self, series: str, since: float = 0.0,
+              until: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Aggregate a series per key over a time window.
+
+        Args:
+            series: Series name
+            since: Window start, epoch seconds (rounded down to the hour)
+            until: Window end, epoch seconds (None for open-ended)
+
+        Returns:
+            Dictionary mapping keys to {'count', 'ok', 'total', 'total2',
+            'total3', 'min', 'max', 'last_ts'}
+        """
+        where, args = self._where(series, since, until)
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT key, SUM(count), SUM(ok), SUM(total), SUM(total2), SUM(total3), '
+                f'MIN(min), MAX(max), MAX(last_ts) FROM rollups WHERE {where} GROUP BY key',
+                args
+            ).fetchall()
+        return {
+            row[0]: {
+                'count': row[1], 'ok': row[2], 'total': row[3], 'total2': row[4],
+                'total3': row[5], 'min': row[6], 'max': row[7], 'last_ts': row[8]
+            }
+            for row in rows
+        }
+
+    def latest(self, series: str, since: float = 0.0,
+               until: Optional[float] = None) -> Optional[str]:
+        """
+        Most recent 'last' value of a series within a window.
+
+        Args:
+            series: Series name
+            since: Window start, epoch seconds
+            until: Window end, epoch seconds (None for open-ended)
+
+        Returns:
+            The stored last value, or None if the window is empty
+        """
+        where, args = self._where(series, since, until)
+        with self.lock:
+            row = self.conn.execute(
+                f'SELECT last FROM rollups WHERE {where} ORDER BY last_ts DESC LIMIT 1',
+                args
+            ).fetchone()
+        return row[0] if row else None
+
+
+# ----------------------------------------------------------------------
+# Row converters shared by the report scripts
+# ----------------------------------------------------------------------
+
+def workflow_run_sample(row: Dict[str, str]) -> Sample:
+    """workflow-results.csv row -> (ts, workflow, success, 0, 0, 0, None)."""
+    return (
+        parse_timestamp(row['timestamp']), row['workflow_name'],
+        int(row['conclusion'] == 'success'), 0.0, 0.0, 0.0, None
+    )
+
+
+def classification_sample(row: Dict[str, str]) -> Sample:
+    """failure-classifications.csv row -> ok = internal, total = external."""
+    return (
+        parse_timestamp(row['timestamp']), row['workflow_name'],
+        int(row['failure_type'] == 'internal'),
+        float(row['failure_type'] == 'external'), 0.0, 0.0, None
+    )
+
+
+def dashboard_performance_sampler(target_duration: float) -> Callable[[Dict[str, str]], Sample]:
+    """dashboard-performance.csv row -> ok = within target, total = duration."""
+    def to_sample(row: Dict[str, str]) -> Sample:
+        duration = float(row['duration_minutes'])
+        return (
+            parse_timestamp(row['timestamp']), row['workflow_name'],
+            int(duration <= target_duration), duration, 0.0, 0.0, None
+        )
+    return to_sample
+
+
+def ingest_workflow_results(store: RollupStore, path: Path) -> int:
+    """Roll up new rows of workflow-results.csv."""
+    return store.ingest_csv(WORKFLOW_RUNS, path, WORKFLOW_RESULTS_FIELDS, workflow_run_sample)
+
+
+def ingest_classifications(store: RollupStore, path: Path) -> int:
+    """Roll up new rows of failure-classifications.csv."""
+    return store.ingest_csv(
+        FAILURE_CLASSIFICATIONS, path, CLASSIFICATION_FIELDS, classification_sample
+    )
+
+
+def ingest_dashboard_performance(store: RollupStore, path: Path, target_duration: float) -> int:
+    """Roll up new rows of dashboard-performance.csv (rebuilds if the target changes)."""
+    return store.ingest_csv(
+        DASHBOARD_PERFORMANCE, path, DASHBOARD_PERFORMANCE_FIELDS,
+        dashboard_performance_sampler(target_duration),
+        params=json.dumps({'target_duration': target_duration})
+    )
+
+
+if __name__ == '__main__':
+    import sys
+
+    store = RollupStore(Path(sys.argv[1]) if len(sys.argv) > 1 else Path('metrics/rollups.sqlite'))
+    for (series,) in store.conn.execute('SELECT DISTINCT series FROM rollups ORDER BY series'):
+        keys = store.query(series)
+        print(f"{series}: {len(keys)} keys, {sum(k['count'] for k in keys.values())} samples")
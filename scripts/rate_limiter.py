@@ -10,41 +10,567 @@ Features:
 - Request throttling and queueing
 - Rate limit usage tracking
 - Violation logging
+- Pluggable window engines (GCRA token bucket, sliding-window counter,
+  exact sliding log) with O(1) memory for the counter-based engines
+- Buffered background metrics sink (batched, sampled, flushed on exit)
+- Blocking acquire() and asyncio AsyncRateLimiter with FIFO admission
+- Adaptive mode: admission resynchronized from response headers
+- Optional cross-process shared state (mmap + flock) for parallel jobs
+- Priority lanes with reserved headroom and low-priority shedding
+- OpenMetrics counters/histograms via metrics_registry
 """
 
+import asyncio
+import atexit
+import bisect
+import itertools
+import math
+import os
+import random
+import re
 import time
 import json
+import struct
+import sys
 import threading
-from datetime import datetime, timedelta
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from collections import deque
 
+sys.path.insert(0, str(Path(__file__).parent))
+from metrics_registry import REGISTRY
+
+# OpenMetrics instrumentation (no-op unless METRICS_ENABLED=1)
+REQUESTS_METRIC = REGISTRY.counter(
+    'rate_limiter_requests', 'Requests admitted by the rate limiter', ['api'])
+THROTTLED_METRIC = REGISTRY.counter(
+    'rate_limiter_throttled', 'Requests that had to wait for capacity', ['api'])
+SHED_METRIC = REGISTRY.counter(
+    'rate_limiter_shed', 'Low-priority requests rejected at their watermark', ['api', 'priority'])
+VIOLATIONS_METRIC = REGISTRY.counter(
+    'rate_limiter_violations', 'Responses reporting an exhausted server budget', ['api'])
+WAIT_METRIC = REGISTRY.histogram(
+    'rate_limiter_wait_seconds', 'Time spent waiting for admission', ['api'])
+
+
+class RateLimitExceeded(Exception):
+    """A context-managed acquire() timed out or its lane shed the request."""
+
+    def __init__(self, api_name: str, priority: Optional[str] = None):
+        self.api_name = api_name
+        self.priority = priority
+        lane = f" ({priority})" if priority else ""
+        super().__init__(f"No rate limit slot for {api_name}{lane}")
+
+
+class SlidingLogEngine:
+    """
+    Exact sliding-window log (legacy behaviour).
+
+    Keeps one timestamp per request inside the window, so memory and
+    cleanup cost grow with the configured limit.
+    """
+
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        self.timestamps = deque()
+
+    def _clean(self, now: float):
+        while self.timestamps and (now - self.timestamps[0]) > self.period:
+            self.timestamps.popleft()
+
+    def check(self, now: float, reserve: int = 0) -> Tuple[bool, float]:
+        self._clean(now)
+        limit = self.limit - reserve
+        if limit <= 0:
+            return False, self.period
+        if len(self.timestamps) >= limit:
+            wait_seconds = self.period - (now - self.timestamps[len(self.timestamps) - limit])
+            return False, max(0, wait_seconds)
+        return True, 0
+
+    def record(self, now: float):
+        self.timestamps.append(now)
+
+    def count(self, now: float) -> int:
+        self._clean(now)
+        return len(self.timestamps)
+
+
+class TokenBucketEngine:
+    """
+    Token bucket implemented as GCRA (generic cell rate algorithm).
+
+    State is a single theoretical arrival time (TAT), so memory and the
+    cost of check/record are constant regardless of the limit. A full
+    bucket admits a burst of ``limit`` requests, after which requests are
+    spaced ``period / limit`` seconds apart.
+    """
+
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        self.emission_interval = period / limit
+        self.tat = 0.0
+
+    def check(self, now: float, reserve: int = 0) -> Tuple[bool, float]:
+        new_tat = max(self.tat, now) + self.emission_interval
+        wait_seconds = new_tat - (self.period - reserve * self.emission_interval) - now
+        if wait_seconds > 0:
+            return False, wait_seconds
+        return True, 0
+
+    def record(self, now: float):
+        self.tat = max(self.tat, now) + self.emission_interval
+
+    def count(self, now: float) -> int:
+        """Approximate requests consumed from the current bucket."""
+        backlog = self.tat - now
+        if backlog <= 0:
+            return 0
+        return min(self.limit, math.ceil(backlog / self.emission_interval))
+
+    def get_state(self) -> Tuple[float, float, float]:
+        return (self.tat, 0.0, 0.0)
+
+    def set_state(self, state: Tuple[float, float, float]):
+        self.tat = state[0]
+
+
+class SlidingWindowCounterEngine:
+    """
+    Sliding-window counter for long (daily/monthly) windows.
+
+    Tracks only the counts of the current and previous fixed windows and
+    weights the previous one by how much of it still overlaps the sliding
+    window. Constant memory, suitable for limits like 10000 per 30 days.
+    """
+
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        self.window_start = 0.0
+        self.current = 0
+        self.previous = 0
+
+    def _roll(self, now: float):
+        elapsed_windows = int((now - self.window_start) // self.period)
+        if elapsed_windows <= 0:
+            return
+        self.previous = self.current if elapsed_windows == 1 else 0
+        self.current = 0
+        self.window_start += elapsed_windows * self.period
+
+    def _estimate(self, now: float) -> float:
+        overlap = 1 - (now - self.window_start) / self.period
+        return self.previous * overlap + self.current
+
+    def check(self, now: float, reserve: int = 0) -> Tuple[bool, float]:
+        self._roll(now)
+        limit = self.limit - reserve
+        if limit <= 0:
+            return False, self.period
+        if self._estimate(now) < limit:
+            return True, 0
+
+        elapsed = now - self.window_start
+        if self.current >= limit:
+            # Wait for the next window, then for enough of the (then
+            # previous) current window to slide out.
+            wait_seconds = (self.period - elapsed) + self.period * (1 - limit / self.current)
+        else:
+            wait_seconds = self.period * (1 - (limit - self.current) / self.previous) - elapsed
+        return False, max(0, wait_seconds)
+
+    def record(self, now: float):
+        self._roll(now)
+        self.current += 1
+
+    def count(self, now: float) -> int:
+        self._roll(now)
+        return int(math.ceil(self._estimate(now)))
+
+    def get_state(self) -> Tuple[float, float, float]:
+        return (self.window_start, float(self.current), float(self.previous))
+
+    def set_state(self, state: Tuple[float, float, float]):
+        self.window_start = state[0]
+        self.current = int(state[1])
+        self.previous = int(state[2])
+
+
+# Engine registry: name -> window engine class
+ENGINES = {
+    'sliding_log': SlidingLogEngine,
+    'token_bucket': TokenBucketEngine,
+    'sliding_window': SlidingWindowCounterEngine,
+}
+
+# Default engines for short (minute/hour) and long (day/month) windows
+DEFAULT_ENGINE = 'token_bucket'
+DEFAULT_LONG_WINDOW_ENGINE = 'sliding_window'
+
+# Priority lanes: a class may only consume quota while more than its
+# `reserve` fraction of each window remains, which keeps headroom for the
+# classes above it. `shed` classes are rejected immediately instead of
+# waiting once they hit their watermark. `rank` orders queued waiters.
+PRIORITY_CLASSES = {
+    'critical': {'rank': 0, 'reserve': 0.0, 'shed': False},     # SOC 2 evidence
+    'interactive': {'rank': 1, 'reserve': 0.05, 'shed': False},  # CLI validation
+    'normal': {'rank': 2, 'reserve': 0.10, 'shed': False},
+    'bulk': {'rank': 3, 'reserve': 0.25, 'shed': True},          # dashboard refreshes
+}
+
+
+class SharedStateFile:
+    """
+    Cross-process limiter state in a memory-mapped file.
+
+    Holds a fixed array of doubles: three per window engine (window,
+    daily, monthly) followed by the adaptive server budget. Every access
+    happens under an exclusive flock(), so processes on one runner share
+    a single budget; a state round trip is a lock plus a struct
+    unpack/pack, a few microseconds.
+    """
+
+    WINDOW_SLOTS = 3
+    STATE_PER_WINDOW = 3
+    # server_remaining, server_reset_at, retry_after_until
+    ADAPTIVE_FIELDS = 3
+    FORMAT = '<' + 'd' * (WINDOW_SLOTS * STATE_PER_WINDOW + ADAPTIVE_FIELDS)
+    SIZE = struct.calcsize(FORMAT)
+
+    def __init__(self, path: Path):
+        """
+        Open (creating if needed) a shared state file.
+
+        Args:
+            path: State file path, one per API
+        """
+        import fcntl
+        import mmap
+
+        self._fcntl = fcntl
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size != self.SIZE:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, self.SIZE)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, self.SIZE)
+
+    @contextmanager
+    def locked(self):
+        """
+        Hold the cross-process lock and yield the state as a list.
+
+        Changes made to the list are written back on exit.
+        """
+        self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+        try:
+            values = list(struct.unpack_from(self.FORMAT, self._map))
+            yield values
+            struct.pack_into(self.FORMAT, self._map, 0, *values)
+        finally:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+    def close(self):
+        """Unmap and close the state file."""
+        self._map.close()
+        os.close(self._fd)
+
+
+@contextmanager
+def metrics_file_lock(path: Path):
+    """
+    Hold the cross-process append lock of a metrics file.
+
+    Writers take it around each append and rotation takes it while it
+    moves lines out, so no append lands in a file that is being rotated.
+    The lock lives on a '<name>.lock' sidecar, which rotation never
+    replaces.
+
+    Args:
+        path: Metrics file
+    """
+    import fcntl
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path.with_name(path.name + '.lock'), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+class FileMetricsSink:
+    """Write-through metrics sink: appends one JSON line per record."""
+
+    def __init__(self, path: Path, sample_rate: float = 1.0):
+        """
+        Initialize metrics sink.
+
+        Args:
+            path: JSONL file to append metrics to
+            sample_rate: Fraction of records to keep (0.0 - 1.0)
+        """
+        self.path = Path(path)
+        self.sample_rate = sample_rate
+        self.written = 0
+
+    def _sampled(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def _write(self, records: List[Dict]):
+        with metrics_file_lock(self.path), open(self.path, 'a') as f:
+            f.write(''.join(json.dumps(r) + '\n' for r in records))
+        self.written += len(records)
+
+    def emit(self, record: Dict):
+        """Write a metrics record (subject to sampling)."""
+        if self._sampled():
+            self._write([record])
+
+    def flush(self):
+        """No-op: records are written immediately."""
+
+    def close(self):
+        """No-op: records are written immediately."""
+
+
+class BufferedMetricsSink(FileMetricsSink):
+    """
+    Batched metrics sink backed by an in-memory ring buffer.
+
+    emit() only appends to a bounded deque; a daemon thread writes the
+    buffer out every ``flush_every`` records or ``flush_interval`` seconds,
+    and any remainder is flushed at interpreter exit. If the writer falls
+    behind, the oldest buffered records are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_every: int = 100,
+        flush_interval: float = 5.0,
+        sample_rate: float = 1.0,
+        max_buffer: int = 10000
+    ):
+        """
+        Initialize buffered metrics sink.
+
+        Args:
+            path: JSONL file to append metrics to
+            flush_every: Flush once this many records are buffered
+            flush_interval: Flush at least this often (seconds)
+            sample_rate: Fraction of records to keep (0.0 - 1.0)
+            max_buffer: Ring buffer capacity
+        """
+        super().__init__(path, sample_rate)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.buffer = deque(maxlen=max_buffer)
+        self.dropped = 0
+
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = None
+
+        atexit.register(self.close)
+
+    def _ensure_writer(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f"metrics-sink:{self.path.name}", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def emit(self, record: Dict):
+        """Buffer a metrics record (subject to sampling)."""
+        if not self._sampled():
+            return
+
+        with self._buffer_lock:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append(record)
+            pending = len(self.buffer)
+            if self._thread is None and not self._closed:
+                self._ensure_writer()
+
+        if pending >= self.flush_every:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write all buffered records to disk."""
+        with self._write_lock:
+            with self._buffer_lock:
+                if not self.buffer:
+                    return
+                records = list(self.buffer)
+                self.buffer.clear()
+            self._write(records)
+
+    def close(self):
+        """Stop the writer thread and flush remaining records."""
+        self._closed = True
+        self._wakeup.set()
+        self.flush()
+
+
+# Shared buffered sinks, one per metrics file
+_metrics_sinks: Dict[Path, BufferedMetricsSink] = {}
+_metrics_sinks_lock = threading.Lock()
+
+
+DEFAULT_METRICS_FILE = Path('compliance/rate-limits/metrics/api-usage.jsonl')
+
+# Environment overrides for the buffered sink behind the global limiters
+METRICS_SINK_ENV = {
+    'sample_rate': ('RATE_LIMIT_METRICS_SAMPLE_RATE', float),
+    'flush_interval': ('RATE_LIMIT_METRICS_FLUSH_INTERVAL', float),
+    'flush_every': ('RATE_LIMIT_METRICS_FLUSH_EVERY', int),
+}
+
+
+def metrics_sink_options_from_env(environ=os.environ) -> Dict[str, Any]:
+    """
+    BufferedMetricsSink options set through METRICS_SINK_ENV variables.
+
+    Unparseable values are reported and ignored.
+    """
+    options: Dict[str, Any] = {}
+    for option, (name, cast) in METRICS_SINK_ENV.items():
+        value = environ.get(name)
+        if not value:
+            continue
+        try:
+            options[option] = cast(value)
+        except ValueError:
+            print(f"⚠️  Ignoring invalid {name}={value!r}", file=sys.stderr)
+    return options
+
+
+def get_metrics_sink(path: Path, **options) -> BufferedMetricsSink:
+    """
+    Get the shared buffered sink for a metrics file.
+
+    Args:
+        path: JSONL metrics file
+        **options: BufferedMetricsSink options (sample_rate, flush_every,
+            flush_interval, max_buffer); applied when the sink is created
+
+    Returns:
+        BufferedMetricsSink instance
+    """
+    key = Path(path).resolve()
+    with _metrics_sinks_lock:
+        if key not in _metrics_sinks:
+            _metrics_sinks[key] = BufferedMetricsSink(path, **options)
+        return _metrics_sinks[key]
+
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+
+
+def parse_reset_header(value: str, reset_format: str, now: float) -> Optional[float]:
+    """
+    Convert a rate limit reset header to an absolute epoch timestamp.
+
+    Args:
+        value: Raw header value
+        reset_format: 'epoch' (GitHub), 'delta_seconds' (Reddit),
+            'retry_after' (Retry-After: delta seconds or an HTTP-date),
+            'rfc3339' (Anthropic) or 'duration' (OpenAI, e.g. '6m0s', '20ms')
+        now: Current epoch time
+
+    Returns:
+        Epoch seconds of the reset, or None if the value cannot be parsed
+    """
+    value = str(value).strip()
+    try:
+        if reset_format == 'epoch':
+            return float(value)
+        if reset_format == 'delta_seconds':
+            return now + float(value)
+        if reset_format == 'retry_after':
+            if re.fullmatch(r'\d+(?:\.\d+)?', value):
+                return now + float(value)
+            parsed = parsedate_to_datetime(value)
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed.timestamp()
+        if reset_format == 'rfc3339':
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed.timestamp()
+        if reset_format == 'duration':
+            parts = _DURATION_PART.findall(value)
+            if not parts:
+                return None
+            scale = {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}
+            return now + sum(float(n) * scale[unit] for n, unit in parts)
+    except (TypeError, ValueError):
+        return None
+    return None
+
 
 class RateLimiter:
     """Rate limiter for external API calls."""
 
-    # Rate limit configurations (requests, period_seconds)
-    RATE_LIMITS = {
+    # Rate limit configurations (requests, period_seconds). header_* keys
+    # name the response headers carrying the server-side budget;
+    # reset_format selects how parse_reset_header() reads header_reset.
+    RATE_LIMITS: Dict[str, Dict[str, Any]] = {
         'github': {
             'requests_per_hour': 5000,
             'period_seconds': 3600,
             'header_remaining': 'x-ratelimit-remaining',
-            'header_reset': 'x-ratelimit-reset'
+            'header_reset': 'x-ratelimit-reset',
+            'reset_format': 'epoch'
         },
         'claude': {
             'requests_per_minute': 50,
             'requests_per_day': 40000,
             'period_seconds': 60,
-            'day_period_seconds': 86400
+            'day_period_seconds': 86400,
+            'header_remaining': 'anthropic-ratelimit-requests-remaining',
+            'header_reset': 'anthropic-ratelimit-requests-reset',
+            'reset_format': 'rfc3339'
         },
         'reddit': {
             'requests_per_minute': 60,
-            'period_seconds': 60
+            'period_seconds': 60,
+            'header_remaining': 'x-ratelimit-remaining',
+            'header_reset': 'x-ratelimit-reset',
+            'reset_format': 'delta_seconds'
         },
         'openai_whisper': {
             'requests_per_minute': 50,  # Conservative default
-            'period_seconds': 60
+            'period_seconds': 60,
+            'header_remaining': 'x-ratelimit-remaining-requests',
+            'header_reset': 'x-ratelimit-reset-requests',
+            'reset_format': 'duration'
         },
         'x_api': {
             'requests_per_month': 10000,
@@ -52,102 +578,314 @@ class RateLimiter:
         }
     }
 
-    def __init__(self, api_name: str, metrics_file: Optional[Path] = None):
+    def __init__(
+        self,
+        api_name: str,
+        metrics_file: Optional[Path] = None,
+        engine: Optional[str] = None,
+        metrics_sink: Optional[FileMetricsSink] = None,
+        adaptive: bool = False,
+        shared_state: Optional[SharedStateFile] = None
+    ):
         """
         Initialize rate limiter for specific API.
 
         Args:
             api_name: Name of API ('github', 'claude', 'reddit', etc.)
             metrics_file: Optional path to save metrics
+            engine: Optional window engine name from ENGINES. Defaults to
+                'token_bucket' for minute/hour windows and
+                'sliding_window' for daily/monthly windows.
+            metrics_sink: Optional sink for usage metrics. Defaults to the
+                shared buffered sink for metrics_file.
+            adaptive: Resynchronize admission from response headers
+                (remaining budget, reset time, Retry-After). While the
+                server budget is current it replaces the static windows.
+            shared_state: Optional SharedStateFile so that every process
+                using the same file draws from one budget. Requires the
+                constant-state engines (not 'sliding_log').
         """
         self.api_name = api_name
-        self.config = self.RATE_LIMITS.get(api_name.lower(), {})
-        self.metrics_file = metrics_file or Path(
-            'compliance/rate-limits/metrics/api-usage.jsonl'
+        self.config: Dict[str, Any] = self.RATE_LIMITS.get(api_name.lower(), {})
+        self.metrics_file = metrics_file or DEFAULT_METRICS_FILE
+        self.metrics_sink = metrics_sink or get_metrics_sink(self.metrics_file)
+
+        if engine is not None and engine not in ENGINES:
+            raise ValueError(
+                f"Unknown rate limiter engine '{engine}' "
+                f"(expected one of: {', '.join(ENGINES)})"
+            )
+        self.engine_name = engine
+
+        # Request tracking: one engine per configured window
+        self.window = self._build_window('requests_per_hour', 'period_seconds') \
+            or self._build_window('requests_per_minute', 'period_seconds')
+        self.daily_window = self._build_window(
+            'requests_per_day', 'day_period_seconds', long_window=True
+        )
+        self.monthly_window = self._build_window(
+            'requests_per_month', 'period_seconds', long_window=True
         )
 
-        # Request tracking
-        self.requests = deque()
-        self.daily_requests = deque() if 'requests_per_day' in self.config else None
-        self.monthly_requests = deque() if 'requests_per_month' in self.config else None
+        # Server-reported budget (adaptive mode)
+        self.adaptive = adaptive
+        self.server_remaining: Optional[float] = None
+        self.server_reset_at: Optional[float] = None
+        self.retry_after_until: Optional[float] = None
 
-        # Lock for thread safety
+        if shared_state is not None and any(
+            not hasattr(w, 'get_state') for w in self._windows
+        ):
+            raise ValueError("Shared rate limit state requires a constant-state engine")
+        self.shared_state = shared_state
+
+        # Lock for thread safety; acquire() waiters queue on the condition
         self.lock = threading.Lock()
+        self._admission = threading.Condition(self.lock)
+        self._waiters = []  # sorted (rank, arrival) tickets
+        self._arrivals = itertools.count()
 
         # Metrics
         self.total_requests = 0
         self.throttled_requests = 0
         self.violations = 0
+        self.shed_requests = 0
 
-    def _clean_old_requests(self):
-        """Remove requests outside the rate limit window."""
-        now = time.time()
+    def _build_window(self, limit_key: str, period_key: str, long_window: bool = False):
+        """
+        Create a window engine for a configured limit.
 
-        # Clean minute/hour window
-        if 'period_seconds' in self.config:
-            period = self.config['period_seconds']
-            while self.requests and (now - self.requests[0]) > period:
-                self.requests.popleft()
+        Args:
+            limit_key: Config key holding the request limit
+            period_key: Config key holding the window length in seconds
+            long_window: Whether this is a daily/monthly window
 
-        # Clean daily window
-        if self.daily_requests is not None:
-            day_period = self.config.get('day_period_seconds', 86400)
-            while self.daily_requests and (now - self.daily_requests[0]) > day_period:
-                self.daily_requests.popleft()
+        Returns:
+            Engine instance, or None if the limit is not configured
+        """
+        if limit_key not in self.config:
+            return None
 
-        # Clean monthly window
-        if self.monthly_requests is not None:
-            month_period = self.config.get('period_seconds', 2592000)
-            while self.monthly_requests and (now - self.monthly_requests[0]) > month_period:
-                self.monthly_requests.popleft()
+        default_period = 86400 if period_key == 'day_period_seconds' else 2592000
+        period = self.config.get(period_key, default_period)
+        name = self.engine_name or (
+            DEFAULT_LONG_WINDOW_ENGINE if long_window else DEFAULT_ENGINE
+        )
+        return ENGINES[name](self.config[limit_key], period)
+
+    @property
+    def _windows(self) -> List:
+        """Configured window engines, shortest first."""
+        return [
+            w for w in (self.window, self.daily_window, self.monthly_window)
+            if w is not None
+        ]
+
+    @contextmanager
+    def _shared(self):
+        """
+        Sync window and server-budget state with the shared state file
+        for the duration of the block (caller holds self.lock).
+        """
+        if self.shared_state is None:
+            yield
+            return
+
+        slots = (self.window, self.daily_window, self.monthly_window)
+        per_window = SharedStateFile.STATE_PER_WINDOW
+        adaptive_at = SharedStateFile.WINDOW_SLOTS * per_window
+
+        with self.shared_state.locked() as values:
+            for i, window in enumerate(slots):
+                if window is not None:
+                    window.set_state(values[i * per_window:(i + 1) * per_window])
+            remaining, reset_at, retry_until = values[adaptive_at:]
+            # 0.0 means unset: a zero epoch timestamp is always in the past
+            self.server_remaining = remaining if reset_at else None
+            self.server_reset_at = reset_at or None
+            self.retry_after_until = retry_until or None
+
+            yield
+
+            for i, window in enumerate(slots):
+                if window is not None:
+                    values[i * per_window:(i + 1) * per_window] = window.get_state()
+            values[adaptive_at:] = [
+                self.server_remaining or 0.0,
+                self.server_reset_at or 0.0,
+                self.retry_after_until or 0.0,
+            ]
+
+    def _server_budget(self, now: float) -> Optional[Tuple[float, float]]:
+        """
+        Header-reported (remaining, reset_at) while it still applies, else
+        None (caller holds self.lock).
+        """
+        remaining, reset_at = self.server_remaining, self.server_reset_at
+        if self.adaptive and remaining is not None and reset_at is not None and now < reset_at:
+            return remaining, reset_at
+        return None
+
+    def _check_windows(self, now: float, priority: Optional[str] = None) -> Tuple[bool, float]:
+        """Check every window (caller holds self.lock)."""
+        if self.retry_after_until is not None and now < self.retry_after_until:
+            return False, self.retry_after_until - now
+
+        reserve = PRIORITY_CLASSES[priority]['reserve'] if priority else 0.0
+
+        # A current server budget is authoritative over the static table
+        budget = self._server_budget(now)
+        if budget is not None:
+            remaining, reset_at = budget
+            primary_limit = self._windows[0].limit if self._windows else 0
+            if remaining <= int(primary_limit * reserve):
+                return False, reset_at - now
+            return True, 0
 
-    def check_limit(self) -> Tuple[bool, float]:
+        for window in self._windows:
+            can_proceed, wait_seconds = window.check(now, int(window.limit * reserve))
+            if not can_proceed:
+                return False, wait_seconds
+
+        return True, 0
+
+    def _note_throttled(self):
+        """Count a request that had to wait for capacity."""
+        self.throttled_requests += 1
+        THROTTLED_METRIC.inc(api=self.api_name)
+
+    def _should_shed(self, priority: Optional[str]) -> bool:
+        """Record and report a rejected low-priority request (caller holds self.lock)."""
+        if priority and PRIORITY_CLASSES[priority]['shed']:
+            self.shed_requests += 1
+            SHED_METRIC.inc(api=self.api_name, priority=priority)
+            return True
+        return False
+
+    def _reserve(self, now: float) -> Dict:
+        """Record a request in every window (caller holds self.lock)."""
+        for window in self._windows:
+            window.record(now)
+
+        budget = self._server_budget(now)
+        if budget is not None:
+            self.server_remaining = budget[0] - 1
+
+        self.total_requests += 1
+        return self._snapshot_metrics(now)
+
+    def check_limit(self, priority: Optional[str] = None) -> Tuple[bool, float]:
         """
         Check if request can be made within rate limits.
 
+        Args:
+            priority: Optional PRIORITY_CLASSES lane (None uses the full quota)
+
         Returns:
             Tuple of (can_proceed, wait_seconds)
         """
-        with self.lock:
-            self._clean_old_requests()
-
-            # Check minute/hour limit
-            if 'requests_per_hour' in self.config:
-                max_requests = self.config['requests_per_hour']
-            elif 'requests_per_minute' in self.config:
-                max_requests = self.config['requests_per_minute']
-            else:
-                max_requests = float('inf')
-
-            if len(self.requests) >= max_requests:
-                # Calculate wait time
-                oldest_request = self.requests[0]
-                period = self.config['period_seconds']
-                wait_seconds = period - (time.time() - oldest_request)
-                return False, max(0, wait_seconds)
-
-            # Check daily limit (Claude API)
-            if self.daily_requests is not None:
-                max_daily = self.config['requests_per_day']
-                if len(self.daily_requests) >= max_daily:
-                    oldest_request = self.daily_requests[0]
-                    wait_seconds = 86400 - (time.time() - oldest_request)
-                    return False, max(0, wait_seconds)
-
-            # Check monthly limit (X API)
-            if self.monthly_requests is not None:
-                max_monthly = self.config['requests_per_month']
-                if len(self.monthly_requests) >= max_monthly:
-                    oldest_request = self.monthly_requests[0]
-                    wait_seconds = 2592000 - (time.time() - oldest_request)
-                    return False, max(0, wait_seconds)
+        with self.lock, self._shared():
+            return self._check_windows(time.time(), priority)
 
-            return True, 0
+    def try_acquire(self, priority: Optional[str] = None) -> Tuple[bool, float]:
+        """
+        Atomically check limits and reserve a request slot.
+
+        Unlike check_limit() followed by record_request(), concurrent
+        callers cannot both observe the same free slot.
+
+        Args:
+            priority: Optional PRIORITY_CLASSES lane (None uses the full quota)
+
+        Returns:
+            Tuple of (acquired, wait_seconds)
+        """
+        with self.lock, self._shared():
+            now = time.time()
+            can_proceed, wait_seconds = self._check_windows(now, priority)
+            if not can_proceed:
+                self._should_shed(priority)
+                return False, wait_seconds
+            metric = self._reserve(now)
+
+        self._save_metrics(metric)
+        return True, 0
+
+    def acquire(self, timeout: Optional[float] = None, priority: Optional[str] = None) -> bool:
+        """
+        Block until a request slot is reserved.
+
+        Waiters are admitted in FIFO order within a priority lane, and
+        higher lanes go first: only the head of the queue checks the
+        windows, so a burst of threads cannot over-admit and later
+        arrivals cannot overtake earlier ones of the same priority.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely,
+                0 never blocks)
+            priority: Optional PRIORITY_CLASSES lane (None uses the full
+                quota and queues with 'normal'). Shedding lanes return
+                False as soon as they reach their watermark.
+
+        Returns:
+            True if a slot was reserved, False on timeout or shedding
+        """
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        rank = PRIORITY_CLASSES[priority or 'normal']['rank']
+        throttled = False
+
+        with self._admission:
+            ticket = (rank, next(self._arrivals))
+            bisect.insort(self._waiters, ticket)
+            try:
+                while True:
+                    wait_seconds = None
+                    if self._waiters[0] == ticket:
+                        with self._shared():
+                            now = time.time()
+                            can_proceed, wait_seconds = self._check_windows(now, priority)
+                            if can_proceed:
+                                metric = self._reserve(now)
+                        if can_proceed:
+                            break
+                        if self._should_shed(priority):
+                            return False
+
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        # Fail fast when the slot cannot free up in time
+                        if remaining <= 0 or (wait_seconds is not None and wait_seconds > remaining):
+                            return False
+                        wait_seconds = remaining if wait_seconds is None else wait_seconds
+
+                    if not throttled:
+                        throttled = True
+                        self._note_throttled()
+                    self._admission.wait(wait_seconds)
+            finally:
+                self._waiters.remove(ticket)
+                self._admission.notify_all()
+
+        WAIT_METRIC.observe(time.monotonic() - started, api=self.api_name)
+        self._save_metrics(metric)
+        return True
+
+    def __enter__(self):
+        if not self.acquire():
+            raise RateLimitExceeded(self.api_name)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
 
     def wait_if_needed(self) -> float:
         """
         Wait if rate limit would be exceeded.
 
+        Does not reserve a slot; prefer acquire() when several threads
+        share a limiter.
+
         Returns:
             Seconds waited (0 if no wait needed)
         """
@@ -155,7 +893,8 @@ class RateLimiter:
 
         if not can_proceed:
             print(f"⏳ Rate limit reached for {self.api_name}, waiting {wait_seconds:.1f}s")
-            self.throttled_requests += 1
+            self._note_throttled()
+            WAIT_METRIC.observe(wait_seconds, api=self.api_name)
             time.sleep(wait_seconds)
             return wait_seconds
 
@@ -168,31 +907,67 @@ class RateLimiter:
         Args:
             response_headers: Optional API response headers for limit detection
         """
-        with self.lock:
-            now = time.time()
+        with self.lock, self._shared():
+            metric = self._reserve(time.time())
+            self._process_headers(response_headers)
 
-            # Record request timestamp
-            self.requests.append(now)
-            if self.daily_requests is not None:
-                self.daily_requests.append(now)
-            if self.monthly_requests is not None:
-                self.monthly_requests.append(now)
+        # Save metrics outside the lock; the sink only buffers the record
+        self._save_metrics(metric)
 
-            self.total_requests += 1
+    def record_response(self, response_headers: Optional[Dict] = None):
+        """
+        Process response headers for a request already reserved by
+        acquire()/try_acquire(), without counting it a second time.
+
+        Args:
+            response_headers: API response headers
+        """
+        if not response_headers:
+            return
+        with self.lock, self._shared():
+            self._process_headers(response_headers)
 
-            # Parse rate limit headers (GitHub)
-            if response_headers and self.api_name == 'github':
-                remaining_header = self.config.get('header_remaining')
-                reset_header = self.config.get('header_reset')
+    def _process_headers(self, response_headers: Optional[Dict]):
+        """Parse rate limit headers (caller holds self.lock)."""
+        if not response_headers:
+            return
 
-                if remaining_header in response_headers:
-                    remaining = int(response_headers[remaining_header])
-                    if remaining == 0:
-                        self.violations += 1
-                        self._log_violation(response_headers)
+        headers = {str(k).lower(): v for k, v in response_headers.items()}
+        now = time.time()
 
-            # Save metrics
-            self._save_metrics()
+        remaining_header = self.config.get('header_remaining')
+        reset_header = self.config.get('header_reset')
+
+        remaining = None
+        if remaining_header and remaining_header in headers:
+            try:
+                remaining = float(headers[remaining_header])
+            except ValueError:
+                remaining = None
+
+        if remaining is not None and remaining <= 0:
+            self.violations += 1
+            VIOLATIONS_METRIC.inc(api=self.api_name)
+            self._log_violation(response_headers)
+
+        if not self.adaptive:
+            return
+
+        if 'retry-after' in headers:
+            retry_until = parse_reset_header(headers['retry-after'], 'retry_after', now)
+            # An unparseable value leaves the previous deadline in place
+            if retry_until is not None:
+                self.retry_after_until = retry_until
+
+        if remaining is not None and reset_header and reset_header in headers:
+            reset_at = parse_reset_header(
+                headers[reset_header], self.config.get('reset_format', 'epoch'), now
+            )
+            if reset_at is not None:
+                self.server_remaining = remaining
+                self.server_reset_at = reset_at
+                # Capacity may have appeared; let queued acquire() callers recheck
+                self._admission.notify_all()
 
     def _log_violation(self, response_headers: Dict):
         """
@@ -208,31 +983,31 @@ class RateLimiter:
             'headers': dict(response_headers)
         }
 
-        violations_file = Path('compliance/rate-limits/metrics/violations.jsonl')
-        violations_file.parent.mkdir(parents=True, exist_ok=True)
+        violations_file = self.metrics_file.parent / 'violations.jsonl'
 
-        with open(violations_file, 'a') as f:
+        with metrics_file_lock(violations_file), open(violations_file, 'a') as f:
             f.write(json.dumps(violation) + '\n')
 
         print(f"⚠️ Rate limit violation logged for {self.api_name}")
 
-    def _save_metrics(self):
-        """Save rate limit usage metrics."""
-        self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
-
-        metric = {
+    def _snapshot_metrics(self, now: float) -> Dict:
+        """Build a usage metrics record (caller holds self.lock)."""
+        return {
             'timestamp': datetime.utcnow().isoformat(),
             'api': self.api_name,
             'total_requests': self.total_requests,
             'throttled_requests': self.throttled_requests,
             'violations': self.violations,
-            'current_window_requests': len(self.requests),
-            'daily_requests': len(self.daily_requests) if self.daily_requests else None,
-            'monthly_requests': len(self.monthly_requests) if self.monthly_requests else None
+            'shed_requests': self.shed_requests,
+            'current_window_requests': self.window.count(now) if self.window else 0,
+            'daily_requests': self.daily_window.count(now) if self.daily_window else None,
+            'monthly_requests': self.monthly_window.count(now) if self.monthly_window else None
         }
 
-        with open(self.metrics_file, 'a') as f:
-            f.write(json.dumps(metric) + '\n')
+    def _save_metrics(self, metric: Dict):
+        """Save rate limit usage metrics."""
+        REQUESTS_METRIC.inc(api=self.api_name)
+        self.metrics_sink.emit(metric)
 
     def get_usage_stats(self) -> Dict:
         """
@@ -241,57 +1016,244 @@ class RateLimiter:
         Returns:
             Dictionary containing usage stats
         """
-        with self.lock:
-            self._clean_old_requests()
+        with self.lock, self._shared():
+            now = time.time()
 
             stats = {
                 'api': self.api_name,
                 'total_requests': self.total_requests,
                 'throttled_requests': self.throttled_requests,
                 'violations': self.violations,
+                'shed_requests': self.shed_requests,
                 'current_window': {
-                    'requests': len(self.requests),
+                    'requests': self.window.count(now) if self.window else 0,
                     'limit': self.config.get('requests_per_hour') or self.config.get('requests_per_minute'),
                     'period': self.config.get('period_seconds')
                 }
             }
 
-            if self.daily_requests is not None:
+            if self.daily_window is not None:
                 stats['daily'] = {
-                    'requests': len(self.daily_requests),
+                    'requests': self.daily_window.count(now),
                     'limit': self.config.get('requests_per_day')
                 }
 
-            if self.monthly_requests is not None:
+            if self.monthly_window is not None:
                 stats['monthly'] = {
-                    'requests': len(self.monthly_requests),
+                    'requests': self.monthly_window.count(now),
                     'limit': self.config.get('requests_per_month')
                 }
 
+            budget = self._server_budget(now)
+            if budget is not None:
+                stats['server'] = {
+                    'remaining': budget[0],
+                    'reset_in_seconds': budget[1] - now
+                }
+
             return stats
 
 
+class AsyncRateLimiter:
+    """
+    asyncio front-end for a RateLimiter.
+
+    Shares window state with the wrapped limiter, so sync and async
+    callers draw from one budget. Coroutines are admitted in FIFO order
+    (asyncio.Lock wakes waiters first-come first-served) and the head
+    sleeps only until the next slot frees up, so a concurrent fetcher can
+    run at the full allowed rate without sleeping through a whole window.
+    """
+
+    def __init__(self, limiter: RateLimiter, priority: Optional[str] = None):
+        """
+        Initialize async rate limiter.
+
+        Args:
+            limiter: RateLimiter whose windows are shared
+            priority: Optional PRIORITY_CLASSES lane for every acquire()
+        """
+        self.limiter = limiter
+        self.priority = priority
+        self._queue = asyncio.Lock()
+
+    async def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until a request slot is reserved.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if a slot was reserved, False on timeout
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = None if timeout is None else started + timeout
+
+        try:
+            await asyncio.wait_for(self._queue.acquire(), timeout)
+        except asyncio.TimeoutError:
+            return False
+
+        try:
+            throttled = False
+            while True:
+                acquired, wait_seconds = self.limiter.try_acquire(self.priority)
+                if acquired:
+                    WAIT_METRIC.observe(loop.time() - started, api=self.limiter.api_name)
+                    return True
+
+                if self.priority and PRIORITY_CLASSES[self.priority]['shed']:
+                    return False
+
+                if deadline is not None and loop.time() + wait_seconds > deadline:
+                    return False
+
+                if not throttled:
+                    throttled = True
+                    self.limiter._note_throttled()
+                await asyncio.sleep(wait_seconds)
+        finally:
+            self._queue.release()
+
+    def record_response(self, response_headers: Optional[Dict] = None):
+        """Process response headers for a reserved request."""
+        self.limiter.record_response(response_headers)
+
+    async def __aenter__(self):
+        if not await self.acquire():
+            raise RateLimitExceeded(self.limiter.api_name, self.priority)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class PriorityLane:
+    """
+    A RateLimiter bound to one priority class.
+
+    Shares the limiter's windows and queue; every admission call is made
+    with the lane's priority, so lower lanes stop short of the headroom
+    reserved for higher ones.
+    """
+
+    def __init__(self, limiter: RateLimiter, priority: str):
+        """
+        Initialize priority lane.
+
+        Args:
+            limiter: Shared RateLimiter
+            priority: Key of PRIORITY_CLASSES
+        """
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(
+                f"Unknown priority '{priority}' "
+                f"(expected one of: {', '.join(PRIORITY_CLASSES)})"
+            )
+        self.limiter = limiter
+        self.priority = priority
+        self.api_name = limiter.api_name
+
+    def check_limit(self) -> Tuple[bool, float]:
+        return self.limiter.check_limit(self.priority)
+
+    def try_acquire(self) -> Tuple[bool, float]:
+        return self.limiter.try_acquire(self.priority)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        return self.limiter.acquire(timeout, self.priority)
+
+    def wait_if_needed(self) -> float:
+        """
+        Wait if the lane's watermark would be exceeded.
+
+        Returns:
+            Seconds waited (0 if no wait needed)
+        """
+        can_proceed, wait_seconds = self.check_limit()
+
+        if not can_proceed:
+            print(f"⏳ Rate limit reached for {self.api_name} ({self.priority}), waiting {wait_seconds:.1f}s")
+            self.limiter._note_throttled()
+            WAIT_METRIC.observe(wait_seconds, api=self.api_name)
+            time.sleep(wait_seconds)
+            return wait_seconds
+
+        return 0
+
+    def record_request(self, response_headers: Optional[Dict] = None):
+        self.limiter.record_request(response_headers)
+
+    def record_response(self, response_headers: Optional[Dict] = None):
+        self.limiter.record_response(response_headers)
+
+    def get_usage_stats(self) -> Dict:
+        return self.limiter.get_usage_stats()
+
+    def __enter__(self):
+        if not self.acquire():
+            raise RateLimitExceeded(self.api_name, self.priority)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
 class RateLimitManager:
     """Manages rate limiters for all APIs."""
 
-    def __init__(self):
-        """Initialize rate limit manager."""
+    def __init__(
+        self,
+        adaptive: bool = False,
+        shared_state_dir: Optional[Path] = None,
+        metrics_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize rate limit manager.
+
+        Args:
+            adaptive: Create limiters in header-driven adaptive mode
+            shared_state_dir: Optional directory of per-API SharedStateFile
+                budgets shared by every process pointing at it
+            metrics_options: BufferedMetricsSink options (sample_rate,
+                flush_every, flush_interval, max_buffer) for the limiters'
+                shared metrics sink
+        """
         self.limiters: Dict[str, RateLimiter] = {}
         self.lock = threading.Lock()
+        self.adaptive = adaptive
+        self.shared_state_dir = Path(shared_state_dir) if shared_state_dir else None
+        self.metrics_options = metrics_options or {}
 
-    def get_limiter(self, api_name: str) -> RateLimiter:
+    def get_limiter(self, api_name: str, priority: Optional[str] = None):
         """
         Get or create rate limiter for API.
 
         Args:
             api_name: Name of API
+            priority: Optional PRIORITY_CLASSES lane ('critical',
+                'interactive', 'normal', 'bulk'). Lanes share one budget.
 
         Returns:
-            RateLimiter instance
+            RateLimiter instance, or a PriorityLane over it if a priority
+            was given
         """
+        if priority is not None:
+            return PriorityLane(self.get_limiter(api_name), priority)
+
         with self.lock:
             if api_name not in self.limiters:
-                self.limiters[api_name] = RateLimiter(api_name)
+                shared_state = None
+                if self.shared_state_dir is not None:
+                    shared_state = SharedStateFile(self.shared_state_dir / f'{api_name}.state')
+                metrics_sink = None
+                if self.metrics_options:
+                    metrics_sink = get_metrics_sink(DEFAULT_METRICS_FILE, **self.metrics_options)
+                self.limiters[api_name] = RateLimiter(
+                    api_name, metrics_sink=metrics_sink, adaptive=self.adaptive, shared_state=shared_state
+                )
             return self.limiters[api_name]
 
     def get_all_stats(self) -> Dict[str, Dict]:
@@ -307,21 +1269,44 @@ class RateLimitManager:
         }
 
 
-# Global rate limit manager
-_rate_limit_manager = RateLimitManager()
+# Global rate limit manager (RATE_LIMIT_ADAPTIVE=1 enables header-driven
+# limits; RATE_LIMIT_STATE_DIR shares budgets across processes;
+# RATE_LIMIT_METRICS_* tune the metrics sink, see METRICS_SINK_ENV)
+_rate_limit_manager = RateLimitManager(
+    adaptive=os.environ.get('RATE_LIMIT_ADAPTIVE') == '1',
+    shared_state_dir=Path(os.environ['RATE_LIMIT_STATE_DIR']) if os.environ.get('RATE_LIMIT_STATE_DIR') else None,
+    metrics_options=metrics_sink_options_from_env()
+)
 
 
-def get_rate_limiter(api_name: str) -> RateLimiter:
+def get_rate_limiter(api_name: str, priority: Optional[str] = None):
     """
     Get rate limiter for specified API.
 
     Args:
         api_name: Name of API ('github', 'claude', 'reddit', etc.)
+        priority: Optional PRIORITY_CLASSES lane
+
+    Returns:
+        RateLimiter instance (PriorityLane if a priority was given)
+    """
+    return _rate_limit_manager.get_limiter(api_name, priority)
+
+
+def get_async_rate_limiter(api_name: str, priority: Optional[str] = None) -> AsyncRateLimiter:
+    """
+    Get an asyncio rate limiter sharing the budget of get_rate_limiter().
+
+    Create one per event loop.
+
+    Args:
+        api_name: Name of API ('github', 'claude', 'reddit', etc.)
+        priority: Optional PRIORITY_CLASSES lane
 
     Returns:
-        RateLimiter instance
+        AsyncRateLimiter instance
     """
-    return _rate_limit_manager.get_limiter(api_name)
+    return AsyncRateLimiter(get_rate_limiter(api_name), priority)
 
 
 def wait_for_rate_limit(api_name: str) -> float:
@@ -11,8 +11,10 @@ Features:
 - Circuit breaker pattern (trips after 5 consecutive failures)
 - Comprehensive error logging
 - Fallback to degraded mode
+- OpenMetrics breaker/retry metrics via metrics_registry
 """
 
+import sys
 import time
 import functools
 import logging
@@ -21,6 +23,9 @@ from enum import Enum
 from typing import Callable, Any, Optional, Dict
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from metrics_registry import REGISTRY
+
 
 # Configure logging
 logging.basicConfig(
@@ -36,6 +41,23 @@ class CircuitState(Enum):
     HALF_OPEN = "half_open"  # Testing if service recovered
 
 
+# OpenMetrics instrumentation (no-op unless METRICS_ENABLED=1)
+BREAKER_TRANSITIONS_METRIC = REGISTRY.counter(
+    'circuit_breaker_transitions', 'Circuit breaker state transitions', ['name', 'state'])
+BREAKER_STATE_METRIC = REGISTRY.gauge(
+    'circuit_breaker_state', 'Current circuit state (0=closed, 1=half_open, 2=open)', ['name'])
+RETRY_ATTEMPTS_METRIC = REGISTRY.counter(
+    'retry_attempts', 'Retries scheduled after a failed call', ['function'])
+RETRY_DELAY_METRIC = REGISTRY.histogram(
+    'retry_delay_seconds', 'Backoff delay before each retry', ['function'])
+
+_STATE_GAUGE_VALUES = {
+    CircuitState.CLOSED: 0,
+    CircuitState.HALF_OPEN: 1,
+    CircuitState.OPEN: 2,
+}
+
+
 class CircuitBreaker:
     """
     Circuit breaker pattern implementation.
@@ -125,6 +147,7 @@ class CircuitBreaker:
         """Transition to HALF_OPEN state to test recovery."""
         self.state = CircuitState.HALF_OPEN
         self.half_open_calls = 0
+        self._record_transition()
         self.logger.info(f"Circuit breaker '{self.name}' entering HALF_OPEN state")
 
     def _on_success(self):
@@ -157,6 +180,7 @@ class CircuitBreaker:
     def _trip(self):
         """Trip circuit breaker to OPEN state."""
         self.state = CircuitState.OPEN
+        self._record_transition()
         self.logger.error(
             f"Circuit breaker '{self.name}' TRIPPED "
             f"({self.failure_count} consecutive failures)"
@@ -171,8 +195,14 @@ class CircuitBreaker:
         self.failure_count = 0
         self.success_count = 0
         self.half_open_calls = 0
+        self._record_transition()
         self.logger.info(f"Circuit breaker '{self.name}' RESET to CLOSED state")
 
+    def _record_transition(self):
+        """Export the new state to the metrics registry."""
+        BREAKER_TRANSITIONS_METRIC.inc(name=self.name, state=self.state.value)
+        BREAKER_STATE_METRIC.set(_STATE_GAUGE_VALUES[self.state], name=self.name)
+
     def _log_trip(self):
         """Log circuit breaker trip event."""
         log_file = Path('compliance/resilience/circuit-breaker-trips.log')
@@ -316,6 +346,8 @@ def _retry_logic(
 
                 # Log detailed error
                 _log_retry_error(func.__name__, attempt, e, delay)
+                RETRY_ATTEMPTS_METRIC.inc(function=func.__name__)
+                RETRY_DELAY_METRIC.observe(delay, function=func.__name__)
 
                 time.sleep(delay)
             else:
@@ -91,19 +91,19 @@ echo ""
 
 # Test 6: Check script structure (without running)
 echo "Test 6: Script functionality check"
-if grep -q "def generate_summary_with_claude" dashboards/ai/scripts/generate_weekly_summary.py; then
+if grep -q "def generate_summary_with_claude" scripts/generate_weekly_summaries.py; then
     echo "✅ PASS: Claude API integration function exists"
 else
     echo "❌ FAIL: Claude API function not found"
 fi
 
-if grep -q "def save_summary" dashboards/ai/scripts/generate_weekly_summary.py; then
+if grep -q "def save_summary" scripts/generate_weekly_summaries.py; then
     echo "✅ PASS: Summary save function exists"
 else
     echo "❌ FAIL: Save function not found"
 fi
 
-if grep -q "def update_readme_with_summary" dashboards/ai/scripts/generate_weekly_summary.py; then
+if grep -q "def update_readme_with_summary" scripts/generate_weekly_summaries.py; then
     echo "✅ PASS: README update function exists"
 else
     echo "❌ FAIL: README update function not found"
@@ -14,6 +14,17 @@ import feedparser
 import requests
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+import feed_stream
+from http_cache import HTTPCache
+from rate_limiter import get_rate_limiter
+
+# User-Agents the dashboard sent before fetches went through HTTPCache
+# (urllib's default 'Python-urllib/3.x' is refused by some feed hosts)
+FEED_HEADERS = {'User-Agent': feedparser.USER_AGENT}
+GITHUB_HEADERS = {'User-Agent': requests.utils.default_user_agent()}
+
 # Optional imports with fallback
 try:
     import praw
@@ -21,6 +32,39 @@ try:
 except ImportError:
     REDDIT_AVAILABLE = False
 
+
+def parse_feed(body: bytes) -> List[Dict[str, str]]:
+    """Feed entries as plain dicts (cacheable across 304 responses)"""
+    feed = feedparser.parse(body)
+    if feed.bozo:  # Feed parsing error
+        raise Exception(f"Feed parsing error: {feed.bozo_exception}")
+
+    return [{
+        'title': entry.title,
+        'link': entry.link,
+        'published': entry.get('published', 'N/A'),
+        'summary': entry.get('summary', '')[:200]
+    } for entry in feed.entries]
+
+
+def feed_parser(limit: int):
+    """Streaming parser for the first limit entries, feedparser for malformed feeds"""
+    def parse(chunks) -> List[Dict[str, str]]:
+        return feed_stream.parse_entries_with_fallback(chunks, parse_feed, limit)
+    parse.__name__ = f'feed_stream:{limit}'
+    return parse
+
+
+def parse_release(body: bytes) -> Dict[str, str]:
+    """Fields of a GitHub latest-release response used by the dashboard"""
+    release = json.loads(body)
+    return {
+        'tag_name': release['tag_name'],
+        'html_url': release['html_url'],
+        'published_at': release['published_at'],
+        'body': (release.get('body') or '')[:200]
+    }
+
 class DashboardUpdater:
     def __init__(self, config_path: str = "dashboards/ai/sources.yaml"):
         with open(config_path, 'r') as f:
@@ -32,6 +76,11 @@ class DashboardUpdater:
         self.cache_file = self.cache_dir / self.config['cache']['filename']
         self.metadata_file = self.cache_dir / self.config['cache']['metadata_filename']
 
+        # Conditional-GET cache: unchanged sources cost one 304 round trip
+        self.http_cache = HTTPCache(
+            Path(self.config['cache'].get('http_directory', '.cache/http/ai'))
+        )
+
         self.updates = []
         self.failures = []
         self.source_count = 0
@@ -46,19 +95,13 @@ class DashboardUpdater:
 
             self.source_count += 1
             try:
-                feed = feedparser.parse(source['url'])
-                if feed.bozo:  # Feed parsing error
-                    raise Exception(f"Feed parsing error: {feed.bozo_exception}")
-
-                for entry in feed.entries[:5]:  # Latest 5 entries
-                    updates.append({
-                        'source': source['name'],
-                        'type': 'rss',
-                        'title': entry.title,
-                        'link': entry.link,
-                        'published': entry.get('published', 'N/A'),
-                        'summary': entry.get('summary', '')[:200]
-                    })
+                entries = self.http_cache.fetch(
+                    source['url'], feed_parser(5), timeout=source.get('timeout', 10),
+                    headers=FEED_HEADERS, stream=True
+                )
+
+                for entry in entries[:5]:  # Latest 5 entries
+                    updates.append({'source': source['name'], 'type': 'rss', **entry})
             except Exception as e:
                 self.failures.append({'source': source['name'], 'error': str(e)})
                 self.failure_count += 1
@@ -69,7 +112,9 @@ class DashboardUpdater:
         """Fetch latest GitHub releases"""
         updates = []
         token = os.environ.get('GITHUB_TOKEN')
-        headers = {'Authorization': f'token {token}'} if token else {}
+        headers = {**GITHUB_HEADERS, 'Authorization': f'token {token}'} if token else GITHUB_HEADERS
+        # Dashboard refreshes are shed before they eat into evidence collection
+        limiter = get_rate_limiter('github', 'bulk')
 
         for source in self.config['sources']['github']:
             if not source['enabled']:
@@ -78,17 +123,17 @@ class DashboardUpdater:
             self.source_count += 1
             try:
                 url = f"https://api.github.com/repos/{source['repo']}/releases/latest"
-                response = requests.get(url, headers=headers, timeout=source['timeout'])
-                response.raise_for_status()
-
-                release = response.json()
+                with limiter:
+                    release = self.http_cache.fetch(
+                        url, parse_release, timeout=source['timeout'], headers=headers
+                    )
                 updates.append({
                     'source': source['name'],
                     'type': 'github',
                     'title': f"Release {release['tag_name']}",
                     'link': release['html_url'],
                     'published': release['published_at'],
-                    'summary': release.get('body', '')[:200]
+                    'summary': release['body']
                 })
             except Exception as e:
                 self.failures.append({'source': source['name'], 'error': str(e)})
@@ -147,20 +192,13 @@ class DashboardUpdater:
             try:
                 # YouTube RSS feed URL
                 url = f"https://www.youtube.com/feeds/videos.xml?channel_id={source['channel_id']}"
-                feed = feedparser.parse(url)
-
-                if feed.bozo:
-                    raise Exception(f"Feed parsing error: {feed.bozo_exception}")
-
-                for entry in feed.entries[:source['limit']]:
-                    updates.append({
-                        'source': source['name'],
-                        'type': 'youtube',
-                        'title': entry.title,
-                        'link': entry.link,
-                        'published': entry.get('published', 'N/A'),
-                        'summary': entry.get('summary', '')[:200]
-                    })
+                entries = self.http_cache.fetch(
+                    url, feed_parser(source['limit']), timeout=source.get('timeout', 10),
+                    headers=FEED_HEADERS, stream=True
+                )
+
+                for entry in entries[:source['limit']]:
+                    updates.append({'source': source['name'], 'type': 'youtube', **entry})
             except Exception as e:
                 self.failures.append({'source': source['name'], 'error': str(e)})
                 self.failure_count += 1
@@ -299,6 +337,7 @@ class DashboardUpdater:
         self.updates.extend(self.fetch_reddit_posts())
         self.updates.extend(self.fetch_youtube_videos())
         self.updates.extend(self.fetch_x_posts())
+        print(self.http_cache.summary())
 
         # Save cache
         self.save_cached_data()
@@ -85,7 +85,7 @@ class TestFallbackClassification:
     def test_timeout_log_classified_as_transient(self, monkeypatch):
         """Path 1: 'timed out' in log → transient + retriable."""
         _strip_api_key(monkeypatch)
-        result = call_claude_api(
+        result, _ = call_claude_api(
             "Step failed: connection timed out after 300s", "wf", "job"
         )
         assert result["category"] == "transient"
@@ -94,7 +94,7 @@ class TestFallbackClassification:
     def test_connection_refused_classified_as_transient(self, monkeypatch):
         """Path 1: 'connection refused' → transient + retriable."""
         _strip_api_key(monkeypatch)
-        result = call_claude_api(
+        result, _ = call_claude_api(
             "dial tcp: connection refused", "wf", "job"
         )
         assert result["category"] == "transient"
@@ -103,7 +103,7 @@ class TestFallbackClassification:
     def test_rate_limit_classified_as_transient(self, monkeypatch):
         """Path 1: '429 too many requests' → transient + retriable."""
         _strip_api_key(monkeypatch)
-        result = call_claude_api(
+        result, _ = call_claude_api(
             "HTTP 429 Too Many Requests - rate limit exceeded", "wf", "job"
         )
         assert result["category"] == "transient"
@@ -112,7 +112,7 @@ class TestFallbackClassification:
     def test_permission_error_classified_as_known_pattern(self, monkeypatch):
         """Path 2: 'permission denied' → known_pattern + not retriable."""
         _strip_api_key(monkeypatch)
-        result = call_claude_api(
+        result, _ = call_claude_api(
             "Error: permission denied for /etc/secrets", "wf", "job"
         )
         assert result["category"] == "known_pattern"
@@ -121,7 +121,7 @@ class TestFallbackClassification:
     def test_403_classified_as_known_pattern(self, monkeypatch):
         """Path 2: '403 unauthorized' → known_pattern."""
         _strip_api_key(monkeypatch)
-        result = call_claude_api(
+        result, _ = call_claude_api(
             "HTTP 403 Forbidden: unauthorized access", "wf", "job"
         )
         assert result["category"] == "known_pattern"
@@ -130,7 +130,7 @@ class TestFallbackClassification:
     def test_syntax_error_classified_as_known_pattern(self, monkeypatch):
         """Path 2: 'syntax error' → known_pattern + not retriable."""
         _strip_api_key(monkeypatch)
-        result = call_claude_api(
+        result, _ = call_claude_api(
             "SyntaxError: invalid syntax at line 42", "wf", "job"
         )
         assert result["category"] == "known_pattern"
@@ -139,7 +139,7 @@ class TestFallbackClassification:
     def test_unrecognized_error_classified_as_unknown(self, monkeypatch):
         """Path 3: unrecognized log content → unknown + not retriable."""
         _strip_api_key(monkeypatch)
-        result = call_claude_api(
+        result, _ = call_claude_api(
             "Segmentation fault (core dumped) at address 0xdeadbeef", "wf", "job"
         )
         assert result["category"] == "unknown"
@@ -155,7 +155,7 @@ class TestFallbackClassification:
             "syntax error",
             "something completely unrecognized xyz",
         ]:
-            result = call_claude_api(log, "wf", "job")
+            result, _ = call_claude_api(log, "wf", "job")
             for field in REQUIRED_FIELDS:
                 assert field in result, f"Missing field '{field}' for log: {log!r}"
 
@@ -163,7 +163,7 @@ class TestFallbackClassification:
         """Fallback category must be one of the three valid values."""
         _strip_api_key(monkeypatch)
         for log in ["timeout", "403", "syntax error", "alien invasion"]:
-            result = call_claude_api(log, "wf", "job")
+            result, _ = call_claude_api(log, "wf", "job")
             assert result["category"] in VALID_CATEGORIES, (
                 f"Invalid category {result['category']!r} for log {log!r}"
             )
@@ -196,7 +196,7 @@ class TestClaudeAPIPath:
         }
         mock_client = self._make_mock_client(expected)
         with patch("anthropic.Anthropic", return_value=mock_client):
-            result = call_claude_api("some log", "wf", "job")
+            result, _ = call_claude_api("some log", "wf", "job")
         assert result["category"] == "transient"
         assert result["is_retriable"] is True
 
@@ -212,7 +212,7 @@ class TestClaudeAPIPath:
         }
         mock_client = self._make_mock_client(expected)
         with patch("anthropic.Anthropic", return_value=mock_client):
-            result = call_claude_api("some log", "wf", "job")
+            result, _ = call_claude_api("some log", "wf", "job")
         assert result["category"] == "known_pattern"
         assert result["is_retriable"] is False
 
@@ -228,7 +228,7 @@ class TestClaudeAPIPath:
         }
         mock_client = self._make_mock_client(expected)
         with patch("anthropic.Anthropic", return_value=mock_client):
-            result = call_claude_api("some log", "wf", "job")
+            result, _ = call_claude_api("some log", "wf", "job")
         assert result["category"] == "unknown"
 
     def test_claude_api_exception_falls_back_to_pattern(self, monkeypatch):
@@ -237,7 +237,7 @@ class TestClaudeAPIPath:
         mock_client = MagicMock()
         mock_client.messages.create.side_effect = Exception("API error")
         with patch("anthropic.Anthropic", return_value=mock_client):
-            result = call_claude_api("connection timed out", "wf", "job")
+            result, _ = call_claude_api("connection timed out", "wf", "job")
         # Should have fallen back to pattern matching
         assert result["category"] == "transient"
 
@@ -250,7 +250,7 @@ class TestClaudeAPIPath:
         }
         mock_client = self._make_mock_client(incomplete)
         with patch("anthropic.Anthropic", return_value=mock_client):
-            result = call_claude_api("connection timed out", "wf", "job")
+            result, _ = call_claude_api("connection timed out", "wf", "job")
         # Fell back to pattern match; result must still have all required fields
         for field in REQUIRED_FIELDS:
             assert field in result
@@ -0,0 +1,299 @@
+"""
+Unit tests for dashboards/ai/scripts/update_dashboard.py
+Requirement: NFR-2.2 — the AI dashboard refresh fetches sources concurrently
+             under per-host caps and a deadline, reads only article heads
+             and merges items incrementally.
+"""
+
+import importlib.util
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+import yaml
+
+pytest.importorskip("feedparser")
+pytest.importorskip("requests")
+
+# ---------------------------------------------------------------------------
+# Load module under test
+# ---------------------------------------------------------------------------
+_SCRIPT = Path(__file__).parents[3] / "dashboards" / "ai" / "scripts" / "update_dashboard.py"
+_spec = importlib.util.spec_from_file_location("ai_update_dashboard", _SCRIPT)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+NOW_TS = _mod._utc_epoch(datetime.utcnow())
+
+
+def _updater(tmp_path, **fetch):
+    config = {
+        "sources": {},
+        "fetch": fetch,
+        "cache": {
+            "directory": str(tmp_path / "cache"),
+            "filename": "cache.json",
+            "metadata_filename": "metadata.json",
+            "http_directory": str(tmp_path / "http"),
+            "article_metadata": str(tmp_path / "http" / "article-metadata.json"),
+        },
+        "degradation": {"warning_threshold": 0.5, "cache_max_age_hours": 24},
+    }
+    path = tmp_path / "sources.yaml"
+    path.write_text(yaml.safe_dump(config))
+    return _mod.DashboardUpdater(config_path=str(path))
+
+
+def _item(n, age_days=0, link=None):
+    return {"source": "feed", "type": "rss", "title": f"Item {n}",
+            "link": link or f"https://example.com/{n}", "published": "",
+            "published_ts": NOW_TS - age_days * 86400}
+
+
+class _Concurrency:
+    """Counts how many fetches of a group run at once."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def fetch(self, result, seconds=0.05):
+        def run():
+            with self.lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            time.sleep(seconds)
+            with self.lock:
+                self.running -= 1
+            return result
+        return run
+
+
+# ---------------------------------------------------------------------------
+# TestFetchAllConcurrent
+# ---------------------------------------------------------------------------
+
+class TestFetchAllConcurrent:
+    """Bounded fan-out with per-host caps and a global deadline."""
+
+    def test_results_in_config_order(self, tmp_path, monkeypatch):
+        updater = _updater(tmp_path)
+        jobs = [(f"s{i}", f"host{i}", _Concurrency().fetch([_item(i)], 0.05 - i * 0.01)) for i in range(4)]
+        monkeypatch.setattr(updater, "_source_jobs", lambda: jobs)
+        updates = updater.fetch_all_concurrent()
+        assert [u["title"] for u in updates] == ["Item 0", "Item 1", "Item 2", "Item 3"]
+        assert (updater.source_count, updater.failure_count) == (4, 0)
+
+    def test_per_host_cap(self, tmp_path, monkeypatch):
+        updater = _updater(tmp_path, max_workers=8, per_host=2)
+        same_host, other_hosts = _Concurrency(), _Concurrency()
+        jobs = [(f"a{i}", "a.example", same_host.fetch([])) for i in range(6)]
+        jobs += [(f"b{i}", f"b{i}.example", other_hosts.fetch([])) for i in range(4)]
+        monkeypatch.setattr(updater, "_source_jobs", lambda: jobs)
+        updater.fetch_all_concurrent()
+        assert same_host.peak == 2
+        assert other_hosts.peak > 1
+
+    def test_reddit_serialized(self, tmp_path, monkeypatch):
+        updater = _updater(tmp_path, per_host=4)
+        reddit = _Concurrency()
+        jobs = [(f"r{i}", _mod.REDDIT_HOST, reddit.fetch([])) for i in range(3)]
+        monkeypatch.setattr(updater, "_source_jobs", lambda: jobs)
+        updater.fetch_all_concurrent()
+        assert reddit.peak == 1
+
+    def test_source_error_recorded(self, tmp_path, monkeypatch):
+        updater = _updater(tmp_path)
+
+        def broken():
+            raise ValueError("bad feed")
+
+        jobs = [("ok", "a", lambda: [_item(1)]), ("broken", "b", broken)]
+        monkeypatch.setattr(updater, "_source_jobs", lambda: jobs)
+        assert len(updater.fetch_all_concurrent()) == 1
+        assert updater.failures == [{"source": "broken", "error": "bad feed"}]
+
+    def test_deadline_abandons_and_cancels(self, tmp_path, monkeypatch):
+        updater = _updater(tmp_path, max_workers=1, deadline_seconds=0.2)
+        release = threading.Event()
+        started = []
+
+        def slow():
+            started.append("slow")
+            release.wait(5)
+            return [_item(1)]
+
+        def queued():
+            started.append("queued")
+            return [_item(2)]
+
+        jobs = [("slow", "a", slow), ("queued", "b", queued)]
+        monkeypatch.setattr(updater, "_source_jobs", lambda: jobs)
+        began = time.monotonic()
+        try:
+            assert updater.fetch_all_concurrent() == []
+            assert time.monotonic() - began < 2
+        finally:
+            release.set()
+        assert [f["source"] for f in updater.failures] == ["slow", "queued"]
+        assert "deadline" in updater.failures[0]["error"]
+        assert started == ["slow"]  # cancel_futures: the queued source never ran
+        assert updater._deadline_passed.is_set()
+
+    def test_straggling_sitemap_stops_and_cannot_write_cache(self, tmp_path, monkeypatch):
+        updater = _updater(tmp_path, deadline_seconds=0.2)
+        entries = [{"loc": f"https://example.com/news/{i}", "lastmod": "2099-01-01"} for i in range(3)]
+        monkeypatch.setattr(updater, "_get_parsed", lambda *args, **kwargs: entries)
+        release = threading.Event()
+        fetched = []
+
+        def metadata(url, timeout):
+            fetched.append(url)
+            release.wait(5)
+            return {"title": "late", "description": ""}
+
+        monkeypatch.setattr(updater, "_fetch_article_metadata", metadata)
+        source = {"name": "news", "sitemap_url": "https://example.com/sitemap.xml", "limit": 3}
+        monkeypatch.setattr(updater, "_source_jobs", lambda: [
+            ("news", "example.com", lambda: updater._fetch_sitemap_source(source))])
+
+        assert updater.fetch_all_concurrent() == []
+        updater.article_cache.save()
+        release.set()
+        time.sleep(0.1)
+        assert len(fetched) == 1
+        assert updater.article_cache.entries == {}
+        assert json.loads(Path(updater.article_cache.path).read_text()) == {}
+
+
+# ---------------------------------------------------------------------------
+# TestReadHead
+# ---------------------------------------------------------------------------
+
+class TestReadHead:
+    """Article pages are read only up to </head>."""
+
+    def test_stops_at_head_across_chunks(self):
+        consumed = []
+
+        def chunks():
+            for chunk in (b"<html><head><title>x</ti", b"tle></HE", b"AD><body>", b"rest"):
+                consumed.append(chunk)
+                yield chunk
+
+        assert _mod.read_head(chunks()) == b"<html><head><title>x</title></HEAD>"
+        assert len(consumed) == 3
+
+    def test_capped_without_head_end(self):
+        assert _mod.read_head(iter([b"a" * 10] * 5), limit=25) == b"a" * 25
+
+    def test_og_metadata(self):
+        html = ('<meta property="og:title" content="Launch" />'
+                '<meta content="A new model" property="og:description">')
+        assert _mod.extract_og_metadata(html) == {"title": "Launch", "description": "A new model"}
+
+
+# ---------------------------------------------------------------------------
+# TestArticleMetadataCache
+# ---------------------------------------------------------------------------
+
+class TestArticleMetadataCache:
+    """og metadata is reused until the sitemap lastmod changes."""
+
+    def test_round_trip_and_lastmod_invalidation(self, tmp_path):
+        path = tmp_path / "articles.json"
+        cache = _mod.ArticleMetadataCache(path)
+        cache.put("https://a", "2026-03-01", {"title": "A", "description": "d"})
+        cache.save()
+        reloaded = _mod.ArticleMetadataCache(path)
+        assert reloaded.get("https://a", "2026-03-01") == {"title": "A", "description": "d"}
+        assert reloaded.get("https://a", "2026-03-02") is None
+        assert reloaded.get("https://b", "2026-03-01") is None
+
+    def test_save_drops_unseen_entries(self, tmp_path):
+        path = tmp_path / "articles.json"
+        cache = _mod.ArticleMetadataCache(path, max_age_days=30)
+        cache.put("https://old", "x", {"title": "", "description": ""})
+        cache.put("https://new", "x", {"title": "", "description": ""})
+        cache.entries["https://old"]["seen"] = (datetime.utcnow() - timedelta(days=31)).isoformat()
+        cache.save()
+        assert list(json.loads(path.read_text())) == ["https://new"]
+
+    def test_put_after_save_ignored(self, tmp_path):
+        cache = _mod.ArticleMetadataCache(tmp_path / "articles.json")
+        cache.save()
+        cache.put("https://late", "x", {"title": "", "description": ""})
+        assert cache.entries == {}
+
+    def test_corrupt_file_starts_empty(self, tmp_path):
+        path = tmp_path / "articles.json"
+        path.write_text("{not json")
+        assert _mod.ArticleMetadataCache(path).entries == {}
+
+
+# ---------------------------------------------------------------------------
+# TestSeenItemStore
+# ---------------------------------------------------------------------------
+
+class TestSeenItemStore:
+    """Only unseen items are appended; expired ones leave the window."""
+
+    def test_merge_appends_only_unseen(self, tmp_path):
+        path = tmp_path / "seen.jsonl"
+        store = _mod.SeenItemStore(path)
+        cutoff = NOW_TS - 30 * 86400
+        assert len(store.merge([_item(1), _item(2, age_days=1)], cutoff)) == 2
+        assert len(store.merge([_item(1), _item(3, age_days=2)], cutoff)) == 1
+        assert len(path.read_text().splitlines()) == 3
+
+    def test_merge_skips_items_older_than_cutoff(self, tmp_path):
+        store = _mod.SeenItemStore(tmp_path / "seen.jsonl")
+        assert store.merge([_item(1, age_days=40)], NOW_TS - 30 * 86400) == []
+
+    def test_window_newest_first_without_id(self, tmp_path):
+        store = _mod.SeenItemStore(tmp_path / "seen.jsonl")
+        store.merge([_item(1, age_days=3), _item(2), _item(3, age_days=1)], 0)
+        window = store.window()
+        assert [u["title"] for u in window] == ["Item 2", "Item 3", "Item 1"]
+        assert "id" not in window[0]
+
+    def test_reload_from_log(self, tmp_path):
+        path = tmp_path / "seen.jsonl"
+        _mod.SeenItemStore(path).merge([_item(1), _item(2, age_days=1)], 0)
+        with open(path, "a") as f:
+            f.write('{"partial')
+        store = _mod.SeenItemStore(path)
+        assert [u["title"] for u in store.window()] == ["Item 1", "Item 2"]
+        assert store.merge([_item(1)], 0) == []
+
+    def test_item_id_falls_back_to_source_and_title(self):
+        a = {"source": "feed", "title": "Same", "link": ""}
+        assert _mod.SeenItemStore.item_id(a) == _mod.SeenItemStore.item_id(dict(a))
+        assert _mod.SeenItemStore.item_id(a) != _mod.SeenItemStore.item_id({**a, "title": "Other"})
+
+    def test_expire_and_compact(self, tmp_path):
+        path = tmp_path / "seen.jsonl"
+        store = _mod.SeenItemStore(path)
+        store.merge([_item(i, age_days=20) for i in range(150)] + [_item("fresh")], 0)
+        store.expire(NOW_TS - 10 * 86400)
+        assert [u["title"] for u in store.window()] == ["Item fresh"]
+        # 151 log lines for 1 live item: the log is rewritten
+        assert store.log_lines == 1
+        assert len(path.read_text().splitlines()) == 1
+
+    def test_expire_without_compaction(self, tmp_path):
+        path = tmp_path / "seen.jsonl"
+        store = _mod.SeenItemStore(path)
+        store.merge([_item(1, age_days=20), _item(2)], 0)
+        store.expire(NOW_TS - 10 * 86400)
+        assert len(store.items) == 1
+        assert len(path.read_text().splitlines()) == 2
@@ -0,0 +1,228 @@
+"""
+Unit tests for scripts/analyze_rate_limits.py
+Requirement: NFR-6.1 — rate limit compliance reporting over day-partitioned,
+             indexed metrics files.
+"""
+
+import importlib.util
+import json
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Load module under test
+# ---------------------------------------------------------------------------
+_SCRIPT = Path(__file__).parents[3] / "scripts" / "analyze_rate_limits.py"
+_spec = importlib.util.spec_from_file_location("analyze_rate_limits", _SCRIPT)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+NOW = datetime.utcnow()
+
+
+def _ts(days_ago, hours=0):
+    return (NOW - timedelta(days=days_ago, hours=hours)).isoformat()
+
+
+def _write(path, records):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def _usage(days_ago, api="github", total=1):
+    return {"timestamp": _ts(days_ago), "api": api, "total_requests": total,
+            "throttled_requests": 0, "violations": 0}
+
+
+def _day(days_ago):
+    return (NOW - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+
+
+# ---------------------------------------------------------------------------
+# TestOffsetIndex
+# ---------------------------------------------------------------------------
+
+class TestOffsetIndex:
+    """Sidecar index maps each day to the byte offset of its first line."""
+
+    def test_offsets_point_at_first_line_of_day(self, tmp_path):
+        path = tmp_path / "api-usage.jsonl"
+        _write(path, [_usage(3), _usage(3), _usage(1)])
+        index = _mod.OffsetIndex(path).update()
+        with open(path, "rb") as f:
+            f.seek(index.offset_for(_day(2)))
+            assert json.loads(f.readline())["timestamp"].startswith(_day(1))
+
+    def test_update_is_incremental_and_persisted(self, tmp_path):
+        path = tmp_path / "api-usage.jsonl"
+        _write(path, [_usage(3)])
+        first = _mod.OffsetIndex(path).update()
+        _write(path, [_usage(1)])
+        reloaded = _mod.OffsetIndex(path)
+        assert reloaded.size == first.size
+        reloaded.update()
+        assert set(reloaded.days) == {_day(3), _day(1)}
+
+    def test_partial_trailing_line_not_indexed(self, tmp_path):
+        path = tmp_path / "api-usage.jsonl"
+        _write(path, [_usage(1)])
+        with open(path, "a") as f:
+            f.write('{"timestamp": "')
+        index = _mod.OffsetIndex(path).update()
+        assert index.size < path.stat().st_size
+
+    def test_truncated_file_rebuilds(self, tmp_path):
+        path = tmp_path / "api-usage.jsonl"
+        _write(path, [_usage(3), _usage(2)])
+        _mod.OffsetIndex(path).update()
+        path.write_text("")
+        _write(path, [_usage(1)])
+        index = _mod.OffsetIndex(path).update()
+        assert index.days == {_day(1): 0}
+
+    def test_replaced_file_larger_than_index_rebuilds(self, tmp_path):
+        path = tmp_path / "api-usage.jsonl"
+        _write(path, [_usage(3)])
+        _mod.OffsetIndex(path).update()
+        path.write_text("")
+        _write(path, [_usage(1)] * 5)
+        assert _mod.OffsetIndex(path).update().days == {_day(1): 0}
+
+
+# ---------------------------------------------------------------------------
+# TestRotation
+# ---------------------------------------------------------------------------
+
+class TestRotation:
+    """Completed days move into per-day partitions."""
+
+    def test_rotate_moves_completed_days(self, tmp_path):
+        path = tmp_path / "api-usage.jsonl"
+        _write(path, [_usage(2), _usage(1), _usage(0)])
+        moved = _mod.rotate_metrics_file(path, before=_day(0))
+        assert moved == 2
+        assert [d for d, _ in _mod.list_partitions(path)] == [_day(2), _day(1)]
+        assert len(path.read_text().splitlines()) == 1
+
+    def test_rotate_appends_to_existing_partition(self, tmp_path):
+        path = tmp_path / "api-usage.jsonl"
+        _write(path, [_usage(1)])
+        _mod.rotate_metrics_file(path, before=_day(0))
+        _write(path, [_usage(1)])
+        _mod.rotate_metrics_file(path, before=_day(0))
+        partition = _mod.partition_path(path, _day(1))
+        assert len(partition.read_text().splitlines()) == 2
+
+    def test_rotate_then_larger_file_reindexed(self, tmp_path):
+        path = tmp_path / "api-usage.jsonl"
+        _write(path, [_usage(2)] * 5)
+        _mod.rotate_metrics_file(path, before=_day(2))  # keeps the 5 lines, indexed
+        _write(path, [_usage(1)] * 50)
+        _mod.rotate_metrics_file(path, before=_day(1))  # keeps 50 lines: larger than before
+        assert _mod.OffsetIndex(path).update().days == {_day(1): 0}
+        records = list(_mod.iter_metrics(path, datetime.strptime(_day(1), "%Y-%m-%d")))
+        assert len(records) == 50
+
+    def test_rotate_keeps_concurrent_appends(self, tmp_path):
+        path = tmp_path / "api-usage.jsonl"
+        _write(path, [_usage(1)] * 200)
+        sink = sys.modules["rate_limiter"].FileMetricsSink(path)
+        writer = threading.Thread(target=lambda: [sink.emit(_usage(0)) for _ in range(300)])
+        writer.start()
+        while writer.is_alive():
+            _mod.rotate_metrics_file(path, before=_day(0))
+        writer.join()
+        assert len(path.read_text().splitlines()) == 300
+        assert len(_mod.partition_path(path, _day(1)).read_text().splitlines()) == 200
+
+
+# ---------------------------------------------------------------------------
+# TestIterMetrics
+# ---------------------------------------------------------------------------
+
+class TestIterMetrics:
+    """Only records inside the window are read."""
+
+    def test_skips_old_partitions_without_opening(self, tmp_path):
+        path = tmp_path / "api-usage.jsonl"
+        _write(path, [_usage(30), _usage(2)])
+        _mod.rotate_metrics_file(path, before=_day(0))
+        old = _mod.partition_path(path, _day(30))
+        old.write_text("not json\n")  # would fail to decode if it were read
+        records = list(_mod.iter_metrics(path, NOW - timedelta(days=7)))
+        assert len(records) == 1
+
+    def test_cutoff_day_filtered_by_time(self, tmp_path):
+        path = tmp_path / "api-usage.jsonl"
+        cutoff = NOW - timedelta(days=7)
+        _write(path, [
+            {"timestamp": (cutoff - timedelta(seconds=1)).isoformat(), "api": "a"},
+            {"timestamp": (cutoff + timedelta(seconds=1)).isoformat(), "api": "b"},
+        ])
+        assert [r["api"] for r in _mod.iter_metrics(path, cutoff)] == ["b"]
+
+    def test_reads_partitions_then_active(self, tmp_path):
+        path = tmp_path / "api-usage.jsonl"
+        _write(path, [_usage(2, api="old"), _usage(0, api="new")])
+        _mod.rotate_metrics_file(path, before=_day(0))
+        apis = [r["api"] for r in _mod.iter_metrics(path, NOW - timedelta(days=7))]
+        assert apis == ["old", "new"]
+
+
+# ---------------------------------------------------------------------------
+# TestRateLimitAnalyzer
+# ---------------------------------------------------------------------------
+
+class TestRateLimitAnalyzer:
+    """Streaming aggregates produce the same report structure."""
+
+    def test_api_usage_within_window(self, tmp_path):
+        _write(tmp_path / "api-usage.jsonl", [
+            _usage(30, total=100), _usage(2, total=3), _usage(1, api="claude", total=2),
+        ])
+        analyzer = _mod.RateLimitAnalyzer(tmp_path)
+        analyzer.load_metrics(days=7)
+        stats = analyzer.analyze_api_usage()
+        assert stats["github"]["total_requests"] == 3
+        assert stats["claude"]["total_requests"] == 2
+
+    def test_github_usage(self, tmp_path):
+        _write(tmp_path / "github-rate-limit.jsonl", [
+            {"timestamp": _ts(2), "core": {"limit": 5000, "used": 1000, "remaining": 4000}},
+            {"timestamp": _ts(1), "core": {"limit": 5000, "used": 3000, "remaining": 2000}},
+        ])
+        analyzer = _mod.RateLimitAnalyzer(tmp_path)
+        analyzer.load_metrics(days=7)
+        stats = analyzer.analyze_github_usage()
+        assert stats["current_used"] == 3000
+        assert stats["avg_used"] == 2000
+        assert stats["samples"] == 2
+
+    def test_violations_keep_most_recent(self, tmp_path):
+        _write(tmp_path / "violations.jsonl", [
+            {"timestamp": _ts(1, hours=i), "api": "github"} for i in range(15, 0, -1)
+        ])
+        analyzer = _mod.RateLimitAnalyzer(tmp_path)
+        analyzer.load_metrics(days=7)
+        stats = analyzer.analyze_violations()
+        assert stats["total"] == 15
+        assert stats["compliant"] is False
+        assert len(stats["violations"]) == _mod.RECENT_VIOLATIONS
+        assert stats["violations"][-1]["timestamp"] == _ts(1, hours=1)
+
+    def test_report_after_rotation(self, tmp_path):
+        _write(tmp_path / "api-usage.jsonl", [_usage(2), _usage(0)])
+        analyzer = _mod.RateLimitAnalyzer(tmp_path)
+        analyzer.rotate(before=_day(0))
+        report = analyzer.generate_report(days=7)
+        assert "Total Requests: 2" in report
+        assert "✅ COMPLIANT" in report
@@ -0,0 +1,189 @@
+"""
+Unit tests for scripts/classification_cache.py
+Requirement: FR-9.2 — repeat failures are classified from a content-addressed
+             cache (no API call); the hit rate is reported in metadata.
+"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Load modules under test
+# ---------------------------------------------------------------------------
+_SCRIPTS = Path(__file__).parents[3] / "scripts"
+_spec = importlib.util.spec_from_file_location("classification_cache", _SCRIPTS / "classification_cache.py")
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+_clf_spec = importlib.util.spec_from_file_location("classify_failure_logs", _SCRIPTS / "classify-failure-logs.py")
+clf = importlib.util.module_from_spec(_clf_spec)
+_clf_spec.loader.exec_module(clf)
+
+LOG_RUN_1 = """2026-03-02T10:15:01.1234567Z ##[group]Run actions/checkout@8e5e7e5ab8b370d6c329ec480221332ada57f0ab
+2026-03-02T10:15:09.0000000Z fatal: unable to access 'https://github.com/org/repo/': Connection timed out
+2026-03-02T10:15:09.5000000Z request id 3f2a9c1e-6b7d-4e8f-9a0b-1c2d3e4f5a6b, run 13584412290 job 38001122334
+"""
+LOG_RUN_2 = """2026-03-09T22:41:55.7654321Z ##[group]Run actions/checkout@11bd71901bbe5b1630ceea73d27597364c9af683
+2026-03-09T22:42:07.0000000Z fatal: unable to access 'https://github.com/org/repo/': Connection timed out
+2026-03-09T22:42:07.2500000Z request id 0aa1bb22-cc33-4d44-8e55-66ff77889900, run 13712000001 job 38555000111
+"""
+
+CLAUDE_RESULT = {
+    "category": "transient",
+    "pattern": "git fetch connection timeout",
+    "is_retriable": True,
+    "root_cause": "GitHub was unreachable from the runner.",
+    "suggested_fix": "Retry the job.",
+}
+
+
+class _Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+# ---------------------------------------------------------------------------
+# TestFingerprint
+# ---------------------------------------------------------------------------
+
+class TestFingerprint:
+    """Per-run noise does not change the key; the failure text does."""
+
+    def test_noise_stripped(self):
+        normalized = _mod.normalize_log(LOG_RUN_1)
+        assert "<ts>" in normalized and "<uuid>" in normalized and "<id>" in normalized
+        assert "checkout@<hex>" in normalized
+        assert "13584412290" not in normalized
+
+    def test_same_failure_other_run_same_key(self):
+        assert _mod.fingerprint(LOG_RUN_1) == _mod.fingerprint(LOG_RUN_2)
+
+    def test_different_failure_different_key(self):
+        other = LOG_RUN_2.replace("Connection timed out", "Permission denied")
+        assert _mod.fingerprint(LOG_RUN_1) != _mod.fingerprint(other)
+
+    def test_namespace_changes_key(self):
+        assert _mod.fingerprint(LOG_RUN_1, "model-a") != _mod.fingerprint(LOG_RUN_1, "model-b")
+
+    def test_words_and_short_numbers_kept(self):
+        normalized = _mod.normalize_log("exit code 137 in   feedface step 42")
+        assert normalized == "exit code 137 in feedface step 42"
+
+
+# ---------------------------------------------------------------------------
+# TestClassificationCache
+# ---------------------------------------------------------------------------
+
+class TestClassificationCache:
+    """Entries persist across instances, expire after the TTL and count hits."""
+
+    def test_round_trip_and_stats(self, tmp_path):
+        path = tmp_path / "cache.json"
+        cache = _mod.ClassificationCache(path)
+        assert cache.get("k") is None
+        cache.put("k", dict(CLAUDE_RESULT, metadata={"run_id": "1"}))
+        cache.save()
+
+        reloaded = _mod.ClassificationCache(path)
+        assert reloaded.get("k") == CLAUDE_RESULT
+        info = reloaded.info("k", hit=True)
+        assert (info["hits"], info["misses"], info["hit_rate"]) == (1, 1, 0.5)
+        assert info["entries"] == 1
+
+    def test_ttl_eviction(self, tmp_path):
+        clock = _Clock()
+        cache = _mod.ClassificationCache(tmp_path / "c.json", ttl_seconds=60, clock=clock)
+        cache.put("old", CLAUDE_RESULT)
+        clock.now += 30
+        cache.put("new", CLAUDE_RESULT)
+        clock.now += 45
+        assert cache.get("old") is None
+        assert cache.get("new") == CLAUDE_RESULT
+        cache.save()
+        stored = json.loads((tmp_path / "c.json").read_text())
+        assert list(stored["entries"]) == ["new"]
+
+    def test_expired_entries_dropped_on_load(self, tmp_path):
+        clock = _Clock()
+        cache = _mod.ClassificationCache(tmp_path / "c.json", ttl_seconds=60, clock=clock)
+        cache.put("k", CLAUDE_RESULT)
+        cache.save()
+        clock.now += 61
+        assert _mod.ClassificationCache(tmp_path / "c.json", ttl_seconds=60, clock=clock).entries == {}
+
+    def test_corrupt_file_starts_empty(self, tmp_path):
+        path = tmp_path / "c.json"
+        path.write_text("{not json")
+        assert _mod.ClassificationCache(path).entries == {}
+
+
+# ---------------------------------------------------------------------------
+# TestClassifyWithCache
+# ---------------------------------------------------------------------------
+
+class TestClassifyWithCache:
+    """classify-failure-logs.py --cache-file skips the API for repeat failures."""
+
+    def _run(self, monkeypatch, tmp_path, log, run_id):
+        log_file = tmp_path / f"{run_id}.log"
+        log_file.write_text(log)
+        output = tmp_path / f"{run_id}.json"
+        monkeypatch.setattr(sys, "argv", [
+            "clf", "--log-file", str(log_file), "--workflow-name", "CI",
+            "--job-name", "build", "--run-id", run_id, "--output", str(output),
+            "--cache-file", str(tmp_path / "cache" / "classifications.json"),
+        ])
+        with pytest.raises(SystemExit):
+            clf.main()
+        return json.loads(output.read_text())
+
+    def test_repeat_failure_hits_cache(self, monkeypatch, tmp_path):
+        with patch.object(clf, "call_claude_api", return_value=(dict(CLAUDE_RESULT), clf.CLAUDE_SOURCE)) as api:
+            first = self._run(monkeypatch, tmp_path, LOG_RUN_1, "1")
+            second = self._run(monkeypatch, tmp_path, LOG_RUN_2, "2")
+        assert api.call_count == 1
+        assert second["pattern"] == CLAUDE_RESULT["pattern"]
+        assert first["metadata"]["cache"]["hit"] is False
+        assert second["metadata"]["cache"]["hit"] is True
+        assert second["metadata"]["cache"]["hit_rate"] == 0.5
+        assert second["metadata"]["run_id"] == "2"
+
+    def test_fallback_result_not_cached(self, monkeypatch, tmp_path):
+        with patch.object(clf, "call_claude_api",
+                          side_effect=lambda log, *a, **k: (clf.fallback_classification(log),
+                                                              clf.FALLBACK_SOURCE)) as api:
+            self._run(monkeypatch, tmp_path, LOG_RUN_1, "1")
+            data = self._run(monkeypatch, tmp_path, LOG_RUN_2, "2")
+        assert api.call_count == 2
+        assert data["metadata"]["cache"]["entries"] == 0
+
+    def test_claude_answer_matching_fallback_cached(self, monkeypatch, tmp_path):
+        with patch.object(clf, "call_claude_api",
+                          side_effect=lambda log, *a, **k: (clf.fallback_classification(log),
+                                                              clf.CLAUDE_SOURCE)) as api:
+            self._run(monkeypatch, tmp_path, LOG_RUN_1, "1")
+            data = self._run(monkeypatch, tmp_path, LOG_RUN_2, "2")
+        assert api.call_count == 1
+        assert data["metadata"]["cache"]["hit"] is True
+
+    def test_no_cache_without_flag(self, monkeypatch, tmp_path):
+        monkeypatch.delenv("CLASSIFY_CACHE_FILE", raising=False)
+        log_file = tmp_path / "x.log"
+        log_file.write_text(LOG_RUN_1)
+        output = tmp_path / "x.json"
+        monkeypatch.setattr(sys, "argv", [
+            "clf", "--log-file", str(log_file), "--workflow-name", "CI",
+            "--job-name", "build", "--run-id", "1", "--output", str(output),
+        ])
+        with patch.object(clf, "call_claude_api", return_value=(dict(CLAUDE_RESULT), clf.CLAUDE_SOURCE)):
+            with pytest.raises(SystemExit):
+                clf.main()
+        assert "cache" not in json.loads(output.read_text())["metadata"]
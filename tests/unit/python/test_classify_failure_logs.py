@@ -2,7 +2,9 @@
 P1-003 — classify-failure-logs.py Unit Tests (FR-9.2)
 
 Coverage:
-- truncate_log: short log passthrough, long log truncation, prefix added
+- truncate_log: short log passthrough, long log truncation, prefix added,
+  100-line cap, oversized single line
+- read_log_tail: file excerpt equals truncate_log, reads only the tail
 - call_claude_api: successful mock API response, markdown code-block stripping,
   missing-field triggers fallback, exception triggers fallback
 - Fallback classification: transient (timeout), transient (rate-limit),
@@ -10,11 +12,15 @@ Coverage:
 - API unavailable: no ANTHROPIC_API_KEY, anthropic import error
 - validate_classification: valid, missing field, bad category, non-bool is_retriable
 - Constants: REQUIRED_FIELDS, VALID_CATEGORIES
+- Batch mode (--batch): directory/manifest jobs, one call per distinct
+  fingerprint, bounded concurrency, shared client and limiter, JSONL output
 """
 
 import json
 import os
 import sys
+import threading
+import time
 import importlib.util
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -83,6 +89,77 @@ class TestTruncateLog:
         result = clf.truncate_log(big_log, max_bytes=50000)
         assert result.startswith("[LOG TRUNCATED")
 
+    def test_keeps_last_100_lines(self):
+        big_log = "\n".join(f"line{i:04d}" + "x" * 40 for i in range(2000))
+        result = clf.truncate_log(big_log, max_bytes=50000)
+        assert result.startswith("[LOG TRUNCATED - Last 100 lines]\n\nline1900")
+        assert result.endswith("line1999" + "x" * 40)
+
+    def test_single_oversized_line_keeps_its_tail(self):
+        result = clf.truncate_log("ab" + "é" * 30000, max_bytes=50000)
+        body = result.split("\n\n", 1)[1]
+        assert len(result.encode("utf-8")) <= 50000
+        assert body and set(body) == {"é"}  # cut on a character boundary, not emptied
+
+
+# ---------------------------------------------------------------------------
+# TestReadLogTail
+# ---------------------------------------------------------------------------
+
+class TestReadLogTail:
+    """File excerpts read from the end match truncate_log() on the whole text."""
+
+    @pytest.mark.parametrize("content", [
+        "short log\n",
+        ("x" * 1000 + "\n") * 60,
+        "\n".join(f"step {i} ✓" for i in range(20000)),
+        "no newline " * 6000,
+        "é" * 40000 + "\nfinal error\n",
+    ])
+    def test_matches_truncate_log(self, tmp_path, content):
+        log_file = tmp_path / "job.log"
+        log_file.write_bytes(content.encode("utf-8"))
+        excerpt, size = clf.read_log_tail(log_file, max_bytes=50000)
+        assert excerpt == clf.truncate_log(content, max_bytes=50000)
+        assert size == len(content.encode("utf-8"))
+
+    def test_reads_only_the_tail(self, tmp_path, monkeypatch):
+        log_file = tmp_path / "big.log"
+        log_file.write_bytes(b"noise line\n" * 200000 + b"Error: disk full\n")
+        reads = []
+        real_open = open
+
+        def tracking_open(*args, **kwargs):
+            handle = real_open(*args, **kwargs)
+            return _Tracked(handle, reads) if args[0] == log_file else handle
+
+        monkeypatch.setattr("builtins.open", tracking_open)
+        excerpt, size = clf.read_log_tail(log_file, max_bytes=1000)
+        assert excerpt.endswith("Error: disk full\n")
+        assert size == 2200017
+        assert reads == [1001 - clf.HEADER_BYTES]
+
+
+class _Tracked:
+    """File wrapper recording how many bytes each read() returned."""
+
+    def __init__(self, handle, reads):
+        self.handle, self.reads = handle, reads
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.handle.close()
+
+    def seek(self, *args):
+        return self.handle.seek(*args)
+
+    def read(self, *args):
+        data = self.handle.read(*args)
+        self.reads.append(len(data))
+        return data
+
 
 # ---------------------------------------------------------------------------
 # TestCallClaudeApiSuccess
@@ -96,8 +173,9 @@ class TestCallClaudeApiSuccess:
         mock_anthropic = _make_mock_anthropic(payload)
 
         with patch.dict(sys.modules, {"anthropic": mock_anthropic}):
-            result = clf.call_claude_api("some log", "My Workflow", "my-job")
+            result, source = clf.call_claude_api("some log", "My Workflow", "my-job")
 
+        assert source == clf.CLAUDE_SOURCE
         assert result["category"] == "transient"
         assert result["is_retriable"] is True
         assert result["pattern"] == "Network timeout"
@@ -109,7 +187,7 @@ class TestCallClaudeApiSuccess:
         mock_anthropic = _make_mock_anthropic(payload)
 
         with patch.dict(sys.modules, {"anthropic": mock_anthropic}):
-            result = clf.call_claude_api("some log", "My Workflow", "my-job")
+            result, _ = clf.call_claude_api("some log", "My Workflow", "my-job")
 
         assert result["category"] == "transient"
 
@@ -121,9 +199,10 @@ class TestCallClaudeApiSuccess:
 
         with patch.dict(sys.modules, {"anthropic": mock_anthropic}):
             # Must fall back to pattern-based (log has no recognizable pattern → unknown)
-            result = clf.call_claude_api("nothing recognizable here", "W", "J")
+            result, source = clf.call_claude_api("nothing recognizable here", "W", "J")
 
         # Fallback should still return a valid structure
+        assert source == clf.FALLBACK_SOURCE
         assert result["category"] in clf.VALID_CATEGORIES
         assert all(f in result for f in clf.REQUIRED_FIELDS)
 
@@ -140,7 +219,7 @@ class TestCallClaudeApiSuccess:
         }
         mock_anthropic = _make_mock_anthropic(json.dumps(invalid_cat))
         with patch.dict(sys.modules, {"anthropic": mock_anthropic}):
-            result = clf.call_claude_api("connection timed out", "W", "J")
+            result, _ = clf.call_claude_api("connection timed out", "W", "J")
         # Must fall back gracefully — category must be valid
         assert result["category"] in clf.VALID_CATEGORIES
         assert all(f in result for f in clf.REQUIRED_FIELDS)
@@ -155,7 +234,7 @@ class TestFallbackClassification:
     def _classify(self, log_text, monkeypatch):
         """Remove API key to force the pattern-based fallback path."""
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
-        return clf.call_claude_api(log_text, "W", "J")
+        return clf.call_claude_api(log_text, "W", "J")[0]
 
     def test_timeout_log_classified_as_transient(self, monkeypatch):
         result = self._classify("Step failed: connection timed out after 30s", monkeypatch)
@@ -193,7 +272,7 @@ class TestApiUnavailable:
         monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
         # Remove anthropic from sys.modules so the import inside the function fails
         with patch.dict(sys.modules, {"anthropic": None}):
-            result = clf.call_claude_api("timeout occurred", "W", "J")
+            result, _ = clf.call_claude_api("timeout occurred", "W", "J")
         # Should still return a valid fallback result
         assert result["category"] in clf.VALID_CATEGORIES
         assert all(f in result for f in clf.REQUIRED_FIELDS)
@@ -207,7 +286,7 @@ class TestApiUnavailable:
             "syntax error",
             "something completely new",
         ]:
-            result = clf.call_claude_api(log_text, "W", "J")
+            result, _ = clf.call_claude_api(log_text, "W", "J")
             for field in clf.REQUIRED_FIELDS:
                 assert field in result, f"Missing '{field}' for log: {log_text!r}"
 
@@ -314,7 +393,7 @@ class TestFallbackExactStringValues:
 
     def _classify(self, log_text, monkeypatch):
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
-        return clf.call_claude_api(log_text, "W", "J")
+        return clf.call_claude_api(log_text, "W", "J")[0]
 
     def test_timeout_category_is_exact_string_transient(self, monkeypatch):
         result = self._classify("connection timed out", monkeypatch)
@@ -388,7 +467,7 @@ class TestMarkdownStripping:
         mock_anthropic = _make_mock_anthropic(wrapped)
 
         with patch.dict(sys.modules, {"anthropic": mock_anthropic}):
-            result = clf.call_claude_api("some log", "W", "J")
+            result, _ = clf.call_claude_api("some log", "W", "J")
 
         assert result["category"] == "transient"
         # Verify neither fence survived (would cause JSON parse error if they did)
@@ -400,7 +479,7 @@ class TestMarkdownStripping:
         mock_anthropic = _make_mock_anthropic(json.dumps(_valid_classification()))
 
         with patch.dict(sys.modules, {"anthropic": mock_anthropic}):
-            result = clf.call_claude_api("some log", "W", "J")
+            result, _ = clf.call_claude_api("some log", "W", "J")
 
         assert result["category"] == "transient"
 
@@ -416,7 +495,7 @@ class TestJsonResponseNotDict:
 
         with patch.dict(sys.modules, {"anthropic": mock_anthropic}):
             # log text has "timeout" so fallback returns "transient"
-            result = clf.call_claude_api("connection timed out", "W", "J")
+            result, _ = clf.call_claude_api("connection timed out", "W", "J")
 
         assert result["category"] in clf.VALID_CATEGORIES
         assert all(f in result for f in clf.REQUIRED_FIELDS)
@@ -497,7 +576,7 @@ class TestFallbackPatternMatching:
 
     def _classify(self, log_text, monkeypatch):
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
-        return clf.call_claude_api(log_text, "W", "J")
+        return clf.call_claude_api(log_text, "W", "J")[0]
 
     def test_timeout_keyword_alone_triggers_transient(self, monkeypatch):
         """Mutant 70: 'timeout' → 'XXtimeoutXX' — direct 'timeout' match removed."""
@@ -545,7 +624,7 @@ class TestFallbackExactReturnStrings:
 
     def _classify(self, log_text, monkeypatch):
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
-        return clf.call_claude_api(log_text, "W", "J")
+        return clf.call_claude_api(log_text, "W", "J")[0]
 
     # --- timeout fallback ---
     def test_timeout_pattern_exact_string(self, monkeypatch):
@@ -651,7 +730,7 @@ class TestApiCallStructure:
         """Mutants 29, 30: prompt = None or has XX prefix."""
         call_args = self._get_call_args("timeout log", "My Workflow", "my-job", monkeypatch)
         messages = call_args.kwargs.get("messages", call_args.args[0] if call_args.args else [])
-        content = messages[0]["content"]
+        content = "\n\n".join(block["text"] for block in messages[0]["content"])
         assert content is not None
         assert content.startswith("Analyze")  # not "XXAnalyze..." or None
 
@@ -659,10 +738,27 @@ class TestApiCallStructure:
         """Prompt must contain workflow_name and job_name."""
         call_args = self._get_call_args("timeout log", "My Workflow", "my-job", monkeypatch)
         messages = call_args.kwargs.get("messages", call_args.args[0] if call_args.args else [])
-        content = messages[0]["content"]
+        content = "\n\n".join(block["text"] for block in messages[0]["content"])
         assert "My Workflow" in content
         assert "my-job" in content
 
+    def test_static_prefix_marked_for_prompt_cache(self, monkeypatch):
+        """System prompt and instructions are cached; the failure details come last."""
+        call_args = self._get_call_args("timeout log", "My Workflow", "my-job", monkeypatch)
+        system = call_args.kwargs["system"]
+        instructions, failure = call_args.kwargs["messages"][0]["content"]
+        assert [block["text"] for block in system] == [clf.SYSTEM_PROMPT, clf.CLASSIFY_GUIDE]
+        assert system[-1]["cache_control"] == {"type": "ephemeral"}
+        assert instructions["text"] == clf.CLASSIFY_INSTRUCTIONS
+        assert instructions["cache_control"] == {"type": "ephemeral"}
+        assert "cache_control" not in failure
+        assert "timeout log" in failure["text"]
+
+    def test_static_prefix_reaches_cacheable_minimum(self):
+        """Shorter prefixes are not cached; ~4 characters per token is a low estimate here."""
+        prefix = clf.SYSTEM_PROMPT + clf.CLASSIFY_GUIDE + clf.CLASSIFY_INSTRUCTIONS
+        assert len(prefix) // 4 >= 1024
+
     def test_api_called_with_correct_model(self, monkeypatch):
         """Mutant 39: model = 'XXclaude-sonnet-4-6XX'."""
         call_args = self._get_call_args("log", "W", "J", monkeypatch)
@@ -694,7 +790,7 @@ class TestApiCallStructure:
 
         with patch.dict(sys.modules, {"anthropic": mock_anthropic}):
             # Neutral log — fallback would give "unknown", but API gives "transient"
-            result = clf.call_claude_api("no recognizable pattern here xyzzy123", "W", "J")
+            result, _ = clf.call_claude_api("no recognizable pattern here xyzzy123", "W", "J")
 
         assert result["category"] == "transient"  # from API, not fallback
 
@@ -738,11 +834,11 @@ class TestMainFunctionMutations:
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
 
         # Mock call_claude_api to return "known_pattern" (not "unknown")
-        with patch.object(clf, "call_claude_api", return_value={
+        with patch.object(clf, "call_claude_api", return_value=({
             "category": "known_pattern",
             "pattern": "Test", "is_retriable": False,
             "root_cause": "test", "suggested_fix": "test"
-        }):
+        }, clf.CLAUDE_SOURCE)):
             with pytest.raises(SystemExit) as exc_info:
                 clf.main()
 
@@ -764,7 +860,7 @@ class TestMainFunctionMutations:
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
 
         # Return invalid classification (missing required fields) to trigger fallback
-        with patch.object(clf, "call_claude_api", return_value={"bad": "data"}):
+        with patch.object(clf, "call_claude_api", return_value=({"bad": "data"}, clf.CLAUDE_SOURCE)):
             with pytest.raises(SystemExit):
                 clf.main()
 
@@ -783,7 +879,7 @@ class TestMainFunctionMutations:
         ])
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
 
-        with patch.object(clf, "call_claude_api", return_value={"bad": "data"}):
+        with patch.object(clf, "call_claude_api", return_value=({"bad": "data"}, clf.CLAUDE_SOURCE)):
             with pytest.raises(SystemExit):
                 clf.main()
 
@@ -802,7 +898,7 @@ class TestMainFunctionMutations:
         ])
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
 
-        with patch.object(clf, "call_claude_api", return_value={"bad": "data"}):
+        with patch.object(clf, "call_claude_api", return_value=({"bad": "data"}, clf.CLAUDE_SOURCE)):
             with pytest.raises(SystemExit):
                 clf.main()
 
@@ -1065,7 +1161,7 @@ class TestPromptInjectionSecurity:
         Function must return a valid classification dict (from fallback path).
         """
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
-        result = clf.call_claude_api(
+        result, _ = clf.call_claude_api(
             log_excerpt="timeout error",
             workflow_name="Workflow\nInjected line",
             job_name="build",
@@ -1081,7 +1177,7 @@ class TestPromptInjectionSecurity:
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
         long_name = "A" * 500
         # Should not raise; fallback must still return valid dict
-        result = clf.call_claude_api(
+        result, _ = clf.call_claude_api(
             log_excerpt="syntax error",
             workflow_name=long_name,
             job_name="build",
@@ -1091,7 +1187,7 @@ class TestPromptInjectionSecurity:
     def test_null_bytes_in_job_name_sanitized(self, monkeypatch):
         """MED-003 fix: null bytes and other control chars stripped from job_name."""
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
-        result = clf.call_claude_api(
+        result, _ = clf.call_claude_api(
             log_excerpt="permission denied",
             workflow_name="CI",
             job_name="build\x00\x01\x02job",
@@ -1176,3 +1272,176 @@ class TestClassifyIntegrationFileIO:
         assert exc.value.code == 1
         # Output file should NOT be created on error
         assert not output_file.exists()
+
+# ---------------------------------------------------------------------------
+# Batch mode helpers
+# ---------------------------------------------------------------------------
+
+TIMEOUT_LOG = "2026-03-0{day}T10:15:09.0000000Z fatal: Connection timed out (run {run})\n"
+SYNTAX_LOG = "2026-03-02T10:15:09.0000000Z SyntaxError: invalid syntax in build.py line 7\n"
+
+CLAUDE_RESULT = {
+    "category": "transient",
+    "pattern": "git fetch connection timeout",
+    "is_retriable": True,
+    "root_cause": "GitHub was unreachable from the runner.",
+    "suggested_fix": "Retry the job.",
+}
+
+
+def _logs(tmp_path):
+    """Sentinel layout: logs/RUNID_JOBID_Name.log plus failures.jsonl."""
+    logs = tmp_path / "workflow-failures" / "logs"
+    logs.mkdir(parents=True)
+    (logs / "100001_200001_build_linux.log").write_text(TIMEOUT_LOG.format(day=2, run=100001))
+    (logs / "100002_200002_build_linux.log").write_text(TIMEOUT_LOG.format(day=3, run=100002))
+    (logs / "100003_200003_lint.log").write_text(SYNTAX_LOG)
+    (logs / "notes.txt").write_text("ignored")
+    (logs.parent / "failures.jsonl").write_text(
+        json.dumps({"workflow_name": "CI", "run_id": "100001"}) + "\n"
+        + json.dumps({"workflow_name": "Lint", "run_id": "100003"}) + "\n"
+    )
+    return logs
+
+
+class _FakeLimiter:
+    def __init__(self):
+        self.acquired = 0
+        self.responses = []
+
+    def acquire(self, timeout=None):
+        self.acquired += 1
+        return True
+
+    def record_response(self, headers):
+        self.responses.append(headers)
+
+
+# ---------------------------------------------------------------------------
+# TestLoadBatchJobs
+# ---------------------------------------------------------------------------
+
+class TestLoadBatchJobs:
+    """Directory and manifest inputs."""
+
+    def test_directory(self, tmp_path):
+        jobs = clf.load_batch_jobs(_logs(tmp_path), default_workflow="Nightly")
+        assert [(j["run_id"], j["workflow_name"], j["job_name"]) for j in jobs] == [
+            ("100001", "CI", "build linux"),
+            ("100002", "Nightly", "build linux"),
+            ("100003", "Lint", "lint"),
+        ]
+
+    def test_manifest(self, tmp_path):
+        logs = _logs(tmp_path)
+        manifest = tmp_path / "manifest.jsonl"
+        manifest.write_text(
+            json.dumps({"log_file": str(logs / "100003_200003_lint.log"), "workflow_name": "Lint",
+                        "job_name": "ruff", "run_id": 100003}) + "\n\n"
+            + json.dumps({"log_file": str(logs / "100001_200001_build_linux.log")}) + "\n"
+        )
+        jobs = clf.load_batch_jobs(manifest)
+        assert jobs[0] == {"log_file": str(logs / "100003_200003_lint.log"), "workflow_name": "Lint",
+                           "job_name": "ruff", "run_id": "100003"}
+        assert jobs[1]["workflow_name"] == "unknown"
+        assert jobs[1]["job_name"] == "100001_200001_build_linux"
+
+
+# ---------------------------------------------------------------------------
+# TestClassifyBatch
+# ---------------------------------------------------------------------------
+
+class TestClassifyBatch:
+    """Identical fingerprints are classified once and fanned out."""
+
+    def test_dedupes_fingerprints(self, tmp_path):
+        jobs = clf.load_batch_jobs(_logs(tmp_path))
+        with patch.object(clf, "call_claude_api", return_value=(dict(CLAUDE_RESULT), clf.CLAUDE_SOURCE)) as api:
+            results = clf.classify_batch(jobs)
+        assert api.call_count == 2
+        assert [r["metadata"]["run_id"] for r in results] == ["100001", "100002", "100003"]
+        assert results[0]["metadata"]["fingerprint"] == results[1]["metadata"]["fingerprint"]
+        assert [r["metadata"]["group_size"] for r in results] == [2, 2, 1]
+        assert results[0] is not results[1]
+
+    def test_bounded_concurrency_with_shared_client(self, tmp_path):
+        logs = tmp_path / "logs"
+        logs.mkdir()
+        for i in range(8):
+            (logs / f"{i}_{i}_job.log").write_text(f"failure kind {chr(65 + i)}\n")
+        state = {"active": 0, "max": 0, "clients": set()}
+        lock = threading.Lock()
+
+        def fake_api(log_excerpt, workflow_name, job_name, timeout=30, client=None, limiter=None):
+            with lock:
+                state["active"] += 1
+                state["max"] = max(state["max"], state["active"])
+                state["clients"].add(id(client))
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return dict(CLAUDE_RESULT), clf.CLAUDE_SOURCE
+
+        client = object()
+        with patch.object(clf, "call_claude_api", side_effect=fake_api):
+            clf.classify_batch(clf.load_batch_jobs(logs), client=client, concurrency=3)
+        assert 1 < state["max"] <= 3
+        assert state["clients"] == {id(client)}
+
+    def test_cache_hits_skip_api(self, tmp_path):
+        jobs = clf.load_batch_jobs(_logs(tmp_path))
+        cache = clf.ClassificationCache(tmp_path / "cache.json")
+        with patch.object(clf, "call_claude_api", return_value=(dict(CLAUDE_RESULT), clf.CLAUDE_SOURCE)) as api:
+            clf.classify_batch(jobs, cache=cache)
+            results = clf.classify_batch(jobs, cache=cache)
+        assert api.call_count == 2
+        assert all(r["metadata"]["cache"]["hit"] for r in results)
+
+    def test_unreadable_log_reported(self, tmp_path):
+        jobs = [{"log_file": str(tmp_path / "missing.log"), "workflow_name": "CI",
+                 "job_name": "x", "run_id": "1"}]
+        (result,) = clf.classify_batch(jobs)
+        assert result["run_id"] == "1" and "error" in result
+
+    def test_limiter_and_raw_headers(self):
+        message = MagicMock()
+        message.content = [MagicMock(text=json.dumps(CLAUDE_RESULT))]
+        raw = MagicMock(headers={"anthropic-ratelimit-requests-remaining": "49"})
+        raw.parse.return_value = message
+        client = MagicMock()
+        client.messages.with_raw_response.create.return_value = raw
+        limiter = _FakeLimiter()
+
+        result, source = clf.call_claude_api("log", "CI", "build", client=client, limiter=limiter)
+
+        assert (result, source) == (CLAUDE_RESULT, clf.CLAUDE_SOURCE)
+        assert limiter.acquired == 1
+        assert limiter.responses == [{"anthropic-ratelimit-requests-remaining": "49"}]
+        client.messages.create.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# TestBatchMain
+# ---------------------------------------------------------------------------
+
+class TestBatchMain:
+    """--batch writes one JSONL file for all logs."""
+
+    def test_writes_jsonl(self, monkeypatch, tmp_path, capsys):
+        logs = _logs(tmp_path)
+        output = tmp_path / "out" / "classifications.jsonl"
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        monkeypatch.delenv("CLASSIFY_CACHE_FILE", raising=False)
+        monkeypatch.setattr(sys, "argv", ["clf", "--batch", str(logs), "--output", str(output)])
+        with pytest.raises(SystemExit) as exc:
+            clf.main()
+        assert exc.value.code == 0
+        lines = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [line["category"] for line in lines] == ["transient", "transient", "known_pattern"]
+        assert "3 logs (2 distinct fingerprints, 0 unreadable)" in capsys.readouterr().out
+
+    def test_single_mode_still_requires_log_args(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(sys, "argv", ["clf", "--output", str(tmp_path / "o.json")])
+        with pytest.raises(SystemExit) as exc:
+            clf.main()
+        assert exc.value.code == 2
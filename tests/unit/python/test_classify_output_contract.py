@@ -139,7 +139,7 @@ class TestFallbackOutputContract:
         """Drive the fallback path by setting no API key."""
         with patch.dict(os.environ, {}, clear=True):
             os.environ.pop("ANTHROPIC_API_KEY", None)
-            return call_claude_api(log_content, "Test Workflow", "test-job")
+            return call_claude_api(log_content, "Test Workflow", "test-job")[0]
 
     def test_timeout_fallback_satisfies_contract(self):
         result = self._get_fallback_output("fatal: connection timed out after 30 seconds")
@@ -208,7 +208,7 @@ class TestApiOutputContract:
         }
         with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}):  # pragma: allowlist secret
             with patch.dict(sys.modules, {"anthropic": self._make_mock_anthropic(valid_payload)}):
-                result = call_claude_api("error log", "Workflow", "job")
+                result, _ = call_claude_api("error log", "Workflow", "job")
         assert_valid_contract(result, "api-valid-response")
 
     def test_api_response_missing_field_falls_back_to_valid_contract(self):
@@ -220,7 +220,7 @@ class TestApiOutputContract:
         }
         with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}):  # pragma: allowlist secret
             with patch.dict(sys.modules, {"anthropic": self._make_mock_anthropic(incomplete_payload)}):
-                result = call_claude_api("connection timed out", "Workflow", "job")
+                result, _ = call_claude_api("connection timed out", "Workflow", "job")
         # Should fall back to pattern-based classification — still contract-valid
         assert_valid_contract(result, "api-missing-field-fallback")
 
@@ -235,7 +235,7 @@ class TestApiOutputContract:
         }
         with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}):  # pragma: allowlist secret
             with patch.dict(sys.modules, {"anthropic": self._make_mock_anthropic(bad_category_payload)}):
-                result = call_claude_api("some error log", "Workflow", "job")
+                result, _ = call_claude_api("some error log", "Workflow", "job")
         assert_valid_contract(result, "api-bad-category-fallback")
 
 
@@ -314,7 +314,7 @@ class TestJsonSerialisability:
         with patch.dict(os.environ, {}, clear=True):
             os.environ.pop("ANTHROPIC_API_KEY", None)
             for log in test_logs:
-                result = call_claude_api(log, "Workflow", "job")
+                result, _ = call_claude_api(log, "Workflow", "job")
                 try:
                     serialised = json.dumps(result)
                     reparsed = json.loads(serialised)
@@ -0,0 +1,98 @@
+"""
+Unit tests for scripts/claude_request.py
+Requirement: NFR-2.2 — repeated Claude calls read their static prompt
+             prefix from the prompt cache; cache usage is recorded.
+"""
+
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Load module under test
+# ---------------------------------------------------------------------------
+_SCRIPT = Path(__file__).parents[3] / "scripts" / "claude_request.py"
+_spec = importlib.util.spec_from_file_location("claude_request", _SCRIPT)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+EPHEMERAL = {"type": "ephemeral"}
+
+
+# ---------------------------------------------------------------------------
+# TestBuildRequest
+# ---------------------------------------------------------------------------
+
+class TestBuildRequest:
+    """Static material first, cache breakpoints at the end of the static prefix."""
+
+    def test_ordering_and_breakpoints(self):
+        request = _mod.build_request("m", 100, system="SYS", instructions="RULES",
+                                     content="LOG", temperature=0.2)
+        assert request["model"] == "m"
+        assert request["max_tokens"] == 100
+        assert request["temperature"] == 0.2
+        assert request["system"] == [{"type": "text", "text": "SYS", "cache_control": EPHEMERAL}]
+        assert request["messages"] == [{"role": "user", "content": [
+            {"type": "text", "text": "RULES", "cache_control": EPHEMERAL},
+            {"type": "text", "text": "LOG"},
+        ]}]
+
+    def test_breakpoint_on_last_static_block_only(self):
+        request = _mod.build_request("m", 1, instructions=["A", "B"], content=["x", "y"])
+        blocks = request["messages"][0]["content"]
+        assert [("cache_control" in b) for b in blocks] == [False, True, False, False]
+
+    def test_no_system_and_no_cache(self):
+        request = _mod.build_request("m", 1, instructions="RULES", content="LOG", cache=False)
+        assert "system" not in request
+        assert all("cache_control" not in b for b in request["messages"][0]["content"])
+
+    def test_stable_prefix_across_calls(self):
+        first = _mod.build_request("m", 1, system="S", instructions="R", content="one")
+        second = _mod.build_request("m", 1, system="S", instructions="R", content="two")
+        assert first["system"] == second["system"]
+        assert first["messages"][0]["content"][0] == second["messages"][0]["content"][0]
+
+    def test_prompt_text(self):
+        request = _mod.build_request("m", 1, instructions="RULES", content="LOG")
+        assert _mod.prompt_text(request) == "RULES\n\nLOG"
+
+
+# ---------------------------------------------------------------------------
+# TestRecordUsage
+# ---------------------------------------------------------------------------
+
+class TestRecordUsage:
+    """Per-call usage includes prompt-cache reads and writes."""
+
+    @pytest.fixture(autouse=True)
+    def metrics(self):
+        registry = _mod.REGISTRY
+        was_enabled = registry.enabled
+        registry.enabled = True
+        _mod.TOKENS_METRIC.clear()
+        yield _mod.TOKENS_METRIC
+        _mod.TOKENS_METRIC.clear()
+        registry.enabled = was_enabled
+
+    def test_cache_fields_recorded(self, metrics):
+        message = SimpleNamespace(usage=SimpleNamespace(
+            input_tokens=40, output_tokens=120,
+            cache_creation_input_tokens=0, cache_read_input_tokens=1800,
+        ))
+        usage = _mod.record_usage(message, "classify")
+        assert usage == {"input_tokens": 40, "output_tokens": 120,
+                         "cache_write_tokens": 0, "cache_read_tokens": 1800}
+        assert metrics.value(call="classify", kind="cache_read") == 1800
+        assert metrics.value(call="classify", kind="input") == 40
+        assert "1800 cache read" in _mod.format_usage(usage)
+
+    def test_missing_usage_fields_are_zero(self):
+        usage = _mod.record_usage(SimpleNamespace(usage=SimpleNamespace(
+            input_tokens=5, output_tokens=1, cache_read_input_tokens=None)), "x")
+        assert usage["cache_read_tokens"] == 0
+        assert usage["cache_write_tokens"] == 0
+        assert _mod.record_usage(SimpleNamespace(), "x")["input_tokens"] == 0
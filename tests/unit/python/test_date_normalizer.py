@@ -0,0 +1,124 @@
+"""
+Unit tests for scripts/date_normalizer.py
+Requirement: NFR-2.2 — dashboard items are date-parsed once at ingest;
+             filters and sorts compare integer epochs.
+"""
+
+import importlib.util
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Load module under test
+# ---------------------------------------------------------------------------
+_SCRIPT = Path(__file__).parents[3] / "scripts" / "date_normalizer.py"
+_spec = importlib.util.spec_from_file_location("date_normalizer", _SCRIPT)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+FEB_13 = int(datetime(2026, 2, 13, 11, 0, tzinfo=timezone.utc).timestamp())
+
+
+@pytest.fixture
+def dates():
+    return _mod.DateNormalizer()
+
+
+# ---------------------------------------------------------------------------
+# TestParse
+# ---------------------------------------------------------------------------
+
+class TestParse:
+    """Formats seen across dashboard sources parse to UTC epoch seconds."""
+
+    @pytest.mark.parametrize("value", [
+        "Fri, 13 Feb 2026 11:00:00 GMT",       # RSS
+        "Fri, 13 Feb 2026 12:00:00 +0100",     # RSS with offset
+        "2026-02-13T11:00:00Z",                # GitHub
+        "2026-02-13T11:00:00.000Z",            # JavaScript toISOString
+        "2026-02-13T11:00:00.1234567Z",        # 7 fractional digits
+        "2026-02-13T11:00:00+00:00",           # Atom
+        "2026-02-13T11:00:00",                 # naive (Reddit isoformat)
+        "2026-02-13 11:00:00",
+        str(FEB_13),
+        FEB_13,
+    ])
+    def test_formats(self, dates, value):
+        assert dates.parse(value) == FEB_13
+
+    def test_date_only_is_midnight_utc(self, dates):
+        assert dates.parse("2026-02-13") == FEB_13 - 11 * 3600
+
+    @pytest.mark.parametrize("value", ["", None, "yesterday", "13/02/2026 25:00"])
+    def test_unparseable_is_unknown(self, dates, value):
+        assert dates.parse(value) == _mod.UNKNOWN
+        assert dates.stats["unparseable"] == 1
+
+
+# ---------------------------------------------------------------------------
+# TestFormatCache
+# ---------------------------------------------------------------------------
+
+class TestFormatCache:
+    """The format detected for a source is tried first on its next item."""
+
+    def test_detected_format_remembered(self, dates):
+        dates.parse("Fri, 13 Feb 2026 11:00:00 GMT", "OpenAI")
+        dates.parse("2026-02-13", "GitHub")
+        assert dates.format_for("OpenAI") == "rfc2822"
+        assert dates.format_for("GitHub") == "iso8601"
+        assert dates.format_for("Reddit") is None
+
+    def test_cached_format_tried_first(self, dates, monkeypatch):
+        dates.parse("Fri, 13 Feb 2026 11:00:00 GMT", "OpenAI")
+        calls = []
+        original = dict(_mod._PARSERS)
+
+        def tracking(name):
+            def parse(value):
+                calls.append(name)
+                return original[name](value)
+            return parse
+
+        monkeypatch.setattr(_mod, "_PARSERS", {n: tracking(n) for n in original})
+        monkeypatch.setattr(_mod, "FORMATS", [(n, tracking(n)) for n, _ in _mod.FORMATS])
+        dates.parse("Sat, 14 Feb 2026 11:00:00 GMT", "OpenAI")
+        assert calls == ["rfc2822"]
+
+    def test_format_change_redetected(self, dates):
+        dates.parse("Fri, 13 Feb 2026 11:00:00 GMT", "Blog")
+        assert dates.parse("2026-02-13T11:00:00Z", "Blog") == FEB_13
+        assert dates.format_for("Blog") == "iso8601"
+
+
+# ---------------------------------------------------------------------------
+# TestNormalize
+# ---------------------------------------------------------------------------
+
+class TestNormalize:
+    """Records carry published_ts so later filters and sorts are integer work."""
+
+    def test_sets_epoch_on_records(self, dates):
+        updates = [
+            {"source": "OpenAI", "published": "Fri, 13 Feb 2026 11:00:00 GMT"},
+            {"source": "GitHub", "published": "2026-02-14T11:00:00Z"},
+            {"source": "X"},
+        ]
+        dates.normalize(updates)
+        ordered = sorted(updates, key=lambda u: u["published_ts"], reverse=True)
+        assert [u["source"] for u in ordered] == ["GitHub", "OpenAI", "X"]
+        assert ordered[-1]["published_ts"] == _mod.UNKNOWN
+
+    def test_already_normalized_not_reparsed(self, dates):
+        updates = [{"source": "a", "published": "2026-02-13", "published_ts": 42}]
+        dates.normalize(updates)
+        assert updates[0]["published_ts"] == 42
+        assert dates.stats == {"parsed": 0, "unparseable": 0}
+
+    def test_custom_fields(self, dates):
+        runs = dates.normalize([{"repo": "x", "created_at": "2026-02-13T11:00:00Z"}],
+                               field="created_at", key="created_ts", source_field="repo")
+        assert runs[0]["created_ts"] == FEB_13
+        assert dates.format_for("x") == "iso8601"
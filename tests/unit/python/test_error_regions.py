@@ -0,0 +1,159 @@
+"""
+Unit tests for scripts/error_regions.py
+Requirement: FR-9.2 — failure classification sends the log regions around
+             errors instead of a plain tail excerpt.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Load modules under test
+# ---------------------------------------------------------------------------
+_SCRIPTS = Path(__file__).parents[3] / "scripts"
+_spec = importlib.util.spec_from_file_location("error_regions", _SCRIPTS / "error_regions.py")
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+_clf_spec = importlib.util.spec_from_file_location(
+    "classify_failure_logs", _SCRIPTS / "classify-failure-logs.py")
+clf = importlib.util.module_from_spec(_clf_spec)
+_clf_spec.loader.exec_module(clf)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "ci-logs"
+
+
+def _filler(count, prefix="ok"):
+    return [f"{prefix} line {i}" for i in range(count)]
+
+
+# ---------------------------------------------------------------------------
+# TestFindRegions
+# ---------------------------------------------------------------------------
+
+class TestFindRegions:
+    """Context windows around hotspots, found in one pass."""
+
+    def test_window_around_hotspot(self):
+        lines = _filler(20) + ["FAILED tests/test_api.py::test_get"] + _filler(20, "after")
+        found = _mod.find_regions(lines, before=2, after=3)
+        assert len(found["regions"]) == 1
+        region = found["regions"][0]
+        assert (region["start"], region["end"]) == (19, 24)
+        assert region["lines"] == ["ok line 18", "ok line 19", "FAILED tests/test_api.py::test_get",
+                                   "after line 0", "after line 1", "after line 2"]
+        assert region["kinds"] == ["error"]
+        assert found["total_lines"] == 41
+
+    def test_overlapping_windows_merge(self):
+        lines = _filler(10) + ["npm ERR! code E403"] + _filler(2) + ["##[error]Process completed with exit code 1"]
+        found = _mod.find_regions(lines, before=2, after=3)
+        assert len(found["regions"]) == 1
+        assert found["regions"][0]["kinds"] == ["error", "annotation"]
+
+    @pytest.mark.parametrize("line, kind", [
+        ("##[error]Something broke", "annotation"),
+        ("Traceback (most recent call last):", "traceback"),
+        ("make: *** [all] exit status 2", "exit_code"),
+        ("ModuleNotFoundError: No module named 'x'", "error"),
+        ("fatal: could not read Username", "error"),
+    ])
+    def test_hotspot_kinds(self, line, kind):
+        assert _mod.find_regions([line])["regions"][0]["kinds"] == [kind]
+
+    def test_no_hotspots(self):
+        lines = _filler(50) + ["Process completed with exit code 0", "0 errors, 0 failures"]
+        assert _mod.find_regions(lines)["regions"] == []
+
+    def test_step_labels_and_boundaries(self):
+        lines = (["##[group]Run npm ci"] + _filler(3) + ["npm ERR! code E403"]
+                 + ["##[group]Run npm test"] + _filler(3) + ["ERROR: 2 tests failed"])
+        regions = _mod.find_regions(lines, before=2, after=10)["regions"]
+        assert [r["step"] for r in regions] == ["npm ci", "npm test"]
+        # A new step ends the open region and its context does not leak across
+        assert regions[0]["lines"][-1] == "npm ERR! code E403"
+        assert regions[1]["lines"][0] == "ok line 1"
+
+    def test_timestamps_stripped_and_long_lines_clipped(self):
+        lines = ["2026-03-04T08:02:45.0155030Z ERROR: boom\n", "x" * 1000 + " error: long"]
+        region = _mod.find_regions(lines)["regions"][0]
+        assert region["lines"][0] == "ERROR: boom"
+        assert region["lines"][1] == "x" * _mod.MAX_LINE_CHARS + " [...]"
+
+    def test_region_size_capped(self):
+        lines = [f"ERROR: failure {i}" for i in range(150)]
+        regions = _mod.find_regions(lines)["regions"]
+        assert all(len(r["lines"]) <= _mod.MAX_REGION_LINES for r in regions)
+        assert sum(len(r["lines"]) for r in regions) == 150
+
+    def test_budget_keeps_earliest_and_latest(self):
+        lines = []
+        for i in range(200):
+            lines += _filler(30) + [f"ERROR: failure number {i:03d}"]
+        found = _mod.find_regions(lines, max_bytes=2000, before=0, after=0)
+        kept = [r["lines"][0] for r in found["regions"]]
+        assert kept[0] == "ERROR: failure number 000"
+        assert kept[-1] == "ERROR: failure number 199"
+        assert found["omitted"] == 200 - len(kept)
+        assert len(_mod.format_regions(found).encode("utf-8")) <= 2000
+
+
+# ---------------------------------------------------------------------------
+# TestFormatRegions
+# ---------------------------------------------------------------------------
+
+class TestFormatRegions:
+    """Excerpt text is stable across runs of the same failure."""
+
+    def test_header_steps_and_omitted_marker(self):
+        found = {"regions": [{"step": None, "lines": ["a"]}, {"step": "npm test", "lines": ["b"]}],
+                 "head": 1, "omitted": 3}
+        assert _mod.format_regions(found) == (
+            "[ERROR REGIONS - 2 regions around errors]\n\n"
+            "--- step: (setup) ---\na\n\n"
+            "[... 3 more error regions omitted ...]\n\n"
+            "--- step: npm test ---\nb"
+        )
+
+    def test_no_line_numbers_in_excerpt(self):
+        failure = ["##[group]Run pytest", "ERROR: connection timed out"]
+        first = _mod.format_regions(_mod.find_regions(_filler(10) + failure))
+        second = _mod.format_regions(_mod.find_regions(_filler(500) + failure))
+        assert first == second
+
+
+# ---------------------------------------------------------------------------
+# TestExtractLogExcerpt
+# ---------------------------------------------------------------------------
+
+class TestExtractLogExcerpt:
+    """classify-failure-logs.py picks regions, tail or the whole log."""
+
+    def test_small_log_sent_whole(self, tmp_path):
+        log = tmp_path / "job.log"
+        log.write_text("ERROR: boom\n")
+        excerpt, size, info = clf.extract_log_excerpt(log)
+        assert (excerpt, size, info) == ("ERROR: boom\n", 12, {"mode": "full"})
+
+    def test_large_log_without_hotspots_sends_tail(self, tmp_path):
+        log = tmp_path / "job.log"
+        log.write_text("\n".join(_filler(5000)))
+        excerpt, size, info = clf.extract_log_excerpt(log, max_bytes=1000)
+        assert info == {"mode": "tail"}
+        assert (excerpt, size) == clf.read_log_tail(log, max_bytes=1000)
+
+    @pytest.mark.parametrize("fixture, pattern", [
+        ("npm-permission-denied.log", "Permission or authentication error"),
+        ("pytest-network-timeout.log", "Network timeout or connection issue"),
+        ("terraform-parse-error.log", "Syntax or parse error"),
+    ])
+    def test_recorded_logs(self, fixture, pattern):
+        path = FIXTURES / fixture
+        excerpt, size, info = clf.extract_log_excerpt(path)
+        tail, _ = clf.read_log_tail(path)
+        assert info["mode"] == "regions"
+        assert size == path.stat().st_size
+        assert len(excerpt) * 4 < len(tail)
+        assert clf.fallback_classification(excerpt)["pattern"] == pattern
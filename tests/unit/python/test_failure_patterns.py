@@ -0,0 +1,117 @@
+"""
+Unit tests for scripts/failure_patterns.py
+Requirement: FR-9.2 — the pattern-based fallback classifier runs YAML rules
+             compiled into one matcher that reports every rule and line.
+"""
+
+import importlib.util
+import re
+from pathlib import Path
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Load module under test
+# ---------------------------------------------------------------------------
+_SCRIPT = Path(__file__).parents[3] / "scripts" / "failure_patterns.py"
+_spec = importlib.util.spec_from_file_location("failure_patterns", _SCRIPT)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+
+def _rule(rule_id, *match, category="known_pattern"):
+    return {"id": rule_id, "category": category, "pattern": rule_id, "is_retriable": False,
+            "root_cause": "r", "suggested_fix": "f", "match": list(match)}
+
+
+# ---------------------------------------------------------------------------
+# TestTrieRegex
+# ---------------------------------------------------------------------------
+
+class TestTrieRegex:
+    """One regex matching exactly the given strings, longest first."""
+
+    @pytest.mark.parametrize("strings", [
+        ["timeout"],
+        ["rate limit", "rate limit exceeded", "ratelimit"],
+        ["403", "429", "4", "a.b", "a+b"],
+    ])
+    def test_matches_exactly_the_strings(self, strings):
+        regex = re.compile(_mod.trie_regex(strings))
+        for string in strings:
+            assert regex.fullmatch(string)
+        assert not regex.fullmatch("zzz")
+        assert regex.match(max(strings, key=len)).group(0) == max(strings, key=len)
+
+    def test_shared_prefixes_factored(self):
+        assert _mod.trie_regex(["abc", "abd"]) == "ab(?:c|d)"
+
+
+# ---------------------------------------------------------------------------
+# TestPatternMatcher
+# ---------------------------------------------------------------------------
+
+class TestPatternMatcher:
+    """Every rule and occurrence in one scan, precedence by rule order."""
+
+    def test_scan_reports_rules_and_lines(self):
+        matcher = _mod.PatternMatcher([_rule("net", "timed out"), _rule("auth", "403")])
+        log = "step 1\nHTTP 403 Forbidden\nok\nRequest TIMED OUT\nretry 403\n"
+        assert [(m["rule"], m["line"]) for m in matcher.scan(log)] == [
+            ("auth", 2), ("net", 4), ("auth", 5)
+        ]
+
+    def test_overlapping_and_prefix_matches(self):
+        matcher = _mod.PatternMatcher([
+            _rule("limit", "rate limit"),
+            _rule("exceeded", "rate limit exceeded"),
+            _rule("exceed", "limit exceeded"),
+        ])
+        rules = {m["rule"] for m in matcher.scan("API rate limit exceeded")}
+        assert rules == {"limit", "exceeded", "exceed"}
+
+    def test_string_shared_by_rules(self):
+        matcher = _mod.PatternMatcher([_rule("a", "oom", "oom"), _rule("b", "OOM")])
+        assert [m["rule"] for m in matcher.scan("killed: oom")] == ["a", "b"]
+
+    def test_classify_uses_first_rule_and_summarizes(self):
+        matcher = _mod.PatternMatcher(
+            [_rule("net", "timeout", category="transient"), _rule("auth", "403")],
+            default={"category": "unknown", "pattern": "none"},
+        )
+        result = matcher.classify("403\n403\ntimeout\n")
+        assert result["category"] == "transient"
+        assert result["matches"] == [{"rule": "net", "line": 3, "count": 1},
+                                     {"rule": "auth", "line": 1, "count": 2}]
+        assert matcher.classify("all good") == {"category": "unknown", "pattern": "none", "matches": []}
+        assert _mod.PatternMatcher([_rule("x", "x")]).classify("nothing") is None
+
+    def test_invalid_rules(self):
+        with pytest.raises(ValueError):
+            _mod.PatternMatcher([{"id": "empty", "match": []}])
+        with pytest.raises(ValueError):
+            _mod.PatternMatcher([_rule("dup", "a"), _rule("dup", "b")])
+
+    def test_hundreds_of_rules(self):
+        rules = [_rule(f"r{i}", f"error e{i:04d}", f"fault f{i:04d}") for i in range(500)]
+        matcher = _mod.PatternMatcher(rules)
+        log = "\n".join(f"line {i}" for i in range(200)) + "\nfatal: fault f0421\n"
+        assert matcher.scan(log) == [{"rule": "r421", "line": 201, "text": "fault f0421"}]
+
+
+# ---------------------------------------------------------------------------
+# TestShippedRules
+# ---------------------------------------------------------------------------
+
+class TestShippedRules:
+    """config/failure_patterns.yaml loads and keeps the documented precedence."""
+
+    def test_loads(self):
+        matcher = _mod.PatternMatcher.from_file()
+        assert [rule["id"] for rule in matcher.rules][:2] == ["network-timeout", "rate-limit"]
+        assert matcher.default["category"] == "unknown"
+
+    def test_timeout_wins_over_rate_limit(self):
+        result = _mod.PatternMatcher.from_file().classify("429 Too Many Requests\nthen timed out")
+        assert result["pattern"] == "Network timeout or connection issue"
+        assert [m["rule"] for m in result["matches"]] == ["network-timeout", "rate-limit"]
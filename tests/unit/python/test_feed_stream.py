@@ -0,0 +1,210 @@
+"""
+Unit tests for scripts/feed_stream.py
+Requirement: NFR-2.2 — dashboard refreshes read only the head of large
+             archive feeds, in bounded memory.
+"""
+
+import importlib.util
+import sys
+import threading
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Load modules under test
+# ---------------------------------------------------------------------------
+_SCRIPTS = Path(__file__).parents[3] / "scripts"
+_FIXTURES = Path(__file__).parent / "fixtures" / "feeds"
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(name, _SCRIPTS / f"{name}.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+_mod = _load("feed_stream")
+_cache_mod = _load("http_cache")
+sys.path.insert(0, str(_SCRIPTS))
+_bench = _load("benchmark_feed_parser")
+
+RSS = (_FIXTURES / "openai-news.rss.xml").read_bytes()
+ATOM = (_FIXTURES / "deepmind-blog.atom.xml").read_bytes()
+
+
+class _CountingChunks:
+    """Iterable of small chunks that records how many were read."""
+
+    def __init__(self, body, size=512):
+        self.chunks = [body[i:i + size] for i in range(0, len(body), size)]
+        self.consumed = 0
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+
+# ---------------------------------------------------------------------------
+# TestParseEntries
+# ---------------------------------------------------------------------------
+
+class TestParseEntries:
+    """RSS and Atom entries are extracted from the recorded fixtures."""
+
+    def test_rss_fixture(self):
+        entries = _mod.parse_entries(RSS, limit=5)
+        assert len(entries) == 5
+        first = entries[0]
+        assert first["title"] == "GPT-5.2 derives a new result in theoretical physics"
+        assert first["link"] == "https://openai.com/index/new-result-theoretical-physics"
+        assert first["published"] == "Fri, 13 Feb 2026 11:00:00 GMT"
+        assert first["summary"].startswith("A new preprint shows GPT-5.2")
+
+    def test_atom_fixture(self):
+        entries = _mod.parse_entries(ATOM, limit=5)
+        assert len(entries) == 5
+        first = entries[0]
+        assert first["title"].startswith("Gemini 3 Deep Think")
+        assert first["link"].startswith("https://deepmind.google/blog/gemini-3-deep-think")
+        assert first["published"] == "2026-02-12T16:15:09+00:00"
+        assert first["summary"].startswith("Our most specialized reasoning mode")
+
+    def test_channel_link_not_taken_as_entry(self):
+        titles = [e["title"] for e in _mod.parse_entries(RSS, limit=10)]
+        assert "OpenAI News" not in titles
+
+    def test_file_object_source(self):
+        with open(_FIXTURES / "openai-news.rss.xml", "rb") as f:
+            assert len(_mod.parse_entries(f, limit=2)) == 2
+
+    def test_summary_truncated(self):
+        long = b"<rss><channel><item><title>t</title><description>" + b"x" * 500 + \
+            b"</description></item></channel></rss>"
+        assert len(_mod.parse_entries(long)[0]["summary"]) == 200
+
+    def test_zero_limit(self):
+        assert _mod.parse_entries(RSS, limit=0) == []
+
+
+# ---------------------------------------------------------------------------
+# TestEarlyStop
+# ---------------------------------------------------------------------------
+
+class TestEarlyStop:
+    """Parsing stops at the limit without reading the rest of the feed."""
+
+    def test_stops_consuming_chunks(self):
+        archive = _bench.expand_feed(RSS, 2000)
+        chunks = _CountingChunks(archive)
+        assert len(_mod.parse_entries(chunks, limit=5)) == 5
+        assert chunks.consumed < 10 < len(chunks.chunks)
+
+    def test_finished_entries_detached(self, monkeypatch):
+        retained = []
+        original = _mod._entry
+
+        def capture(elem):
+            retained.append(elem)
+            return original(elem)
+
+        monkeypatch.setattr(_mod, "_entry", capture)
+        _mod.parse_entries(_bench.expand_feed(ATOM, 50), limit=40)
+        # Only the last yielded entry can still be attached to the tree
+        parents = {id(child) for e in retained for child in e}
+        assert len(retained) == 40
+        assert all(id(e) not in parents for e in retained)
+
+    def test_expand_feed_is_well_formed(self):
+        root = ET.fromstring(_bench.expand_feed(RSS, 12))
+        assert len(root.findall("./channel/item")) == 12
+
+
+# ---------------------------------------------------------------------------
+# TestFallback
+# ---------------------------------------------------------------------------
+
+class TestFallback:
+    """Malformed feeds are handed, complete, to the lenient parser."""
+
+    def test_malformed_feed_uses_fallback(self):
+        broken = RSS.replace(b"</guid>", b"</guid><oops>", 1)
+        received = []
+
+        def fallback(body):
+            received.append(body)
+            return [{"title": "lenient"}] * 9
+
+        result = _mod.parse_entries_with_fallback(_CountingChunks(broken, 256), fallback, limit=3)
+        assert result == [{"title": "lenient"}] * 3
+        assert received == [broken]
+
+    def test_well_formed_feed_skips_fallback(self):
+        def fallback(body):
+            raise AssertionError("fallback called")
+
+        assert len(_mod.parse_entries_with_fallback(_CountingChunks(ATOM), fallback)) == 5
+
+    def test_strict_parser_raises(self):
+        with pytest.raises(ET.ParseError):
+            _mod.parse_entries(b"<rss><channel><item></channel></rss>")
+
+
+# ---------------------------------------------------------------------------
+# TestHTTPCacheStreaming
+# ---------------------------------------------------------------------------
+
+class TestHTTPCacheStreaming:
+    """The HTTP cache hands streaming parsers the response in chunks."""
+
+    @pytest.fixture
+    def server(self):
+        body = _bench.expand_feed(RSS, 500)
+        requests = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                requests.append(dict(self.headers))
+                if self.headers.get("If-None-Match") == '"a"':
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", '"a"')
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except OSError:
+                    pass  # client stopped reading after the first entries
+
+            def log_message(self, *args):
+                pass
+
+        srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(
+            target=srv.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        ).start()
+        yield f"http://127.0.0.1:{srv.server_address[1]}/feed", requests
+        srv.shutdown()
+        srv.server_close()
+
+    def test_stream_parse_cached_and_revalidated(self, server, tmp_path):
+        url, requests = server
+        cache = _cache_mod.HTTPCache(tmp_path / "http")
+
+        def parse(chunks):
+            return _mod.parse_entries(chunks, limit=5)
+
+        first = cache.fetch(url, parse, parser_name="feed_stream:5", stream=True)
+        assert len(first) == 5
+        assert not list(cache.directory.glob("*.body"))
+
+        again = cache.fetch(url, parse, parser_name="feed_stream:5", stream=True)
+        assert again == first
+        assert requests[1]["If-None-Match"] == '"a"'
+        assert cache.stats == {"hits": 1, "misses": 1, "errors": 0}
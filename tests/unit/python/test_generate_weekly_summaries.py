@@ -0,0 +1,245 @@
+"""
+Unit tests for scripts/generate_weekly_summaries.py
+Requirement: FR-4.x — weekly dashboard summaries, generated for all
+             dashboards in one process with a shared client and limiter.
+"""
+
+import importlib.util
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Load module under test
+# ---------------------------------------------------------------------------
+_SCRIPT = Path(__file__).parents[3] / "scripts" / "generate_weekly_summaries.py"
+_spec = importlib.util.spec_from_file_location("generate_weekly_summaries", _SCRIPT)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+
+# ---------------------------------------------------------------------------
+# Fakes for the shared Anthropic client and rate limiter
+# ---------------------------------------------------------------------------
+
+class _Raw:
+    def __init__(self, text):
+        self.headers = {"anthropic-ratelimit-requests-remaining": "49"}
+        self._text = text
+
+    def parse(self):
+        content = type("Block", (), {"text": self._text})()
+        usage = type("Usage", (), {"input_tokens": 800, "output_tokens": 300,
+                                   "cache_read_input_tokens": 1200})()
+        return type("Message", (), {"content": [content], "usage": usage})()
+
+
+class _FakeClient:
+    """Records prompts; overlapping calls show dashboards ran concurrently."""
+
+    def __init__(self, delay=0.0):
+        self.prompts = []
+        self.requests = []
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        self.messages = self
+        self.with_raw_response = self
+
+    def create(self, **request):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.requests.append(request)
+            self.prompts.append(_mod.prompt_text(request))
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return _Raw("## Executive Summary\nQuiet week.")
+
+
+class _FakeLimiter:
+    def __init__(self):
+        self.acquired = 0
+        self.responses = []
+
+    def acquire(self, timeout=None):
+        self.acquired += 1
+        return True
+
+    def record_response(self, headers):
+        self.responses.append(headers)
+
+
+def _dashboard(tmp_path, name, updates):
+    data_dir = tmp_path / name / "data"
+    data_dir.mkdir(parents=True)
+    (data_dir / "cached_updates.json").write_text(json.dumps({"updates": updates}))
+    (tmp_path / name / "README.md").write_text(f"# {name}\n\n## Sources\n")
+    return _mod.dashboard_job(name, data_dir, tmp_path / name / "summaries")
+
+
+def _update(days_ago, title="t"):
+    published = (datetime.utcnow() - timedelta(days=days_ago)).strftime("%a, %d %b %Y %H:%M:%S GMT")
+    return {"source": "S", "title": title, "link": f"https://x/{title}", "published": published}
+
+
+# ---------------------------------------------------------------------------
+# TestRunDashboards
+# ---------------------------------------------------------------------------
+
+class TestRunDashboards:
+    """All dashboards share one client and limiter and run concurrently."""
+
+    def test_all_dashboards_summarized_concurrently(self, tmp_path):
+        jobs = [_dashboard(tmp_path, name, [_update(1)]) for name in sorted(_mod.DASHBOARDS)]
+        client, limiter = _FakeClient(delay=0.05), _FakeLimiter()
+
+        results = _mod.run_dashboards(jobs, client, limiter, max_workers=4)
+
+        assert [r["name"] for r in results] == sorted(_mod.DASHBOARDS)
+        assert all(r["summary_file"].exists() for r in results)
+        assert client.max_active > 1
+        assert limiter.acquired == 4
+        assert len(limiter.responses) == 4
+
+    def test_failed_dashboard_does_not_stop_others(self, tmp_path):
+        jobs = [_dashboard(tmp_path, "ai", [_update(1)]),
+                _mod.dashboard_job("edutech", tmp_path / "missing" / "data")]
+        results = _mod.run_dashboards(jobs, _FakeClient(), _FakeLimiter())
+        assert "summary_file" in results[0]
+        assert "cached_updates.json not found" in results[1]["error"]
+        assert _mod.report(results) == 1
+
+    def test_old_updates_used_when_week_is_empty(self, tmp_path):
+        job = _dashboard(tmp_path, "fintech", [_update(30, f"old{i}") for i in range(25)])
+        client = _FakeClient()
+        result = _mod.summarize_dashboard(job, client, _FakeLimiter())
+        assert result["recent"] == 0
+        assert client.prompts[0].count("Link: ") == _mod.FALLBACK_UPDATES
+
+
+# ---------------------------------------------------------------------------
+# TestOutputs
+# ---------------------------------------------------------------------------
+
+class TestOutputs:
+    """Prompt wording, summary file and README link per dashboard."""
+
+    def test_prompt_uses_dashboard_focus(self):
+        request = _mod.build_summary_request(_mod.dashboard_job("security"), [_update(1)])
+        prompt = _mod.prompt_text(request)
+        assert "Security Intelligence" in prompt
+        assert "- Vulnerability disclosures and CVEs" in prompt
+        assert "(what matters for enterprise security posture)" in prompt
+
+    def test_static_instructions_first_and_uncached(self):
+        job = _mod.dashboard_job("ai")
+        first = _mod.build_summary_request(job, [_update(1, "a")])
+        second = _mod.build_summary_request(job, [_update(2, "b")])
+        blocks = first["messages"][0]["content"]
+        assert blocks[0] == second["messages"][0]["content"][0]
+        assert all("cache_control" not in block for block in blocks)
+        assert "https://x/a" in blocks[1]["text"]
+
+    def test_usage_reported(self, tmp_path):
+        job = _dashboard(tmp_path, "ai", [_update(1)])
+        result = _mod.summarize_dashboard(job, _FakeClient(), _FakeLimiter())
+        assert result["usage"] == {"input_tokens": 800, "output_tokens": 300,
+                                   "cache_write_tokens": 0, "cache_read_tokens": 1200}
+
+    def test_filter_updates_by_week(self):
+        recent = _mod.filter_updates_by_week([_update(1, "new"), _update(9, "old"),
+                                              {"title": "undated"}])
+        assert [u["title"] for u in recent] == ["new"]
+
+    def test_summary_file_and_readme(self, tmp_path):
+        job = _dashboard(tmp_path, "edutech", [_update(2)])
+        result = _mod.summarize_dashboard(job, _FakeClient(), _FakeLimiter())
+        year, week = _mod.get_week_number()
+
+        summary = result["summary_file"].read_text()
+        assert result["summary_file"].name == f"{year}-W{week:02d}.md"
+        assert summary.startswith(f"# Weekly EduTech Summary - Week {week}, {year}")
+        assert summary.endswith("Quiet week.")
+
+        readme = (tmp_path / "edutech" / "README.md").read_text()
+        assert readme.index("## Latest Weekly Summary") < readme.index("## Sources")
+        assert result["readme_updated"]
+
+    def test_readme_section_replaced(self, tmp_path):
+        job = _dashboard(tmp_path, "ai", [_update(2)])
+        for _ in range(2):
+            _mod.summarize_dashboard(job, _FakeClient(), _FakeLimiter())
+        readme = (tmp_path / "ai" / "README.md").read_text()
+        assert readme.count("## Latest Weekly Summary") == 1
+
+    def test_missing_api_key(self, monkeypatch, capsys):
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        assert _mod.run([_mod.dashboard_job("ai")]) == 1
+        assert "ANTHROPIC_API_KEY" in capsys.readouterr().out
+
+
+# ---------------------------------------------------------------------------
+# TestBatchMode
+# ---------------------------------------------------------------------------
+
+class TestBatchMode:
+    """All prompts go out as one Message Batch and results fan back out."""
+
+    def test_one_batch_for_all_dashboards(self, tmp_path):
+        jobs = [_dashboard(tmp_path, name, [_update(1)]) for name in sorted(_mod.DASHBOARDS)]
+        backend = _mod.LocalBatchBackend(polls_until_ended=3)
+        sleeps = []
+
+        results = _mod.run_dashboards_batch(jobs, backend, _FakeLimiter(), sleep=sleeps.append)
+
+        (requests,) = backend.submitted.values()
+        assert [r["custom_id"] for r in requests] == sorted(_mod.DASHBOARDS)
+        assert requests[0]["params"]["model"] == _mod.MODEL
+        assert len(sleeps) == 3
+        for name, result in zip(sorted(_mod.DASHBOARDS), results):
+            assert result["summary_file"].parent == tmp_path / name / "summaries"
+            assert "Local stub summary of 1 updates" in result["summary_file"].read_text()
+            assert "prompt" not in result
+
+    def test_errored_request_fails_only_its_dashboard(self, tmp_path):
+        jobs = [_dashboard(tmp_path, "ai", [_update(1)]),
+                _dashboard(tmp_path, "security", [_update(1)])]
+
+        def respond(params):
+            if "Security Intelligence" in _mod.prompt_text(params):
+                raise ValueError("overloaded")
+            return "AI summary"
+
+        results = _mod.run_dashboards_batch(
+            jobs, _mod.LocalBatchBackend(respond), None, sleep=lambda s: None
+        )
+        assert results[0]["summary_file"].read_text().endswith("AI summary")
+        assert results[1]["error"] == "batch request errored: overloaded"
+
+    def test_unprepared_dashboard_not_submitted(self, tmp_path):
+        jobs = [_mod.dashboard_job("fintech", tmp_path / "missing" / "data"),
+                _dashboard(tmp_path, "ai", [_update(1)])]
+        backend = _mod.LocalBatchBackend()
+        results = _mod.run_dashboards_batch(jobs, backend, None, sleep=lambda s: None)
+        assert [r["custom_id"] for r in next(iter(backend.submitted.values()))] == ["ai"]
+        assert "not found" in results[0]["error"]
+        assert "summary_file" in results[1]
+
+    def test_timeout_cancels_batch(self, tmp_path):
+        jobs = [_dashboard(tmp_path, "ai", [_update(1)])]
+        backend = _mod.LocalBatchBackend(polls_until_ended=10**6)
+        results = _mod.run_dashboards_batch(jobs, backend, None, poll_seconds=0, timeout=0.01,
+                                            sleep=lambda s: time.sleep(0.005))
+        assert backend.cancelled == ["msgbatch_local_1"]
+        assert "not ended" in results[0]["error"]
+
+    def test_stub_backend_needs_no_api_key(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        job = _dashboard(tmp_path, "ai", [_update(1)])
+        assert _mod.run([job], backend="stub", poll_seconds=0) == 0
+        assert list((tmp_path / "ai" / "summaries").glob("*.md"))
@@ -0,0 +1,405 @@
+"""
+Unit tests for scripts/github_client.py
+Requirement: FR-5.4 — SOC 2 evidence collection paginates GitHub list
+             endpoints and fans out per-repo calls with bounded concurrency
+             under the shared rate limiter, retrying with backoff.
+"""
+
+import importlib.util
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+# ---------------------------------------------------------------------------
+# Load modules under test
+# ---------------------------------------------------------------------------
+_ROOT = Path(__file__).parents[3]
+_spec = importlib.util.spec_from_file_location("github_client", _ROOT / "scripts" / "github_client.py")
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+_collector_spec = importlib.util.spec_from_file_location(
+    "collect_github_evidence", _ROOT / "compliance" / "evidence-collection" / "collect-github-evidence.py")
+collector_mod = importlib.util.module_from_spec(_collector_spec)
+_collector_spec.loader.exec_module(collector_mod)
+
+
+# ---------------------------------------------------------------------------
+# Local GitHub stub
+# ---------------------------------------------------------------------------
+
+class _GitHubStub:
+    """
+    Serves scripted responses per path. A route is a callable taking the
+    query dict and returning (status, headers, body); list routes are paged
+    with Link headers like the real API. POST /graphql answers from
+    `graphql`, a callable(query, variables) returning the payload.
+    """
+
+    def __init__(self, delay=0.0):
+        self.routes = {}
+        self.graphql = None
+        self.requests = []
+        self.ports = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay = delay
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                with stub.lock:
+                    stub.requests.append((parts.path, query))
+                    stub.ports.add(self.client_address[1])
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    route = stub.routes.get(parts.path)
+                    status, headers, body = route(query) if route else (404, {}, {"message": "Not Found"})
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+                self._send(status, headers, body)
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub.lock:
+                    stub.requests.append((self.path, payload["variables"]))
+                self._send(200, {}, stub.graphql(payload["query"], payload["variables"]))
+
+            def _send(self, status, headers, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        ).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def paged(self, path, items):
+        """Route serving items in pages of per_page with Link rel="next"."""
+        def route(query):
+            per_page = int(query.get("per_page", 30))
+            page = int(query.get("page", 1))
+            headers = {}
+            if page * per_page < len(items):
+                rest = "&".join(f"{k}={v}" for k, v in query.items() if k not in ("page", "per_page"))
+                headers["Link"] = (f'<{self.base}{path}?{rest}&per_page={per_page}&page={page + 1}>; rel="next", '
+                                   f'<{self.base}{path}?page=1>; rel="first"')
+            return 200, headers, items[(page - 1) * per_page:page * per_page]
+        self.routes[path] = route
+
+    def scripted(self, path, responses):
+        """Route returning responses in order, repeating the last one."""
+        remaining = list(responses)
+
+        def route(query):
+            return remaining.pop(0) if len(remaining) > 1 else remaining[0]
+        self.routes[path] = route
+
+
+def _recorded_graphql(path=Path(__file__).parent / "fixtures" / "github-graphql" / "acme-evidence.json"):
+    """Replays recorded GraphQL responses matched by operation name and variables."""
+    exchanges = json.loads(path.read_text())["exchanges"]
+
+    def run_query(query, variables):
+        operation = re.search(r"query (\w+)", query).group(1)
+        for exchange in exchanges:
+            if exchange["operation"] == operation and all(
+                    variables.get(k) == v for k, v in exchange["variables"].items()):
+                return exchange["response"]
+        raise AssertionError(f"No recorded response for {operation} {variables}")
+    return run_query
+
+
+class _Limiter:
+    def __init__(self):
+        self.acquired = 0
+        self.headers = []
+        self.lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        with self.lock:
+            self.acquired += 1
+        return True
+
+    def record_response(self, headers=None):
+        with self.lock:
+            self.headers.append(dict(headers or {}))
+
+
+@pytest.fixture
+def stub():
+    s = _GitHubStub()
+    yield s
+    s.server.shutdown()
+    s.server.server_close()
+
+
+@pytest.fixture
+def limiter():
+    return _Limiter()
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def client(stub, limiter, sleeps):
+    with _mod.GitHubClient("t0ken", stub.base, concurrency=4, limiter=limiter, sleep=sleeps.append) as c:
+        yield c
+
+
+# ---------------------------------------------------------------------------
+# TestPagination
+# ---------------------------------------------------------------------------
+
+class TestPagination:
+    """List endpoints are followed through every Link rel="next"."""
+
+    def test_all_pages_collected(self, stub, client):
+        stub.paged("/orgs/acme/repos", [{"name": f"repo-{i}"} for i in range(250)])
+        repos = client.paginate("/orgs/acme/repos")
+        assert [r["name"] for r in repos] == [f"repo-{i}" for i in range(250)]
+        assert [q.get("page", "1") for _, q in stub.requests] == ["1", "2", "3"]
+        assert stub.requests[0][1]["per_page"] == "100"
+
+    def test_query_string_kept(self, stub, client):
+        stub.paged("/repos/acme/api/dependabot/alerts", [{"number": i} for i in range(150)])
+        alerts = client.paginate("/repos/acme/api/dependabot/alerts?state=open")
+        assert len(alerts) == 150
+        assert all(q["state"] == "open" for _, q in stub.requests)
+
+    def test_single_page(self, stub, client):
+        stub.paged("/orgs/acme/teams", [{"id": 1}])
+        assert client.paginate("/orgs/acme/teams") == [{"id": 1}]
+        assert len(stub.requests) == 1
+
+
+# ---------------------------------------------------------------------------
+# TestRetries
+# ---------------------------------------------------------------------------
+
+class TestRetries:
+    """Transient failures and rate limits are retried with backoff."""
+
+    def test_server_error_retried_with_backoff(self, stub, client, sleeps):
+        stub.scripted("/x", [(502, {}, {}), (503, {}, {}), (200, {}, {"ok": True})])
+        assert client.get("/x") == {"ok": True}
+        assert len(sleeps) == 2
+        assert 1.0 <= sleeps[0] <= 1.5 and 2.0 <= sleeps[1] <= 3.0
+        assert client.stats == {"requests": 3, "retries": 2}
+
+    def test_retry_after_honoured(self, stub, client, sleeps):
+        stub.scripted("/x", [(429, {"Retry-After": "7"}, {}), (200, {}, {})])
+        client.get("/x")
+        assert sleeps == [7.0]
+
+    def test_secondary_rate_limit_waits_for_reset(self, stub, client, sleeps):
+        reset = int(time.time()) + 20
+        stub.scripted("/x", [(403, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": str(reset)}, {}),
+                             (200, {}, {})])
+        client.get("/x")
+        assert 18 <= sleeps[0] <= 22
+
+    def test_reset_too_far_out_fails(self, stub, client, sleeps):
+        reset = int(time.time()) + 3600
+        stub.scripted("/x", [(403, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": str(reset)}, {})])
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get("/x")
+        assert sleeps == []
+
+    @pytest.mark.parametrize("status", [403, 404, 422])
+    def test_client_errors_not_retried(self, stub, client, sleeps, status):
+        stub.scripted("/x", [(status, {}, {})])
+        with pytest.raises(requests.exceptions.HTTPError) as e:
+            client.get("/x")
+        assert e.value.response.status_code == status
+        assert sleeps == [] and len(stub.requests) == 1
+
+    def test_retries_exhausted(self, stub, client, sleeps):
+        stub.scripted("/x", [(500, {}, {})])
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get("/x")
+        assert len(stub.requests) == _mod.MAX_RETRIES + 1
+
+    def test_final_status_always_raises(self, client, sleeps, monkeypatch):
+        class Lenient(requests.Response):
+            ok = False
+
+            def raise_for_status(self):
+                pass
+
+        response = Lenient()
+        response.status_code, response.reason = 404, "Not Found"
+        monkeypatch.setattr(client.session, "request", lambda *args, **kwargs: response)
+        with pytest.raises(requests.exceptions.HTTPError) as e:
+            client.get("/x")
+        assert e.value.response is response and sleeps == []
+
+    def test_no_attempts_raises(self, limiter):
+        client = _mod.GitHubClient("t", "http://127.0.0.1:9", limiter=limiter, max_retries=-1)
+        with pytest.raises(requests.exceptions.RetryError):
+            client.get("/x")
+        assert limiter.acquired == 0
+
+    def test_connection_error_retried(self, limiter, sleeps):
+        client = _mod.GitHubClient("t", "http://127.0.0.1:9", limiter=limiter, max_retries=1,
+                                   timeout=1, sleep=sleeps.append)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.get("/x")
+        assert len(sleeps) == 1 and limiter.acquired == 2
+
+
+# ---------------------------------------------------------------------------
+# TestConcurrency
+# ---------------------------------------------------------------------------
+
+class TestConcurrency:
+    """Bounded fan-out on pooled connections under the rate limiter."""
+
+    def test_map_bounded_ordered_and_pooled(self, limiter):
+        stub = _GitHubStub(delay=0.05)
+        try:
+            for i in range(20):
+                stub.scripted(f"/repos/acme/r{i}", [(200, {"x-ratelimit-remaining": "4999"}, {"n": i})])
+            client = _mod.GitHubClient("t", stub.base, concurrency=4, limiter=limiter)
+            started = time.perf_counter()
+            results = client.map(lambda i: client.get(f"/repos/acme/r{i}")["n"], range(20))
+            elapsed = time.perf_counter() - started
+            client.close()
+        finally:
+            stub.server.shutdown()
+            stub.server.server_close()
+        assert results == list(range(20))
+        assert 1 < stub.max_in_flight <= 4
+        assert len(stub.ports) <= 4
+        assert elapsed < 20 * 0.05
+        assert limiter.acquired == 20
+        assert all(h["x-ratelimit-remaining"] == "4999" for h in limiter.headers)
+
+    def test_token_sent(self, stub, client):
+        seen = {}
+
+        def route(query):
+            return 200, {}, {}
+        stub.routes["/user"] = route
+        client.session.hooks["response"].append(
+            lambda r, *a, **k: seen.update(auth=r.request.headers["Authorization"]))
+        client.get("/user")
+        assert seen["auth"] == "token t0ken"
+
+
+# ---------------------------------------------------------------------------
+# TestEvidenceCollector
+# ---------------------------------------------------------------------------
+
+class TestEvidenceCollector:
+    """collect-github-evidence.py sees every repo and alert, not the first 30."""
+
+    def _collector(self, stub, limiter):
+        repos = [{"name": f"repo-{i}"} for i in range(45)]
+        stub.paged("/orgs/acme/repos", repos)
+        for i in range(45):
+            if i % 3:
+                stub.scripted(f"/repos/acme/repo-{i}/branches/main/protection", [(200, {}, {
+                    "required_pull_request_reviews": {"required_approving_review_count": 2},
+                    "enforce_admins": {"enabled": True},
+                })])
+        stub.paged("/repos/acme/repo-0/dependabot/alerts", [
+            {"security_vulnerability": {"severity": "critical" if n < 2 else "low",
+                                        "package": {"name": f"pkg{n}"}}, "created_at": "2026-01-01"}
+            for n in range(130)
+        ])
+        stub.scripted("/repos/acme/repo-1/dependabot/alerts", [(403, {}, {"message": "disabled"})])
+        client = _mod.GitHubClient("t", stub.base, concurrency=8, limiter=limiter)
+        return collector_mod.GitHubEvidenceCollector("t", "acme", client=client)
+
+    def test_branch_protection(self, stub, limiter):
+        evidence = self._collector(stub, limiter).collect_branch_protection()
+        repos = evidence["evidence_data"]["repositories"]
+        assert [r["repo_name"] for r in repos] == [f"repo-{i}" for i in range(45)]
+        assert evidence["metrics"]["protected_repos"] == 30
+        assert evidence["metrics"]["unprotected_repos"] == 15
+        assert repos[1] == {"repo_name": "repo-1", "protected": True, "required_reviews": 2,
+                            "required_status_checks": [], "enforce_admins": True}
+        assert repos[0] == {"repo_name": "repo-0", "protected": False}
+
+    def test_dependabot_alerts_paginated(self, stub, limiter):
+        evidence = self._collector(stub, limiter).collect_dependabot_alerts()
+        assert evidence["metrics"] == {"total_open_alerts": 130, "critical_alerts": 2, "high_alerts": 0}
+        assert evidence["compliant"] is False
+        assert evidence["evidence_data"]["alerts"][0] == {
+            "repo_name": "repo-0", "severity": "critical", "package": "pkg0", "created_at": "2026-01-01"}
+
+    def test_repos_listed_once(self, stub, limiter):
+        collector = self._collector(stub, limiter)
+        collector.collect_branch_protection()
+        collector.collect_secret_scanning()
+        repo_pages = [q for path, q in stub.requests if path == "/orgs/acme/repos"]
+        assert len(repo_pages) == 1
+
+    def test_graphql_mode_matches_rest(self, stub, limiter):
+        stub.paged("/orgs/acme/repos", [{"name": "api"}, {"name": "web"}, {"name": "infra"}])
+        stub.scripted("/repos/acme/api/branches/main/protection", [(200, {}, {
+            "required_pull_request_reviews": {"required_approving_review_count": 2},
+            "required_status_checks": {"contexts": ["ci/test", "lint"], "checks": [
+                {"context": "ci/test", "app_id": 15368}, {"context": "lint", "app_id": None}]},
+            "enforce_admins": {"enabled": True},
+        })])
+        stub.scripted("/repos/acme/infra/branches/main/protection", [(200, {}, {"enforce_admins": {"enabled": False}})])
+        stub.paged("/repos/acme/api/dependabot/alerts", [
+            {"security_vulnerability": {"severity": sev, "package": {"name": pkg}}, "created_at": created}
+            for sev, pkg, created in [("critical", "lodash", "2026-02-03T09:15:00Z"),
+                                      ("medium", "minimist", "2026-02-02T14:40:00Z"),
+                                      ("high", "axios", "2026-01-20T08:00:00Z")]
+        ])
+        stub.paged("/repos/acme/web/dependabot/alerts", [])
+        stub.scripted("/repos/acme/infra/dependabot/alerts", [(403, {}, {"message": "disabled"})])
+        stub.graphql = _recorded_graphql()
+
+        def collect(mode):
+            client = _mod.GitHubClient("t", stub.base, limiter=limiter)
+            collector = collector_mod.GitHubEvidenceCollector("t", "acme", client=client, mode=mode)
+            evidence = [collector.collect_branch_protection(), collector.collect_dependabot_alerts()]
+            for item in evidence:
+                item.pop("timestamp")
+            return evidence, client.stats["requests"]
+
+        rest, rest_requests = collect("rest")
+        graphql, graphql_requests = collect("graphql")
+        assert graphql == rest
+        assert rest[0]["metrics"]["protected_repos"] == 2
+        assert rest[1]["metrics"]["total_open_alerts"] == 3
+        assert (rest_requests, graphql_requests) == (7, 3)
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError, match="Unknown evidence mode"):
+            collector_mod.GitHubEvidenceCollector("t", "acme", client=object(), mode="soap")
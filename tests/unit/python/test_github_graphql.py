@@ -0,0 +1,201 @@
+"""
+Unit tests for scripts/github_graphql.py
+Requirement: FR-5.4 — SOC 2 branch protection and Dependabot evidence is
+             fetched for many repositories per GraphQL query, with the same
+             evidence schema as the per-repository REST collection.
+"""
+
+import importlib.util
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Load modules under test
+# ---------------------------------------------------------------------------
+_SCRIPTS = Path(__file__).parents[3] / "scripts"
+_spec = importlib.util.spec_from_file_location("github_graphql", _SCRIPTS / "github_graphql.py")
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+_soc2_spec = importlib.util.spec_from_file_location("collect_soc2_evidence", _SCRIPTS / "collect_soc2_evidence.py")
+soc2 = importlib.util.module_from_spec(_soc2_spec)
+_soc2_spec.loader.exec_module(soc2)
+
+CASSETTE = Path(__file__).parent / "fixtures" / "github-graphql" / "acme-evidence.json"
+
+
+class _Recorded:
+    """Replays recorded GraphQL responses matched by operation name and variables."""
+
+    def __init__(self, path=CASSETTE):
+        self.exchanges = json.loads(Path(path).read_text())["exchanges"]
+        self.calls = []
+
+    def __call__(self, query, variables):
+        operation = re.search(r"query (\w+)", query).group(1)
+        self.calls.append((operation, variables))
+        for exchange in self.exchanges:
+            if exchange["operation"] == operation and all(
+                    variables.get(k) == v for k, v in exchange["variables"].items()):
+                return exchange["response"]
+        raise AssertionError(f"No recorded response for {operation} {variables}")
+
+
+# ---------------------------------------------------------------------------
+# TestFetchRepositories
+# ---------------------------------------------------------------------------
+
+class TestFetchRepositories:
+    """Repositories and alerts are paged by cursor and normalized to REST shapes."""
+
+    def test_recorded_org(self):
+        recorded = _Recorded()
+        repos = _mod.fetch_repositories(recorded, "acme")
+        assert [r["name"] for r in repos] == ["api", "web", "infra"]
+        assert [op for op, _ in recorded.calls] == ["RepositoryEvidence", "RepositoryAlerts", "RepositoryEvidence"]
+        assert recorded.calls[0][1]["states"] == ["OPEN"]
+        assert recorded.calls[0][1]["repos"] == _mod.REPOS_PER_QUERY
+
+        api, web, infra = repos
+        assert api["default_branch"] == "main"
+        assert api["branch_protection"] == {
+            "enforce_admins": {"enabled": True},
+            "required_pull_request_reviews": {"required_approving_review_count": 2},
+            "required_status_checks": {
+                "contexts": ["ci/test", "lint"],
+                "checks": [{"context": "ci/test", "app_id": 15368}, {"context": "lint", "app_id": None}],
+            },
+        }
+        assert [a["security_vulnerability"]["severity"] for a in api["vulnerability_alerts"]] == [
+            "critical", "medium", "high"]
+        assert web["branch_protection"] is None and web["default_branch_protection"] is None
+        assert web["default_branch"] == "develop"
+        assert web["vulnerability_alerts"] == []
+        assert infra["branch_protection"] == {"enforce_admins": {"enabled": False}}
+        assert infra["vulnerability_alerts"] is None
+
+    def test_all_alert_states(self):
+        recorded = _Recorded()
+        _mod.fetch_repositories(recorded, "acme", alert_states=None)
+        assert all(variables["states"] is None for _, variables in recorded.calls)
+
+    def test_missing_data_raises(self):
+        with pytest.raises(_mod.GraphQLError, match="Bad credentials"):
+            _mod.fetch_repositories(lambda q, v: {"data": None, "errors": [{"message": "Bad credentials"}]}, "acme")
+        with pytest.raises(_mod.GraphQLError, match="Organization not found"):
+            _mod.fetch_repositories(lambda q, v: {"data": {"organization": None}}, "nobody")
+        with pytest.raises(_mod.GraphQLError):
+            _mod.fetch_repositories(lambda q, v: None, "acme")
+
+    def test_rate_limited_retried_with_backoff(self):
+        recorded = _Recorded()
+        limited = {"data": None, "errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]}
+        responses = [limited, limited]
+        sleeps = []
+
+        def run_query(query, variables):
+            return responses.pop(0) if responses else recorded(query, variables)
+
+        repos = _mod.fetch_repositories(run_query, "acme", sleep=sleeps.append)
+        assert [r["name"] for r in repos] == ["api", "web", "infra"]
+        assert sleeps == [_mod.RATE_LIMIT_BACKOFF_SECONDS, _mod.RATE_LIMIT_BACKOFF_SECONDS * 2]
+
+    def test_rate_limited_gives_up(self):
+        sleeps = []
+        limited = {"data": None, "errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]}
+        with pytest.raises(_mod.GraphQLError, match="API rate limit exceeded"):
+            _mod.fetch_repositories(lambda q, v: limited, "acme", sleep=sleeps.append)
+        assert len(sleeps) == _mod.RATE_LIMIT_RETRIES
+
+    def test_other_errors_not_retried(self):
+        sleeps = []
+        with pytest.raises(_mod.GraphQLError, match="Bad credentials"):
+            _mod.fetch_repositories(lambda q, v: {"data": None, "errors": [{"message": "Bad credentials"}]},
+                                    "acme", sleep=sleeps.append)
+        assert sleeps == []
+
+    def test_queries_balanced(self):
+        for query in (_mod.REPOSITORY_EVIDENCE_QUERY, _mod.REPOSITORY_ALERTS_QUERY):
+            assert query.count("{") == query.count("}")
+            assert query.count("(") == query.count(")")
+
+
+# ---------------------------------------------------------------------------
+# TestRestShapes
+# ---------------------------------------------------------------------------
+
+class TestRestShapes:
+    """GraphQL objects map onto the fields the REST-based collectors read."""
+
+    def test_alert(self):
+        node = {"number": 4, "state": "FIXED", "createdAt": "c", "fixedAt": "f",
+                "securityVulnerability": {"severity": "MODERATE", "package": {"name": "yaml"}},
+                "securityAdvisory": {"severity": "LOW"}}
+        assert _mod.rest_alert(node) == {
+            "number": 4, "state": "fixed", "created_at": "c", "fixed_at": "f",
+            "security_vulnerability": {"severity": "medium", "package": {"name": "yaml"}},
+            "security_advisory": {"severity": "low"},
+        }
+
+    def test_unprotected(self):
+        assert _mod.rest_protection(None) is None
+
+
+# ---------------------------------------------------------------------------
+# TestSOC2Collector
+# ---------------------------------------------------------------------------
+
+class TestSOC2Collector:
+    """collect_soc2_evidence.py writes the same evidence in both modes."""
+
+    REST = {
+        "/orgs/acme/repos": [{"name": "api", "default_branch": "main"},
+                             {"name": "web", "default_branch": "develop"},
+                             {"name": "infra", "default_branch": "main"}],
+        "/repos/acme/api/branches/main/protection": {
+            "required_pull_request_reviews": {"required_approving_review_count": 2},
+            "required_status_checks": {"contexts": ["ci/test", "lint"]},
+            "enforce_admins": {"enabled": True},
+        },
+        "/repos/acme/infra/branches/main/protection": {"enforce_admins": {"enabled": False}},
+        "/repos/acme/api/dependabot/alerts": [
+            {"number": n, "state": "open", "security_advisory": {"severity": sev},
+             "created_at": created, "fixed_at": None}
+            for n, sev, created in [(7, "critical", "2026-02-03T09:15:00Z"),
+                                    (6, "medium", "2026-02-02T14:40:00Z"),
+                                    (3, "high", "2026-01-20T08:00:00Z")]
+        ],
+        "/repos/acme/web/dependabot/alerts": [],
+    }
+
+    def _evidence(self, tmp_path, monkeypatch, mode):
+        monkeypatch.chdir(tmp_path / mode)
+        collector = soc2.SOC2EvidenceCollector("acme", mode=mode)
+        calls = []
+        collector.run_gh_api = lambda endpoint: calls.append(endpoint) or self.REST.get(endpoint)
+        collector.run_gh_graphql = _Recorded()
+        collector.collect_branch_protection()
+        collector.collect_dependabot_alerts()
+        evidence = {}
+        for name in ("branch_protection.json", "dependabot_alerts.json"):
+            data = json.loads((collector.evidence_dir / name).read_text())
+            data.pop("collected_at")
+            evidence[name] = data
+        return evidence, calls, collector.run_gh_graphql.calls
+
+    def test_graphql_matches_rest(self, tmp_path, monkeypatch):
+        (tmp_path / "rest").mkdir()
+        (tmp_path / "graphql").mkdir()
+        rest, rest_calls, _ = self._evidence(tmp_path, monkeypatch, "rest")
+        graphql, graphql_rest_calls, queries = self._evidence(tmp_path, monkeypatch, "graphql")
+        assert graphql == rest
+        assert graphql["branch_protection.json"]["protection_status"][0] == {
+            "repository": "api", "branch": "main", "protected": True,
+            "required_reviews": 2, "required_status_checks": 2, "enforce_admins": True}
+        assert graphql["dependabot_alerts.json"]["alert_count"] == 3
+        # 1 + 2N REST calls become one query per repository page (+ one alerts page)
+        assert len(rest_calls) == 8
+        assert graphql_rest_calls == [] and len(queries) == 3
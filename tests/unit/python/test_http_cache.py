@@ -0,0 +1,155 @@
+"""
+Unit tests for scripts/http_cache.py
+Requirement: NFR-2.2 — dashboard refreshes revalidate unchanged sources
+             with conditional GETs instead of re-downloading them.
+"""
+
+import importlib.util
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Load module under test
+# ---------------------------------------------------------------------------
+_SCRIPT = Path(__file__).parents[3] / "scripts" / "http_cache.py"
+_spec = importlib.util.spec_from_file_location("http_cache", _SCRIPT)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+
+# ---------------------------------------------------------------------------
+# Local stub server
+# ---------------------------------------------------------------------------
+
+class _Stub:
+    """Serves /feed with an ETag, /dated with Last-Modified, /plain without."""
+
+    def __init__(self):
+        self.body = b"v1"
+        self.etag = '"v1"'
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append((self.path, dict(self.headers)))
+                if self.path == "/missing":
+                    self.send_error(404)
+                    return
+                if self.path == "/feed" and self.headers.get("If-None-Match") == stub.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                if self.path == "/dated" and self.headers.get("If-Modified-Since"):
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                if self.path == "/feed":
+                    self.send_header("ETag", stub.etag)
+                if self.path == "/dated":
+                    self.send_header("Last-Modified", "Mon, 02 Mar 2026 10:00:00 GMT")
+                self.send_header("Content-Length", str(len(stub.body)))
+                self.end_headers()
+                self.wfile.write(stub.body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        ).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+
+@pytest.fixture
+def stub():
+    s = _Stub()
+    yield s
+    s.server.shutdown()
+    s.server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return _mod.HTTPCache(tmp_path / "http")
+
+
+class _CountingParser:
+    def __init__(self):
+        self.calls = 0
+        self.__name__ = "counting"
+
+    def __call__(self, body):
+        self.calls += 1
+        return {"text": body.decode()}
+
+
+# ---------------------------------------------------------------------------
+# TestConditionalGet
+# ---------------------------------------------------------------------------
+
+class TestConditionalGet:
+    """Validators are stored and a 304 skips download and parsing."""
+
+    def test_etag_revalidation_skips_parse(self, stub, cache):
+        parse = _CountingParser()
+        assert cache.fetch(f"{stub.base}/feed", parse) == {"text": "v1"}
+        assert cache.fetch(f"{stub.base}/feed", parse) == {"text": "v1"}
+        assert parse.calls == 1
+        assert stub.requests[1][1]["If-None-Match"] == '"v1"'
+        assert cache.stats == {"hits": 1, "misses": 1, "errors": 0}
+
+    def test_caller_headers_sent_with_validators(self, stub, cache):
+        headers = {"User-Agent": "AI-Dashboard-Test/1.0"}
+        cache.fetch(f"{stub.base}/feed", _CountingParser(), headers=headers)
+        cache.fetch(f"{stub.base}/feed", _CountingParser(), headers=headers)
+        assert [r[1]["User-Agent"] for r in stub.requests] == ["AI-Dashboard-Test/1.0"] * 2
+        assert stub.requests[1][1]["If-None-Match"] == '"v1"'
+
+    def test_changed_resource_refetched(self, stub, cache):
+        cache.fetch(f"{stub.base}/feed", _CountingParser())
+        stub.body, stub.etag = b"v2", '"v2"'
+        assert cache.fetch(f"{stub.base}/feed", _CountingParser()) == {"text": "v2"}
+        assert cache.stats["misses"] == 2
+
+    def test_last_modified_revalidation(self, stub, cache):
+        cache.fetch(f"{stub.base}/dated", _CountingParser())
+        cache.fetch(f"{stub.base}/dated", _CountingParser())
+        assert stub.requests[1][1]["If-Modified-Since"] == "Mon, 02 Mar 2026 10:00:00 GMT"
+        assert cache.hit_ratio() == 0.5
+
+    def test_persists_across_instances(self, stub, tmp_path):
+        _mod.HTTPCache(tmp_path / "http").fetch(f"{stub.base}/feed", _CountingParser())
+        reloaded = _mod.HTTPCache(tmp_path / "http")
+        reloaded.fetch(f"{stub.base}/feed", _CountingParser())
+        assert reloaded.stats["hits"] == 1
+
+    def test_other_parser_parses_stored_body(self, stub, cache):
+        cache.fetch(f"{stub.base}/feed", _CountingParser())
+        length = cache.fetch(f"{stub.base}/feed", len, parser_name="length")
+        assert length == 2
+        assert cache.stats["hits"] == 1
+
+    def test_without_validators_nothing_stored(self, stub, cache):
+        cache.fetch(f"{stub.base}/plain", _CountingParser())
+        cache.fetch(f"{stub.base}/plain", _CountingParser())
+        assert "If-None-Match" not in stub.requests[1][1]
+        assert cache.stats["misses"] == 2
+
+    def test_lost_body_refetched(self, stub, cache):
+        cache.fetch(f"{stub.base}/feed", _CountingParser())
+        for body in cache.directory.glob("*.body"):
+            body.unlink()
+        assert cache.fetch(f"{stub.base}/feed", len, parser_name="length") == 2
+
+    def test_http_error_raised_and_counted(self, stub, cache):
+        with pytest.raises(urllib.error.HTTPError):
+            cache.fetch(f"{stub.base}/missing", _CountingParser())
+        assert cache.stats["errors"] == 1
+        assert "0 not modified" in cache.summary()
@@ -0,0 +1,185 @@
+"""
+Unit tests for scripts/metrics_registry.py
+Requirement: NFR-6.1/NFR-6.2 — OpenMetrics exposition for rate limiter,
+             circuit breaker and retry instrumentation.
+"""
+
+import importlib.util
+import sys
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Load modules under test
+# ---------------------------------------------------------------------------
+_SCRIPTS = Path(__file__).parents[3] / "scripts"
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(name, _SCRIPTS / f"{name}.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+_mod = _load("metrics_registry")
+_rate_limiter = _load("rate_limiter")
+_resilience = _load("resilience")
+# Instrumented modules record into the metrics_registry they imported
+_global = sys.modules["metrics_registry"].REGISTRY
+
+
+@pytest.fixture
+def registry():
+    return _mod.MetricsRegistry(enabled=True)
+
+
+@pytest.fixture
+def global_registry():
+    _global.reset()
+    _global.enabled = True
+    yield _global
+    _global.enabled = False
+    _global.reset()
+
+
+# ---------------------------------------------------------------------------
+# TestMetrics
+# ---------------------------------------------------------------------------
+
+class TestMetrics:
+    """Counters, gauges and histograms record only while enabled."""
+
+    def test_disabled_registry_records_nothing(self):
+        registry = _mod.MetricsRegistry()
+        counter = registry.counter("requests", "Requests", ["api"])
+        counter.inc(api="github")
+        assert counter.value(api="github") == 0
+
+    def test_counter_by_label(self, registry):
+        counter = registry.counter("requests", "Requests", ["api"])
+        counter.inc(api="github")
+        counter.inc(2, api="github")
+        counter.inc(api="claude")
+        assert counter.value(api="github") == 3
+        assert counter.value(api="claude") == 1
+
+    def test_histogram_buckets(self, registry):
+        hist = registry.histogram("wait_seconds", "Wait", buckets=(1, 5))
+        for value in (0.5, 2, 10):
+            hist.observe(value)
+        text = registry.render()
+        assert 'wait_seconds_bucket{le="1"} 1' in text
+        assert 'wait_seconds_bucket{le="5"} 2' in text
+        assert 'wait_seconds_bucket{le="+Inf"} 3' in text
+        assert "wait_seconds_sum 12.5" in text
+        assert "wait_seconds_count 3" in text
+
+    def test_type_conflict_rejected(self, registry):
+        registry.counter("x", "X")
+        with pytest.raises(ValueError):
+            registry.gauge("x", "X")
+
+    def test_same_name_returns_same_metric(self, registry):
+        assert registry.counter("x", "X") is registry.counter("x", "X")
+
+
+# ---------------------------------------------------------------------------
+# TestExposition
+# ---------------------------------------------------------------------------
+
+class TestExposition:
+    """OpenMetrics text format, file export and localhost endpoint."""
+
+    def test_render_format(self, registry):
+        registry.counter("requests", "Requests admitted", ["api"]).inc(api='git"hub')
+        registry.gauge("state", "State", ["name"]).set(2, name="github_api")
+        lines = registry.render().splitlines()
+        assert lines[-1] == "# EOF"
+        assert "# TYPE requests counter" in lines
+        assert "# HELP requests Requests admitted" in lines
+        assert 'requests_total{api="git\\"hub"} 1' in lines
+        assert 'state{name="github_api"} 2' in lines
+
+    def test_write_file(self, registry, tmp_path):
+        registry.counter("requests", "Requests").inc()
+        out = tmp_path / "metrics" / "rate-limits.prom"
+        registry.write(out)
+        assert "requests_total 1" in out.read_text()
+
+    def test_http_endpoint(self, registry):
+        registry.counter("requests", "Requests").inc()
+        server = registry.serve(0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as resp:
+                assert resp.headers["Content-Type"] == _mod.CONTENT_TYPE
+                assert "requests_total 1" in resp.read().decode()
+        finally:
+            registry.stop()
+
+
+# ---------------------------------------------------------------------------
+# TestInstrumentation
+# ---------------------------------------------------------------------------
+
+class TestInstrumentation:
+    """rate_limiter and resilience report into the global registry."""
+
+    def _limiter(self, tmp_path):
+        limiter = _rate_limiter.RateLimiter(
+            "reddit", metrics_file=tmp_path / "m.jsonl",
+            metrics_sink=_rate_limiter.FileMetricsSink(tmp_path / "m.jsonl"),
+        )
+        limiter.window = _rate_limiter.TokenBucketEngine(1, 0.05)
+        return limiter
+
+    def test_rate_limiter_counters_and_wait(self, global_registry, tmp_path):
+        limiter = self._limiter(tmp_path)
+        limiter.acquire()
+        limiter.acquire()
+        text = global_registry.render()
+        assert 'rate_limiter_requests_total{api="reddit"} 2' in text
+        assert 'rate_limiter_throttled_total{api="reddit"} 1' in text
+        assert 'rate_limiter_wait_seconds_count{api="reddit"} 2' in text
+
+    def test_rate_limiter_shed(self, global_registry, tmp_path):
+        limiter = self._limiter(tmp_path)
+        limiter.window = _rate_limiter.TokenBucketEngine(4, 60)
+        while limiter.try_acquire("bulk")[0]:
+            pass
+        assert 'rate_limiter_shed_total{api="reddit",priority="bulk"} 1' in global_registry.render()
+
+    def test_breaker_transitions(self, global_registry, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        breaker = _resilience.CircuitBreaker("github_api", failure_threshold=1)
+        with pytest.raises(RuntimeError):
+            breaker.call(lambda: (_ for _ in ()).throw(RuntimeError("down")))
+        text = global_registry.render()
+        assert 'circuit_breaker_transitions_total{name="github_api",state="open"} 1' in text
+        assert 'circuit_breaker_state{name="github_api"} 2' in text
+
+    def test_retry_delays(self, global_registry, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(_resilience.time, "sleep", lambda s: None)
+        calls = []
+
+        @_resilience.retry_with_backoff(max_retries=2, backoff_sequence=(1, 2))
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise RuntimeError("transient")
+            return "ok"
+
+        assert flaky() == "ok"
+        text = global_registry.render()
+        assert 'retry_attempts_total{function="flaky"} 2' in text
+        assert 'retry_delay_seconds_sum{function="flaky"} 3' in text
+
+    def test_disabled_costs_no_records(self, tmp_path):
+        _global.reset()
+        limiter = self._limiter(tmp_path)
+        limiter.acquire()
+        assert "rate_limiter_requests_total" not in _global.render()
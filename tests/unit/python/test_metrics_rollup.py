@@ -0,0 +1,244 @@
+"""
+Unit tests for scripts/metrics_rollup.py
+Requirement: NFR-4.1/NFR-2.2/NFR-6.1 — reports answered from hourly and
+             daily rollups instead of raw metrics history.
+"""
+
+import importlib.util
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Load modules under test
+# ---------------------------------------------------------------------------
+_SCRIPTS = Path(__file__).parents[3] / "scripts"
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(name, _SCRIPTS / f"{name}.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+_mod = _load("metrics_rollup")
+_reliability = _load("check_workflow_reliability")
+_report = _load("generate_reliability_report")
+_performance = _load("analyze_dashboard_performance")
+_rate_limits = _load("analyze_rate_limits")
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+NOW = datetime.now(timezone.utc)
+RESULTS_HEADER = "timestamp,workflow_name,workflow_id,status,conclusion,created_at,updated_at,run_url\n"
+
+
+def _iso(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _run(moment, name="ci", conclusion="success"):
+    return f"{_iso(moment)},{name},1,completed,{conclusion},,,\n"
+
+
+def _append(path, text):
+    with open(path, "a") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = _mod.RollupStore(tmp_path / "rollups.sqlite")
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def results(tmp_path):
+    path = tmp_path / "workflow-results.csv"
+    path.write_text(RESULTS_HEADER + "# Workflow Reliability Metrics\n")
+    return path
+
+
+# ---------------------------------------------------------------------------
+# TestRollupStore
+# ---------------------------------------------------------------------------
+
+class TestRollupStore:
+    """Hourly/daily buckets, incremental ingestion and window queries."""
+
+    def test_window_combines_hourly_edges_and_days(self, store, results):
+        start = datetime(2026, 3, 1, 22, tzinfo=timezone.utc)
+        _append(results, "".join(_run(start + timedelta(hours=h)) for h in range(60)))
+        _mod.ingest_workflow_results(store, results)
+        since = (start + timedelta(hours=1)).timestamp()
+        until = (start + timedelta(hours=50)).timestamp()
+        assert store.query(_mod.WORKFLOW_RUNS, since, until)["ci"]["count"] == 49
+        assert store.query(_mod.WORKFLOW_RUNS)["ci"]["count"] == 60
+
+    def test_ingest_is_incremental(self, store, results):
+        _append(results, _run(NOW) + _run(NOW, conclusion="failure"))
+        assert _mod.ingest_workflow_results(store, results) == 2
+        _append(results, _run(NOW))
+        assert _mod.ingest_workflow_results(store, results) == 1
+        agg = store.query(_mod.WORKFLOW_RUNS)["ci"]
+        assert (agg["count"], agg["ok"]) == (3, 2)
+
+    def test_partial_trailing_line_waits(self, store, results):
+        _append(results, _run(NOW) + _iso(NOW))
+        assert _mod.ingest_workflow_results(store, results) == 1
+        _append(results, ",ci,1,completed,success,,,\n")
+        assert _mod.ingest_workflow_results(store, results) == 1
+
+    def test_truncated_source_rebuilds(self, store, results):
+        _append(results, _run(NOW) * 5)
+        _mod.ingest_workflow_results(store, results)
+        results.write_text(_run(NOW))
+        _mod.ingest_workflow_results(store, results)
+        assert store.query(_mod.WORKFLOW_RUNS)["ci"]["count"] == 1
+
+    def test_trimmed_source_rebuilds(self, store, results):
+        _append(results, _run(NOW) * 3)
+        _mod.ingest_workflow_results(store, results)
+        # `tail -n` drops the oldest lines and keeps the size roughly constant
+        lines = results.read_text().splitlines(keepends=True)
+        results.write_text("".join(lines[1:]) + _run(NOW) * 2 + _run(NOW, conclusion="failure"))
+        _mod.ingest_workflow_results(store, results)
+        agg = store.query(_mod.WORKFLOW_RUNS)["ci"]
+        assert (agg["count"], agg["ok"]) == (6, 5)
+
+    def test_changed_params_rebuild(self, store, tmp_path):
+        path = tmp_path / "dashboard-performance.csv"
+        path.write_text(f"{_iso(NOW)},dash,1,8.0,success\n")
+        _mod.ingest_dashboard_performance(store, path, 10.0)
+        assert store.query(_mod.DASHBOARD_PERFORMANCE)["dash"]["ok"] == 1
+        _mod.ingest_dashboard_performance(store, path, 5.0)
+        assert store.query(_mod.DASHBOARD_PERFORMANCE)["dash"]["ok"] == 0
+
+    def test_samples_watermark_and_latest(self, store, tmp_path):
+        t0 = NOW.timestamp()
+        samples = [(t0 + i, "core", 0, float(i), 0.0, 0.0, str(i)) for i in range(3)]
+        read = lambda watermark: samples
+        assert store.ingest_samples("s", tmp_path / "s.jsonl", read) == 3
+        samples.append((t0 + 3, "core", 0, 3.0, 0.0, 0.0, "3"))
+        assert store.ingest_samples("s", tmp_path / "s.jsonl", read) == 1
+        assert store.query("s")["core"]["total"] == 6
+        assert store.latest("s") == "3"
+
+    def test_late_samples_in_overlap_counted_once(self, store, tmp_path):
+        t0 = NOW.timestamp()
+        samples = [(t0 + i, "core", 0, 1.0, 0.0, 0.0, None) for i in (0, 10, 10)]
+        read = lambda start: [s for s in samples if s[0] >= start]
+        assert store.ingest_samples("s", tmp_path / "s.jsonl", read) == 3
+        # Appended after the watermark moved past it, and a repeat read
+        samples.append((t0 + 5, "core", 0, 1.0, 0.0, 0.0, None))
+        assert store.ingest_samples("s", tmp_path / "s.jsonl", read) == 1
+        assert store.ingest_samples("s", tmp_path / "s.jsonl", read) == 0
+        assert store.query("s")["core"]["count"] == 4
+
+    def test_samples_before_overlap_skipped(self, store, tmp_path):
+        t0 = NOW.timestamp()
+        samples = [(t0, "core", 0, 1.0, 0.0, 0.0, None)]
+        read = lambda start: [s for s in samples if s[0] >= start]
+        store.ingest_samples("s", tmp_path / "s.jsonl", read)
+        samples.append((t0 - _mod.INGEST_OVERLAP_SECONDS - 1, "core", 0, 1.0, 0.0, 0.0, None))
+        assert store.ingest_samples("s", tmp_path / "s.jsonl", read) == 0
+
+
+# ---------------------------------------------------------------------------
+# TestReports
+# ---------------------------------------------------------------------------
+
+class TestReports:
+    """Reports give the same answers from rollups as from raw files."""
+
+    def test_workflow_reliability(self, store, results):
+        _append(results, "".join([
+            _run(NOW - timedelta(days=40), conclusion="failure"),
+            _run(NOW - timedelta(days=2)),
+            _run(NOW - timedelta(days=1), conclusion="failure"),
+            _run(NOW - timedelta(days=1), name="new", conclusion="failure"),
+        ]))
+        raw = _reliability.WorkflowReliabilityChecker(results, grace_workflows=["new"])
+        rolled = _reliability.WorkflowReliabilityChecker(
+            results, grace_workflows=["new"], rollup_store=store
+        )
+        for checker in (raw, rolled):
+            checker.load_results(period_days=30)
+        assert rolled.calculate_reliability() == raw.calculate_reliability() == (0.5, 2, 1)
+        assert rolled.get_per_workflow_stats() == raw.get_per_workflow_stats()
+
+    def test_monthly_report(self, store, results, tmp_path):
+        classifications = tmp_path / "failure-classifications.csv"
+        classifications.write_text(
+            "2026-03-05T10:00:00Z,ci,1,internal,bug\n"
+            "2026-03-06T10:00:00Z,ci,2,external,outage\n"
+            "2026-04-01T00:00:00Z,ci,3,internal,bug\n"
+        )
+        _append(results, "".join([
+            "2026-02-28T23:59:59Z,ci,1,completed,failure,,,\n",
+            "2026-03-05T10:00:00Z,ci,1,completed,failure,,,\n",
+            "2026-03-20T10:00:00Z,ci,1,completed,success,,,\n",
+            "2026-03-31T23:59:59Z,lint,1,completed,success,,,\n",
+        ]))
+        raw = _report.ReliabilityReportGenerator(results, classifications)
+        rolled = _report.ReliabilityReportGenerator(results, classifications, rollup_store=store)
+        for generator in (raw, rolled):
+            generator.load_data("2026-03")
+        assert rolled.calculate_statistics() == raw.calculate_statistics()
+        assert rolled.calculate_statistics()["total_runs"] == 3
+        assert rolled.calculate_statistics()["external_failures"] == 1
+
+    def test_dashboard_performance(self, store, tmp_path):
+        path = tmp_path / "dashboard-performance.csv"
+        path.write_text(
+            "timestamp,workflow_name,workflow_id,duration_minutes,conclusion\n"
+            + "".join(
+                f"{_iso(NOW - timedelta(days=d))},{name},1,{minutes},success\n"
+                for d, name, minutes in [(20, "a", 12.0), (3, "a", 4.0), (1, "b", 9.0)]
+            )
+        )
+        analysis = _performance.DashboardPerformanceAnalyzer(
+            path, rollup_store=store
+        ).analyze_performance()
+        assert analysis["total_runs"] == 3
+        assert analysis["compliant_runs"] == 2
+        assert analysis["average_duration"] == pytest.approx(25 / 3)
+        assert (analysis["min_duration"], analysis["max_duration"]) == (4.0, 12.0)
+        assert analysis["workflow_stats"]["a"]["average_duration"] == 8.0
+        assert analysis["recent_7_day_runs"] == 2
+        assert analysis["recent_7_day_compliance"] == 100.0
+
+    def test_rate_limits(self, store, tmp_path):
+        now = datetime.utcnow()
+        records = {
+            "api-usage.jsonl": [
+                {"timestamp": (now - timedelta(days=d)).isoformat(), "api": "github",
+                 "total_requests": 5, "throttled_requests": 1, "violations": 0}
+                for d in (30, 2, 1)
+            ],
+            "github-rate-limit.jsonl": [
+                {"timestamp": (now - timedelta(days=d)).isoformat(),
+                 "core": {"limit": 5000, "used": used, "remaining": 5000 - used}}
+                for d, used in ((2, 1000), (1, 3000))
+            ],
+            "violations.jsonl": [
+                {"timestamp": (now - timedelta(days=1)).isoformat(), "api": "reddit"}
+            ],
+        }
+        for name, lines in records.items():
+            (tmp_path / name).write_text("".join(json.dumps(r) + "\n" for r in lines))
+
+        raw = _rate_limits.RateLimitAnalyzer(tmp_path)
+        rolled = _rate_limits.RateLimitAnalyzer(tmp_path, rollup_store=store)
+        for analyzer in (raw, rolled):
+            analyzer.load_metrics(days=7)
+        assert rolled.analyze_api_usage() == raw.analyze_api_usage()
+        assert rolled.analyze_github_usage() == raw.analyze_github_usage()
+        assert rolled.analyze_violations() == raw.analyze_violations()
@@ -0,0 +1,710 @@
+"""
+Unit tests for scripts/rate_limiter.py
+Requirement: NFR-6.1 — per-API rate limiting with constant-cost window engines.
+"""
+
+import asyncio
+import importlib.util
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import formatdate
+from pathlib import Path
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# Load module under test
+# ---------------------------------------------------------------------------
+_SCRIPT = Path(__file__).parents[3] / "scripts" / "rate_limiter.py"
+_spec = importlib.util.spec_from_file_location("rate_limiter", _SCRIPT)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _limiter(tmp_path, api_name="reddit", **kwargs):
+    return _mod.RateLimiter(api_name, metrics_file=tmp_path / "api-usage.jsonl", **kwargs)
+
+
+def _fill(engine, now, n):
+    for _ in range(n):
+        engine.record(now)
+
+
+# ---------------------------------------------------------------------------
+# TestTokenBucketEngine
+# ---------------------------------------------------------------------------
+
+class TestTokenBucketEngine:
+    """GCRA token bucket: burst of `limit`, then one per emission interval."""
+
+    def test_allows_full_burst(self):
+        engine = _mod.TokenBucketEngine(10, 60)
+        for _ in range(10):
+            assert engine.check(1000.0) == (True, 0)
+            engine.record(1000.0)
+
+    def test_blocks_after_burst_with_emission_interval_wait(self):
+        engine = _mod.TokenBucketEngine(10, 60)
+        _fill(engine, 1000.0, 10)
+        can_proceed, wait = engine.check(1000.0)
+        assert can_proceed is False
+        assert wait == pytest.approx(6.0)
+
+    def test_refills_one_token_per_interval(self):
+        engine = _mod.TokenBucketEngine(10, 60)
+        _fill(engine, 1000.0, 10)
+        assert engine.check(1006.0) == (True, 0)
+
+    def test_count_reflects_backlog(self):
+        engine = _mod.TokenBucketEngine(10, 60)
+        _fill(engine, 1000.0, 4)
+        assert engine.count(1000.0) == 4
+        assert engine.count(1100.0) == 0
+
+    def test_state_is_constant_size(self):
+        engine = _mod.TokenBucketEngine(1_000_000, 3600)
+        _fill(engine, 1000.0, 50_000)
+        assert set(vars(engine)) == {"limit", "period", "emission_interval", "tat"}
+
+
+# ---------------------------------------------------------------------------
+# TestSlidingWindowCounterEngine
+# ---------------------------------------------------------------------------
+
+class TestSlidingWindowCounterEngine:
+    """Sliding-window counter weights the previous fixed window by overlap."""
+
+    def test_allows_until_limit(self):
+        engine = _mod.SlidingWindowCounterEngine(5, 100)
+        _fill(engine, 10.0, 4)
+        assert engine.check(10.0) == (True, 0)
+        engine.record(10.0)
+        assert engine.check(10.0)[0] is False
+
+    def test_wait_spans_into_next_window(self):
+        engine = _mod.SlidingWindowCounterEngine(5, 100)
+        _fill(engine, 10.0, 5)
+        can_proceed, wait = engine.check(10.0)
+        assert can_proceed is False
+        assert wait == pytest.approx(90.0)
+
+    def test_previous_window_slides_out(self):
+        engine = _mod.SlidingWindowCounterEngine(10, 100)
+        _fill(engine, 50.0, 10)
+        # At t=150 half of the previous window still overlaps: estimate 5
+        assert engine.count(150.0) == 5
+        assert engine.check(150.0) == (True, 0)
+
+    def test_reported_wait_admits(self):
+        engine = _mod.SlidingWindowCounterEngine(10, 100)
+        _fill(engine, 50.0, 10)
+        _fill(engine, 120.0, 4)
+        can_proceed, wait = engine.check(120.0)
+        assert can_proceed is False
+        assert engine.check(120.0 + wait + 1e-6)[0] is True
+
+    def test_stale_windows_reset(self):
+        engine = _mod.SlidingWindowCounterEngine(10, 100)
+        _fill(engine, 50.0, 10)
+        assert engine.count(500.0) == 0
+
+
+# ---------------------------------------------------------------------------
+# TestSlidingLogEngine
+# ---------------------------------------------------------------------------
+
+class TestSlidingLogEngine:
+    """Exact legacy behaviour is still available."""
+
+    def test_wait_until_oldest_expires(self):
+        engine = _mod.SlidingLogEngine(2, 60)
+        engine.record(100.0)
+        engine.record(110.0)
+        assert engine.check(120.0) == (False, 40.0)
+        assert engine.check(161.0) == (True, 0)
+
+
+# ---------------------------------------------------------------------------
+# TestRateLimiter
+# ---------------------------------------------------------------------------
+
+class TestRateLimiter:
+    """RateLimiter wires one engine per configured window."""
+
+    def test_default_engines(self, tmp_path):
+        limiter = _limiter(tmp_path, "claude")
+        assert isinstance(limiter.window, _mod.TokenBucketEngine)
+        assert isinstance(limiter.daily_window, _mod.SlidingWindowCounterEngine)
+        assert limiter.monthly_window is None
+
+    def test_monthly_only_api(self, tmp_path):
+        limiter = _limiter(tmp_path, "x_api")
+        assert limiter.window is None
+        assert isinstance(limiter.monthly_window, _mod.SlidingWindowCounterEngine)
+
+    def test_engine_override(self, tmp_path):
+        limiter = _limiter(tmp_path, "claude", engine="sliding_log")
+        assert isinstance(limiter.window, _mod.SlidingLogEngine)
+        assert isinstance(limiter.daily_window, _mod.SlidingLogEngine)
+
+    def test_unknown_engine_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            _limiter(tmp_path, engine="leaky")
+
+    def test_unknown_api_is_unlimited(self, tmp_path):
+        limiter = _limiter(tmp_path, "unknown")
+        for _ in range(100):
+            limiter.record_request()
+        assert limiter.check_limit() == (True, 0)
+
+    @pytest.mark.parametrize("engine", ["token_bucket", "sliding_log"])
+    def test_admits_exactly_limit(self, tmp_path, engine):
+        limiter = _limiter(tmp_path, "reddit", engine=engine)
+        admitted = 0
+        while limiter.check_limit()[0]:
+            limiter.record_request()
+            admitted += 1
+        assert admitted == 60
+
+    def test_usage_stats(self, tmp_path):
+        limiter = _limiter(tmp_path, "claude")
+        for _ in range(3):
+            limiter.record_request()
+        stats = limiter.get_usage_stats()
+        assert stats["total_requests"] == 3
+        assert stats["current_window"]["requests"] == 3
+        assert stats["daily"] == {"requests": 3, "limit": 40000}
+
+
+# ---------------------------------------------------------------------------
+# TestMetricsSinks
+# ---------------------------------------------------------------------------
+
+def _lines(path):
+    return path.read_text().splitlines() if path.exists() else []
+
+
+class TestMetricsSinks:
+    """Metrics are buffered off the request path and flushed in batches."""
+
+    def test_file_sink_writes_through(self, tmp_path):
+        sink = _mod.FileMetricsSink(tmp_path / "m.jsonl")
+        sink.emit({"n": 1})
+        assert len(_lines(sink.path)) == 1
+
+    def test_buffered_sink_defers_writes(self, tmp_path):
+        sink = _mod.BufferedMetricsSink(tmp_path / "m.jsonl", flush_every=1000, flush_interval=60)
+        for i in range(5):
+            sink.emit({"n": i})
+        assert _lines(sink.path) == []
+        sink.flush()
+        assert len(_lines(sink.path)) == 5
+
+    def test_close_flushes_remainder(self, tmp_path):
+        sink = _mod.BufferedMetricsSink(tmp_path / "m.jsonl", flush_every=1000, flush_interval=60)
+        sink.emit({"n": 1})
+        sink.close()
+        assert len(_lines(sink.path)) == 1
+
+    def test_flush_every_wakes_writer(self, tmp_path):
+        sink = _mod.BufferedMetricsSink(tmp_path / "m.jsonl", flush_every=3, flush_interval=60)
+        for i in range(3):
+            sink.emit({"n": i})
+        deadline = time.monotonic() + 2
+        while sink.written < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sink.written == 3
+        sink.close()
+
+    def test_ring_buffer_drops_oldest(self, tmp_path):
+        sink = _mod.BufferedMetricsSink(
+            tmp_path / "m.jsonl", flush_every=1000, flush_interval=60, max_buffer=2
+        )
+        for i in range(3):
+            sink.emit({"n": i})
+        assert sink.dropped == 1
+        assert [r["n"] for r in sink.buffer] == [1, 2]
+
+    def test_sample_rate_zero_discards(self, tmp_path):
+        sink = _mod.BufferedMetricsSink(tmp_path / "m.jsonl", sample_rate=0.0)
+        sink.emit({"n": 1})
+        sink.close()
+        assert sink.written == 0
+
+    def test_limiter_uses_shared_sink_per_file(self, tmp_path):
+        a = _limiter(tmp_path, "reddit")
+        b = _limiter(tmp_path, "claude")
+        assert a.metrics_sink is b.metrics_sink
+
+    def test_limiter_records_through_sink(self, tmp_path):
+        sink = _mod.FileMetricsSink(tmp_path / "m.jsonl")
+        limiter = _limiter(tmp_path, "reddit", metrics_sink=sink)
+        limiter.record_request()
+        limiter.record_request()
+        assert sink.written == 2
+
+    def test_sink_options_from_env(self, capsys):
+        options = _mod.metrics_sink_options_from_env({
+            "RATE_LIMIT_METRICS_SAMPLE_RATE": "0.1",
+            "RATE_LIMIT_METRICS_FLUSH_INTERVAL": "30",
+            "RATE_LIMIT_METRICS_FLUSH_EVERY": "many",
+        })
+        assert options == {"sample_rate": 0.1, "flush_interval": 30.0}
+        assert "RATE_LIMIT_METRICS_FLUSH_EVERY" in capsys.readouterr().err
+        assert _mod.metrics_sink_options_from_env({}) == {}
+
+    def test_manager_configures_shared_sink(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(_mod, "_metrics_sinks", {})
+        manager = _mod.RateLimitManager(metrics_options={"sample_rate": 0.25, "flush_interval": 30})
+        sink = manager.get_limiter("reddit").metrics_sink
+        assert (sink.sample_rate, sink.flush_interval) == (0.25, 30)
+        assert manager.get_limiter("claude").metrics_sink is sink
+        sink.close()
+
+
+# ---------------------------------------------------------------------------
+# TestAcquire
+# ---------------------------------------------------------------------------
+
+def _fast_limiter(tmp_path, limit=5, period=0.5):
+    """Limiter with a short single window so waits stay in the millisecond range."""
+    limiter = _limiter(tmp_path, "reddit", metrics_sink=_mod.FileMetricsSink(tmp_path / "m.jsonl"))
+    limiter.window = _mod.TokenBucketEngine(limit, period)
+    return limiter
+
+
+class TestAcquire:
+    """acquire() atomically reserves capacity and queues waiters FIFO."""
+
+    def test_try_acquire_reserves(self, tmp_path):
+        limiter = _fast_limiter(tmp_path, limit=2, period=60)
+        assert limiter.try_acquire() == (True, 0)
+        assert limiter.try_acquire() == (True, 0)
+        acquired, wait = limiter.try_acquire()
+        assert acquired is False
+        assert wait > 0
+        assert limiter.total_requests == 2
+
+    def test_nonblocking_timeout(self, tmp_path):
+        limiter = _fast_limiter(tmp_path, limit=1, period=60)
+        assert limiter.acquire(timeout=0) is True
+        assert limiter.acquire(timeout=0) is False
+
+    def test_fails_fast_when_wait_exceeds_timeout(self, tmp_path):
+        limiter = _fast_limiter(tmp_path, limit=1, period=60)
+        limiter.acquire()
+        start = time.monotonic()
+        assert limiter.acquire(timeout=1) is False
+        assert time.monotonic() - start < 0.5
+
+    def test_blocks_until_slot_frees(self, tmp_path):
+        limiter = _fast_limiter(tmp_path, limit=2, period=0.2)
+        limiter.acquire()
+        limiter.acquire()
+        start = time.monotonic()
+        assert limiter.acquire(timeout=2) is True
+        assert time.monotonic() - start >= 0.05
+        assert limiter.throttled_requests == 1
+
+    def test_threads_do_not_over_admit(self, tmp_path):
+        limiter = _fast_limiter(tmp_path, limit=5, period=60)
+        results = []
+
+        def worker():
+            results.append(limiter.acquire(timeout=0.1))
+
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results.count(True) == 5
+        assert limiter.total_requests == 5
+
+    def test_waiters_admitted_in_fifo_order(self, tmp_path):
+        limiter = _fast_limiter(tmp_path, limit=1, period=0.1)
+        limiter.acquire()
+        order = []
+
+        def worker(i):
+            limiter.acquire()
+            order.append(i)
+
+        threads = []
+        for i in range(4):
+            t = threading.Thread(target=worker, args=(i,))
+            t.start()
+            threads.append(t)
+            time.sleep(0.01)  # ensure arrival order
+        for t in threads:
+            t.join()
+        assert order == [0, 1, 2, 3]
+
+    def test_context_manager_reserves(self, tmp_path):
+        limiter = _fast_limiter(tmp_path)
+        with limiter:
+            pass
+        assert limiter.total_requests == 1
+
+    def test_record_response_does_not_double_count(self, tmp_path):
+        limiter = _fast_limiter(tmp_path)
+        limiter.acquire()
+        limiter.record_response({"x-ratelimit-remaining": "10"})
+        assert limiter.total_requests == 1
+
+
+# ---------------------------------------------------------------------------
+# TestAsyncRateLimiter
+# ---------------------------------------------------------------------------
+
+class TestAsyncRateLimiter:
+    """AsyncRateLimiter shares the sync budget and admits coroutines FIFO."""
+
+    def test_saturates_rate_without_sleeping_full_window(self, tmp_path):
+        limiter = _fast_limiter(tmp_path, limit=5, period=0.25)
+        alimiter = _mod.AsyncRateLimiter(limiter)
+
+        async def run():
+            start = time.monotonic()
+            await asyncio.gather(*(alimiter.acquire() for _ in range(10)))
+            return time.monotonic() - start
+
+        elapsed = asyncio.run(run())
+        # 5 burst + 5 spaced 50ms apart: ~0.25s, not two full windows
+        assert 0.2 <= elapsed < 0.45
+        assert limiter.total_requests == 10
+
+    def test_fifo_order(self, tmp_path):
+        limiter = _fast_limiter(tmp_path, limit=1, period=0.05)
+        alimiter = _mod.AsyncRateLimiter(limiter)
+        order = []
+
+        async def worker(i):
+            await alimiter.acquire()
+            order.append(i)
+
+        async def run():
+            await asyncio.gather(*(worker(i) for i in range(5)))
+
+        asyncio.run(run())
+        assert order == [0, 1, 2, 3, 4]
+
+    def test_timeout(self, tmp_path):
+        limiter = _fast_limiter(tmp_path, limit=1, period=60)
+        alimiter = _mod.AsyncRateLimiter(limiter)
+
+        async def run():
+            first = await alimiter.acquire(timeout=0.1)
+            second = await alimiter.acquire(timeout=0.1)
+            return first, second
+
+        assert asyncio.run(run()) == (True, False)
+
+    def test_async_context_manager(self, tmp_path):
+        limiter = _fast_limiter(tmp_path)
+
+        async def run():
+            async with _mod.AsyncRateLimiter(limiter):
+                pass
+
+        asyncio.run(run())
+        assert limiter.total_requests == 1
+
+
+# ---------------------------------------------------------------------------
+# TestAdaptiveHeaders
+# ---------------------------------------------------------------------------
+
+class TestParseResetHeader:
+    """Reset headers in every provider's format resolve to epoch seconds."""
+
+    @pytest.mark.parametrize("value,fmt,expected", [
+        ("1700000000", "epoch", 1700000000.0),
+        ("42", "delta_seconds", 1042.0),
+        ("6m0s", "duration", 1360.0),
+        ("1h2m3.5s", "duration", 1000 + 3723.5),
+        ("20ms", "duration", 1000.02),
+        ("1970-01-01T00:20:00Z", "rfc3339", 1200.0),
+        ("42", "retry_after", 1042.0),
+        ("Thu, 01 Jan 1970 00:20:00 GMT", "retry_after", 1200.0),
+    ])
+    def test_formats(self, value, fmt, expected):
+        assert _mod.parse_reset_header(value, fmt, 1000.0) == pytest.approx(expected)
+
+    @pytest.mark.parametrize("value,fmt", [
+        ("soon", "epoch"), ("", "duration"), ("x", "rfc3339"), ("tomorrow", "retry_after"), ("", "retry_after"),
+    ])
+    def test_unparseable(self, value, fmt):
+        assert _mod.parse_reset_header(value, fmt, 1000.0) is None
+
+
+class TestAdaptiveMode:
+    """Adaptive limiters pace against the server-reported budget."""
+
+    def _adaptive(self, tmp_path, api_name="github"):
+        return _limiter(
+            tmp_path, api_name, adaptive=True,
+            metrics_sink=_mod.FileMetricsSink(tmp_path / "m.jsonl"),
+        )
+
+    def test_server_budget_overrides_static_window(self, tmp_path):
+        limiter = self._adaptive(tmp_path, "reddit")
+        limiter.window = _mod.TokenBucketEngine(1, 60)
+        limiter.record_response({"X-Ratelimit-Remaining": "3.0", "X-Ratelimit-Reset": "30"})
+        admitted = 0
+        while limiter.try_acquire()[0]:
+            admitted += 1
+        assert admitted == 3
+
+    def test_exhausted_budget_waits_until_reset(self, tmp_path):
+        limiter = self._adaptive(tmp_path, "github")
+        reset = int(time.time()) + 120
+        limiter.record_response({"x-ratelimit-remaining": "1", "x-ratelimit-reset": str(reset)})
+        assert limiter.try_acquire() == (True, 0)
+        acquired, wait = limiter.try_acquire()
+        assert acquired is False
+        assert 100 < wait <= 120
+
+    def test_retry_after_blocks(self, tmp_path):
+        limiter = self._adaptive(tmp_path, "claude")
+        limiter.record_response({"retry-after": "30"})
+        acquired, wait = limiter.try_acquire()
+        assert acquired is False
+        assert 29 < wait <= 30
+
+    def test_retry_after_http_date(self, tmp_path):
+        limiter = self._adaptive(tmp_path, "claude")
+        limiter.record_response({"retry-after": formatdate(time.time() + 60, usegmt=True)})
+        acquired, wait = limiter.try_acquire()
+        assert acquired is False
+        assert 58 < wait <= 60
+
+    def test_unparseable_retry_after_keeps_deadline(self, tmp_path):
+        limiter = self._adaptive(tmp_path, "claude")
+        limiter.record_response({"retry-after": "30"})
+        deadline = limiter.retry_after_until
+        limiter.record_response({"retry-after": "later"})
+        assert limiter.retry_after_until == deadline
+
+    def test_anthropic_headers(self, tmp_path):
+        limiter = self._adaptive(tmp_path, "claude")
+        reset = datetime.fromtimestamp(time.time() + 60, tz=timezone.utc).isoformat()
+        limiter.record_response({
+            "anthropic-ratelimit-requests-remaining": "200",
+            "anthropic-ratelimit-requests-reset": reset,
+        })
+        assert limiter.server_remaining == 200
+        assert limiter.get_usage_stats()["server"]["remaining"] == 200
+
+    def test_openai_headers(self, tmp_path):
+        limiter = self._adaptive(tmp_path, "openai_whisper")
+        limiter.record_response({
+            "x-ratelimit-remaining-requests": "7",
+            "x-ratelimit-reset-requests": "6m0s",
+        })
+        assert limiter.server_remaining == 7
+        assert limiter.server_reset_at == pytest.approx(time.time() + 360, abs=2)
+
+    def test_stale_budget_falls_back_to_static_window(self, tmp_path):
+        limiter = self._adaptive(tmp_path, "github")
+        limiter.record_response({"x-ratelimit-remaining": "0", "x-ratelimit-reset": "1"})
+        assert limiter.try_acquire() == (True, 0)
+
+    def test_non_adaptive_ignores_budget(self, tmp_path):
+        limiter = _limiter(tmp_path, "reddit", metrics_sink=_mod.FileMetricsSink(tmp_path / "m.jsonl"))
+        limiter.record_response({"retry-after": "30", "x-ratelimit-remaining": "5", "x-ratelimit-reset": "30"})
+        assert limiter.server_remaining is None
+        assert limiter.try_acquire() == (True, 0)
+
+
+# ---------------------------------------------------------------------------
+# TestSharedState
+# ---------------------------------------------------------------------------
+
+_WORKER = """
+import importlib.util, sys
+from pathlib import Path
+spec = importlib.util.spec_from_file_location("rate_limiter", sys.argv[1])
+mod = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(mod)
+tmp = Path(sys.argv[2])
+limiter = mod.RateLimiter(
+    "github",
+    metrics_file=tmp / "m.jsonl",
+    metrics_sink=mod.FileMetricsSink(tmp / "m.jsonl", sample_rate=0.0),
+    shared_state=mod.SharedStateFile(tmp / "github.state"),
+)
+admitted = sum(1 for _ in range(2000) if limiter.try_acquire()[0])
+print(admitted)
+"""
+
+
+class TestSharedState:
+    """Processes sharing a state file draw from one budget."""
+
+    def _shared(self, tmp_path, api_name="github"):
+        return _limiter(
+            tmp_path, api_name,
+            metrics_sink=_mod.FileMetricsSink(tmp_path / "m.jsonl"),
+            shared_state=_mod.SharedStateFile(tmp_path / f"{api_name}.state"),
+        )
+
+    def test_two_limiters_share_budget(self, tmp_path):
+        a = self._shared(tmp_path, "reddit")
+        b = self._shared(tmp_path, "reddit")
+        admitted = 0
+        while a.try_acquire()[0] and b.try_acquire()[0]:
+            admitted += 2
+        assert admitted == 60
+        assert a.check_limit()[0] is False
+        assert b.check_limit()[0] is False
+
+    def test_server_budget_is_shared(self, tmp_path):
+        a = self._shared(tmp_path, "github")
+        b = self._shared(tmp_path, "github")
+        a.adaptive = b.adaptive = True
+        a.record_response({"x-ratelimit-remaining": "0", "x-ratelimit-reset": str(int(time.time()) + 60)})
+        assert b.try_acquire()[0] is False
+        assert b.server_remaining == 0
+
+    def test_state_file_reinitialized_on_size_mismatch(self, tmp_path):
+        path = tmp_path / "reddit.state"
+        path.write_bytes(b"garbage")
+        _mod.SharedStateFile(path)
+        assert path.stat().st_size == _mod.SharedStateFile.SIZE
+
+    def test_sliding_log_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            _limiter(
+                tmp_path, engine="sliding_log",
+                shared_state=_mod.SharedStateFile(tmp_path / "reddit.state"),
+            )
+
+    def test_processes_do_not_overrun_budget(self, tmp_path):
+        procs = [
+            subprocess.Popen(
+                [sys.executable, "-c", _WORKER, str(_SCRIPT), str(tmp_path)],
+                stdout=subprocess.PIPE, text=True,
+            )
+            for _ in range(4)
+        ]
+        total = sum(int(p.communicate(timeout=60)[0]) for p in procs)
+        assert total == 5000
+
+    def test_manager_uses_state_dir(self, tmp_path):
+        manager = _mod.RateLimitManager(shared_state_dir=tmp_path)
+        limiter = manager.get_limiter("reddit")
+        assert limiter.shared_state.path == tmp_path / "reddit.state"
+
+
+# ---------------------------------------------------------------------------
+# TestPriorityLanes
+# ---------------------------------------------------------------------------
+
+class TestPriorityLanes:
+    """Lower lanes stop at their watermark, leaving headroom for higher ones."""
+
+    def _quota(self, tmp_path):
+        return _fast_limiter(tmp_path, limit=20, period=60)
+
+    def _drain(self, limiter, priority):
+        admitted = 0
+        while limiter.try_acquire(priority)[0]:
+            admitted += 1
+        return admitted
+
+    def test_bulk_stops_at_watermark(self, tmp_path):
+        limiter = self._quota(tmp_path)
+        assert self._drain(limiter, "bulk") == 15
+
+    def test_higher_lanes_use_reserved_headroom(self, tmp_path):
+        limiter = self._quota(tmp_path)
+        self._drain(limiter, "bulk")
+        assert self._drain(limiter, "normal") == 3
+        assert self._drain(limiter, "interactive") == 1
+        assert self._drain(limiter, "critical") == 1
+
+    def test_bulk_is_shed_not_queued(self, tmp_path):
+        limiter = self._quota(tmp_path)
+        self._drain(limiter, "bulk")
+        start = time.monotonic()
+        assert limiter.acquire(priority="bulk") is False
+        assert time.monotonic() - start < 0.1
+        assert limiter.shed_requests >= 2
+
+    def test_normal_defers_instead_of_shedding(self, tmp_path):
+        limiter = self._quota(tmp_path)
+        self._drain(limiter, "normal")
+        assert limiter.acquire(timeout=0, priority="normal") is False
+        assert limiter.shed_requests == 0
+
+    def test_critical_overtakes_queued_normal(self, tmp_path):
+        limiter = _fast_limiter(tmp_path, limit=10, period=0.5)
+        self._drain(limiter, None)
+        order = []
+
+        def worker(priority):
+            limiter.acquire(timeout=2, priority=priority)
+            order.append(priority)
+
+        normal = threading.Thread(target=worker, args=("normal",))
+        normal.start()
+        time.sleep(0.01)
+        critical = threading.Thread(target=worker, args=("critical",))
+        critical.start()
+        normal.join()
+        critical.join()
+        assert order == ["critical", "normal"]
+
+    def test_adaptive_server_budget_reserve(self, tmp_path):
+        limiter = _limiter(tmp_path, "github", adaptive=True,
+                           metrics_sink=_mod.FileMetricsSink(tmp_path / "m.jsonl"))
+        limiter.record_response({
+            "x-ratelimit-remaining": "1000",
+            "x-ratelimit-reset": str(int(time.time()) + 60),
+        })
+        # 25% of the static 5000/hour is held back from bulk
+        assert limiter.check_limit("bulk")[0] is False
+        assert limiter.check_limit("critical") == (True, 0)
+
+    def test_manager_returns_lane_over_shared_limiter(self, tmp_path):
+        manager = _mod.RateLimitManager()
+        lane = manager.get_limiter("reddit", "bulk")
+        assert isinstance(lane, _mod.PriorityLane)
+        assert lane.limiter is manager.get_limiter("reddit")
+
+    def test_unknown_priority_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            _mod.RateLimitManager().get_limiter("reddit", "urgent")
+
+    def test_async_bulk_shed(self, tmp_path):
+        limiter = self._quota(tmp_path)
+        self._drain(limiter, "bulk")
+        alimiter = _mod.AsyncRateLimiter(limiter, priority="bulk")
+        assert asyncio.run(alimiter.acquire()) is False
+
+    def test_shed_lane_context_manager_raises(self, tmp_path):
+        limiter = self._quota(tmp_path)
+        self._drain(limiter, "bulk")
+        with pytest.raises(_mod.RateLimitExceeded, match=r"reddit \(bulk\)"):
+            with _mod.PriorityLane(limiter, "bulk"):
+                pytest.fail("body ran without a slot")
+
+    def test_async_shed_context_manager_raises(self, tmp_path):
+        limiter = self._quota(tmp_path)
+        self._drain(limiter, "bulk")
+
+        async def run():
+            async with _mod.AsyncRateLimiter(limiter, priority="bulk"):
+                pytest.fail("body ran without a slot")
+
+        with pytest.raises(_mod.RateLimitExceeded):
+            asyncio.run(run())